@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Shared Actress Profile Cache
+- Scraped actress profiles persisted in database/actress_profiles.json, so
+  every scraper instance and process starts warm (the same performers recur
+  across hundreds of videos)
+- Keyed by profile URL slug when known, else by normalized name, per scraper
+  namespace (each scraper stores its own profile dataclass)
+- Profiles expire after ACTRESS_CACHE_TTL_DAYS (default 30)
+- "No profile exists" is cached too, for ACTRESS_CACHE_NEGATIVE_TTL_HOURS
+  (default 24) once the browser confirmed it; a miss seen over plain HTTP
+  only is kept for ACTRESS_CACHE_UNCONFIRMED_TTL_MINUTES (default 30) -
+  page-load errors and timeouts are never cached
+
+Usage:
+    from actress_profiles import actress_profiles, profile_key, restore, MISSING
+    key = profile_key('javdb', name, profile_url)
+    cached = actress_profiles.get(key)
+    if cached is not MISSING:
+        return restore(ActressData, cached)     # None = known to have no profile
+    ...
+    actress_profiles.put(key, asdict(profile))  # or put(key, None, confirmed=tier == 'browser')
+
+CLI: python actress_profiles.py [--purge] [--clear]
+"""
+import os
+import re
+import json
+import time
+import threading
+import dataclasses
+from typing import Dict, Optional
+
+try:
+    from filelock import FileLock
+    FILELOCK_AVAILABLE = True
+except ImportError:
+    FILELOCK_AVAILABLE = False
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ACTRESS_CACHE_FILE = os.path.join(SCRIPT_DIR, "database", "actress_profiles.json")
+
+
+def _env_seconds(name, default, unit):
+    value = os.getenv(name, '').strip()
+    try:
+        return float(value) * unit if value else default * unit
+    except ValueError:
+        print(f"⚠️ Ignoring invalid {name}: {value}")
+        return default * unit
+
+
+PROFILE_TTL = _env_seconds('ACTRESS_CACHE_TTL_DAYS', 30, 86400)
+NEGATIVE_TTL = _env_seconds('ACTRESS_CACHE_NEGATIVE_TTL_HOURS', 24, 3600)
+UNCONFIRMED_TTL = _env_seconds('ACTRESS_CACHE_UNCONFIRMED_TTL_MINUTES', 30, 60)
+
+# Returned by get() when nothing (unexpired) is cached
+MISSING = object()
+
+
+def profile_key(namespace: str, name: str, profile_url: Optional[str] = None) -> str:
+    """
+    Cache key for an actress
+
+    'javdb', 'Yua Mikami', '.../idols/yua-mikami/' -> 'javdb:idol:yua-mikami'
+    'by_code', 'Yua Mikami'                        -> 'by_code:name:yua mikami'
+    """
+    if profile_url:
+        match = re.search(r'/idols/([^/?#]+)', profile_url)
+        if match:
+            return f"{namespace}:idol:{match.group(1).lower()}"
+    return f"{namespace}:name:{' '.join(name.split()).lower()}"
+
+
+def restore(cls, data: Optional[Dict]):
+    """Rebuild a profile dataclass from cached data (unknown fields ignored)"""
+    if data is None:
+        return None
+    names = {f.name for f in dataclasses.fields(cls)}
+    return cls(**{k: v for k, v in data.items() if k in names})
+
+
+class ActressProfileCache:
+    """Actress profiles shared across scraper instances and processes"""
+
+    def __init__(self, cache_file: str = None, ttl: float = None, negative_ttl: float = None,
+                 unconfirmed_ttl: float = None):
+        self.cache_file = cache_file or ACTRESS_CACHE_FILE
+        self.ttl = PROFILE_TTL if ttl is None else ttl
+        self.negative_ttl = NEGATIVE_TTL if negative_ttl is None else negative_ttl
+        self.unconfirmed_ttl = UNCONFIRMED_TTL if unconfirmed_ttl is None else unconfirmed_ttl
+        self.entries = {}  # key -> {'data': dict or None, 'cached_at', 'expires_at'}
+        self.lock = threading.Lock()
+        self.file_lock = FileLock(self.cache_file + '.lock', timeout=10) if FILELOCK_AVAILABLE else None
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+        self.entries = self._read_file()
+
+    def _read_file(self) -> Dict:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        except Exception as e:
+            print(f"[ActressCache] Could not read {self.cache_file}: {e}")
+            return {}
+
+    def _update_file(self, change):
+        """Apply change(entries) to the file contents under the file lock"""
+        def write():
+            merged = self._read_file()
+            change(merged)
+
+            now = time.time()
+            merged = {k: e for k, e in merged.items() if e.get('expires_at', 0) > now}
+
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp{os.getpid()}"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(merged, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+            self.entries = merged
+
+        try:
+            if self.file_lock:
+                with self.file_lock:
+                    write()
+            else:
+                write()
+        except Exception as e:
+            print(f"[ActressCache] Could not save {self.cache_file}: {e}")
+
+    def get(self, key: str):
+        """
+        Cached profile data
+
+        Returns:
+            dict (profile), None (known to have no profile) or MISSING
+        """
+        now = time.time()
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            # Another scraper (process) may have stored it since we loaded
+            if not entry or entry.get('expires_at', 0) <= now:
+                entry = self._read_file().get(key)
+                if entry:
+                    self.entries[key] = entry
+
+            if not entry or entry.get('expires_at', 0) <= now:
+                self.misses += 1
+                return MISSING
+
+            if entry.get('data') is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return entry.get('data')
+
+    def put(self, key: str, data: Optional[Dict], confirmed: bool = True):
+        """
+        Store profile data, or None for "this actress has no profile" (shorter TTL)
+
+        Args:
+            confirmed: False for a miss only seen over plain HTTP (no browser
+                check yet) - kept for the short unconfirmed TTL
+        """
+        if data is not None:
+            ttl = self.ttl
+        else:
+            ttl = self.negative_ttl if confirmed else self.unconfirmed_ttl
+
+        now = time.time()
+        entry = {
+            'data': data,
+            'cached_at': now,
+            'expires_at': now + ttl
+        }
+
+        with self.lock:
+            self.entries[key] = entry
+            self._update_file(lambda entries: entries.__setitem__(key, entry))
+
+    def invalidate(self, key: str):
+        with self.lock:
+            self.entries.pop(key, None)
+            self._update_file(lambda entries: entries.pop(key, None))
+
+    def purge(self) -> int:
+        """Drop expired entries from the file; returns how many were dropped"""
+        with self.lock:
+            before = len(self._read_file())
+            self._update_file(lambda entries: None)
+            return before - len(self.entries)
+
+    def clear(self):
+        with self.lock:
+            self._update_file(lambda entries: entries.clear())
+
+    def print_stats(self):
+        lookups = self.hits + self.negative_hits + self.misses
+        if not lookups:
+            return
+        print(f"👤 Actress cache: {self.hits} hits, {self.negative_hits} known-missing, "
+              f"{self.misses} misses ({(self.hits + self.negative_hits) / lookups * 100:.0f}% without page load)")
+
+
+# Global instance
+actress_profiles = ActressProfileCache()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Shared actress profile cache')
+    parser.add_argument('--purge', action='store_true', help='Drop expired entries')
+    parser.add_argument('--clear', action='store_true', help='Drop all entries')
+    args = parser.parse_args()
+
+    if args.clear:
+        actress_profiles.clear()
+        print("✓ Actress cache cleared")
+    elif args.purge:
+        print(f"✓ Dropped {actress_profiles.purge()} expired entries")
+
+    entries = actress_profiles._read_file()
+    profiles = sum(1 for e in entries.values() if e.get('data') is not None)
+    print(f"Actress cache: {actress_profiles.cache_file}")
+    print(f"  Profiles: {profiles}")
+    print(f"  Known missing: {len(entries) - profiles}")
@@ -0,0 +1,348 @@
+"""
+Bandwidth Scheduler
+Token buckets shared by every uploader and downloader in the process:
+- Flows: one per upload host (e.g. 'mixdrop') plus 'download' for HLS
+  segment downloads; each flow is in the 'upload' or 'download' pool
+- Caps: 'total' (all flows), 'upload', 'download' and per-host limits in MB/s
+- Weights: a capped pool is split between its active flows by weight
+  (weighted max-min - bandwidth a flow does not use goes to the others)
+- Live retuning: set_limit / set_weight / set_host_limit apply to the
+  very next chunk of every running transfer
+- rates() / stats() report the achieved MB/s per flow
+
+Configured from .env:
+    BANDWIDTH_TOTAL_MBPS=40
+    BANDWIDTH_UPLOAD_MBPS=25
+    BANDWIDTH_DOWNLOAD_MBPS=
+    BANDWIDTH_WEIGHTS=seekstreaming=4,download=3,mixdrop=1
+    BANDWIDTH_HOST_LIMITS=streamtape=5
+Nothing set = no throttling, only measurement.
+"""
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+MB = 1024 * 1024
+
+POOLS = ('total', 'upload', 'download')
+
+# A flow that moved data this recently competes for its pool's share
+ACTIVE_WINDOW = 1.0
+# Rolling window for achieved rates
+RATE_WINDOW = 5.0
+
+
+def _parse_mapping(value):
+    """'a=1,b=2.5' -> {'a': 1.0, 'b': 2.5}"""
+    mapping = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            name, number = item.split('=', 1)
+            try:
+                mapping[name.strip()] = float(number)
+            except ValueError:
+                print(f"⚠️ Ignoring invalid bandwidth setting: {item}")
+    return mapping
+
+
+def _env_mbps(name):
+    value = os.getenv(name, '').strip()
+    try:
+        return float(value) if value else None
+    except ValueError:
+        print(f"⚠️ Ignoring invalid {name}: {value}")
+        return None
+
+
+class _Flow:
+    """Per-flow bucket and meter (guarded by the scheduler lock)"""
+
+    def __init__(self, name, kind, now):
+        self.name = name
+        self.kind = kind
+        self.rate = None          # Allocated bytes/s, None = unlimited
+        self.tokens = 0.0
+        self.last_refill = now
+        self.started = now
+        self.last_active = now
+        self.throttled_until = 0  # Recently had to wait = wants more
+        self.samples = deque()    # (time, bytes)
+        self.bursts = deque([now], maxlen=64)  # Times data started moving after idling
+        self.window_bytes = 0
+        self.total_bytes = 0
+        self.busy_time = 0.0
+
+    def measured_rate(self, now):
+        while self.samples and self.samples[0][0] < now - RATE_WINDOW:
+            self.window_bytes -= self.samples.popleft()[1]
+        span = min(RATE_WINDOW, max(now - self.started, 0.1))
+        return self.window_bytes / span
+
+
+class BandwidthScheduler:
+    """Weighted token-bucket rate limiting for concurrent transfers"""
+
+    def __init__(self, total_mbps=None, upload_mbps=None, download_mbps=None,
+                 weights=None, host_limits=None, burst_seconds=0.25):
+        """
+        Args:
+            total_mbps / upload_mbps / download_mbps: Pool caps in MB/s (None = no cap)
+            weights: Flow name -> weight (default 1)
+            host_limits: Flow name -> absolute cap in MB/s
+            burst_seconds: Bucket depth, in seconds of the flow's rate
+        """
+        self.lock = threading.Lock()
+        self.limits = {'total': total_mbps, 'upload': upload_mbps, 'download': download_mbps}
+        self.weights = dict(weights or {})
+        self.host_limits = dict(host_limits or {})
+        self.burst_seconds = burst_seconds
+        self.flows = {}
+        self._allocated_at = 0
+        self._local = threading.local()
+        self._env_pending = False
+
+    @classmethod
+    def from_env(cls):
+        """
+        Scheduler configured from BANDWIDTH_* variables
+        Read on first use, so a load_dotenv() after import still applies.
+        """
+        scheduler = cls()
+        scheduler._env_pending = True
+        return scheduler
+
+    def _load_env(self):
+        """Apply BANDWIDTH_* settings once (caller holds self.lock)"""
+        if not self._env_pending:
+            return
+        self._env_pending = False
+
+        self.limits = {
+            'total': _env_mbps('BANDWIDTH_TOTAL_MBPS'),
+            'upload': _env_mbps('BANDWIDTH_UPLOAD_MBPS'),
+            'download': _env_mbps('BANDWIDTH_DOWNLOAD_MBPS')
+        }
+        self.weights.update(_parse_mapping(os.getenv('BANDWIDTH_WEIGHTS')))
+        self.host_limits.update(_parse_mapping(os.getenv('BANDWIDTH_HOST_LIMITS')))
+
+    # -- live retuning -----------------------------------------------------
+
+    def set_limit(self, pool, mbps):
+        """Cap a pool ('total', 'upload', 'download') in MB/s; None removes the cap"""
+        if pool not in POOLS:
+            raise ValueError(f"Unknown bandwidth pool: {pool}")
+        with self.lock:
+            self._load_env()
+            self.limits[pool] = mbps
+            self._allocated_at = 0
+
+    def set_weight(self, flow, weight):
+        """Relative share of a flow inside capped pools"""
+        with self.lock:
+            self._load_env()
+            self.weights[flow] = max(0.01, float(weight))
+            self._allocated_at = 0
+
+    def set_host_limit(self, flow, mbps):
+        """Absolute cap for one flow in MB/s; None removes it"""
+        with self.lock:
+            self._load_env()
+            if mbps is None:
+                self.host_limits.pop(flow, None)
+            else:
+                self.host_limits[flow] = mbps
+            self._allocated_at = 0
+
+    @property
+    def enabled(self):
+        """True if any cap is set"""
+        with self.lock:
+            self._load_env()
+            return any(v for v in self.limits.values()) or any(v for v in self.host_limits.values())
+
+    # -- flow context ------------------------------------------------------
+
+    @contextmanager
+    def use_flow(self, name, kind='upload'):
+        """Attribute transfers started in this thread to a flow"""
+        previous = getattr(self._local, 'flow', None)
+        self._local.flow = (name, kind)
+        try:
+            yield
+        finally:
+            self._local.flow = previous
+
+    def current_flow(self, default=('upload', 'upload')):
+        """(name, kind) set by use_flow in this thread, else default"""
+        return getattr(self._local, 'flow', None) or default
+
+    # -- allocation (caller holds self.lock) -------------------------------
+
+    def _demand(self, flow, now):
+        """Bytes/s the flow could use: unbounded if it is being held back"""
+        if flow.throttled_until > now or now - flow.started < ACTIVE_WINDOW:
+            demand = float('inf')
+        else:
+            demand = flow.measured_rate(now) * 1.5 + 0.5 * MB
+
+        host_limit = self.host_limits.get(flow.name)
+        if host_limit:
+            demand = min(demand, host_limit * MB)
+        return demand
+
+    def _allocate(self, now):
+        """Weighted max-min share of every capped pool among its active flows"""
+        active = [f for f in self.flows.values() if now - f.last_active < ACTIVE_WINDOW]
+        demands = {f.name: self._demand(f, now) for f in active}
+        rates = {}
+
+        for f in self.flows.values():
+            host_limit = self.host_limits.get(f.name)
+            rates[f.name] = host_limit * MB if host_limit else None
+
+        for pool in POOLS:
+            cap = self.limits.get(pool)
+            if not cap:
+                continue
+
+            members = [f for f in active if pool == 'total' or f.kind == pool]
+            remaining = cap * MB
+            pending = sorted(members, key=lambda f: demands[f.name] / self.weights.get(f.name, 1.0))
+
+            while pending:
+                total_weight = sum(self.weights.get(f.name, 1.0) for f in pending)
+                f = pending[0]
+                fair = remaining * self.weights.get(f.name, 1.0) / total_weight
+                share = min(demands[f.name], fair)
+
+                if rates[f.name] is None or share < rates[f.name]:
+                    rates[f.name] = share
+                remaining -= share
+                pending.pop(0)
+
+            # Idle flows restart at the pool rate and are rebalanced once active
+            for f in self.flows.values():
+                if f not in active and (pool == 'total' or f.kind == pool):
+                    if rates[f.name] is None or cap * MB < rates[f.name]:
+                        rates[f.name] = cap * MB
+
+        for f in self.flows.values():
+            f.rate = rates[f.name]
+        self._allocated_at = now
+
+    # -- transfers ---------------------------------------------------------
+
+    def acquire(self, nbytes, flow=None, kind=None):
+        """
+        Account nbytes to a flow and block until its budget allows them
+
+        Args:
+            nbytes: Bytes about to be sent / just received
+            flow: Flow name (default: current_flow())
+            kind: 'upload' or 'download' (default: from current_flow())
+        """
+        if flow is None:
+            flow, default_kind = self.current_flow()
+            kind = kind or default_kind
+        kind = kind or 'upload'
+
+        with self.lock:
+            self._load_env()
+            now = time.time()
+            f = self.flows.get(flow)
+            if f is None:
+                f = self.flows[flow] = _Flow(flow, kind, now)
+                self._allocated_at = 0
+
+            f.samples.append((now, nbytes))
+            f.window_bytes += nbytes
+            f.total_bytes += nbytes
+            if now - f.last_active < ACTIVE_WINDOW:
+                f.busy_time += now - f.last_active
+            else:
+                f.bursts.append(now)
+            f.last_active = now
+
+            if now - self._allocated_at > 0.1:
+                self._allocate(now)
+
+            rate = f.rate
+            if not rate:
+                f.tokens = 0.0
+                return 0.0
+
+            burst = rate * self.burst_seconds
+            f.tokens = min(burst, f.tokens + (now - f.last_refill) * rate) - nbytes
+            f.last_refill = now
+
+            wait = -f.tokens / rate if f.tokens < 0 else 0.0
+            if wait > 0:
+                f.throttled_until = now + RATE_WINDOW
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def throttle(self, chunks, flow=None, kind=None):
+        """Yield chunks from an iterable, pacing each through acquire()"""
+        for chunk in chunks:
+            self.acquire(len(chunk), flow, kind)
+            yield chunk
+
+    def read_response(self, response, flow='download', kind='download', chunk_size=64 * 1024):
+        """Body of a stream=True requests response, received at the flow's rate"""
+        data = bytearray()
+        for chunk in response.iter_content(chunk_size):
+            data += chunk
+            self.acquire(len(chunk), flow, kind)
+        return bytes(data)
+
+    # -- reporting ---------------------------------------------------------
+
+    def rates(self):
+        """Achieved MB/s per flow over the last few seconds"""
+        with self.lock:
+            now = time.time()
+            return {name: f.measured_rate(now) / MB for name, f in self.flows.items()}
+
+    def stats(self):
+        """Per-flow bytes, rolling and average MB/s, and current allocation"""
+        with self.lock:
+            now = time.time()
+            return {
+                name: {
+                    'kind': f.kind,
+                    'total_mb': f.total_bytes / MB,
+                    'mbps': f.measured_rate(now) / MB,
+                    'avg_mbps': f.total_bytes / MB / f.busy_time if f.busy_time else 0.0,
+                    'allocated_mbps': f.rate / MB if f.rate else None,
+                    'weight': self.weights.get(name, 1.0)
+                }
+                for name, f in self.flows.items()
+            }
+
+    def first_byte_since(self, flow, since):
+        """Time the flow first moved data at or after since (None if it has not)"""
+        with self.lock:
+            f = self.flows.get(flow)
+            if f is None:
+                return None
+            return next((t for t in f.bursts if t >= since), None)
+
+    def print_rates(self):
+        stats = self.stats()
+        if not stats:
+            return
+
+        limits = ', '.join(f"{pool} {mbps:g}" for pool, mbps in self.limits.items() if mbps)
+        print(f"📶 Bandwidth ({limits or 'no caps'} MB/s):")
+        for name, s in sorted(stats.items(), key=lambda item: -item[1]['total_mb']):
+            allocated = f", budget {s['allocated_mbps']:.1f}" if s['allocated_mbps'] else ''
+            print(f"   {name:<15} {s['mbps']:6.2f} MB/s now, {s['avg_mbps']:6.2f} avg, "
+                  f"{s['total_mb']:8.1f} MB (w={s['weight']:g}{allocated})")
+
+
+# Global instance - shared by upload_pipeline and the HLS downloaders
+bandwidth = BandwidthScheduler.from_env()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Catalog Normalization Benchmark
+Normalizes every record of the catalog (database/combined_videos.json) with
+normalize.py - no browser, no network:
+- The catalog is repeated up to --records records (codes made unique per
+  copy, so the caches see realistic cardinality)
+- Per pass: normalize_video, URL and code keys, file size parsing - what
+  ingest, duplicate checks and update_stats do per record
+- A cold pass (caches empty) and --passes warm passes, as ms/pass and
+  records/s, plus the cache hit rates, as JSON
+
+Usage:
+    python benchmark_normalize.py                    # 100000 records
+    python benchmark_normalize.py --records 20000 --passes 5
+    python benchmark_normalize.py --catalog other.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+from datetime import datetime
+
+import normalize
+from normalize import code_key, code_from_url, normalize_url, normalize_video, parse_size_bytes
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CATALOG = os.path.join(SCRIPT_DIR, 'database', 'combined_videos.json')
+DEFAULT_OUTPUT = os.path.join(SCRIPT_DIR, 'benchmark_normalize_results.json')
+
+# Used when the catalog file is missing or empty
+SAMPLE_RECORD = {
+    'code': 'ABC-123',
+    'title': 'ABC-123 -  Sample   title',
+    'title_japanese': 'サンプル',
+    'source_url': 'https://www.example.com/videos/abc-123/?ref=1',
+    'file_size': '~600MB'
+}
+
+
+def load_catalog(path, records):
+    """Catalog records repeated up to `records`, codes and URLs unique per copy"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        videos = data.get('videos', []) if isinstance(data, dict) else data
+    except (FileNotFoundError, json.JSONDecodeError):
+        videos = []
+    videos = [v for v in videos if isinstance(v, dict) and v.get('code')] or [SAMPLE_RECORD]
+
+    catalog = []
+    while len(catalog) < records:
+        copy = len(catalog) // len(videos)
+        for video in videos[:records - len(catalog)]:
+            record = dict(video)
+            if copy:
+                record['code'] = f"{video['code']}-{copy}"
+                record['title'] = (video.get('title') or '').replace(video['code'], record['code'])
+                if video.get('source_url'):
+                    record['source_url'] = f"{video['source_url'].rstrip('/')}-{copy}/"
+            catalog.append(record)
+    return catalog, len(videos)
+
+
+def normalize_record(video):
+    record = normalize_video(video)
+    url = record.get('source_url') or ''
+    return normalize_url(url), code_key(code_from_url(url) or record['code']), parse_size_bytes(record.get('file_size'))
+
+
+def run_pass(catalog):
+    start = time.perf_counter()
+    for video in catalog:
+        normalize_record(video)
+    return time.perf_counter() - start
+
+
+def summarize(name, elapsed, records):
+    return {
+        'pass': name,
+        'ms': round(elapsed * 1000, 1),
+        'records_per_s': round(records / elapsed) if elapsed > 0 else None
+    }
+
+
+def print_summary(results):
+    print("\n" + "=" * 70)
+    print("NORMALIZATION BENCHMARK RESULTS")
+    print("=" * 70)
+    print(f"  {results['settings']['records']} records ({results['settings']['unique_records']} from the catalog)")
+    print(f"  {'pass':<20}{'ms':>12}{'records/s':>14}")
+    print("  " + "-" * 46)
+    for p in results['passes']:
+        print(f"  {p['pass']:<20}{p['ms']:>12.1f}{(p['records_per_s'] or 0):>14}")
+    print("\n  cache hit rates:")
+    for name, info in results['caches'].items():
+        calls = info['hits'] + info['misses']
+        rate = info['hits'] / calls * 100 if calls else 0
+        print(f"  {name:<20}{calls:>12} calls{rate:>9.1f}% hits")
+    print("\n" + "=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark normalizing the full catalog')
+    parser.add_argument('--catalog', default=DEFAULT_CATALOG, help='Catalog JSON (default: database/combined_videos.json)')
+    parser.add_argument('--records', type=int, default=100000, help='Records per pass (default: 100000)')
+    parser.add_argument('--passes', type=int, default=3, help='Warm passes after the cold one (default: 3)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Results JSON path')
+    args = parser.parse_args()
+
+    catalog, unique = load_catalog(args.catalog, args.records)
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'host': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count()
+        },
+        'settings': {
+            'catalog': args.catalog,
+            'records': len(catalog),
+            'unique_records': unique,
+            'passes': args.passes,
+            'cache_size': normalize.CACHE_SIZE
+        },
+        'passes': []
+    }
+
+    try:
+        normalize.cache_clear()
+        print(f"[Benchmark] {len(catalog)} records: cold pass + {args.passes} warm...")
+        results['passes'].append(summarize('cold', run_pass(catalog), len(catalog)))
+        for i in range(args.passes):
+            results['passes'].append(summarize(f'warm {i + 1}', run_pass(catalog), len(catalog)))
+        results['caches'] = normalize.cache_info()
+    except Exception as e:
+        print(f"✗ Benchmark failed: {e}")
+        sys.exit(1)
+
+    print_summary(results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Warm Browser Pool for Selenium Scrapers
+- Keeps up to BROWSER_POOL_SIZE (default 1) started browsers and hands them
+  out again instead of restarting Chrome per page / per N videos
+- Between pages the browser gets a fresh tab (old tabs closed), which frees
+  the previous page's renderer without a cold start; cookies (Cloudflare
+  clearance) survive
+- A browser is only recycled on measured health signals:
+    * RSS growth of its process tree since its first page
+      > BROWSER_MAX_RSS_GROWTH_MB (default 800, needs psutil)
+    * BROWSER_MAX_ERROR_STREAK failed pages in a row (default 3)
+    * driver not responding (dead session, crashed tab)
+    * optional BROWSER_MAX_PAGES safety net (default 0 = off)
+- Recycling kills exactly that browser's process tree - other pooled
+  browsers keep running
+
+Usage:
+    from browser_pool import BrowserPool
+    pool = BrowserPool(lambda: JableScraper(headless=True), name='jable')
+    browser = pool.acquire()          # warm scraper, .driver started
+    video = browser.scraper.scrape_video(url)
+    pool.release(browser, ok=video is not None)
+    ...
+    pool.close()
+"""
+import os
+import time
+import threading
+from typing import Callable, List, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+def _env_int(name, default):
+    value = os.getenv(name, '').strip()
+    try:
+        return int(value) if value else default
+    except ValueError:
+        print(f"⚠️ Ignoring invalid {name}: {value}")
+        return default
+
+
+POOL_SIZE = _env_int('BROWSER_POOL_SIZE', 1)
+MAX_RSS_GROWTH_MB = _env_int('BROWSER_MAX_RSS_GROWTH_MB', 800)
+MAX_ERROR_STREAK = _env_int('BROWSER_MAX_ERROR_STREAK', 3)
+MAX_PAGES = _env_int('BROWSER_MAX_PAGES', 0)
+
+
+def _driver_processes(driver) -> List:
+    """psutil processes of a driver: chromedriver, the browser and all their children"""
+    if not PSUTIL_AVAILABLE or driver is None:
+        return []
+
+    roots = []
+    try:
+        roots.append(driver.service.process.pid)
+    except Exception:
+        pass
+    browser_pid = getattr(driver, 'browser_pid', None)  # undetected-chromedriver
+    if browser_pid:
+        roots.append(browser_pid)
+
+    procs = {}
+    for pid in roots:
+        try:
+            root = psutil.Process(pid)
+            for proc in [root] + root.children(recursive=True):
+                procs[proc.pid] = proc
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return list(procs.values())
+
+
+def driver_rss_mb(driver) -> Optional[float]:
+    """Total RSS of a driver's process tree in MB (None if unmeasurable)"""
+    procs = _driver_processes(driver)
+    if not procs:
+        return None
+    total = 0
+    for proc in procs:
+        try:
+            total += proc.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return total / (1024 * 1024)
+
+
+def fresh_tab(driver):
+    """Open a new tab and close all others (drops the old pages' renderers)"""
+    old_handles = list(driver.window_handles)
+    driver.switch_to.new_window('tab')
+    new_handle = driver.current_window_handle
+    for handle in old_handles:
+        if handle != new_handle:
+            driver.switch_to.window(handle)
+            driver.close()
+    driver.switch_to.window(new_handle)
+
+
+class PooledBrowser:
+    """A scraper with a started driver, plus the health signals the pool tracks"""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.pages = 0
+        self.error_streak = 0
+        self.started_at = time.time()
+        self.baseline_rss_mb = None   # After the first page (normal page-load growth excluded)
+        self.rss_mb = None
+        self.driver_id = id(getattr(scraper, 'driver', None))
+
+    @property
+    def driver(self):
+        return getattr(self.scraper, 'driver', None)
+
+    def rss_growth_mb(self) -> Optional[float]:
+        if self.rss_mb is None or self.baseline_rss_mb is None:
+            return None
+        return self.rss_mb - self.baseline_rss_mb
+
+    def responsive(self) -> bool:
+        try:
+            _ = self.driver.current_url
+            _ = self.driver.window_handles
+            return True
+        except Exception:
+            return False
+
+
+class BrowserPool:
+    """Up to `size` warm browsers, recycled on health signals instead of fixed counters"""
+
+    def __init__(self, factory: Callable, size: int = None, name: str = 'browser',
+                 max_rss_growth_mb: float = None, max_error_streak: int = None, max_pages: int = None):
+        self.factory = factory
+        self.size = max(1, size or POOL_SIZE)
+        self.name = name
+        self.max_rss_growth_mb = MAX_RSS_GROWTH_MB if max_rss_growth_mb is None else max_rss_growth_mb
+        self.max_error_streak = MAX_ERROR_STREAK if max_error_streak is None else max_error_streak
+        self.max_pages = MAX_PAGES if max_pages is None else max_pages
+
+        self.idle = []
+        self.busy = set()
+        self.starting = 0
+        self.condition = threading.Condition()
+        self.closed = False
+
+        # Stats
+        self.started = 0
+        self.recycled = {}  # reason -> count
+        self.pages = 0
+        self.reused = 0
+
+    # -- lifecycle ------------------------------------------------------------
+
+    def _start(self) -> PooledBrowser:
+        start = time.time()
+        scraper = self.factory()
+        if getattr(scraper, 'driver', None) is None and hasattr(scraper, '_init_driver'):
+            scraper._init_driver()
+        browser = PooledBrowser(scraper)
+        self.started += 1
+        print(f"[BrowserPool] {self.name}: browser #{self.started} started in {time.time() - start:.1f}s")
+        return browser
+
+    def _stop(self, browser: PooledBrowser, reason: str):
+        """Close the scraper and make sure its whole process tree is gone"""
+        procs = _driver_processes(browser.driver)
+        try:
+            browser.scraper.close()
+        except Exception as e:
+            print(f"[BrowserPool] {self.name}: close error: {e}")
+
+        if procs:
+            gone, alive = psutil.wait_procs(procs, timeout=5)
+            for proc in alive:
+                try:
+                    proc.kill()
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+            if alive:
+                print(f"[BrowserPool] {self.name}: killed {len(alive)} leftover browser processes")
+
+        if reason:
+            self.recycled[reason] = self.recycled.get(reason, 0) + 1
+
+    def acquire(self, timeout: float = None) -> PooledBrowser:
+        """
+        A warm browser: an idle one if available, else a new one while the
+        pool is below its size, else wait for a release
+        """
+        deadline = time.time() + timeout if timeout else None
+
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError(f"Browser pool '{self.name}' is closed")
+                if self.idle:
+                    browser = self.idle.pop()
+                    self.busy.add(browser)
+                    self.reused += 1
+                    return browser
+                if len(self.busy) + self.starting < self.size:
+                    self.starting += 1
+                    break
+                remaining = deadline - time.time() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No browser free in pool '{self.name}'")
+                self.condition.wait(remaining)
+
+        try:
+            browser = self._start()
+        except Exception:
+            with self.condition:
+                self.starting -= 1
+                self.condition.notify()
+            raise
+
+        with self.condition:
+            self.starting -= 1
+            self.busy.add(browser)
+        return browser
+
+    def release(self, browser: PooledBrowser, ok: Optional[bool] = True):
+        """
+        Return a browser after a page: record the outcome, check health,
+        recycle if unhealthy, else open a fresh tab and keep it warm
+
+        ok=None hands it back without an outcome (error streak unchanged), for
+        callers that already reported this page's failure
+        """
+        self.pages += 1
+        browser.pages += 1
+        if ok is not None:
+            browser.error_streak = 0 if ok else browser.error_streak + 1
+
+        # The scraper restarted its own driver: new process tree, new baseline
+        if id(browser.driver) != browser.driver_id:
+            browser.driver_id = id(browser.driver)
+            browser.baseline_rss_mb = None
+
+        reason = self._unhealthy(browser)
+        if not reason:
+            try:
+                fresh_tab(browser.driver)
+            except Exception as e:
+                reason = f"tab reset failed ({str(e)[:40]})"
+
+        if reason:
+            growth = browser.rss_growth_mb()
+            print(f"[BrowserPool] {self.name}: recycling browser after {browser.pages} pages - {reason}"
+                  + (f", RSS {browser.rss_mb:.0f} MB (+{growth:.0f} MB)" if growth is not None else ""))
+            self._stop(browser, reason.split(' (')[0])
+
+        with self.condition:
+            self.busy.discard(browser)
+            if not reason and not self.closed:
+                self.idle.append(browser)
+            self.condition.notify()
+
+        if reason is None and self.closed:
+            self._stop(browser, None)
+
+    def _unhealthy(self, browser: PooledBrowser) -> Optional[str]:
+        """Reason to recycle the browser, or None if it is healthy"""
+        if browser.driver is None or not browser.responsive():
+            return 'unresponsive'
+
+        if browser.error_streak >= self.max_error_streak:
+            return f"error streak ({browser.error_streak} failed pages)"
+
+        browser.rss_mb = driver_rss_mb(browser.driver)
+        if browser.rss_mb is not None:
+            if browser.baseline_rss_mb is None:
+                browser.baseline_rss_mb = browser.rss_mb
+            elif self.max_rss_growth_mb and browser.rss_growth_mb() > self.max_rss_growth_mb:
+                return f"RSS growth (> {self.max_rss_growth_mb} MB)"
+
+        if self.max_pages and browser.pages >= self.max_pages:
+            return f"page limit ({self.max_pages})"
+        return None
+
+    def close(self):
+        """Stop all idle browsers; busy ones are stopped when released"""
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.condition.notify_all()
+
+        for browser in idle:
+            self._stop(browser, None)
+        self.print_stats()
+
+    # -- stats ----------------------------------------------------------------
+
+    def stats(self) -> dict:
+        return {
+            'size': self.size,
+            'started': self.started,
+            'pages': self.pages,
+            'reused': self.reused,
+            'recycled': dict(self.recycled),
+            'idle': len(self.idle),
+            'busy': len(self.busy)
+        }
+
+    def print_stats(self):
+        if not self.pages:
+            return
+        recycled = ', '.join(f"{n} {reason}" for reason, n in self.recycled.items()) or 'none'
+        print(f"[BrowserPool] {self.name}: {self.pages} pages on {self.started} browser starts "
+              f"({self.pages / self.started:.1f} pages/start), recycled: {recycled}")
@@ -5,15 +5,30 @@ Centralized Database Manager
 - Progress tracking for all operations
 - Handles database deletion gracefully
 - Tracks hosting status and failures
+- Host health model (success rate, MB/s, TTFB, error classes) for upload ordering
 - Automatic recovery and sync
 - Enhanced file locking with retry logic
 """
 import os
+import re
+import ssl
 import json
 import time
+import socket
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 import shutil
+from statistics import median
+
+from normalize import normalize_url, normalize_video, parse_size_bytes
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
 
 try:
     from filelock import FileLock, Timeout
@@ -32,9 +47,97 @@ FAILED_DB = os.path.join(DATABASE_DIR, "failed_videos.json")
 HOSTING_STATUS_DB = os.path.join(DATABASE_DIR, "hosting_status.json")
 STATS_DB = os.path.join(DATABASE_DIR, "stats.json")
 
+# Host health: attempts kept per host, and the window for "recently failing"
+HOST_HEALTH_MAX_ATTEMPTS = 50
+HOST_HEALTH_RECENT_SECONDS = 3600
+
 # Backup directory
 BACKUP_DIR = os.path.join(DATABASE_DIR, "backups")
 
+# HTTP status -> error class; other 5xx are 'server', other 4xx 'other'
+HTTP_STATUS_CLASSES = {
+    401: 'auth', 403: 'auth', 407: 'auth',
+    408: 'timeout', 504: 'timeout', 524: 'timeout',
+    413: 'file', 415: 'file',
+    429: 'rate_limit', 509: 'rate_limit',  # 509: bandwidth limit exceeded
+}
+
+# Status code named in a message ("HTTP 503", "status 429", "status_code=502")
+STATUS_IN_TEXT = re.compile(r'\b(?:http|status(?:[ _]code)?)\s*[:=]?\s*([1-5]\d\d)\b', re.IGNORECASE)
+
+
+def _status_class(status: int) -> Optional[str]:
+    if status in HTTP_STATUS_CLASSES:
+        return HTTP_STATUS_CLASSES[status]
+    if 500 <= status < 600:
+        return 'server'
+    if 400 <= status < 500:
+        return 'other'
+    return None
+
+
+def _exception_class(error: BaseException) -> Optional[str]:
+    if REQUESTS_AVAILABLE:
+        # ConnectTimeout is both a Timeout and a ConnectionError - timeout wins
+        if isinstance(error, requests.exceptions.Timeout):
+            return 'timeout'
+        if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+            return _status_class(error.response.status_code)
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError)):
+            return 'connection'
+    if isinstance(error, (TimeoutError, socket.timeout)):
+        return 'timeout'
+    if isinstance(error, (ConnectionError, socket.gaierror, ssl.SSLError)):
+        return 'connection'
+    if isinstance(error, (FileNotFoundError, IsADirectoryError, PermissionError)):
+        return 'file'
+    return None
+
+
+def classify_host_error(error, status: int = None) -> str:
+    """
+    Coarse error class of an upload failure
+
+    The exception type and HTTP status decide when known; the message text is
+    only searched when neither does (most uploaders return plain strings).
+
+    Args:
+        error: Exception or error message
+        status: HTTP status code of the failed response, if any
+    """
+    if status:
+        error_class = _status_class(int(status))
+        if error_class:
+            return error_class
+
+    if isinstance(error, BaseException):
+        error_class = _exception_class(error)
+        if error_class:
+            return error_class
+
+    text = str(error or '').lower()
+
+    match = STATUS_IN_TEXT.search(text)
+    if match:
+        error_class = _status_class(int(match.group(1)))
+        if error_class and error_class != 'other':
+            return error_class
+
+    if any(k in text for k in ('rate_limit', 'rate limit', 'bandwidth limit', 'quota', 'too many', 'limit reached')):
+        return 'rate_limit'
+    if 'timeout' in text or 'timed out' in text:
+        return 'timeout'
+    if any(k in text for k in ('api key', 'unauthorized', 'forbidden', 'login')):
+        return 'auth'
+    if any(k in text for k in ('too large', 'too small', 'file size')):
+        return 'file'
+    if any(k in text for k in ('connection', 'resolve', 'ssl', 'reset', 'refused', 'unreachable')):
+        return 'connection'
+    if any(k in text for k in ('internal server', 'bad gateway', 'service unavailable', 'server error')):
+        return 'server'
+    return 'other'
+
+
 # Legacy database locations (for migration)
 LEGACY_LOCATIONS = [
     "jable/database/videos_complete.json",
@@ -49,6 +152,7 @@ class DatabaseManager:
     def __init__(self):
         """Initialize database manager"""
         self.locks = {}  # filepath -> FileLock instance
+        self.update_lock = threading.RLock()  # read-modify-write of a file within this process
         self.lock_timeout = 30  # seconds
         self.max_retries = 3
         
@@ -92,6 +196,38 @@ class DatabaseManager:
         
         return default if default is not None else []
     
+    @contextmanager
+    def _locked(self, filepath: str):
+        """
+        Hold a file's lock for a whole read-modify-write: the process lock
+        against other threads, the file lock against other processes
+        """
+        with self.update_lock:
+            lock = self._get_lock(filepath)
+            if not lock:
+                yield
+                return
+
+            for attempt in range(self.max_retries):
+                try:
+                    lock.acquire()
+                    break
+                except Timeout:
+                    if attempt < self.max_retries - 1:
+                        wait_time = 2 ** attempt  # Exponential backoff: 1, 2, 4 seconds
+                        print(f"⚠️ Lock timeout on {filepath}, retrying in {wait_time}s (attempt {attempt + 1}/{self.max_retries})")
+                        time.sleep(wait_time)
+            else:
+                print(f"❌ Failed to acquire lock on {filepath} after {self.max_retries} attempts")
+                # Fallback: only other threads of this process are kept out
+                yield
+                return
+
+            try:
+                yield
+            finally:
+                lock.release()
+
     def _write_json_locked(self, filepath: str, data: Any, backup: bool = True) -> bool:
         """Write JSON with exclusive lock and retry logic"""
         lock = self._get_lock(filepath)
@@ -233,15 +369,13 @@ class DatabaseManager:
                 except Exception as backup_error:
                     print(f"⚠️ Could not create backup: {backup_error}")
             
-            # Atomic write
-            temp_path = filepath + '.tmp'
+            # Atomic write (temp file per writer - threads may write the same file)
+            temp_path = f"{filepath}.tmp{os.getpid()}.{threading.get_ident()}"
             with open(temp_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
             
             # Replace original (atomic on POSIX, near-atomic on Windows)
-            if os.path.exists(filepath):
-                os.remove(filepath)
-            os.rename(temp_path, filepath)
+            os.replace(temp_path, filepath)
             
             return True
         except Exception as e:
@@ -249,7 +383,7 @@ class DatabaseManager:
             import traceback
             traceback.print_exc()
             # Clean up temp file
-            temp_path = filepath + '.tmp'
+            temp_path = f"{filepath}.tmp{os.getpid()}.{threading.get_ident()}"
             if os.path.exists(temp_path):
                 try:
                     os.remove(temp_path)
@@ -297,65 +431,79 @@ class DatabaseManager:
     
     def add_or_update_video(self, video_data: Dict) -> bool:
         """Add new video or update existing one"""
+        code = str((video_data or {}).get('code') or '').strip()
+        if not code:
+            print("❌ Video data missing code")
+            return False
+        return self.update_video(code, lambda current: video_data)
+
+    def update_video(self, code: str, update: Callable[[Optional[Dict]], Optional[Dict]]) -> bool:
+        """
+        Atomically replace one video: update(current entry or None) -> new entry
+
+        The database stays locked from the read to the write, so concurrent
+        updates (worker threads, other processes) cannot overwrite each other.
+        update returning None leaves the database unchanged.
+
+        Returns:
+            True if the video was written
+        """
         try:
-            # Get existing structure to preserve stats if possible
-            raw_data = self._read_json_locked(COMBINED_DB, [])
-            if isinstance(raw_data, list):
-                videos = raw_data
-                stats = {}
-            else:
-                videos = raw_data.get('videos', [])
-                stats = raw_data.get('stats', {})
+            with self._locked(COMBINED_DB):
+                # Get existing structure to preserve stats if possible
+                raw_data = self._read_json(COMBINED_DB, [])
+                if isinstance(raw_data, list):
+                    videos = raw_data
+                    stats = {}
+                else:
+                    videos = raw_data.get('videos', [])
+                    stats = raw_data.get('stats', {})
 
-            code = video_data.get('code')
-            
-            if not code:
-                print("❌ Video data missing code")
-                return False
-            
-            # Find existing video
-            found = False
-            for i, v in enumerate(videos):
-                if v.get('code') == code:
-                    # Update existing
-                    videos[i] = video_data
-                    found = True
+                index = next((i for i, v in enumerate(videos) if v.get('code') == code), None)
+                video_data = update(dict(videos[index]) if index is not None else None)
+                if video_data is None:
+                    return False
+
+                video_data = normalize_video(video_data)
+                if video_data.get('code') != code:
+                    print(f"❌ Video data for {code} has code {video_data.get('code')}")
+                    return False
+
+                if index is not None:
+                    videos[index] = video_data
                     print(f"✓ Updated video: {code}")
-                    break
-            
-            if not found:
-                # Add new
-                videos.append(video_data)
-                print(f"✓ Added video: {code}")
-            
-            # Sort by processed_at (newest first)
-            videos.sort(key=lambda x: x.get('processed_at', ''), reverse=True)
-            
-            # Remove duplicates (keep first occurrence)
-            seen_codes = set()
-            unique_videos = []
-            for video in videos:
-                v_code = video.get('code')
-                if v_code and v_code not in seen_codes:
-                    seen_codes.add(v_code)
-                    unique_videos.append(video)
-            
-            # Prepare new data structure
-            new_data = {
-                'videos': unique_videos,
-                'stats': stats
-            }
-            # Update explicit stats
-            new_data['stats']['total_videos'] = len(unique_videos)
-            new_data['stats']['last_updated'] = datetime.now().isoformat()
-            
-            # Save
-            if self._write_json_locked(COMBINED_DB, new_data):
-                self.update_progress()
-                self.update_stats()
-                return True
-            return False
-            
+                else:
+                    videos.append(video_data)
+                    print(f"✓ Added video: {code}")
+
+                # Sort by processed_at (newest first)
+                videos.sort(key=lambda x: x.get('processed_at', ''), reverse=True)
+
+                # Remove duplicates (keep first occurrence)
+                seen_codes = set()
+                unique_videos = []
+                for video in videos:
+                    v_code = video.get('code')
+                    if v_code and v_code not in seen_codes:
+                        seen_codes.add(v_code)
+                        unique_videos.append(video)
+
+                # Prepare new data structure
+                new_data = {
+                    'videos': unique_videos,
+                    'stats': stats
+                }
+                # Update explicit stats
+                new_data['stats']['total_videos'] = len(unique_videos)
+                new_data['stats']['last_updated'] = datetime.now().isoformat()
+
+                if not self._write_json(COMBINED_DB, new_data):
+                    return False
+
+            self.update_progress()
+            self.update_stats()
+            return True
+
         except Exception as e:
             print(f"❌ Error adding/updating video: {e}")
             return False
@@ -453,45 +601,8 @@ class DatabaseManager:
         try:
             videos = self.get_all_videos()
             
-            # Calculate total size safely (handle None values and string values)
-            total_size = 0
-            for v in videos:
-                size = v.get('file_size', 0)
-                if size is None:
-                    continue
-                
-                try:
-                    # Handle string sizes like "~600MB", "1.5GB", "600 MB"
-                    if isinstance(size, str):
-                        # Remove common prefixes and clean whitespace
-                        size_str = size.strip().replace('~', '').replace(' ', '').upper()
-                        
-                        # Skip if it's a placeholder
-                        if size_str in ['N/A', 'UNKNOWN', '', 'NONE']:
-                            continue
-                        
-                        # Extract number (including decimals)
-                        import re
-                        match = re.search(r'(\d+\.?\d*)', size_str)
-                        if match:
-                            size_num = float(match.group(1))
-                            
-                            # Determine unit and convert to bytes
-                            if 'GB' in size_str:
-                                total_size += int(size_num * 1024 * 1024 * 1024)
-                            elif 'MB' in size_str:
-                                total_size += int(size_num * 1024 * 1024)
-                            elif 'KB' in size_str:
-                                total_size += int(size_num * 1024)
-                            else:
-                                # Assume MB if no unit specified
-                                total_size += int(size_num * 1024 * 1024)
-                    elif isinstance(size, (int, float)):
-                        total_size += int(size)
-                except Exception as e:
-                    # Skip this video's size if parsing fails
-                    print(f"⚠️ Could not parse file_size '{size}' for video {v.get('code', 'unknown')}: {e}")
-                    continue
+            # Calculate total size safely (handle None values and string values like "~600MB")
+            total_size = sum(parse_size_bytes(v.get('file_size')) for v in videos)
             
             stats = {
                 "total_videos": len(videos),
@@ -580,6 +691,136 @@ class DatabaseManager:
         
         return status.get('available', True)
     
+    def record_host_attempt(self, service: str, success: bool, duration: float = None,
+                            bytes_sent: int = None, ttfb: float = None, error=None,
+                            rate_limited_until: int = None, status: int = None) -> Dict:
+        """
+        Record one upload attempt in the host's rolling health history
+
+        Args:
+            service: Host name (as used in hosting_status.json)
+            success: Whether the upload succeeded
+            duration: Seconds the attempt took (transfer time when known)
+            bytes_sent: Bytes delivered (for MB/s)
+            ttfb: Seconds from starting the attempt until the first byte moved
+            error: Exception or error message of a failed attempt (classified, not stored raw)
+            rate_limited_until: Unix time the host refuses uploads until
+            status: HTTP status code of the failed response, if known
+
+        Returns:
+            Updated health summary (see get_host_health)
+        """
+        attempt = {'ts': time.time(), 'success': bool(success)}
+        if duration:
+            attempt['duration'] = round(duration, 2)
+            if success and bytes_sent:
+                attempt['mbps'] = round(bytes_sent / (1024 * 1024) / duration, 3)
+        if ttfb is not None:
+            attempt['ttfb'] = round(ttfb, 3)
+        if not success:
+            attempt['error_class'] = classify_host_error(error, status)
+
+        lock = self._get_lock(HOSTING_STATUS_DB)
+        try:
+            if lock:
+                lock.acquire()
+
+            hosting = self._read_json(HOSTING_STATUS_DB, {})
+            entry = hosting.setdefault(service, {})
+            attempts = entry.setdefault('attempts', [])
+            attempts.append(attempt)
+            del attempts[:-HOST_HEALTH_MAX_ATTEMPTS]
+
+            entry['last_check'] = datetime.now().isoformat()
+            if rate_limited_until:
+                entry['rate_limited_until'] = rate_limited_until
+            entry['health'] = self._summarize_host(entry)
+
+            self._write_json(HOSTING_STATUS_DB, hosting, backup=False)
+            return entry['health']
+        except Exception as e:
+            print(f"⚠️ Could not record host attempt: {e}")
+            return {}
+        finally:
+            if lock and lock.is_locked:
+                lock.release()
+
+    def _summarize_host(self, entry: Dict) -> Dict:
+        """Health summary from a host's attempt history"""
+        attempts = entry.get('attempts', [])
+        now = time.time()
+        recent = [a for a in attempts if now - a['ts'] < HOST_HEALTH_RECENT_SECONDS]
+        last = attempts[-20:]
+
+        speeds = [a['mbps'] for a in last if a.get('mbps')]
+        ttfbs = [a['ttfb'] for a in last if a.get('ttfb') is not None]
+
+        error_classes = {}
+        for a in recent:
+            if not a['success']:
+                error_classes[a['error_class']] = error_classes.get(a['error_class'], 0) + 1
+
+        return {
+            'attempts': len(attempts),
+            'success_rate': sum(a['success'] for a in last) / len(last) if last else None,
+            'median_mbps': median(speeds) if speeds else None,
+            'median_ttfb': median(ttfbs) if ttfbs else None,
+            'recent_attempts': len(recent),
+            'recent_failures': sum(not a['success'] for a in recent),
+            'recent_errors': error_classes,
+            'last_success': max((a['ts'] for a in attempts if a['success']), default=None)
+        }
+
+    def get_host_health(self, service: str) -> Dict:
+        """
+        Rolling health of a host: success_rate and median_mbps / median_ttfb
+        over the last 20 attempts, failures and error classes of the last hour
+        """
+        entry = self.get_hosting_status(service)
+        health = self._summarize_host(entry)
+        health['rate_limited_until'] = entry.get('rate_limited_until')
+        return health
+
+    def rank_hosts(self, services: List[str], file_size: int = None) -> List[str]:
+        """
+        Order hosts for uploading, best first
+
+        Tiers: healthy hosts, then hosts failing in the last hour
+        (more failures than successes), then rate-limited hosts.
+        Within a tier: lowest expected time to deliver the file
+        (size / median MB/s + TTFB, divided by success rate).
+        Hosts without history keep their given order among the others.
+        """
+        size_mb = (file_size or 1024 ** 3) / (1024 * 1024)
+        now = time.time()
+        scored = []
+
+        for index, service in enumerate(services):
+            health = self.get_host_health(service)
+
+            if health['rate_limited_until'] and now < health['rate_limited_until']:
+                tier = 2
+            elif health['recent_failures'] and health['recent_failures'] * 2 > health['recent_attempts']:
+                tier = 1
+            else:
+                tier = 0
+
+            expected = None
+            if health['median_mbps']:
+                expected = size_mb / health['median_mbps'] + (health['median_ttfb'] or 0)
+                expected /= max(health['success_rate'] or 0, 0.1)
+
+            scored.append([tier, expected, expected is None, index, service])
+
+        # Unknown hosts rank just behind the median known host of the list
+        known = sorted(s[1] for s in scored if s[1] is not None)
+        default = known[(len(known) - 1) // 2] if known else 0
+        for s in scored:
+            if s[1] is None:
+                s[1] = default
+
+        return [s[-1] for s in sorted(scored)]
+
     def get_progress(self) -> Dict:
         """Get current progress"""
         return self._read_json(PROGRESS_DB, {})
@@ -670,40 +911,8 @@ class DatabaseManager:
         }
     
     def _normalize_url(self, url: str) -> str:
-        """
-        Normalize URL for comparison to prevent duplicates.
-        
-        Rules:
-        - Convert to lowercase
-        - Use https:// protocol
-        - Remove www. prefix
-        - Remove trailing slashes
-        - Remove query parameters (?key=value)
-        - Remove fragments (#section)
-        """
-        if not url:
-            return ""
-        
-        url = url.lower().strip()
-        
-        # Normalize protocol
-        url = url.replace('http://', 'https://')
-        
-        # Remove www prefix
-        url = url.replace('https://www.', 'https://')
-        
-        # Remove query parameters
-        if '?' in url:
-            url = url.split('?')[0]
-        
-        # Remove fragments
-        if '#' in url:
-            url = url.split('#')[0]
-        
-        # Remove trailing slash (after removing query/fragment)
-        url = url.rstrip('/')
-        
-        return url
+        """Normalize URL for comparison to prevent duplicates (see normalize.normalize_url)"""
+        return normalize_url(url)
     
     def print_status(self):
         """Print current database status"""
@@ -728,7 +937,14 @@ class DatabaseManager:
         for service, count in stats.get('by_hosting', {}).items():
             status = self.get_hosting_status(service)
             available = "✓" if status.get('available') else "✗"
-            print(f"   {available} {service}: {count} videos")
+            health = self._summarize_host(status)
+            detail = ''
+            if health['success_rate'] is not None:
+                detail = f" ({health['success_rate']:.0%} ok"
+                if health['median_mbps']:
+                    detail += f", {health['median_mbps']:.1f} MB/s"
+                detail += ")"
+            print(f"   {available} {service}: {count} videos{detail}")
         
         print(f"\n📁 Database location: {DATABASE_DIR}")
         print(f"   Combined DB: {os.path.getsize(COMBINED_DB) / 1024:.1f} KB" if os.path.exists(COMBINED_DB) else "   Combined DB: Not found")
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""
+HTML Snapshot Store
+Keeps the pages the scrapers fetched, so a parser fix can be applied to the
+catalog by re-parsing stored pages instead of loading every page again:
+- Optional: HTML_SNAPSHOTS=1 turns it on (TieredFetcher stores every page it
+  parses - HTTP responses automatically, browser pages via snapshot())
+- Content-addressed: page bodies are gzip files named by their SHA-256 in
+  database/html_snapshots/objects/, so an unchanged page is stored once
+- Index (SQLite, index.db): one row per fetch - URL, fetch time, scraper,
+  page kind, tier and the parser inputs that are not in the HTML (video code,
+  actress name, m3u8 URLs seen on the network)
+- Size-bounded: past HTML_SNAPSHOT_MAX_MB (default 500) of compressed pages
+  the oldest fetches are evicted; only the newest HTML_SNAPSHOT_VERSIONS
+  (default 3) fetches of a URL are kept
+
+Parser fixtures (javdatabase/fixtures/) are exported from here, so the tests
+run against pages the site actually served:
+- capture: plain HTTP GET of given URLs into the store, whatever the status
+  (404 pages included) - pages behind a challenge are captured by running a
+  scraper with HTML_SNAPSHOTS=1 instead (browser tier)
+- export-fixtures: newest stored fetch of each javdb page -> fixture file plus
+  its expected.json entry (current parser output and the page's source)
+
+CLI:
+    python html_snapshots.py                                   # store stats
+    python html_snapshots.py re-extract --scraper javdb --kind movie [--output file.json]
+    python html_snapshots.py capture URL... --kind movie|idol|search [--code CODE | --name NAME]
+    python html_snapshots.py export-fixtures [URL...] [--fixtures DIR]
+    python html_snapshots.py prune | --clear
+"""
+import os
+import json
+import gzip
+import time
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.path.join(SCRIPT_DIR, "database", "html_snapshots")
+FIXTURES_DIR = os.path.join(SCRIPT_DIR, "javdatabase", "fixtures")
+
+ENABLED = os.getenv('HTML_SNAPSHOTS', '0').strip().lower() in ('1', 'true', 'yes')
+MAX_BYTES = int(float(os.getenv('HTML_SNAPSHOT_MAX_MB', '500') or 500) * 1024 * 1024)
+VERSIONS = int(os.getenv('HTML_SNAPSHOT_VERSIONS', '3') or 3)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    scraper TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    tier TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS snapshots_url ON snapshots (url, fetched_at);
+CREATE INDEX IF NOT EXISTS snapshots_fetched_at ON snapshots (fetched_at);
+CREATE INDEX IF NOT EXISTS snapshots_kind ON snapshots (scraper, kind);
+CREATE INDEX IF NOT EXISTS snapshots_digest ON snapshots (digest);
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL
+);
+"""
+
+
+class SnapshotStore:
+    """Compressed, content-addressed store of fetched pages with a size bound"""
+
+    def __init__(self, root: str = None, max_bytes: int = None, versions: int = None):
+        self.root = root or SNAPSHOT_DIR
+        self.objects_dir = os.path.join(self.root, 'objects')
+        self.index_file = os.path.join(self.root, 'index.db')
+        self.max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+        self.versions = max(1, VERSIONS if versions is None else versions)
+        self.lock = threading.Lock()
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+        with self._connect(immediate=True) as conn:
+            for statement in SCHEMA.split(';'):
+                if statement.strip():
+                    conn.execute(statement)
+
+    @contextmanager
+    def _connect(self, immediate: bool = False):
+        """Connection for one operation, commits on success (immediate=True: write lock up front)"""
+        conn = sqlite3.connect(self.index_file, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest + '.html.gz')
+
+    # -- write ----------------------------------------------------------------
+
+    def put(self, url: str, html: str, scraper: str, kind: str, tier: str = 'http',
+            extra: Dict = None, fetched_at: float = None) -> Optional[str]:
+        """
+        Store one fetched page
+
+        Args:
+            extra: Parser inputs not in the HTML (code, actress name, network m3u8s...)
+
+        Returns:
+            The page's digest, or None if it could not be stored
+        """
+        if not html:
+            return None
+        try:
+            raw = html.encode('utf-8')
+            digest = hashlib.sha256(raw).hexdigest()
+            path = self._object_path(digest)
+
+            with self.lock, self._connect(immediate=True) as conn:
+                if not conn.execute("SELECT 1 FROM objects WHERE digest = ?", (digest,)).fetchone():
+                    data = gzip.compress(raw, compresslevel=6)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    tmp_file = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+                    with open(tmp_file, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp_file, path)
+                    conn.execute("INSERT INTO objects (digest, size, raw_size) VALUES (?, ?, ?)",
+                                 (digest, len(data), len(raw)))
+                conn.execute(
+                    "INSERT INTO snapshots (url, fetched_at, scraper, kind, tier, digest, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, fetched_at or time.time(), scraper, kind, tier, digest,
+                     json.dumps(extra or {}, ensure_ascii=False))
+                )
+                self._evict(conn, url)
+            return digest
+        except Exception as e:
+            print(f"[Snapshots] Could not store {url}: {e}")
+            return None
+
+    def _evict(self, conn, url: Optional[str] = None):
+        """Drop old versions of `url`, then the oldest fetches while over the size bound"""
+        if url is not None:
+            old = conn.execute(
+                "SELECT id FROM snapshots WHERE url = ? ORDER BY fetched_at DESC, id DESC LIMIT -1 OFFSET ?",
+                (url, self.versions)
+            ).fetchall()
+            self._delete(conn, [row['id'] for row in old])
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+        while total > self.max_bytes:
+            oldest = conn.execute("SELECT id FROM snapshots ORDER BY fetched_at, id LIMIT 64").fetchall()
+            if not oldest:
+                break
+            for row in oldest:
+                total -= self._delete(conn, [row['id']])
+                if total <= self.max_bytes:
+                    break
+
+    def _delete(self, conn, ids: List[int]) -> int:
+        """Delete fetches, and the page files no other fetch refers to; returns the bytes freed"""
+        if not ids:
+            return 0
+        marks = ', '.join('?' * len(ids))
+        digests = {row['digest'] for row in conn.execute(
+            f"SELECT DISTINCT digest FROM snapshots WHERE id IN ({marks})", ids).fetchall()}
+        conn.execute(f"DELETE FROM snapshots WHERE id IN ({marks})", ids)
+
+        freed = 0
+        for digest in digests:
+            if conn.execute("SELECT 1 FROM snapshots WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+                continue
+            row = conn.execute("SELECT size FROM objects WHERE digest = ?", (digest,)).fetchone()
+            conn.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+            freed += row['size'] if row else 0
+        return freed
+
+    def prune(self):
+        """Apply the version and size bounds (e.g. after lowering them)"""
+        with self.lock, self._connect(immediate=True) as conn:
+            for row in conn.execute(
+                "SELECT url FROM snapshots GROUP BY url HAVING COUNT(*) > ?", (self.versions,)
+            ).fetchall():
+                self._evict(conn, row['url'])
+            self._evict(conn)
+
+    # -- read -----------------------------------------------------------------
+
+    def read(self, digest: str) -> Optional[str]:
+        try:
+            with open(self._object_path(digest), 'rb') as f:
+                return gzip.decompress(f.read()).decode('utf-8')
+        except FileNotFoundError:
+            return None
+
+    def latest(self, url: str) -> Optional[Dict]:
+        """Newest stored fetch of a URL, with its HTML"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM snapshots WHERE url = ? ORDER BY fetched_at DESC, id DESC LIMIT 1",
+                               (url,)).fetchone()
+        return self._snapshot(row) if row else None
+
+    def iter_latest(self, scraper: str = None, kind: str = None, limit: int = None) -> Iterator[Dict]:
+        """Newest fetch of every stored URL (optionally one scraper / page kind), with its HTML"""
+        where, params = [], []
+        if scraper:
+            where.append("scraper = ?")
+            params.append(scraper)
+        if kind:
+            where.append("kind = ?")
+            params.append(kind)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM snapshots s WHERE id = (SELECT id FROM snapshots WHERE url = s.url "
+                "ORDER BY fetched_at DESC, id DESC LIMIT 1)"
+                + (" AND " + " AND ".join(where) if where else "") + " ORDER BY url LIMIT ?",
+                params + [-1 if limit is None else limit]
+            ).fetchall()
+        for row in rows:
+            snapshot = self._snapshot(row)
+            if snapshot['html'] is not None:
+                yield snapshot
+
+    def _snapshot(self, row) -> Dict:
+        return {
+            'url': row['url'],
+            'fetched_at': row['fetched_at'],
+            'scraper': row['scraper'],
+            'kind': row['kind'],
+            'tier': row['tier'],
+            'digest': row['digest'],
+            'extra': json.loads(row['extra'] or '{}'),
+            'html': self.read(row['digest'])
+        }
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            fetches = conn.execute("SELECT COUNT(*), COUNT(DISTINCT url) FROM snapshots").fetchone()
+            sizes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) "
+                                 "FROM objects").fetchone()
+            kinds = conn.execute("SELECT scraper, kind, COUNT(*) AS n FROM snapshots GROUP BY scraper, kind "
+                                 "ORDER BY scraper, kind").fetchall()
+        return {
+            'fetches': fetches[0],
+            'urls': fetches[1],
+            'pages': sizes[0],
+            'bytes': sizes[1],
+            'raw_bytes': sizes[2],
+            'max_bytes': self.max_bytes,
+            'kinds': {f"{row['scraper']}.{row['kind']}": row['n'] for row in kinds}
+        }
+
+    def print_stats(self):
+        s = self.stats()
+        ratio = s['raw_bytes'] / s['bytes'] if s['bytes'] else 0
+        print(f"📦 HTML snapshots: {s['urls']} URLs, {s['fetches']} fetches, {s['pages']} distinct pages - "
+              f"{s['bytes'] / 1024 / 1024:.1f} of {s['max_bytes'] / 1024 / 1024:.0f} MB ({ratio:.1f}x compressed)")
+        for name, n in s['kinds'].items():
+            print(f"   {name}: {n}")
+
+    def clear(self):
+        with self.lock, self._connect(immediate=True) as conn:
+            digests = [row['digest'] for row in conn.execute("SELECT digest FROM objects").fetchall()]
+            conn.execute("DELETE FROM snapshots")
+            conn.execute("DELETE FROM objects")
+        for digest in digests:
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> Optional[SnapshotStore]:
+    """The shared store if HTML_SNAPSHOTS is on, else None"""
+    global _store
+    if not ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = SnapshotStore()
+            except Exception as e:
+                print(f"[Snapshots] Disabled - could not open {SNAPSHOT_DIR}: {e}")
+                return None
+        return _store
+
+
+# -- re-extraction --------------------------------------------------------------
+
+_parsers_state = {}  # parser objects reused across pages
+
+
+def _jable_video(html: str, url: str, extra: Dict):
+    from jable_scraper import JableScraper
+    scraper = _parsers_state.get('jable')
+    if scraper is None:
+        scraper = _parsers_state['jable'] = JableScraper(headless=True)
+    return scraper._parse_video_page(html, extra['code'], extra.get('video_url') or url,
+                                     extra.get('network_m3u8') or [], extra.get('duration') or '')
+
+
+def _javdb_movie(html: str, url: str, extra: Dict):
+    from javdb_parser import parse_video_page
+    return parse_video_page(html, extra['code'], url)
+
+
+def _javdb_idol(html: str, url: str, extra: Dict):
+    from javdb_parser import parse_actress_page
+    return parse_actress_page(html, extra['name'], url)
+
+
+def _javdb_search(html: str, url: str, extra: Dict):
+    from javdb_parser import find_idol_links
+    return [list(link) for link in find_idol_links(html)]
+
+
+# (scraper, kind) -> (html, url, extra) -> parsed result, with the current parser code
+PARSERS: Dict[tuple, Callable] = {
+    ('jable', 'video'): _jable_video,
+    ('javdb', 'movie'): _javdb_movie,
+    ('javdb', 'idol'): _javdb_idol,
+    ('javdb', 'search'): _javdb_search,
+}
+
+
+def re_extract(store: SnapshotStore, scraper: str = None, kind: str = None, limit: int = None) -> List[Dict]:
+    """
+    Run the current parsers over the newest stored fetch of every URL
+
+    Returns:
+        One entry per page: url, scraper, kind, fetched_at, result (dict or None), error
+    """
+    import dataclasses
+
+    results = []
+    for snapshot in store.iter_latest(scraper, kind, limit):
+        parse = PARSERS.get((snapshot['scraper'], snapshot['kind']))
+        if parse is None:
+            continue
+        entry = {key: snapshot[key] for key in ('url', 'scraper', 'kind', 'fetched_at')}
+        try:
+            result = parse(snapshot['html'], snapshot['url'], snapshot['extra'])
+            entry['result'] = dataclasses.asdict(result) if dataclasses.is_dataclass(result) else result
+        except Exception as e:
+            entry['result'] = None
+            entry['error'] = str(e)[:200]
+        results.append(entry)
+    return results
+
+
+# -- fixtures -------------------------------------------------------------------
+
+# javdb page kind -> (fixture file prefix, expected.json case type)
+FIXTURE_KINDS = {
+    'movie': ('movie', 'video'),
+    'idol': ('idol', 'actress'),
+    'search': ('idol_search', 'search'),
+}
+
+
+def capture(store: SnapshotStore, url: str, kind: str, extra: Dict = None, session=None,
+            scraper: str = 'javdb') -> Optional[Dict]:
+    """
+    Fetch one page over plain HTTP and store it, whatever its status
+
+    Returns:
+        The stored snapshot, or None if the request failed
+    """
+    if session is None:
+        from http_client import create_session
+        from tiered_fetch import BROWSER_HEADERS
+        session = create_session(headers=BROWSER_HEADERS)
+
+    try:
+        response = session.get(url, timeout=(10, 30), allow_redirects=True)
+    except Exception as e:
+        print(f"[Snapshots] Could not capture {url}: {e}")
+        return None
+
+    extra = dict(extra or {}, status=response.status_code)
+    if not store.put(url, response.text, scraper, kind, tier='http', extra=extra):
+        return None
+    return store.latest(url)
+
+
+def _fixture_case(snapshot: Dict) -> Optional[Dict]:
+    """expected.json case (without the expected result) for a stored javdb page"""
+    from urllib.parse import parse_qs, urlparse
+
+    if snapshot['kind'] not in FIXTURE_KINDS:
+        return None
+    prefix, case_type = FIXTURE_KINDS[snapshot['kind']]
+    parsed = urlparse(snapshot['url'])
+    extra = snapshot['extra']
+
+    if case_type == 'search':
+        name = (parse_qs(parsed.query).get('q') or [''])[0]
+        case = {'type': case_type, 'name': name}
+        slug = name
+    else:
+        slug = parsed.path.rstrip('/').rsplit('/', 1)[-1]
+        if case_type == 'video':
+            case = {'type': case_type, 'code': extra.get('code') or slug.upper()}
+        else:
+            case = {'type': case_type, 'name': extra.get('name') or slug.replace('-', ' ').title(),
+                    'url': snapshot['url']}
+
+    slug = ''.join(c if c.isalnum() or c in '-_' else '-' for c in slug.strip().lower())
+    if not slug:
+        return None
+    return {'file': f"{prefix}_{slug}.html", **case}
+
+
+def _fixture_expected(case: Dict, html: str):
+    """What the current javdb parser makes of a fixture (same shape as test_javdb_parser)"""
+    import dataclasses
+    from javdb_parser import find_idol_links, parse_actress_page, parse_video_page
+
+    if case['type'] == 'video':
+        result = parse_video_page(html, case['code'])
+        if result is None:
+            return None
+        result = dataclasses.asdict(result)
+        result.pop('scraped_at')
+        return result
+    if case['type'] == 'actress':
+        return dataclasses.asdict(parse_actress_page(html, case['name'], case['url']))
+    return [list(link) for link in find_idol_links(html)]
+
+
+def export_fixtures(store: SnapshotStore, fixtures_dir: str = None, urls: List[str] = None) -> List[Dict]:
+    """
+    Write the newest stored fetch of javdb pages into the parser fixtures
+
+    Each page becomes <prefix>_<slug>.html (replacing a fixture of the same
+    name) with an expected.json entry holding the current parser output and
+    the page's source (URL, fetch time, tier, digest). The expected results
+    are whatever the parser makes of the page today - review them.
+
+    Args:
+        urls: Only these URLs (default: every stored javdb movie/idol/search page)
+
+    Returns:
+        The exported expected.json cases
+    """
+    fixtures_dir = fixtures_dir or FIXTURES_DIR
+    expected_file = os.path.join(fixtures_dir, 'expected.json')
+    os.makedirs(fixtures_dir, exist_ok=True)
+
+    if urls:
+        snapshots = []
+        for url in urls:
+            snapshot = store.latest(url)
+            if snapshot is None or snapshot['html'] is None:
+                print(f"[Snapshots] Not stored: {url}")
+                continue
+            snapshots.append(snapshot)
+    else:
+        snapshots = store.iter_latest('javdb')
+
+    exported = []
+    for snapshot in snapshots:
+        case = _fixture_case(snapshot)
+        if case is None:
+            continue
+        with open(os.path.join(fixtures_dir, case['file']), 'w', encoding='utf-8', newline='') as f:
+            f.write(snapshot['html'])
+        case['expected'] = _fixture_expected(case, snapshot['html'])
+        case['source'] = {
+            'url': snapshot['url'],
+            'fetched_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(snapshot['fetched_at'])),
+            'tier': snapshot['tier'],
+            'digest': snapshot['digest']
+        }
+        exported.append(case)
+
+    cases = []
+    if os.path.exists(expected_file):
+        with open(expected_file, 'r', encoding='utf-8') as f:
+            cases = json.load(f)
+    by_file = {case['file']: case for case in exported}
+    cases = [by_file.pop(case['file'], case) for case in cases] + list(by_file.values())
+
+    with open(expected_file, 'w', encoding='utf-8') as f:
+        json.dump(cases, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    return exported
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    sys.path.insert(0, os.path.join(SCRIPT_DIR, 'jable'))
+    sys.path.insert(0, os.path.join(SCRIPT_DIR, 'javdatabase'))
+
+    parser = argparse.ArgumentParser(description='Stored HTML pages of the scrapers')
+    parser.add_argument('command', nargs='?', default='stats',
+                        choices=('stats', 're-extract', 'capture', 'export-fixtures', 'prune'))
+    parser.add_argument('urls', nargs='*', help='Pages to capture / export (export default: all javdb pages)')
+    parser.add_argument('--scraper', choices=sorted({s for s, _ in PARSERS}), help='Only this scraper')
+    parser.add_argument('--kind', help='Only this page kind (video, movie, idol)')
+    parser.add_argument('--limit', type=int, default=None, help='At most this many pages')
+    parser.add_argument('--output', default='re_extracted.json', help='Re-extracted results JSON path')
+    parser.add_argument('--code', help='Video code of captured movie pages')
+    parser.add_argument('--name', help='Actress name of captured idol pages')
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help='Fixture directory to export into')
+    parser.add_argument('--clear', action='store_true', help='Delete all stored pages')
+    args = parser.parse_args()
+
+    store = SnapshotStore()
+    if args.clear:
+        store.clear()
+        print("✓ HTML snapshots cleared")
+    elif args.command == 'capture':
+        if args.kind not in FIXTURE_KINDS or not args.urls:
+            parser.error(f"capture needs URLs and --kind {'|'.join(FIXTURE_KINDS)}")
+        extra = {key: value for key, value in (('code', args.code), ('name', args.name)) if value}
+        for url in args.urls:
+            snapshot = capture(store, url, args.kind, extra)
+            if snapshot:
+                print(f"✓ {url}: HTTP {snapshot['extra']['status']}, {len(snapshot['html'])} chars")
+    elif args.command == 'export-fixtures':
+        exported = export_fixtures(store, args.fixtures, args.urls)
+        for case in exported:
+            print(f"  {case['file']} <- {case['source']['url']} ({case['source']['tier']}, {case['source']['fetched_at']})")
+        print(f"✓ Exported {len(exported)} fixtures to {args.fixtures} - review the expected results in expected.json")
+    elif args.command == 'prune':
+        store.prune()
+        store.print_stats()
+    elif args.command == 're-extract':
+        start = time.time()
+        results = re_extract(store, args.scraper, args.kind, args.limit)
+        parsed = sum(1 for r in results if r['result'])
+        errors = sum(1 for r in results if r.get('error'))
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"✓ Re-extracted {len(results)} pages in {time.time() - start:.1f}s: {parsed} parsed, "
+              f"{len(results) - parsed - errors} without a result, {errors} errors -> {args.output}")
+    else:
+        if not ENABLED:
+            print("ℹ️ HTML_SNAPSHOTS is off - scrapers are not storing pages")
+        store.print_stats()
@@ -0,0 +1,335 @@
+"""
+HTTP Client Factory
+One place that builds requests sessions for uploaders, downloaders and scrapers:
+- Connection pooling with keep-alive: repeated API calls (folder lookups,
+  file-info polls, upload servers) reuse open TCP/TLS connections
+- Per-host pool sizing: HTTP_HOST_POOLS=api.streamwish.com=4,jable.tv=64
+- Consistent timeouts: requests without timeout= get (connect, read) defaults
+- DNS cache: connections opened by factory sessions reuse resolved
+  addresses for HTTP_DNS_TTL seconds (socket.getaddrinfo itself is left
+  alone, so other code in the process resolves as usual)
+- Instrumentation: add_hook(func) sees every request; stats() / print_stats()
+  report requests, errors, latency and connections opened per host
+
+Usage:
+    from http_client import get_session, create_session
+    api = get_session('api')                  # shared, no cookies - replaces bare requests.get/post
+    self.session = create_session(pool_size=20, headers={...})   # owned by one uploader
+
+Configured from .env:
+    HTTP_POOL_SIZE=10
+    HTTP_HOST_POOLS=
+    HTTP_CONNECT_TIMEOUT=10
+    HTTP_READ_TIMEOUT=60
+    HTTP_DNS_TTL=300          (0 disables the DNS cache)
+"""
+import os
+import time
+import socket
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util import connection
+
+_lock = threading.Lock()
+_sessions = {}
+_hooks = []
+_stats = {}
+_connections = {}   # (adapter id, host) -> connections opened by that adapter's pool
+
+_dns_cache = {}
+_dns_lock = threading.Lock()
+_getaddrinfo = socket.getaddrinfo
+_dns_ttl = None
+
+
+def _env_number(name, default, cast=float):
+    value = os.getenv(name, '').strip()
+    try:
+        return cast(value) if value else default
+    except ValueError:
+        print(f"⚠️ Ignoring invalid {name}: {value}")
+        return default
+
+
+def _host_pools():
+    """HTTP_HOST_POOLS='a.com=4,b.com=64' -> {'a.com': 4, 'b.com': 64}"""
+    pools = {}
+    for item in os.getenv('HTTP_HOST_POOLS', '').split(','):
+        if '=' in item:
+            host, size = item.split('=', 1)
+            try:
+                pools[host.strip()] = int(size)
+            except ValueError:
+                print(f"⚠️ Ignoring invalid HTTP_HOST_POOLS entry: {item}")
+    return pools
+
+
+def default_timeout():
+    """(connect, read) timeout used when a request does not pass one"""
+    return (_env_number('HTTP_CONNECT_TIMEOUT', 10), _env_number('HTTP_READ_TIMEOUT', 60))
+
+
+# -- DNS cache -----------------------------------------------------------------
+
+def _resolve(host, port):
+    """Addresses to connect to for host:port, from the cache while fresh"""
+    key = (host, port)
+    now = time.time()
+
+    with _dns_lock:
+        entry = _dns_cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    infos = _getaddrinfo(host, port, connection.allowed_gai_family(), socket.SOCK_STREAM)
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    with _dns_lock:
+        _dns_cache[key] = (now + _dns_ttl, addresses)
+    return addresses
+
+
+def _forget(host, port):
+    with _dns_lock:
+        _dns_cache.pop((host, port), None)
+
+
+def enable_dns_cache(ttl=None):
+    """Set the factory sessions' DNS cache TTL in seconds (0 disables) and clear it"""
+    global _dns_ttl
+    ttl = _env_number('HTTP_DNS_TTL', 300) if ttl is None else ttl
+
+    with _dns_lock:
+        _dns_ttl = ttl
+        _dns_cache.clear()
+
+
+class _CachedDNSMixin:
+    """urllib3 connection that looks its host up through the DNS cache"""
+
+    def _new_conn(self):
+        if not _dns_ttl:
+            return super()._new_conn()
+
+        try:
+            addresses = _resolve(self._dns_host, self.port)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+
+        error = None
+        for address in addresses:
+            try:
+                return connection.create_connection((address, self.port), self.timeout,
+                                                    source_address=self.source_address,
+                                                    socket_options=self.socket_options)
+            except socket.timeout:
+                error = ConnectTimeoutError(
+                    self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})")
+            except OSError as e:
+                error = NewConnectionError(self, f"Failed to establish a new connection: {e}")
+
+        # Unreachable addresses may be stale: look the host up again next time
+        _forget(self._dns_host, self.port)
+        raise error or NewConnectionError(self, f"No addresses for {self.host}")
+
+
+class _CachedHTTPConnection(_CachedDNSMixin, HTTPConnection):
+    pass
+
+
+class _CachedHTTPSConnection(_CachedDNSMixin, HTTPSConnection):
+    pass
+
+
+class _CachedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedHTTPConnection
+
+
+class _CachedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedHTTPSConnection
+
+
+# -- instrumentation -----------------------------------------------------------
+
+def add_hook(func):
+    """
+    Call func(event) after every request made through a factory session
+    event: method, url, host, status (None on error), elapsed, error, session
+    """
+    with _lock:
+        _hooks.append(func)
+
+
+def remove_hook(func):
+    with _lock:
+        if func in _hooks:
+            _hooks.remove(func)
+
+
+def _record(event, adapter_id, connections):
+    with _lock:
+        s = _stats.setdefault(event['host'], {'requests': 0, 'errors': 0, 'total_time': 0.0})
+        s['requests'] += 1
+        s['total_time'] += event['elapsed']
+        if event['error'] or (event['status'] or 0) >= 500:
+            s['errors'] += 1
+        if connections is not None:
+            _connections[(adapter_id, event['host'])] = connections
+        hooks = list(_hooks)
+
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception as e:
+            print(f"⚠️ HTTP hook error: {e}")
+
+
+def stats():
+    """Per host: requests, errors, avg latency (s) and connections opened"""
+    with _lock:
+        result = {}
+        for host, s in _stats.items():
+            result[host] = {
+                'requests': s['requests'],
+                'errors': s['errors'],
+                'avg_time': s['total_time'] / s['requests'] if s['requests'] else 0.0,
+                'connections': sum(n for (_, h), n in _connections.items() if h == host)
+            }
+        return result
+
+
+def reset_stats():
+    with _lock:
+        _stats.clear()
+        _connections.clear()
+
+
+def print_stats():
+    current = stats()
+    if not current:
+        return
+
+    print(f"🌐 HTTP connections:")
+    for host, s in sorted(current.items(), key=lambda item: -item[1]['requests']):
+        print(f"   {host:<30} {s['requests']:5d} requests over {s['connections']:3d} connections, "
+              f"avg {s['avg_time'] * 1000:6.0f} ms, {s['errors']} errors")
+
+
+# -- sessions ------------------------------------------------------------------
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter with a default timeout, the DNS cache and request instrumentation"""
+
+    def __init__(self, timeout=None, session_name=None, **kwargs):
+        self.timeout = timeout
+        self.session_name = session_name
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        # Direct connections resolve through the DNS cache (proxied ones are unchanged)
+        self.poolmanager.pool_classes_by_scheme = {'http': _CachedHTTPConnectionPool,
+                                                   'https': _CachedHTTPSConnectionPool}
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout or default_timeout()
+
+        host = urlsplit(request.url).hostname or ''
+        start = time.time()
+        response = error = None
+        try:
+            response = super().send(request, **kwargs)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # The urllib3 pool that served the request counts the connections it opened
+            pool = getattr(getattr(response, 'raw', None), '_pool', None)
+            connections = getattr(pool, 'num_connections', None)
+
+            _record({
+                'method': request.method,
+                'url': request.url,
+                'host': host,
+                'status': response.status_code if response is not None else None,
+                'elapsed': time.time() - start,
+                'error': str(error)[:200] if error else None,
+                'session': self.session_name
+            }, id(self), connections)
+
+
+def create_session(pool_size=None, retries=3, headers=None, verify=True, host_pools=None,
+                   timeout=None, cookies=True, name=None):
+    """
+    New session with the shared pooling / timeout / instrumentation setup
+
+    Args:
+        pool_size: Connections kept per host (default HTTP_POOL_SIZE or 10)
+        retries: max_retries for the adapters (int or urllib3 Retry)
+        headers: Default headers
+        verify: TLS verification
+        host_pools: Host -> pool size overrides (on top of HTTP_HOST_POOLS)
+        timeout: Default (connect, read) timeout (default HTTP_*_TIMEOUT)
+        cookies: False = never store cookies (behaves like bare requests calls)
+        name: Label passed to hooks
+
+    Returns:
+        requests.Session
+    """
+    if _dns_ttl is None:
+        enable_dns_cache()
+
+    pool_size = pool_size or _env_number('HTTP_POOL_SIZE', 10, int)
+
+    def adapter(size):
+        return PooledAdapter(
+            timeout=timeout,
+            session_name=name,
+            pool_connections=size,
+            pool_maxsize=size,
+            max_retries=retries,
+            pool_block=False
+        )
+
+    session = requests.Session()
+    session.verify = verify
+    session.headers.update({'Connection': 'keep-alive'})
+    if headers:
+        session.headers.update(headers)
+    if not cookies:
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    session.mount('http://', adapter(pool_size))
+    session.mount('https://', adapter(pool_size))
+
+    # Longest prefix wins, so these take precedence for their hosts
+    for host, size in {**_host_pools(), **(host_pools or {})}.items():
+        host_adapter = adapter(size)
+        session.mount(f'http://{host}/', host_adapter)
+        session.mount(f'https://{host}/', host_adapter)
+
+    return session
+
+
+def get_session(name='default', **kwargs):
+    """
+    Process-wide shared session (created on first use, without cookies)
+    For stateless API calls and downloads that used bare requests.get/post.
+    """
+    with _lock:
+        session = _sessions.get(name)
+    if session is not None:
+        return session
+
+    kwargs.setdefault('cookies', False)
+    session = create_session(name=name, **kwargs)
+    with _lock:
+        return _sessions.setdefault(name, session)
@@ -17,6 +17,10 @@ import subprocess
 import shutil
 import re
 
+# Shared ffprobe cache lives in the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from probe_cache import probe_video, get_duration
+
 # Upload service selection
 UPLOAD_SERVICE = "streamtape"  # Options: "streamwish", "lulustream", "streamtape"
 
@@ -102,16 +106,13 @@ def convert_to_mp4(input_ts, output_mp4):
             print(f"   ✅ Converted to MP4 ({output_size:.2f} GB)")
             sys.stdout.flush()
             
-            # Verify with ffprobe
+            # Verify with ffprobe (full probe is cached for upload/preview stages)
             ffprobe = ffmpeg.replace('ffmpeg.exe', 'ffprobe.exe')
-            probe_cmd = [ffprobe, '-v', 'error', '-show_entries', 
-                        'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1', 
-                        output_mp4]
-            probe_result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=30)
+            probe_data = probe_video(output_mp4, ffprobe=ffprobe)
             
-            if probe_result.returncode == 0:
+            if probe_data:
                 try:
-                    duration = float(probe_result.stdout.strip())
+                    duration = get_duration(probe_data)
                     minutes = int(duration // 60)
                     seconds = int(duration % 60)
                     print(f"   Duration: {minutes}m {seconds}s")
@@ -3,12 +3,17 @@
 Download and save video thumbnails
 """
 import os
-import requests
+import sys
 from pathlib import Path
 
 # Use absolute path to project root database
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+sys.path.insert(0, PROJECT_ROOT)
+from http_client import get_session
+
+web_session = get_session('web')
 THUMBNAIL_DIR = os.path.join(PROJECT_ROOT, "database", "thumbnails")
 
 def download_thumbnail(thumbnail_url, video_code):
@@ -48,7 +53,7 @@ def download_thumbnail(thumbnail_url, video_code):
         
         # Download
         print(f"   [Thumbnail] Downloading from {thumbnail_url[:60]}...")
-        response = requests.get(thumbnail_url, timeout=30, headers={
+        response = web_session.get(thumbnail_url, timeout=30, headers={
             'Referer': 'https://jable.tv/',
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -18,20 +18,17 @@ import shutil
 import glob
 from Crypto.Cipher import AES
 
+# Shared bandwidth scheduler lives in the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bandwidth_scheduler import bandwidth
+from http_client import create_session
+
 MAX_WORKERS = 32  # High concurrency with smart rate limiting
 
 class HLSDownloaderV2:
     def __init__(self, max_workers=32):
         self.max_workers = max_workers
-        self.session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=max_workers * 2,  # Increased pool
-            pool_maxsize=max_workers * 2,
-            max_retries=3
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
-        self.session.headers.update({
+        self.session = create_session(pool_size=max_workers * 2, retries=3, name='hls', headers={
             'Referer': 'https://jable.tv/',
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -132,9 +129,10 @@ class HLSDownloaderV2:
                             # Silently fail - URL refresh is optional and 403 is expected
                             pass
                 
-                response = self.session.get(url, timeout=30)
+                response = self.session.get(url, timeout=30, stream=True)
                 response.raise_for_status()
-                data = response.content
+                # Paced by the process-wide scheduler (shares the link with uploads)
+                data = bandwidth.read_response(response)
                 
                 if len(data) == 0:
                     raise ValueError("Empty segment")
@@ -2,9 +2,13 @@
 Jable.tv Complete Scraper
 Scrapes everything from Jable.tv: videos, metadata, M3U8 URLs
 Stores in JSON database
+Video pages are fetched over plain HTTP first (tiered_fetch.py); the browser
+is only used when the static page has no full-video M3U8, and for listings.
 """
 
+import os
 import re
+import sys
 import time
 import json
 from datetime import datetime, timedelta
@@ -14,6 +18,16 @@ from dataclasses import dataclass, asdict
 from bs4 import BeautifulSoup
 from seleniumbase import Driver
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from page_readiness import (page_readiness, any_of, count_settled, element_count, element_present,
+                            network_request, page_source_match)
+from tiered_fetch import TieredFetcher
+
+# Full-video M3U8 URLs; previews/trailers load first and are not what we want
+M3U8_PATTERN = r'(https?://[^"\'<>\s]+\.m3u8[^"\'<>\s]*)'
+PREVIEW_KEYWORDS = ('preview', 'trailer', 'sample', 'promo', 'cloudflare')
+VIDEO_CARD_CSS = 'div.video-img-box'
+
 
 def parse_relative_time(relative_time_str: str) -> str:
     """
@@ -88,6 +102,16 @@ class VideoData:
     source_url: str
 
 
+def seek_duration(driver) -> Optional[str]:
+    """Readiness condition: duration from the player's seek slider ("00:04 of 2:03:53")"""
+    seek_input = driver.find_element('css selector', 'input[data-plyr="seek"]')
+    aria_text = seek_input.get_attribute('aria-valuetext') or ''
+    if ' of ' not in aria_text:
+        return None
+    duration = aria_text.split(' of ')[-1].strip()
+    return duration if duration.strip('0:') else None
+
+
 class JableScraper:
     """Complete scraper for Jable.tv"""
     
@@ -96,6 +120,7 @@ class JableScraper:
     def __init__(self, headless: bool = False):
         self.headless = headless
         self.driver = None
+        self.fetcher = TieredFetcher('jable', headers={'Referer': 'https://jable.tv/'})
         
     def _init_driver(self):
         """Initialize browser with error handling and fallback"""
@@ -124,6 +149,7 @@ class JableScraper:
                                 headless=True,
                                 incognito=True,
                                 page_load_strategy='none',  # Changed from 'eager' to 'none' for faster loading
+                                log_cdp_events=True,  # Performance log: readiness waits watch for the m3u8 request
                                 # Add realistic user agent
                                 agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
                             )
@@ -171,7 +197,8 @@ class JableScraper:
                     self.driver = Driver(
                         uc=True, 
                         headless=False,
-                        page_load_strategy='eager'
+                        page_load_strategy='eager',
+                        log_cdp_events=True
                     )
                     time.sleep(3)
                     self.driver.set_page_load_timeout(30)
@@ -292,64 +319,32 @@ class JableScraper:
             else:
                 print(f"  ✓ Page navigation completed")
             
-            # Give it minimal time to start loading (2s)
-            time.sleep(2)
-            
-            # Force stop any ongoing page loads immediately
-            try:
-                self.driver.execute_script("window.stop();")
-                print(f"  ✓ Stopped page load to prevent hanging")
-            except:
-                pass
-            
-            # Wait for body to appear (shorter timeout for headless)
+            # Wait for body (shorter timeout for headless)
             print(f"  ⏳ Waiting for page body...")
-            start_time = time.time()
-            timeout = 10 if self.headless else 10
-            body_found = False
-            while time.time() - start_time < timeout:
-                try:
-                    if self.driver.find_element("tag name", "body"):
-                        body_found = True
-                        print(f"  ✓ Page body loaded")
-                        break
-                except:
-                    pass
-                time.sleep(0.5)
-            
-            if not body_found:
-                print(f"  ❌ Page body not found after {timeout}s, cannot proceed")
+            if not page_readiness.wait(self.driver, 'jable.list.body', element_present('body'), timeout=10):
+                print(f"  ❌ Page body not found, cannot proceed")
                 return []
+            print(f"  ✓ Page body loaded")
             
-            # Wait for JavaScript to render content (reduced for headless)
+            # Wait for JavaScript to render the video cards (as soon as they appear)
             print(f"  ⏳ Waiting for content to render...")
-            render_wait = 8 if self.headless else 8
-            time.sleep(render_wait)
+            cards = page_readiness.wait(self.driver, 'jable.list.cards', element_count(VIDEO_CARD_CSS),
+                                        timeout=20 if self.headless else 16)
+            print(f"  🔍 Found {len(cards or [])} video cards")
             
-            # Check for video links
+            # Content is there: stop any ongoing page loads to prevent hanging
             try:
-                video_elements = self.driver.find_elements("css selector", "a[href*='/videos/']")
-                print(f"  🔍 Found {len(video_elements)} potential video links")
-                
-                if len(video_elements) == 0:
-                    extra_wait = 12 if self.headless else 8
-                    print(f"  ⏳ No links yet, waiting {extra_wait} more seconds...")
-                    time.sleep(extra_wait)
-                    video_elements = self.driver.find_elements("css selector", "a[href*='/videos/']")
-                    print(f"  🔍 Now found {len(video_elements)} potential video links")
-            except Exception as e:
-                print(f"  ⚠️ Error checking for video links: {e}")
+                self.driver.execute_script("window.stop();")
+                print(f"  ✓ Stopped page load to prevent hanging")
+            except:
+                pass
             
-            # Scroll to trigger lazy loading
+            # Scroll to trigger lazy loading, until the card count stops growing
             try:
                 print(f"  📜 Scrolling to load lazy content...")
-                scroll_wait = 5 if self.headless else 4
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(scroll_wait)
-                self.driver.execute_script("window.scrollTo(0, 0);")
-                time.sleep(2)
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(scroll_wait)
+                page_readiness.wait(self.driver, 'jable.list.lazy', count_settled(VIDEO_CARD_CSS),
+                                    timeout=10 if self.headless else 8)
             except Exception as e:
                 print(f"  ⚠️ Error scrolling: {e}")
             
@@ -381,8 +376,6 @@ class JableScraper:
                 print(f"  🔄 Retrying page load...")
                 
                 # Retry the page load with threading timeout
-                retry_wait = 8
-                
                 load_success = False
                 load_error = None
                 
@@ -403,7 +396,7 @@ class JableScraper:
                 if retry_thread.is_alive():
                     print(f"  ⚠️ Retry timeout after 20s")
                 
-                time.sleep(retry_wait)
+                page_readiness.wait(self.driver, 'jable.list.cards', element_count(VIDEO_CARD_CSS), timeout=16)
                 
                 # Stop page load
                 try:
@@ -411,12 +404,10 @@ class JableScraper:
                 except:
                     pass
                 
-                time.sleep(retry_wait)
-                
                 # Scroll again
                 try:
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(5)
+                    page_readiness.wait(self.driver, 'jable.list.lazy', count_settled(VIDEO_CARD_CSS), timeout=5)
                 except:
                     pass
                 
@@ -474,6 +465,281 @@ class JableScraper:
         print(f"✅ Found {len(video_links)} video links")
         return video_links
     
+    def _scrape_video_browser(self, page_url: str, code: str, video_url: str) -> Optional[VideoData]:
+        """Video page via the browser: click play, wait for the m3u8 request and the player duration"""
+        self._ensure_driver()
+        
+        # Requests from the previous page must not satisfy this page's m3u8 wait
+        try:
+            self.driver.get_log('performance')
+        except Exception:
+            pass
+        self.driver.get(page_url)
+        
+        # Wait for the player (or the page title, e.g. on a 404 page)
+        page_readiness.wait(self.driver, 'jable.video.player',
+                            any_of(element_present('.plyr__control--overlaid'), element_present('video'),
+                                   element_present('h4.title')),
+                            timeout=10)
+        
+        # Click the video player to trigger M3U8 loading
+        try:
+            # Try to find and click the play button or video element
+            play_button = self.driver.find_element('css selector', '.plyr__control--overlaid')
+            if play_button:
+                play_button.click()
+                print(f"  ▶️ Clicked play button")
+        except:
+            try:
+                # Alternative: click the video element directly
+                video_elem = self.driver.find_element('tag name', 'video')
+                if video_elem:
+                    video_elem.click()
+                    print(f"  ▶️ Clicked video element")
+            except:
+                print(f"  ⚠️ Could not click video player, trying to extract M3U8 anyway")
+        
+        # Wait for the full video URL (preview loads first, then full video):
+        # the m3u8 request in the performance log, or the URL in the page
+        print(f"  ⏳ Waiting for full video URL to load...")
+        network_m3u8 = page_readiness.wait(
+            self.driver, 'jable.video.m3u8',
+            any_of(network_request(r'\.m3u8', reject=PREVIEW_KEYWORDS),
+                   page_source_match(M3U8_PATTERN, reject=PREVIEW_KEYWORDS)),
+            timeout=13
+        ) or []
+        
+        # Duration from the player (seek slider's aria-valuetext fills in once
+        # the player has the stream metadata)
+        duration = ""
+        if network_m3u8:
+            duration = page_readiness.wait(self.driver, 'jable.video.duration', seek_duration, timeout=3) or ""
+        
+        page_source = self.fetcher.snapshot(page_url, 'video', self.driver.page_source,
+                                            {'code': code, 'video_url': video_url,
+                                             'network_m3u8': list(network_m3u8), 'duration': duration})
+        return self._parse_video_page(page_source, code, video_url, network_m3u8, duration)
+    
+    def _parse_video_page(self, page_source: str, code: str, video_url: str,
+                          network_m3u8: List[str] = (), duration: str = "") -> Optional[VideoData]:
+        """
+        Extract VideoData from a video page's HTML (static HTTP response or
+        the browser's page source)
+        
+        Args:
+            network_m3u8: m3u8 URLs only seen as browser network requests
+            duration: Duration read from the player, if any
+            
+        Returns:
+            VideoData object or None if the page has no full-video M3U8
+        """
+        soup = BeautifulSoup(page_source, 'html.parser')
+        
+        # Check if page exists
+        title_tag = soup.find('title')
+        if title_tag and ('404' in title_tag.get_text() or 'not found' in title_tag.get_text().lower()):
+            print(f"  ⚠️ Video not found (404)")
+            return None
+        
+        # Extract title
+        title = ""
+        h4_title = soup.find('h4', class_='title')
+        if h4_title:
+            title = h4_title.get_text(strip=True)
+        if not title:
+            og_title = soup.find('meta', property='og:title')
+            if og_title:
+                title = og_title.get('content', '')
+        
+        # If still no title, use code as fallback
+        if not title:
+            title = code
+            print(f"  ⚠️ No title found, using code as title")
+        
+        # Extract M3U8 URL - only accept full video, reject previews
+        m3u8_url = ""
+        m3u8_matches = re.findall(M3U8_PATTERN, page_source)
+        # URLs only seen as network requests (not written into the page)
+        m3u8_matches += [url for url in network_m3u8 if url not in m3u8_matches]
+        if m3u8_matches:
+            print(f"  Found {len(m3u8_matches)} m3u8 URLs")
+            
+            # Filter out preview/trailer URLs completely
+            full_video_urls = []
+            
+            for match in m3u8_matches:
+                match_lower = match.lower()
+                
+                # Skip cloudflare and obviously bad URLs
+                if 'cloudflare' in match_lower:
+                    continue
+                
+                # REJECT preview/trailer URLs completely
+                if any(keyword in match_lower for keyword in ['preview', 'trailer', 'sample', 'promo']):
+                    print(f"  ⚠️ Skipping preview URL: {match[:80]}...")
+                    continue
+                
+                # Accept URLs that look like full videos
+                if any(keyword in match_lower for keyword in ['master', 'playlist', 'index', 'video']):
+                    full_video_urls.append(match)
+                    print(f"  ✓ Found full video URL (length: {len(match)})")
+                else:
+                    # Accept other URLs that aren't explicitly previews
+                    full_video_urls.append(match)
+                    print(f"  ✓ Found video URL (length: {len(match)})")
+            
+            # Sort by URL length (longer URLs are usually full videos with more parameters)
+            full_video_urls.sort(key=len, reverse=True)
+            
+            # Only use full video URLs
+            if full_video_urls:
+                m3u8_url = full_video_urls[0]
+                print(f"  ✅ Selected longest URL ({len(m3u8_url)} chars) as full video")
+            else:
+                print(f"  ❌ No full video URL found (only previews/trailers)")
+                return None
+        
+        # Validate M3U8 URL
+        if not m3u8_url:
+            print(f"  ⚠️ No M3U8 URL found")
+            return None
+        
+        if not m3u8_url.startswith('http'):
+            print(f"  ⚠️ Invalid M3U8 URL format: {m3u8_url[:50]}")
+            return None
+        
+        # Increased limit from 2000 to 3000
+        if len(m3u8_url) > 3000:
+            print(f"  ⚠️ M3U8 URL suspiciously long: {len(m3u8_url)} chars")
+            return None
+        
+        # Extract thumbnail
+        thumbnail_url = ""
+        og_image = soup.find('meta', property='og:image')
+        if og_image:
+            thumbnail_url = og_image.get('content', '')
+        
+        # Duration comes from the player (browser tier); fallback: search in page source
+        if not duration:
+            duration_match = re.search(r'aria-valuetext="[^"]*of\s+([0-9:]+)"', page_source)
+            if duration_match:
+                duration = duration_match.group(1)
+        
+        # Extract views and upload time from info-header
+        views = ""
+        upload_time = ""
+        info_header = soup.find('div', class_='info-header')
+        if info_header:
+            h6_elem = info_header.find('h6')
+            if h6_elem:
+                # Get all spans in the h6
+                spans = h6_elem.find_all('span', class_='mr-3', recursive=False)
+                if len(spans) >= 2:
+                    upload_time = spans[0].get_text(strip=True)  # "1 day ago"
+                    views = spans[1].get_text(strip=True)  # "120 445"
+                elif len(spans) == 1:
+                    # Only one span found, assume it's views
+                    views = spans[0].get_text(strip=True)
+        
+        # Extract release date from header-right (inside video-info section)
+        release_date = ""
+        video_info = soup.find('section', class_='video-info')
+        if video_info:
+            header_right = video_info.find('div', class_='header-right')
+            if header_right:
+                inactive_span = header_right.find('span', class_='inactive-color')
+                if inactive_span:
+                    release_date = inactive_span.get_text(strip=True)
+        
+        # Extract HD quality flag
+        hd_quality = False
+        if video_info:
+            header_right = video_info.find('div', class_='header-right')
+            if header_right:
+                hd_text = header_right.get_text()
+                if 'HD' in hd_text or 'Original Video' in hd_text:
+                    hd_quality = True
+        
+        # Extract likes (count in fav button)
+        likes = ""
+        fav_button = soup.find('button', class_='fav')
+        if fav_button:
+            count_span = fav_button.find('span', class_='count')
+            if count_span:
+                likes = count_span.get_text(strip=True)
+        
+        # Extract categories (links with class="cat")
+        categories = []
+        for cat_link in soup.find_all('a', class_='cat'):
+            cat_text = cat_link.get_text(strip=True)
+            if cat_text and cat_text not in categories:
+                categories.append(cat_text)
+        
+        # Extract models/cast (from models div)
+        models = []
+        models_div = soup.find('div', class_='models')
+        if models_div:
+            for model_link in models_div.find_all('a', class_='model'):
+                # Model name is in data-original-title attribute
+                model_name = model_link.find('span', class_='placeholder')
+                if model_name and model_name.get('data-original-title'):
+                    name = model_name.get('data-original-title')
+                    if name and name not in models:
+                        models.append(name)
+        
+        # Extract tags (links in tags section, after separator)
+        tags = []
+        tags_section = soup.find('h5', class_='tags')
+        if tags_section:
+            # Find all links that are NOT categories (don't have class="cat")
+            for link in tags_section.find_all('a'):
+                if 'cat' not in link.get('class', []) and '/tags/' in link.get('href', ''):
+                    tag_text = link.get_text(strip=True)
+                    if tag_text and tag_text not in tags:
+                        tags.append(tag_text)
+        
+        # Extract preview images/thumbnails (VTT file for video scrubbing)
+        preview_images = []
+        # Look for vttUrl in the page source (this is the actual video preview)
+        vtt_match = re.search(r"var vttUrl = '([^']+)'", page_source)
+        if vtt_match:
+            vtt_url = vtt_match.group(1)
+            preview_images.append(vtt_url)
+        
+        # Also look for poster/thumbnail images specific to this video
+        poster_match = re.search(r'poster="([^"]+)"', page_source)
+        if poster_match:
+            poster_url = poster_match.group(1)
+            if poster_url not in preview_images:
+                preview_images.append(poster_url)
+        
+        print(f"  ✅ Success: {title[:50]}...")
+        print(f"     M3U8: {m3u8_url[:60]}...")
+        print(f"     Categories: {len(categories)}, Models: {len(models)}, Tags: {len(tags)}")
+        
+        # Convert relative upload time to absolute timestamp
+        upload_time_absolute = parse_relative_time(upload_time)
+        
+        return VideoData(
+            code=code,
+            title=title,
+            m3u8_url=m3u8_url,
+            thumbnail_url=thumbnail_url,
+            duration=duration,
+            views=views,
+            likes=likes,
+            release_date=release_date,
+            upload_time=upload_time_absolute,  # Absolute ISO timestamp
+            upload_time_relative=upload_time,  # Original "1 hour ago"
+            hd_quality=hd_quality,
+            categories=categories,
+            models=models,
+            tags=tags,
+            preview_images=preview_images,
+            scraped_at=datetime.now().isoformat(),
+            source_url=video_url
+        )
+    
     def scrape_video(self, video_url: str) -> Optional[VideoData]:
         """
         Scrape complete data from a single video page
@@ -494,8 +760,6 @@ class JableScraper:
             return None
         
         try:
-            self._ensure_driver()
-            
             # Extract code from URL - more robust parsing
             code_match = re.search(r'/videos/([^/\?#]+)', video_url)
             if not code_match:
@@ -514,251 +778,17 @@ class JableScraper:
             # Load page with English language
             video_url_en = video_url.split('?')[0].split('#')[0]  # Remove existing params
             video_url_en += '?lang=en'
-            self.driver.get(video_url_en)
-            time.sleep(5)
-            
-            # Click the video player to trigger M3U8 loading
-            try:
-                # Try to find and click the play button or video element
-                play_button = self.driver.find_element('css selector', '.plyr__control--overlaid')
-                if play_button:
-                    play_button.click()
-                    print(f"  ▶️ Clicked play button")
-                    time.sleep(5)  # Wait longer for full video M3U8 to load (not just preview)
-            except:
-                try:
-                    # Alternative: click the video element directly
-                    video_elem = self.driver.find_element('tag name', 'video')
-                    if video_elem:
-                        video_elem.click()
-                        print(f"  ▶️ Clicked video element")
-                        time.sleep(5)  # Wait longer
-                except:
-                    print(f"  ⚠️ Could not click video player, trying to extract M3U8 anyway")
-            
-            # Wait additional time for full video URL to load (preview loads first, then full video)
-            print(f"  ⏳ Waiting for full video URL to load...")
-            time.sleep(8)  # Total wait: 5 + 8 = 13 seconds after click
-            
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # Check if page exists
-            title_tag = soup.find('title')
-            if title_tag and ('404' in title_tag.get_text() or 'not found' in title_tag.get_text().lower()):
-                print(f"  ⚠️ Video not found (404)")
-                return None
-            
-            # Extract title
-            title = ""
-            h4_title = soup.find('h4', class_='title')
-            if h4_title:
-                title = h4_title.get_text(strip=True)
-            if not title:
-                og_title = soup.find('meta', property='og:title')
-                if og_title:
-                    title = og_title.get('content', '')
-            
-            # If still no title, use code as fallback
-            if not title:
-                title = code
-                print(f"  ⚠️ No title found, using code as title")
-            
-            # Extract M3U8 URL - only accept full video, reject previews
-            m3u8_url = ""
-            m3u8_pattern = r'(https?://[^"\'<>\s]+\.m3u8[^"\'<>\s]*)'
-            m3u8_matches = re.findall(m3u8_pattern, page_source)
-            if m3u8_matches:
-                print(f"  Found {len(m3u8_matches)} m3u8 URLs")
-                
-                # Filter out preview/trailer URLs completely
-                full_video_urls = []
-                
-                for match in m3u8_matches:
-                    match_lower = match.lower()
-                    
-                    # Skip cloudflare and obviously bad URLs
-                    if 'cloudflare' in match_lower:
-                        continue
-                    
-                    # REJECT preview/trailer URLs completely
-                    if any(keyword in match_lower for keyword in ['preview', 'trailer', 'sample', 'promo']):
-                        print(f"  ⚠️ Skipping preview URL: {match[:80]}...")
-                        continue
-                    
-                    # Accept URLs that look like full videos
-                    if any(keyword in match_lower for keyword in ['master', 'playlist', 'index', 'video']):
-                        full_video_urls.append(match)
-                        print(f"  ✓ Found full video URL (length: {len(match)})")
-                    else:
-                        # Accept other URLs that aren't explicitly previews
-                        full_video_urls.append(match)
-                        print(f"  ✓ Found video URL (length: {len(match)})")
-                
-                # Sort by URL length (longer URLs are usually full videos with more parameters)
-                full_video_urls.sort(key=len, reverse=True)
-                
-                # Only use full video URLs
-                if full_video_urls:
-                    m3u8_url = full_video_urls[0]
-                    print(f"  ✅ Selected longest URL ({len(m3u8_url)} chars) as full video")
-                else:
-                    print(f"  ❌ No full video URL found (only previews/trailers)")
-                    return None
-            
-            # Validate M3U8 URL
-            if not m3u8_url:
-                print(f"  ⚠️ No M3U8 URL found")
-                return None
-            
-            if not m3u8_url.startswith('http'):
-                print(f"  ⚠️ Invalid M3U8 URL format: {m3u8_url[:50]}")
-                return None
-            
-            # Increased limit from 2000 to 3000
-            if len(m3u8_url) > 3000:
-                print(f"  ⚠️ M3U8 URL suspiciously long: {len(m3u8_url)} chars")
-                return None
-            
-            # Extract thumbnail
-            thumbnail_url = ""
-            og_image = soup.find('meta', property='og:image')
-            if og_image:
-                thumbnail_url = og_image.get('content', '')
-            
-            # Extract duration from player (after clicking play)
-            duration = ""
-            try:
-                # Try to get duration from the seek slider's aria-valuetext
-                seek_input = self.driver.find_element('css selector', 'input[data-plyr="seek"]')
-                if seek_input:
-                    aria_text = seek_input.get_attribute('aria-valuetext')
-                    if aria_text and ' of ' in aria_text:
-                        # Format: "00:04 of 2:03:53"
-                        duration = aria_text.split(' of ')[-1].strip()
-            except:
-                pass
             
-            # Fallback: search in page source
-            if not duration:
-                duration_match = re.search(r'aria-valuetext="[^"]*of\s+([0-9:]+)"', page_source)
-                if duration_match:
-                    duration = duration_match.group(1)
-            
-            # Extract views and upload time from info-header
-            views = ""
-            upload_time = ""
-            info_header = soup.find('div', class_='info-header')
-            if info_header:
-                h6_elem = info_header.find('h6')
-                if h6_elem:
-                    # Get all spans in the h6
-                    spans = h6_elem.find_all('span', class_='mr-3', recursive=False)
-                    if len(spans) >= 2:
-                        upload_time = spans[0].get_text(strip=True)  # "1 day ago"
-                        views = spans[1].get_text(strip=True)  # "120 445"
-                    elif len(spans) == 1:
-                        # Only one span found, assume it's views
-                        views = spans[0].get_text(strip=True)
-            
-            # Extract release date from header-right (inside video-info section)
-            release_date = ""
-            video_info = soup.find('section', class_='video-info')
-            if video_info:
-                header_right = video_info.find('div', class_='header-right')
-                if header_right:
-                    inactive_span = header_right.find('span', class_='inactive-color')
-                    if inactive_span:
-                        release_date = inactive_span.get_text(strip=True)
-            
-            # Extract HD quality flag
-            hd_quality = False
-            if video_info:
-                header_right = video_info.find('div', class_='header-right')
-                if header_right:
-                    hd_text = header_right.get_text()
-                    if 'HD' in hd_text or 'Original Video' in hd_text:
-                        hd_quality = True
-            
-            # Extract likes (count in fav button)
-            likes = ""
-            fav_button = soup.find('button', class_='fav')
-            if fav_button:
-                count_span = fav_button.find('span', class_='count')
-                if count_span:
-                    likes = count_span.get_text(strip=True)
-            
-            # Extract categories (links with class="cat")
-            categories = []
-            for cat_link in soup.find_all('a', class_='cat'):
-                cat_text = cat_link.get_text(strip=True)
-                if cat_text and cat_text not in categories:
-                    categories.append(cat_text)
-            
-            # Extract models/cast (from models div)
-            models = []
-            models_div = soup.find('div', class_='models')
-            if models_div:
-                for model_link in models_div.find_all('a', class_='model'):
-                    # Model name is in data-original-title attribute
-                    model_name = model_link.find('span', class_='placeholder')
-                    if model_name and model_name.get('data-original-title'):
-                        name = model_name.get('data-original-title')
-                        if name and name not in models:
-                            models.append(name)
-            
-            # Extract tags (links in tags section, after separator)
-            tags = []
-            tags_section = soup.find('h5', class_='tags')
-            if tags_section:
-                # Find all links that are NOT categories (don't have class="cat")
-                for link in tags_section.find_all('a'):
-                    if 'cat' not in link.get('class', []) and '/tags/' in link.get('href', ''):
-                        tag_text = link.get_text(strip=True)
-                        if tag_text and tag_text not in tags:
-                            tags.append(tag_text)
-            
-            # Extract preview images/thumbnails (VTT file for video scrubbing)
-            preview_images = []
-            # Look for vttUrl in the page source (this is the actual video preview)
-            vtt_match = re.search(r"var vttUrl = '([^']+)'", page_source)
-            if vtt_match:
-                vtt_url = vtt_match.group(1)
-                preview_images.append(vtt_url)
-            
-            # Also look for poster/thumbnail images specific to this video
-            poster_match = re.search(r'poster="([^"]+)"', page_source)
-            if poster_match:
-                poster_url = poster_match.group(1)
-                if poster_url not in preview_images:
-                    preview_images.append(poster_url)
-            
-            print(f"  ✅ Success: {title[:50]}...")
-            print(f"     M3U8: {m3u8_url[:60]}...")
-            print(f"     Categories: {len(categories)}, Models: {len(models)}, Tags: {len(tags)}")
-            
-            # Convert relative upload time to absolute timestamp
-            upload_time_absolute = parse_relative_time(upload_time)
-            
-            return VideoData(
-                code=code,
-                title=title,
-                m3u8_url=m3u8_url,
-                thumbnail_url=thumbnail_url,
-                duration=duration,
-                views=views,
-                likes=likes,
-                release_date=release_date,
-                upload_time=upload_time_absolute,  # Absolute ISO timestamp
-                upload_time_relative=upload_time,  # Original "1 hour ago"
-                hd_quality=hd_quality,
-                categories=categories,
-                models=models,
-                tags=tags,
-                preview_images=preview_images,
-                scraped_at=datetime.now().isoformat(),
-                source_url=video_url
-            )
+            # Plain HTTP first: the page usually carries the m3u8 URL already;
+            # the browser (player click + network log) only when it does not
+            video, tier = self.fetcher.fetch(
+                video_url_en, kind='video', required=('title', 'm3u8_url'),
+                parse=lambda html: self._parse_video_page(html, code, video_url),
+                browser=lambda url: self._scrape_video_browser(url, code, video_url),
+                snapshot_extra={'code': code, 'video_url': video_url})
+            if video:
+                print(f"     Fetched via: {tier}")
+            return video
             
         except Exception as e:
             print(f"  ❌ Error: {e}")
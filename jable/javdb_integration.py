@@ -1,6 +1,8 @@
 """
 Integration hook for Jable scraper to call JAVDatabase pipeline
 Uses centralized database manager in root/database folder
+queue_javdb_enrichment() hands a saved video to the background enrichment
+workers (javdatabase/enrichment_workers.py) instead of enriching inline
 """
 
 import sys
@@ -25,6 +27,7 @@ except ImportError as e:
 
 try:
     from integrated_pipeline import IntegratedPipeline
+    from enrichment_workers import enrichment_workers
     JAVDB_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️ JAVDatabase integration not available: {e}")
@@ -73,3 +76,39 @@ def enrich_with_javdb(video_data: dict, headless: bool = True) -> bool:
         import traceback
         traceback.print_exc()
         return False
+
+
+def queue_javdb_enrichment(video_data: dict) -> bool:
+    """
+    Queue a video (already saved with its source data) for background
+    JAVDatabase enrichment; returns immediately
+    
+    Returns:
+        bool: True if queued
+    """
+    if not JAVDB_AVAILABLE:
+        print("⚠️ JAVDatabase integration not available, skipping enrichment")
+        return False
+    
+    code = video_data.get('code', '').upper()
+    if not code:
+        print("❌ No video code provided")
+        return False
+    
+    return enrichment_workers.enqueue(code, video_data)
+
+
+def finish_javdb_enrichment(timeout: float = None) -> bool:
+    """
+    Let the enrichment workers finish the videos that are due, then stop them
+    (videos not done by the timeout stay queued for the next run)
+    
+    Returns:
+        bool: True if every due video was processed
+    """
+    if not JAVDB_AVAILABLE:
+        return True
+    
+    drained = enrichment_workers.drain(timeout)
+    enrichment_workers.stop()
+    return drained
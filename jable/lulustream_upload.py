@@ -5,9 +5,14 @@ import os
 import sys
 import time
 import requests
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'upload_pipeline'))
+from http_client import create_session
+from streaming_multipart import post_multipart
+from bandwidth_scheduler import bandwidth
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -19,8 +24,6 @@ except ImportError:
 
 def create_optimized_session():
     """Create a session with optimized settings"""
-    session = requests.Session()
-    
     retry_strategy = Retry(
         total=3,
         backoff_factor=1,
@@ -28,17 +31,7 @@ def create_optimized_session():
         allowed_methods=["POST"]
     )
     
-    adapter = HTTPAdapter(
-        max_retries=retry_strategy,
-        pool_connections=10,
-        pool_maxsize=10,
-        pool_block=False
-    )
-    
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    return session
+    return create_session(pool_size=10, retries=retry_strategy, name='lulustream')
 
 def upload_to_lulustream(file_path, code, title, folder_name=None):
     """
@@ -95,105 +88,48 @@ def upload_to_lulustream(file_path, code, title, folder_name=None):
     start_time = time.time()
     
     try:
-        from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
-        
-        print("\n⏳ Uploading to Lulustream...")
-        print("="*60)
-        
-        # Larger buffer for faster upload
-        BUFFER_SIZE = 1024 * 1024  # 1MB
-        
-        class BufferedReader:
-            def __init__(self, file_path, buffer_size=BUFFER_SIZE):
-                self.file = open(file_path, 'rb')
-                self.buffer_size = buffer_size
-                self.total_size = os.path.getsize(file_path)
-                self.bytes_read = 0
-            
-            def read(self, size=-1):
-                if size == -1:
-                    size = self.buffer_size
-                else:
-                    size = min(size, self.buffer_size)
-                
-                data = self.file.read(size)
-                self.bytes_read += len(data)
-                return data
-            
-            def __len__(self):
-                return self.total_size
-            
-            def close(self):
-                self.file.close()
-        
-        buffered_file = BufferedReader(file_path)
-        
-        # Prepare upload fields
-        # Note: LuluStream API uses 'key' parameter, not 'api_key'
-        upload_fields = {
+        data = {
             'key': LULUSTREAM_API_KEY,
-            'title': f"{code} - {title[:100]}",
-            'file': (os.path.basename(file_path), buffered_file, 'video/mp4')
+            'title': f"{code} - {title[:100]}"
         }
-        
-        # Add folder if specified
         if folder_name:
-            upload_fields['fld_id'] = folder_name
+            data['fld_id'] = folder_name
             print(f"   📁 Folder: {folder_name}")
         
-        encoder = MultipartEncoder(fields=upload_fields)
-        
-        last_update = 0
+        last_update = start_time
         last_bytes = 0
-        upload_complete = False
         
-        def callback(monitor):
-            nonlocal last_update, last_bytes, upload_complete
+        def callback(bytes_sent, total):
+            nonlocal last_update, last_bytes
             
             current_time = time.time()
             
-            # Check if upload is complete
-            if monitor.bytes_read >= monitor.len and not upload_complete:
-                upload_complete = True
-                print(f"\r📊 [████████████████████████████████████████] 100.0% | Upload complete!{' '*30}")
-                print("\n" + "="*60)
-                print("   ⏳ Waiting for server response (processing/verification)...")
-                print("   (This may take 30-60 seconds)")
-                sys.stdout.flush()
-                return
-            
-            # Update every 2 seconds instead of 0.5 for cleaner output
-            if current_time - last_update >= 2.0:
-                progress = (monitor.bytes_read / monitor.len) * 100
+            # Update every 2 seconds for cleaner output
+            if current_time - last_update >= 2.0 or bytes_sent >= total:
+                progress = (bytes_sent / total) * 100
                 elapsed = current_time - start_time
                 
                 # Instantaneous speed
-                bytes_diff = monitor.bytes_read - last_bytes
+                bytes_diff = bytes_sent - last_bytes
                 time_diff = current_time - last_update
                 instant_speed = (bytes_diff / (1024*1024)) / time_diff if time_diff > 0 else 0
                 
                 # Average speed
-                avg_speed = (monitor.bytes_read / (1024*1024)) / elapsed if elapsed > 0 else 0
+                avg_speed = (bytes_sent / (1024*1024)) / elapsed if elapsed > 0 else 0
                 
                 # ETA
                 if avg_speed > 0:
-                    remaining_bytes = monitor.len - monitor.bytes_read
-                    eta_seconds = remaining_bytes / (avg_speed * 1024 * 1024)
-                    eta_min = int(eta_seconds // 60)
-                    eta_sec = int(eta_seconds % 60)
-                    eta_str = f"ETA: {eta_min}m {eta_sec}s"
+                    eta_seconds = (total - bytes_sent) / (avg_speed * 1024 * 1024)
+                    eta_str = f"ETA: {int(eta_seconds // 60)}m {int(eta_seconds % 60)}s"
                 else:
                     eta_str = "ETA: --"
                 
                 bar = '█' * int(40 * progress / 100) + '░' * (40 - int(40 * progress / 100))
-                # Use sys.stdout.write for better control
                 sys.stdout.write(f"\r📊 [{bar}] {progress:.1f}% | ↑{instant_speed:.1f} MB/s (avg: {avg_speed:.1f}) | {eta_str}" + " " * 10)
                 sys.stdout.flush()
                 
                 last_update = current_time
-                last_bytes = monitor.bytes_read
-        
-        monitor = MultipartEncoderMonitor(encoder, callback)
+                last_bytes = bytes_sent
         
         # Upload with progress tracking
         print("\n⏳ Uploading to Lulustream...")
@@ -205,60 +141,21 @@ def upload_to_lulustream(file_path, code, title, folder_name=None):
         estimated_upload_time = file_size / (1024 * 1024 * 0.5)  # Assume 0.5 MB/s minimum
         timeout_seconds = max(300, int(estimated_upload_time + 300))  # At least 5 minutes
         
-        print(f"   [DEBUG] Starting POST request (timeout: {timeout_seconds}s)...")
-        sys.stdout.flush()
-        
-        response = session.post(
-            server,
-            data=monitor,
-            headers={
-                'Content-Type': monitor.content_type,
-                'Connection': 'keep-alive'
-            },
+        # Body streamed from disk through one buffer (never the whole file in memory)
+        response = post_multipart(
+            session, server, data, 'file', file_path,
+            callback=callback,
+            flow=bandwidth.current_flow(default=('lulustream', 'upload')),
             timeout=timeout_seconds
         )
         
-        print("   [DEBUG] POST request completed!")
-        sys.stdout.flush()
-        
-        buffered_file.close()
-        
-        # If callback didn't print completion message, print it now
-        if not upload_complete:
-            print(f"\r📊 [████████████████████████████████████████] 100.0% | Upload complete!{' '*30}")
-            print("\n" + "="*60)
-            print("   ⏳ Waiting for server response...")
-            sys.stdout.flush()
-        
+        print("\n" + "="*60)
         total_time = time.time() - start_time
         avg_speed = (file_size / (1024**3)) / (total_time / 60) if total_time > 0 else 0
         
         print(f"   Upload time: {int(total_time//60)}m {int(total_time%60)}s")
         print(f"   Average speed: {avg_speed:.2f} GB/min ({avg_speed*1024/60:.1f} MB/s)")
         sys.stdout.flush()
-        
-    except ImportError:
-        print("\n⏳ Uploading (basic mode)...")
-        print("   Install requests-toolbelt for progress: pip install requests-toolbelt")
-        
-        data = {
-            'key': LULUSTREAM_API_KEY,
-            'title': f"{code} - {title[:100]}"
-        }
-        if folder_name:
-            data['fld_id'] = folder_name
-        
-        # Calculate reasonable timeout
-        estimated_upload_time = file_size / (1024 * 1024 * 0.5)  # Assume 0.5 MB/s minimum
-        timeout_seconds = max(300, int(estimated_upload_time + 300))
-        
-        with open(file_path, 'rb') as f:
-            response = session.post(
-                server,
-                files={'file': (os.path.basename(file_path), f, 'video/mp4')},
-                data=data,
-                timeout=timeout_seconds
-            )
     
     except requests.exceptions.Timeout:
         print(f"\n❌ Upload timeout: Server took too long to respond")
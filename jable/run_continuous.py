@@ -24,6 +24,7 @@ if os.path.exists('.env'):
 
 print("Importing modules...")
 from jable_scraper import JableScraper
+from browser_pool import BrowserPool, fresh_tab
 from download_with_decrypt_v2 import HLSDownloaderV2 as HLSDownloader
 from upload_all_hosts import upload_all
 from auto_download import convert_to_mp4
@@ -36,6 +37,7 @@ from set_thumbnail_advanced import set_streamwish_thumbnail_advanced
 
 # Import utilities first (always needed)
 from utils import load_json_safe, save_json_safe, normalize_url
+from normalize import code_from_url, code_key
 
 # Import centralized database manager
 try:
@@ -84,7 +86,8 @@ except ImportError as e:
 
 # Import JAVDatabase integration
 try:
-    from javdb_integration import enrich_with_javdb
+    from javdb_integration import queue_javdb_enrichment, finish_javdb_enrichment
+    from enrichment_workers import enrichment_workers
     JAVDB_INTEGRATION_AVAILABLE = True
     print("✓ JAVDatabase integration available")
 except ImportError as e:
@@ -205,44 +208,53 @@ class CleanupManager:
         except Exception as e:
             log(f"⚠️ Cleanup error: {e}")
 
+def reset_browser_session(scraper):
+    """
+    New browser session without a cold start: cookies cleared, fresh tab.
+    Falls back to restarting the browser if it does not respond.
+    """
+    try:
+        scraper.driver.delete_all_cookies()
+        fresh_tab(scraper.driver)
+        log(f"   ✓ Cookies cleared, fresh tab")
+    except Exception as e:
+        log(f"   ⚠️ Session reset failed ({str(e)[:60]}), restarting browser...")
+        try:
+            scraper.close()
+        except Exception:
+            pass
+        scraper._init_driver()
+        log(f"   ✅ Browser restarted")
+
+
 class BrowserManager:
-    """Manage browser lifecycle to prevent memory leaks"""
+    """Keep one warm browser (BrowserPool) and recycle it on health signals"""
     
-    def __init__(self, restart_interval: int = 5):
-        """
-        Initialize browser manager
-        
-        Args:
-            restart_interval: Number of videos to process before restarting browser
-        """
-        self.scraper = None
-        self.videos_processed = 0
-        self.restart_interval = restart_interval
+    def __init__(self):
+        self.pool = BrowserPool(lambda: JableScraper(headless=True), name='jable')
+        self.browser = None
+        self.orphans_cleaned = False
     
     def get_scraper(self):
-        """Get scraper, creating or restarting as needed"""
-        if self.scraper is None:
-            self._create_scraper()
-        elif self.videos_processed >= self.restart_interval:
-            log(f"🔄 Restarting browser after {self.videos_processed} videos")
-            self.close()
-            self._create_scraper()
-        
-        return self.scraper
+        """Get the warm scraper (starts a browser only if the pool recycled it)"""
+        if self.browser is None:
+            if not self.orphans_cleaned:
+                # Browsers left over from a previous (crashed) run
+                self._kill_orphaned_browsers()
+                self.orphans_cleaned = True
+            self.browser = self.pool.acquire()
+        
+        return self.browser.scraper
     
-    def _create_scraper(self):
-        """Create new scraper instance"""
-        try:
-            # Kill any orphaned browser processes first
-            self._kill_orphaned_browsers()
-            
-            from jable_scraper import JableScraper
-            self.scraper = JableScraper(headless=True)
-            self.videos_processed = 0
-            log("✅ Browser started")
-        except Exception as e:
-            log(f"❌ Failed to create browser: {e}")
-            raise
+    def record_result(self, ok: bool):
+        """
+        Report how the last page/video went: fresh tab if the browser is
+        healthy, restart if its RSS grew too much, errors keep repeating or
+        it stopped responding
+        """
+        if self.browser is not None:
+            self.pool.release(self.browser, ok=ok)
+            self.browser = None
     
     def _kill_orphaned_browsers(self):
         """Kill any orphaned browser processes"""
@@ -272,49 +284,13 @@ class BrowserManager:
             log(f"⚠️ Could not kill orphaned browsers: {e}")
     
     def close(self):
-        """Close browser and verify process termination"""
-        if self.scraper:
-            try:
-                # Close browser
-                self.scraper.close()
-                
-                # Verify process is dead
-                if hasattr(self.scraper, 'driver') and self.scraper.driver:
-                    try:
-                        import psutil
-                        pid = self.scraper.driver.service.process.pid
-                        
-                        # Wait for process to die
-                        for _ in range(10):
-                            if not psutil.pid_exists(pid):
-                                break
-                            time.sleep(0.5)
-                        
-                        # Force kill if still alive
-                        if psutil.pid_exists(pid):
-                            import os
-                            import signal
-                            os.kill(pid, signal.SIGKILL)
-                            log("⚠️ Force killed browser process")
-                    except ImportError:
-                        # psutil not available, just wait a bit
-                        time.sleep(2)
-                    except Exception as e:
-                        log(f"⚠️ Could not verify browser termination: {e}")
-                
-                log("✓ Browser closed")
-            except Exception as e:
-                log(f"⚠️ Browser close error: {e}")
-            finally:
-                self.scraper = None
-    
-    def increment_counter(self):
-        """Increment videos processed counter"""
-        self.videos_processed += 1
-    
-    def __del__(self):
-        """Cleanup on deletion"""
-        self.close()
+        """Close the browser (whole process tree)"""
+        try:
+            self.record_result(ok=True)
+            self.pool.close()
+            log("✓ Browser closed")
+        except Exception as e:
+            log(f"⚠️ Browser close error: {e}")
 
 class DiscoveryBackoff:
     """Exponential backoff for discovery failures"""
@@ -365,10 +341,10 @@ class JAVDatabaseClient:
         self.max_failures_before_skip = 5
         self.is_available = True
     
-    def enrich_video(self, jable_data: dict, max_retries: int = 2) -> bool:
+    def enrich_video(self, jable_data: dict) -> bool:
         """
-        Enrich video with JAVDatabase data.
-        Returns True if successful, False otherwise.
+        Queue video for background JAVDatabase enrichment (enrichment_workers).
+        Returns True if queued - the merge happens asynchronously.
         """
         # Skip if consistently failing
         if not self.is_available:
@@ -380,33 +356,15 @@ class JAVDatabaseClient:
             log("⏭️ JAVDatabase integration not available")
             return False
         
-        for attempt in range(1, max_retries + 1):
-            try:
-                success = enrich_with_javdb(jable_data, headless=True)
-                
-                if success:
-                    self.consecutive_failures = 0
-                    log(f"✅ JAVDatabase enrichment successful")
-                    return True
-                else:
-                    log(f"⚠️ JAVDatabase enrichment failed (attempt {attempt}/{max_retries})")
-                    
-                    if attempt < max_retries:
-                        wait_time = 2 ** attempt
-                        time.sleep(wait_time)
-                    
-            except Exception as e:
-                log(f"❌ JAVDatabase error (attempt {attempt}/{max_retries}): {e}")
-                
-                if attempt < max_retries:
-                    wait_time = 2 ** attempt
-                    time.sleep(wait_time)
+        try:
+            if queue_javdb_enrichment(jable_data):
+                self.consecutive_failures = 0
+                log(f"✅ Queued for JAVDatabase enrichment")
+                return True
+        except Exception as e:
+            log(f"❌ JAVDatabase queue error: {e}")
         
-        # All retries failed
         self.consecutive_failures += 1
-        log(f"⚠️ JAVDatabase consecutive failures: {self.consecutive_failures}")
-        
-        # Mark as unavailable if too many failures
         if self.consecutive_failures >= self.max_failures_before_skip:
             self.is_available = False
             log(f"❌ JAVDatabase marked unavailable after {self.consecutive_failures} failures")
@@ -617,12 +575,19 @@ def _commit_database_attempt():
             os.path.join(PROJECT_ROOT, 'database', 'hosting_status.json'),
             os.path.join(PROJECT_ROOT, 'database', 'stats.json'),
             os.path.join(PROJECT_ROOT, 'database', 'disk_reservations.json'),
-            os.path.join(PROJECT_ROOT, 'database', 'streamwish_folders.json')
+            os.path.join(PROJECT_ROOT, 'database', 'streamwish_folders.json'),
+            # Enrichment work still queued for the next run
+            os.path.join(PROJECT_ROOT, 'database', 'javdb_retry_queue.db')
         ]
         added_files = []
         
         log("   [commit] Checking files to add...")
         for file in files_to_add:
+            # The retry queue database is only committed if SQLite finds it intact
+            if file.endswith('.db') and os.path.exists(file) and not (
+                    JAVDB_INTEGRATION_AVAILABLE and enrichment_workers.manager.check_integrity()):
+                log(f"   [commit]   ⚠️ {file} not checked/intact - not committed")
+                continue
             if os.path.exists(file):
                 # Handle directories differently
                 if os.path.isdir(file):
@@ -876,14 +841,11 @@ def is_processed(url):
                     return True
         
         # Also check by code (in case URL changed but code is same)
-        # Extract code from URL
-        import re
-        code_match = re.search(r'/videos/([^/]+)/?', url)
-        if code_match:
-            url_code = code_match.group(1).upper().replace('-', '_')
+        url_slug = code_from_url(url)
+        if url_slug:
+            url_code = code_key(url_slug)
             for v in videos:
-                video_code = v.get('code', '').upper().replace('-', '_')
-                if video_code == url_code:
+                if code_key(v.get('code', '')) == url_code:
                     hosting = v.get('hosting', {})
                     if hosting and len(hosting) > 0:
                         return True
@@ -1441,43 +1403,32 @@ def process_one_video(scraper, url, num, total):
                     log(f"❌ Download attempt {download_attempt} failed")
                     
                     if download_attempt < max_download_attempts:
-                        log(f"🔄 Restarting browser to get fresh session and cookies...")
+                        log(f"🔄 Fresh browser session (cookies cleared) to get a new M3U8 token...")
                         
-                        # Close current browser to clear session
-                        try:
-                            if hasattr(scraper, 'driver') and scraper.driver:
-                                scraper.driver.quit()
-                                scraper.driver = None
-                                log(f"   ✓ Browser closed")
-                        except Exception as e:
-                            log(f"   ⚠️ Browser close warning: {e}")
-                        
-                        # Wait before restart to avoid rate limiting
+                        # Wait before re-scraping to avoid rate limiting
                         wait_time = 10
-                        log(f"   Waiting {wait_time}s before restart...")
+                        log(f"   Waiting {wait_time}s...")
                         time.sleep(wait_time)
                         
-                        # Reinitialize browser with fresh session
                         try:
-                            scraper._init_driver()
-                            log(f"   ✅ Browser restarted with fresh session")
+                            reset_browser_session(scraper)
                             log(f"   🔄 Re-scraping video page to get fresh M3U8 URL...")
                             
                             # Re-scrape the video to get fresh M3U8 URL
                             video_data = scraper.scrape_video(url)
                             if not video_data or not video_data.m3u8_url:
                                 log(f"   ❌ Failed to get fresh M3U8 URL")
-                                raise Exception("Failed to re-scrape video after browser restart")
+                                raise Exception("Failed to re-scrape video after session reset")
                             
                             log(f"   ✓ Got fresh M3U8 URL")
                         except Exception as e:
-                            log(f"   ⚠️ Browser restart warning: {e}")
+                            log(f"   ⚠️ Session reset warning: {e}")
                             raise
                         
                         # Wait a bit more before retry
                         time.sleep(5)
                     else:
-                        error_msg = f"Download failed after {max_download_attempts} attempts with browser restarts"
+                        error_msg = f"Download failed after {max_download_attempts} attempts with fresh sessions"
                         log(f"❌ {error_msg}")
                         log(f"⏭️ Moving on to next video...")
                         cleanup_and_release(code)
@@ -1489,24 +1440,12 @@ def process_one_video(scraper, url, num, total):
                 log(f"❌ {error_msg}")
                 
                 if download_attempt < max_download_attempts:
-                    log(f"🔄 Restarting browser after exception...")
-                    
-                    # Close current browser
-                    try:
-                        if hasattr(scraper, 'driver') and scraper.driver:
-                            scraper.driver.quit()
-                            log(f"   ✓ Browser closed")
-                    except Exception as e:
-                        log(f"   ⚠️ Browser close error: {e}")
-                        pass
-                    
-                    # Wait and restart
+                    log(f"🔄 Fresh browser session after exception...")
                     time.sleep(10)
                     try:
-                        scraper._init_driver()
-                        log(f"   ✅ Browser restarted")
+                        reset_browser_session(scraper)
                     except Exception as e:
-                        log(f"   ❌ Browser restart failed: {e}")
+                        log(f"   ❌ Session reset failed: {e}")
                         # Don't pass - this is critical
                         raise
                     
@@ -1516,7 +1455,7 @@ def process_one_video(scraper, url, num, total):
                     return False
         
         if not download_success:
-            error_msg = f"Download failed after {max_download_attempts} attempts with browser restarts"
+            error_msg = f"Download failed after {max_download_attempts} attempts with fresh sessions"
             log(f"❌ {error_msg}")
             mark_as_failed(url, error_msg)
             return False
@@ -1762,39 +1701,35 @@ def process_one_video(scraper, url, num, total):
                 log(f"   ⚠️ WARNING: No successful uploads to save!")
                 log(f"   Upload results full: {upload_results}")
             
-            # Skip initial save if JAVDatabase enrichment is available
-            # JAVDatabase enrichment will handle the save with merged data
-            if JAVDB_INTEGRATION_AVAILABLE:
-                log("⏭️ Skipping initial save - JAVDatabase enrichment will save merged data")
-            else:
-                # No JAVDatabase - save now
-                if save_video(video_data, upload_results, thumbnail_url, preview_result):
-                    log("✅ Saved to database")
-                    
-                    # Verify it was saved
-                    if DATABASE_MANAGER_AVAILABLE:
-                        videos = db_manager.get_all_videos()
-                    else:
-                        videos = load_json_safe(DB_FILE, [])
-                    log(f"   Database now has {len(videos)} videos")
-                    
-                    # Show the saved entry
-                    for v in videos:
-                        if v.get('code') == video_data.code:
-                            log(f"   ✓ Found saved entry:")
-                            log(f"     Code: {v.get('code')}")
-                            log(f"     Title: {v.get('title', '')[:50]}")
-                            log(f"     Hosting services: {list(v.get('hosting', {}).keys())}")
-                            for service, data in v.get('hosting', {}).items():
-                                log(f"       {service}: {data.get('embed_url', 'N/A')}")
-                            break
+            # Save Jable data now - JAVDatabase metadata is merged in later
+            # by the background enrichment workers
+            if save_video(video_data, upload_results, thumbnail_url, preview_result):
+                log("✅ Saved to database")
+                
+                # Verify it was saved
+                if DATABASE_MANAGER_AVAILABLE:
+                    videos = db_manager.get_all_videos()
                 else:
-                    log("❌ Save failed!")
-                    log("   This video will NOT be committed to database")
+                    videos = load_json_safe(DB_FILE, [])
+                log(f"   Database now has {len(videos)} videos")
+                
+                # Show the saved entry
+                for v in videos:
+                    if v.get('code') == video_data.code:
+                        log(f"   ✓ Found saved entry:")
+                        log(f"     Code: {v.get('code')}")
+                        log(f"     Title: {v.get('title', '')[:50]}")
+                        log(f"     Hosting services: {list(v.get('hosting', {}).keys())}")
+                        for service, data in v.get('hosting', {}).items():
+                            log(f"       {service}: {data.get('embed_url', 'N/A')}")
+                        break
+            else:
+                log("❌ Save failed!")
+                log("   This video will NOT be committed to database")
             
-            # STEP 5.5: Enrich with JAVDatabase metadata
+            # STEP 5.5: Queue JAVDatabase enrichment (runs in the background)
             if JAVDB_INTEGRATION_AVAILABLE:
-                log("\n🎭 Step 5.5: Enriching with JAVDatabase metadata...")
+                log("\n🎭 Step 5.5: Queueing JAVDatabase enrichment...")
                 try:
                     # Import datetime for this scope
                     from datetime import datetime as dt
@@ -1845,38 +1780,15 @@ def process_one_video(scraper, url, num, total):
                         "upload_folder": upload_folder_from_upload or video_data.code
                     }
                     
-                    log(f"   Calling JAVDatabase enrichment for {video_data.code}...")
-                    success = enrich_with_javdb(jable_data, headless=True)
-                    
-                    if success:
-                        log(f"✅ JAVDatabase enrichment successful")
-                        log(f"   Combined data saved to {os.path.join(DATABASE_DIR, 'combined_videos.json')}")
+                    if queue_javdb_enrichment(jable_data):
+                        log(f"✅ Queued - JAVDatabase metadata will be merged in the background")
                     else:
-                        log(f"⚠️ JAVDatabase enrichment failed, saving Jable data only...")
-                        # Fallback: save Jable data without JAVDatabase enrichment
-                        if save_video(video_data, upload_results, thumbnail_url, preview_result):
-                            log(f"✅ Saved Jable data to database")
-                        else:
-                            log(f"❌ Failed to save Jable data")
+                        log(f"⚠️ Could not queue JAVDatabase enrichment, Jable data only")
                         
                 except Exception as e:
-                    log(f"❌ JAVDatabase enrichment error: {e}")
-                    log(f"   Saving Jable data only...")
-                    # Fallback: save Jable data without JAVDatabase enrichment
-                    try:
-                        if save_video(video_data, upload_results, thumbnail_url, preview_result):
-                            log(f"✅ Saved Jable data to database")
-                        else:
-                            log(f"❌ Failed to save Jable data")
-                    except Exception as save_error:
-                        log(f"❌ Save error: {save_error}")
+                    log(f"❌ JAVDatabase queue error: {e}")
             else:
-                log("\n⏭️ JAVDatabase enrichment not available, saving Jable data only...")
-                # Save Jable data without JAVDatabase enrichment
-                if save_video(video_data, upload_results, thumbnail_url, preview_result):
-                    log(f"✅ Saved Jable data to database")
-                else:
-                    log(f"❌ Failed to save Jable data")
+                log("\n⏭️ JAVDatabase enrichment not available, Jable data only")
                     
         except Exception as e:
             log(f"❌ Save exception: {e}")
@@ -2042,33 +1954,22 @@ def main():
     log(f"Time limit: {TIME_LIMIT/3600:.1f} hours")
     log("Workflow: Scrape → Download → Upload → Save → Delete → Next")
     
-    # Process JAVDatabase retry queue first (if available)
+    # Start JAVDatabase enrichment workers (they also pick up due retries)
     if JAVDB_INTEGRATION_AVAILABLE:
         try:
-            from javdatabase.integrated_pipeline import process_javdb_retry_queue, get_retry_queue_stats
-            
             log(f"\n{'='*60}")
-            log("🔄 CHECKING JAVDATABASE RETRY QUEUE")
+            log("🔄 JAVDATABASE ENRICHMENT QUEUE")
             log(f"{'='*60}")
             
-            stats = get_retry_queue_stats()
+            stats = enrichment_workers.manager.get_queue_stats()
             log(f"   Total in queue: {stats['total']}")
             log(f"   Ready for retry: {stats['ready_for_retry']}")
             log(f"   Pending: {stats['pending']}")
             
-            if stats['ready_for_retry'] > 0:
-                log(f"\n   Processing up to 5 videos from retry queue...")
-                retry_results = process_javdb_retry_queue(max_videos=5, headless=True)
-                log(f"\n   Retry results:")
-                log(f"   - Processed: {retry_results['processed']}")
-                log(f"   - Success: {retry_results['success']}")
-                log(f"   - Failed: {retry_results['failed']}")
-            else:
-                log(f"   No videos ready for retry")
-            
+            enrichment_workers.start()
             log(f"{'='*60}\n")
         except Exception as e:
-            log(f"⚠️ Error processing retry queue: {e}")
+            log(f"⚠️ Error starting enrichment workers: {e}")
     
     # Check existing database
     if DATABASE_MANAGER_AVAILABLE:
@@ -2095,8 +1996,8 @@ def main():
     failed = 0
     skipped = 0
     
-    # Use BrowserManager to handle browser lifecycle
-    browser_manager = BrowserManager(restart_interval=5)
+    # Use BrowserManager to keep one warm browser (restarted on health signals only)
+    browser_manager = BrowserManager()
     
     # Use DiscoveryBackoff to handle repeated failures
     discovery_backoff = DiscoveryBackoff()
@@ -2128,18 +2029,18 @@ def main():
                     log("❌ Stopping due to repeated discovery failures")
                     break
                 
-                # Try to recover browser using BrowserManager
-                log("🔄 Attempting to restart browser...")
+                # Recycled if it stopped responding or keeps failing
+                browser_manager.record_result(ok=False)
                 try:
-                    browser_manager.close()
-                    time.sleep(5)
                     scraper = browser_manager.get_scraper()
-                    log("✅ Browser restarted")
                     continue
                 except Exception as e2:
                     log(f"❌ Browser restart failed: {e2}")
                     break
             
+            browser_manager.record_result(ok=bool(links))
+            scraper = browser_manager.get_scraper()
+            
             if not links:
                 log("✅ No more videos")
                 
@@ -2201,21 +2102,15 @@ def main():
                 
                 if video_success:
                     success += 1
-                    browser_manager.increment_counter()
-                    
-                    # BrowserManager will automatically restart browser after N videos
-                    scraper = browser_manager.get_scraper()
                 else:
                     failed += 1
-                    # Restart browser after failure to ensure clean state
-                    log("\n🔄 Restarting browser after failure...")
-                    try:
-                        browser_manager.close()
-                        time.sleep(2)
-                        scraper = browser_manager.get_scraper()
-                        log("✅ Browser restarted")
-                    except Exception as e:
-                        log(f"⚠️ Browser restart warning: {e}")
+                
+                # Fresh tab on the warm browser; restarted only if unhealthy
+                try:
+                    browser_manager.record_result(ok=bool(video_success))
+                    scraper = browser_manager.get_scraper()
+                except Exception as e:
+                    log(f"⚠️ Browser restart warning: {e}")
                 
                 time.sleep(3)
             
@@ -2227,21 +2122,12 @@ def main():
             if page > 50:
                 break
             
-            # Restart browser between pages for fresh state
-            log("\n🔄 Restarting browser for next page...")
+            # The warm browser carries over to the next page (fresh tab per page)
             try:
-                browser_manager.close()
-                time.sleep(3)
                 scraper = browser_manager.get_scraper()
-                log("✅ Browser ready for next page")
-            except Exception as e:
-                log(f"⚠️ Browser restart warning: {e}")
-                # Try to continue anyway
-                try:
-                    scraper = browser_manager.get_scraper()
-                except:
-                    log("❌ Cannot continue without browser")
-                    break
+            except Exception:
+                log("❌ Cannot continue without browser")
+                break
             
             time.sleep(2)
     
@@ -2254,6 +2140,16 @@ def main():
     finally:
         # Always close browser and remove lock
         browser_manager.close()
+        
+        # Let the enrichment workers finish due videos, then commit their merges
+        if JAVDB_INTEGRATION_AVAILABLE:
+            try:
+                log("\n🎭 Waiting for JAVDatabase enrichment workers...")
+                finish_javdb_enrichment()
+                commit_database()
+            except Exception as e:
+                log(f"⚠️ Enrichment shutdown error: {e}")
+        
         remove_process_lock(lock_file)
     
     total_time = time.time() - start
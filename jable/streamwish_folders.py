@@ -7,6 +7,7 @@ Thread-safe with file locking to prevent duplicate folder creation
 import os
 import json
 import time
+import sys
 import requests
 import threading
 
@@ -16,6 +17,12 @@ PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 FOLDER_CACHE_FILE = os.path.join(PROJECT_ROOT, "database", "streamwish_folders.json")
 PARENT_FOLDER_NAME = "Jable Scrapes"
 
+sys.path.insert(0, PROJECT_ROOT)
+from http_client import get_session
+
+# Folder lookups reuse the pooled StreamWish API connections
+api_session = get_session('api')
+
 # Thread lock for folder operations
 _folder_lock = threading.Lock()
 
@@ -113,7 +120,7 @@ def get_or_create_parent_folder(api_key):
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            r = requests.get("https://api.streamwish.com/api/folder/create",
+            r = api_session.get("https://api.streamwish.com/api/folder/create",
                             params={
                                 'key': api_key,
                                 'name': PARENT_FOLDER_NAME
@@ -392,7 +399,7 @@ def _get_or_create_single_folder(folder_name, api_key, parent_id=None):
                 if parent_id:
                     params['parent_id'] = str(parent_id)
                 
-                r = requests.get("https://api.streamwish.com/api/folder/create",
+                r = api_session.get("https://api.streamwish.com/api/folder/create",
                                 params=params, timeout=30)
                 
                 if r.status_code == 200:
@@ -503,7 +510,7 @@ def list_folders(api_key, max_pages=10):
             # Fetch all pages
             page = 1
             while page <= max_pages:
-                r = requests.get("https://api.streamwish.com/api/folder/list",
+                r = api_session.get("https://api.streamwish.com/api/folder/list",
                                 params={'key': api_key, 'page': page, 'per_page': 100}, 
                                 timeout=30)
                 
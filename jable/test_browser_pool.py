@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test the warm browser pool (browser_pool.py)
+- A healthy browser serves page after page with one start (fresh tab per
+  page), instead of the old restart every 5 videos / every failure / every
+  listing page
+- A browser is recycled on RSS growth of its process tree, on an error
+  streak, or when it stops responding - and its processes are gone after
+- Isolated failures do not restart the browser, and a release without an
+  outcome (ok=None, failure already reported) leaves the error streak alone
+- With size 2, two workers get two browsers and a third waits for a release
+
+Offline - each fake browser is a real child process that allocates memory
+per page load, so RSS is measured with psutil like for Chrome.
+
+Usage: python test_browser_pool.py
+"""
+import sys
+import time
+import threading
+import subprocess
+
+import psutil
+
+import jable_scraper  # noqa: F401 - puts the project root on sys.path
+from browser_pool import BrowserPool
+
+# Child "browser": every line on stdin is a page load that keeps 60 MB
+BROWSER_PROCESS = (
+    "import sys\n"
+    "pages = []\n"
+    "for line in sys.stdin:\n"
+    "    pages.append(b'x' * int(line))\n"
+    "    print('loaded', flush=True)\n"
+)
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, kind):
+        self.driver.tab_counter += 1
+        handle = f"tab-{self.driver.tab_counter}"
+        self.driver.window_handles.append(handle)
+        self.driver.current_window_handle = handle
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+
+class FakeService:
+    def __init__(self, process):
+        self.process = process
+
+
+class FakeDriver:
+    def __init__(self, page_mb):
+        self.process = subprocess.Popen([sys.executable, '-c', BROWSER_PROCESS], stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, text=True)
+        self.service = FakeService(self.process)
+        self.page_mb = page_mb
+        self.window_handles = ['tab-0']
+        self.current_window_handle = 'tab-0'
+        self.tab_counter = 0
+        self.tabs_closed = 0
+        self.switch_to = FakeSwitchTo(self)
+        self.dead = False
+
+    @property
+    def current_url(self):
+        if self.dead:
+            raise Exception("invalid session id")
+        return 'https://jable.tv/'
+
+    def get(self, url):
+        if self.page_mb:
+            self.process.stdin.write(f"{self.page_mb * 1024 * 1024}\n")
+            self.process.stdin.flush()
+            self.process.stdout.readline()  # Page memory allocated
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+        self.tabs_closed += 1
+
+    def quit(self):
+        self.process.stdin.close()
+        self.process.wait(timeout=10)
+
+
+class FakeScraper:
+    def __init__(self, page_mb=0):
+        self.page_mb = page_mb
+        self.driver = None
+
+    def _init_driver(self):
+        self.driver = FakeDriver(self.page_mb)
+
+    def close(self):
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+
+
+def load_pages(pool, count, ok=True):
+    """Acquire / load a page / release `count` times; returns the browsers used"""
+    used = []
+    for _ in range(count):
+        browser = pool.acquire()
+        browser.scraper.driver.get('https://jable.tv/new/')
+        used.append(browser)
+        pool.release(browser, ok=ok)
+    return used
+
+
+def test_browser_pool():
+    # Healthy browser: 12 pages, one start, a fresh tab for each
+    pool = BrowserPool(lambda: FakeScraper(), name='test', max_rss_growth_mb=200, max_error_streak=3)
+    used = load_pages(pool, 12)
+    assert pool.started == 1, f"Healthy browser was restarted: {pool.started} starts"
+    driver = used[-1].scraper.driver
+    assert driver.tabs_closed == 12 and len(driver.window_handles) == 1, "Tabs were not recycled between pages"
+    print("Healthy: 12 pages on 1 browser start, fresh tab per page")
+
+    # Isolated failures do not restart; a streak does
+    load_pages(pool, 2, ok=False)
+    load_pages(pool, 1, ok=True)
+    assert pool.started == 1, "Isolated failures restarted the browser"
+    old_pid = used[-1].scraper.driver.process.pid
+    load_pages(pool, 3, ok=False)
+    assert pool.recycled.get('error streak') == 1, pool.recycled
+    assert not psutil.pid_exists(old_pid), "Recycled browser's process is still running"
+    load_pages(pool, 1)
+    assert pool.started == 2
+    print("Error streak: recycled after 3 failed pages in a row (2 failures did not)")
+
+    # Retries of an already-counted failure: health-checked, not counted again
+    load_pages(pool, 2, ok=False)
+    load_pages(pool, 4, ok=None)
+    assert pool.started == 2, "Releases without outcome counted as failures"
+    browser = pool.acquire()
+    assert browser.error_streak == 2, browser.error_streak
+    pool.release(browser, ok=True)
+    print("No outcome: 2 failures + 4 uncounted releases kept the browser")
+
+    # Unresponsive driver: recycled on release
+    browser = pool.acquire()
+    browser.scraper.driver.dead = True
+    pool.release(browser, ok=True)
+    assert pool.recycled.get('unresponsive') == 1, pool.recycled
+    pool.close()
+    print("Unresponsive: recycled")
+
+    # RSS growth: 60 MB kept per page, limit 150 MB over the first page
+    pool = BrowserPool(lambda: FakeScraper(page_mb=60), name='rss', max_rss_growth_mb=150, max_error_streak=3)
+    used = load_pages(pool, 6)
+    assert pool.recycled.get('RSS growth') == 1, f"No RSS-based recycle: {pool.recycled}"
+    first_pid = used[0].scraper.driver.process.pid if used[0].scraper.driver else None
+    assert first_pid is None, "Recycled browser still has a driver"
+    assert pool.started == 2
+    pool.close()
+    print(f"RSS growth: recycled once the process tree grew > 150 MB ({pool.stats()['pages']} pages, 2 starts)")
+
+    # Size 2: two concurrent workers, a third waits for a release
+    pool = BrowserPool(lambda: FakeScraper(), size=2, name='pair')
+    a, b = pool.acquire(), pool.acquire()
+    assert a is not b and pool.started == 2
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.3)
+    assert not got, "Third acquire did not wait for a free browser"
+    pool.release(a)
+    waiter.join(timeout=5)
+    assert got and got[0] is a and pool.started == 2, "Released browser was not reused"
+    pool.release(b)
+    pool.release(got[0])
+    pool.close()
+    assert all(x.scraper.driver is None for x in (a, b)), "Pool close left browsers running"
+    print("Size 2: two warm browsers, third worker reuses a released one")
+
+
+if __name__ == "__main__":
+    try:
+        test_browser_pool()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Browsers stay warm and are recycled on health signals only")
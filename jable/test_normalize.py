@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test the shared normalization module (normalize.py)
+- Codes: release suffixes dropped for JAVDatabase lookups and JavGG, URL
+  slugs and database codes compare equal ("abc-123" == "ABC_123")
+- URLs: protocol, www, query, fragment and trailing slash normalized
+- Titles: a title that is just the code is taken from title_japanese, an
+  English title_japanese is moved over; fix_video_title and the merge step
+  give the same results as before
+- File sizes: "~600MB", "1.5GB", placeholders
+- normalize_video does not modify its input and is applied at ingest
+- Repeated calls are cache hits
+
+Offline.
+
+Usage: python test_normalize.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'javdatabase'))
+
+import normalize
+from normalize import (code_from_url, code_key, javdb_lookup_code, normalize_url, normalize_video,
+                       parse_size_bytes, resolve_titles, strip_code_suffix, RELEASE_SUFFIXES, QUALITY_SUFFIXES)
+from utils import fix_video_title
+from merge_single import merge_and_validate
+
+
+def test_normalize():
+    # Codes
+    assert javdb_lookup_code(' apak-323-reduce-mosaic ') == 'APAK-323'
+    assert javdb_lookup_code('FC2-PPV-4838212') == 'FC2-PPV-4838212'
+    assert strip_code_suffix('ABC-123-FHD', RELEASE_SUFFIXES + QUALITY_SUFFIXES) == 'ABC-123'
+    assert strip_code_suffix('ABC-123-FHD') == 'ABC-123-FHD'
+    assert code_key(code_from_url('https://jable.tv/videos/abc-123/')) == code_key('ABC_123')
+    assert code_from_url('https://jable.tv/models/x/') is None
+    print("Codes: suffixes dropped, URL slugs match database codes")
+
+    # URLs
+    assert normalize_url(' HTTP://www.Jable.tv/videos/abc-123/?ref=x#top ') == 'https://jable.tv/videos/abc-123'
+    assert normalize_url('') == '' and normalize_url(None) == ''
+    print("URLs: normalized for duplicate checks")
+
+    # Titles
+    assert resolve_titles('ABC-123', 'ABC-123', 'ABC-123 - English title') == ('English title', '')
+    assert resolve_titles('ABC-123', '', 'Plain English') == ('Plain English', '')
+    assert resolve_titles('ABC-123', 'Title', 'Not Japanese') == ('Title', '')
+    assert resolve_titles('ABC-123', 'Title', '日本語タイトル') == ('Title', '日本語タイトル')
+    fixed = fix_video_title({'code': 'ABC-123', 'title': 'ABC-123', 'title_japanese': 'ABC-123 - English title'})
+    assert fixed['title'] == 'English title' and fixed['title_english'] == 'English title', fixed
+    assert merge_and_validate({'code': 'ABC-123', 'title': 'Source'}, {'title': 'ABC-123'})['title'] == 'Source'
+    assert merge_and_validate({'code': 'ABC-123', 'title': 'ABC-123'}, {'title': 'ABC-123'})['title'] == 'ABC-123'
+    print("Titles: code-only titles resolved, merge keeps its priority")
+
+    # Sizes
+    assert parse_size_bytes('~600MB') == 600 * 1024 * 1024
+    assert parse_size_bytes('1.5 GB') == int(1.5 * 1024 ** 3)
+    assert parse_size_bytes('512') == 512 * 1024 * 1024
+    assert parse_size_bytes(1234) == 1234
+    assert parse_size_bytes('N/A') == parse_size_bytes(None) == parse_size_bytes('unknown') == 0
+    print("Sizes: strings, numbers and placeholders")
+
+    # Records
+    video = {'code': ' ABC-123 ', 'title': 'ABC-123', 'title_japanese': 'ABC-123 -  English   title', 'hosting': {}}
+    result = normalize_video(video)
+    assert video['code'] == ' ABC-123 ', "normalize_video modified its input"
+    assert result == {'code': 'ABC-123', 'title': 'English title', 'title_japanese': '', 'hosting': {}}, result
+    assert normalize_video({'code': 'X-1'}) == {'code': 'X-1'}
+    print("Records: normalized copy, fields not present are not added")
+
+    # Cache
+    normalize.cache_clear()
+    for _ in range(3):
+        normalize_url('https://jable.tv/videos/abc-123/')
+    info = normalize.cache_info()['normalize_url']
+    assert info['hits'] == 2 and info['misses'] == 1, info
+    print("Cache: repeated normalization served from the cache")
+
+
+if __name__ == "__main__":
+    try:
+        test_normalize()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Codes, URLs, titles and sizes normalized by one cached module")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test event-driven page readiness (page_readiness.py) in JableScraper
+- A video page is scraped as soon as the full-video m3u8 request shows up in
+  the performance log - preview m3u8s are ignored, and a URL only seen on the
+  network (not in the page source) is still picked up
+- A listing page is parsed once its video cards have rendered and the
+  lazy-loaded count has settled, not after fixed render/scroll sleeps
+- Waits stop at their bound, record ready times / timeouts, and the summary
+  suggests bounds; READY_TIMEOUT_<NAME> overrides a bound
+
+Offline - fake driver whose page fills in over time. Uses a temporary
+ready-time file.
+
+Usage: python test_page_readiness.py
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+
+from bs4 import BeautifulSoup
+
+import jable_scraper
+from jable_scraper import JableScraper
+from page_readiness import PageReadiness, element_present, network_request
+from tiered_fetch import TieredFetcher
+
+FULL_M3U8 = 'https://asf-doc.mushroomtrack.com/hls/abc/def/abc-123.m3u8?expires=1760000000&token=xyz'
+PREVIEW_M3U8 = 'https://cdn.example.com/preview/abc-123.m3u8'
+
+
+class FakeElement:
+    def __init__(self, tag):
+        self.tag = tag
+
+    def click(self):
+        pass
+
+    def get_attribute(self, name):
+        return self.tag.get(name)
+
+
+class TimelineDriver:
+    """
+    Fake Selenium driver: after get(), the page source goes through `stages`
+    [(seconds_after_load, html)] and the browser makes `requests`
+    [(seconds_after_load, url)], visible through get_log('performance')
+    """
+
+    def __init__(self, stages, requests=()):
+        self.stages = stages
+        self.requests = list(requests)
+        self.loaded_at = time.time()
+        self.logged = 0
+        self.current_url = ''
+        self.window_handles = ['main']
+
+    def _elapsed(self):
+        return time.time() - self.loaded_at
+
+    def get(self, url):
+        self.current_url = url
+        self.loaded_at = time.time()
+        self.logged = 0
+
+    @property
+    def page_source(self):
+        html = ''
+        for at, stage in self.stages:
+            if self._elapsed() >= at:
+                html = stage
+        return html
+
+    def find_elements(self, by, css):
+        soup = BeautifulSoup(self.page_source, 'html.parser')
+        return [FakeElement(tag) for tag in soup.select(css)]  # tag names are valid selectors too
+
+    def find_element(self, by, css):
+        elements = self.find_elements(by, css)
+        if not elements:
+            raise Exception(f"no such element: {css}")
+        return elements[0]
+
+    def get_log(self, kind):
+        due = [url for at, url in self.requests if self._elapsed() >= at]
+        new, self.logged = due[self.logged:], len(due)
+        return [{'message': json.dumps({'message': {
+            'method': 'Network.requestWillBeSent', 'params': {'request': {'url': url}}}})} for url in new]
+
+    def execute_script(self, script):
+        return 'complete'
+
+    def quit(self):
+        pass
+
+
+VIDEO_PAGE = '''<html><head><title>ABC-123 - Jable.TV</title>
+<meta property="og:image" content="https://assets.jable.tv/contents/videos_screenshots/1/abc-123/preview.jpg">
+</head><body>
+<section class="video-info"><div class="info-header"><h4 class="title">ABC-123 Test Title</h4>
+<h6><span class="mr-3">2 days ago</span><span class="mr-3">10 000</span></h6></div></section>
+<div class="plyr"><button class="plyr__control--overlaid">Play</button><video></video>
+{seek}</div>
+<script>var hlsUrl = '{preview}';</script>
+</body></html>'''
+
+LIST_PAGE = '<html><body>{cards}</body></html>'
+
+
+def list_page(count):
+    return LIST_PAGE.format(cards=''.join(
+        f'<div class="video-img-box"><a href="https://jable.tv/videos/abc-{i:03d}/">ABC-{i:03d}</a></div>'
+        for i in range(count)))
+
+
+def test_page_readiness():
+    temp_dir = tempfile.mkdtemp()
+    stats_file = os.path.join(temp_dir, 'page_readiness.json')
+    original = jable_scraper.page_readiness
+    jable_scraper.page_readiness = PageReadiness(stats_file, poll_interval=0.05)
+
+    try:
+        # Video page: player at once, preview m3u8 first, full m3u8 request at 0.6s
+        driver = TimelineDriver(
+            stages=[
+                (0.0, VIDEO_PAGE.format(seek='', preview=PREVIEW_M3U8)),
+                (0.7, VIDEO_PAGE.format(seek='<input data-plyr="seek" aria-valuetext="00:01 of 2:03:53">',
+                                        preview=PREVIEW_M3U8)),
+            ],
+            requests=[(0.2, PREVIEW_M3U8), (0.6, FULL_M3U8)]
+        )
+        scraper = JableScraper(headless=True)
+        scraper.fetcher = TieredFetcher('jable', stats_file=os.path.join(temp_dir, 'fetch_tiers.json'),
+                                        http_first=False)  # Browser tier only
+        scraper.driver = driver
+
+        start = time.time()
+        video = scraper.scrape_video('https://jable.tv/videos/abc-123/')
+        elapsed = time.time() - start
+
+        assert video is not None, "Video page was not scraped"
+        assert video.m3u8_url == FULL_M3U8, f"Wrong m3u8: {video.m3u8_url}"
+        assert video.duration == '2:03:53', f"Duration not read from the player: {video.duration!r}"
+        assert elapsed < 4, f"Video scrape took {elapsed:.1f}s (fixed sleeps were 18s)"
+        print(f"Video page: full m3u8 from the network log in {elapsed:.1f}s (was 18s of sleeps)")
+
+        # Listing page: cards render at 0.3s, lazy-loaded ones at 0.8s
+        driver = TimelineDriver(stages=[(0.0, '<html><body></body></html>'), (0.3, list_page(12)),
+                                        (0.8, list_page(24))])
+        scraper.driver = driver
+
+        start = time.time()
+        links = scraper.get_video_links_from_page('https://jable.tv/new/')
+        elapsed = time.time() - start
+
+        assert len(set(links)) == 24, f"Expected 24 videos after lazy load, got {len(set(links))}"
+        assert elapsed < 5, f"Listing page took {elapsed:.1f}s (fixed sleeps were 20s+)"
+        print(f"Listing page: 24 videos once the card count settled, {elapsed:.1f}s")
+
+        # Bounds: a condition that never holds returns None at the bound
+        readiness = jable_scraper.page_readiness
+        start = time.time()
+        assert readiness.wait(driver, 'test.never', element_present('div.never'), timeout=0.3) is None
+        assert 0.3 <= time.time() - start < 1.0
+
+        os.environ['READY_TIMEOUT_TEST_NEVER'] = '0.1'
+        start = time.time()
+        readiness.wait(driver, 'test.never', element_present('div.never'), timeout=5)
+        assert time.time() - start < 1.0, "READY_TIMEOUT_TEST_NEVER override was ignored"
+        del os.environ['READY_TIMEOUT_TEST_NEVER']
+        print("Waits stop at their bound (READY_TIMEOUT_<NAME> overrides it)")
+
+        # Network waits never fire on preview m3u8 requests alone
+        network = network_request(r'\.m3u8', reject=('preview',))
+        driver = TimelineDriver(stages=[(0.0, '')], requests=[(0.0, PREVIEW_M3U8)])
+        assert network(driver) is None, "Preview m3u8 satisfied the full-video wait"
+
+        # Recorded ready times: another process's samples are kept
+        readiness.flush()
+        other = PageReadiness(stats_file)
+        other.record('jable.video.m3u8', 2.0, True)
+        other.flush()
+
+        summary = PageReadiness(stats_file).summary()
+        assert summary['jable.video.m3u8']['samples'] == 2, summary['jable.video.m3u8']
+        assert summary['test.never']['timeouts'] == 2
+        assert summary['jable.list.cards']['p50'] is not None
+        assert summary['jable.video.m3u8']['suggested_bound'] >= 1.0
+        counts = ', '.join(f"{name} ({s['samples']})" for name, s in summary.items())
+        print(f"Recorded waits: {counts}")
+    finally:
+        jable_scraper.page_readiness = original
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    try:
+        test_page_readiness()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Scrapers wait for page readiness instead of fixed sleeps")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test HTTP-first fetching with browser fallback (tiered_fetch.py) in JableScraper
+- A video page whose static HTML carries the full-video m3u8 is scraped over
+  plain HTTP - the browser is never started
+- A page with only a preview m3u8 (or a Cloudflare challenge) escalates to
+  the browser; an HTTP 404 does not
+- A search page that parses to an empty list (no required fields) escalates
+  too, one with results is served over HTTP
+- After FETCH_HTTP_BLOCK_STREAK blocked responses HTTP is paused for that
+  page kind
+- Per-tier counts and escalation reasons merge into the stats file across
+  instances
+
+Offline - fake session and browser tier. Uses a temporary stats file.
+
+Usage: python test_tiered_fetch.py
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+from types import SimpleNamespace
+
+from jable_scraper import JableScraper
+import tiered_fetch
+from tiered_fetch import TieredFetcher
+
+FULL_M3U8 = 'https://asf-doc.mushroomtrack.com/hls/abc/def/abc-123.m3u8?expires=1760000000&token=xyz'
+PREVIEW_M3U8 = 'https://cdn.example.com/preview/abc-123.m3u8'
+CHALLENGE = '<html><head><title>Just a moment...</title></head><body><div id="challenge-platform"></div></body></html>'
+
+VIDEO_PAGE = '''<html><head><title>ABC-123 - Jable.TV</title>
+<meta property="og:image" content="https://assets.jable.tv/contents/videos_screenshots/1/abc-123/preview.jpg">
+</head><body>
+<section class="video-info"><div class="info-header"><h4 class="title">ABC-123 Test Title</h4>
+<h6><span class="mr-3">2 days ago</span><span class="mr-3">10 000</span></h6></div></section>
+<a class="cat" href="https://jable.tv/categories/test/">Test</a>
+<script>var hlsUrl = '{m3u8}';</script>
+</body></html>'''
+
+
+class FakeSession:
+    """url -> (status, html); unknown URLs are 404"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.gets = []
+
+    def get(self, url, **kwargs):
+        self.gets.append(url)
+        status, html = self.pages.get(url, (404, '<html><head><title>404 Not Found</title></head></html>'))
+        return SimpleNamespace(status_code=status, text=html, url=url)
+
+
+class NoBrowser:
+    """Driver stand-in that fails the test if the browser tier is used"""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"Browser used (driver.{name}) although HTTP had the page")
+
+
+def test_tiered_fetch():
+    temp_dir = tempfile.mkdtemp()
+    stats_file = os.path.join(temp_dir, 'fetch_tiers.json')
+    url = 'https://jable.tv/videos/abc-123/'
+    url_en = url + '?lang=en'
+    fetchers = []
+
+    def fetcher_for(pages):
+        fetchers.append(TieredFetcher('jable', session=FakeSession(pages), stats_file=stats_file))
+        return fetchers[-1]
+
+    try:
+        # Static page has the full m3u8: HTTP only, no browser
+        scraper = JableScraper(headless=True)
+        scraper.fetcher = fetcher_for({url_en: (200, VIDEO_PAGE.format(m3u8=FULL_M3U8))})
+        scraper.driver = NoBrowser()
+        video = scraper.scrape_video(url)
+        assert video is not None and video.m3u8_url == FULL_M3U8, video
+        assert video.title == 'ABC-123 Test Title' and video.categories == ['Test'], video
+        print("HTTP tier: full m3u8 in the static page, browser not used")
+
+        # Only a preview in the static page: the browser tier finds the full one
+        browser_calls = []
+
+        def fake_browser(page_url, code, video_url):
+            browser_calls.append(page_url)
+            return scraper._parse_video_page(VIDEO_PAGE.format(m3u8=PREVIEW_M3U8), code, video_url,
+                                             network_m3u8=[FULL_M3U8], duration='2:03:53')
+
+        scraper.fetcher = fetcher_for({url_en: (200, VIDEO_PAGE.format(m3u8=PREVIEW_M3U8))})
+        scraper._scrape_video_browser = fake_browser
+        video = scraper.scrape_video(url)
+        assert browser_calls == [url_en], browser_calls
+        assert video.m3u8_url == FULL_M3U8 and video.duration == '2:03:53', video
+        assert scraper.fetcher.stats()['video']['escalated'] == {'nothing parsed': 1}
+        print("Preview-only page: escalated to the browser")
+
+        # 404 over HTTP is final
+        browser_calls.clear()
+        scraper.fetcher = fetcher_for({})
+        assert scraper.scrape_video('https://jable.tv/videos/xyz-999/') is None
+        assert not browser_calls, "HTTP 404 was retried in the browser"
+        print("HTTP 404: no browser retry")
+
+        # Cloudflare challenge (200 or 403): escalates, and a streak pauses HTTP
+        fetcher = fetcher_for({f'https://jable.tv/videos/abc-{i:03d}/?lang=en': (200 if i % 2 else 403, CHALLENGE)
+                               for i in range(10)})
+        session = fetcher.session
+        scraper.fetcher = fetcher
+        for i in range(8):
+            scraper.scrape_video(f'https://jable.tv/videos/abc-{i:03d}/')
+        assert len(browser_calls) == 8, browser_calls
+        assert len(session.gets) == tiered_fetch.BLOCK_STREAK, \
+            f"HTTP not paused after {tiered_fetch.BLOCK_STREAK} blocks: {len(session.gets)} requests"
+        reasons = fetcher.stats()['video']['escalated']
+        assert set(reasons) == {'blocked (200)', 'blocked (403)'}, reasons
+        print(f"Blocked: escalated, HTTP paused after {tiered_fetch.BLOCK_STREAK} blocks in a row")
+
+        # Empty search results are not an HTTP success
+        search_url = 'https://www.javdatabase.com/idols/?q=nobody'
+        found_url = 'https://www.javdatabase.com/idols/?q=somebody'
+        fetcher = fetcher_for({search_url: (200, '<html><body>No idols</body></html>'),
+                               found_url: (200, '<html><body>idol</body></html>')})
+        searched = []
+        parse = lambda html: ['idol'] if 'idol' in html.replace('idols', '') else []
+
+        def search_browser(page_url):
+            searched.append(page_url)
+            return []
+
+        assert fetcher.fetch(search_url, kind='search', parse=parse, browser=search_browser) == ([], 'browser')
+        assert fetcher.fetch(found_url, kind='search', parse=parse, browser=search_browser) == (['idol'], 'http')
+        assert searched == [search_url], searched
+        assert fetcher.stats()['search']['escalated'] == {'nothing parsed': 1}
+        print("Empty search result: escalated to the browser")
+
+        # Stats from every instance merge into one file
+        for instance in fetchers:
+            instance.flush()
+        with open(stats_file, encoding='utf-8') as f:
+            video_stats = json.load(f)['jable.video']
+        assert (video_stats['http'], video_stats['not_found'], video_stats['browser']) == (1, 1, 9), video_stats
+        assert video_stats['escalated'] == {'nothing parsed': 1, 'blocked (403)': 3, 'blocked (200)': 2}, video_stats
+        print(f"Stats file: HTTP {video_stats['http']}, 404 {video_stats['not_found']}, "
+              f"browser {video_stats['browser']}, escalated {video_stats['escalated']}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    try:
+        test_tiered_fetch()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Pages are fetched over HTTP first, the browser only on demand")
@@ -3,7 +3,12 @@
 Title Validation and Fixing Utilities
 Ensures video titles are properly formatted and not just the code
 """
+import os
 import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from normalize import resolve_titles
 
 def fix_video_title(video_data: dict) -> dict:
     """
@@ -20,27 +25,8 @@ def fix_video_title(video_data: dict) -> dict:
     title = video_data.get('title', '')
     title_japanese = video_data.get('title_japanese', '')
     
-    # Issue 1: Title is just the code or empty
-    if not title or title == code:
-        # Try to extract from title_japanese
-        if title_japanese and ' - ' in title_japanese:
-            parts = title_japanese.split(' - ', 1)
-            if parts[0].strip() == code:
-                # Format: "CODE - English title"
-                title = parts[1].strip()
-                title_japanese = ''  # No actual Japanese text
-        elif title_japanese and title_japanese != code:
-            # Use title_japanese as title if it's not the code
-            title = title_japanese
-            title_japanese = ''
-    
-    # Issue 2: Detect if title_japanese is actually English
-    japanese_pattern = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]')
-    if title_japanese and not japanese_pattern.search(title_japanese):
-        # It's not Japanese, move to title if title is empty or code
-        if not title or title == code:
-            title = title_japanese
-        title_japanese = ''
+    # Issues 1-2: title is the code/empty, title_japanese is actually English
+    title, title_japanese = resolve_titles(code, title or '', title_japanese or '')
     
     # Issue 3: If title is still empty or code, use code with warning
     if not title or title == code:
@@ -1,21 +1,77 @@
 """
 Upload video to multiple hosting services with automatic fallback
-Priority: StreamWish → LuluStream → Streamtape
+Default priority: StreamWish → LuluStream → Streamtape, reordered by the host
+health model in the DB (hosts failing or slow recently are tried last)
 Ensures full video is uploaded correctly with multiple fallback options
+Bodies are streamed from disk and paced by the shared bandwidth scheduler,
+one flow per host (BANDWIDTH_* caps apply as for the upload_pipeline hosts)
 """
 import os
 import sys
 import time
+from datetime import datetime
 import requests
 from streamwish_folders import get_or_create_folder
 
+# database_manager lives in the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from verification_queue import verification_queue
+from http_client import get_session
+
+# Streamed multipart bodies (never the whole video in memory)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'upload_pipeline'))
+from streaming_multipart import post_multipart
+from bandwidth_scheduler import bandwidth
+
+# Pooled keep-alive connections shared by all host API calls
+api_session = get_session('api')
+
 # Load API keys at module level
 LULUSTREAM_API_KEY = os.getenv('LULUSTREAM_API_KEY')
 STREAMWISH_API_KEY = os.getenv('STREAMWISH_API_KEY')
+STREAMWISH_API_URL = os.getenv('STREAMWISH_API_URL', 'https://api.streamwish.com/api')
 STREAMTAPE_LOGIN = os.getenv('STREAMTAPE_LOGIN')
 STREAMTAPE_API_KEY = os.getenv('STREAMTAPE_API_KEY')
 
 
+def upload_flow(host):
+    """Bandwidth flow of an upload: the caller's (e.g. UploadEngine's), else one per host"""
+    return bandwidth.current_flow(default=(host, 'upload'))
+
+
+class UploadProgress:
+    """post_multipart callback: progress bar every few seconds, remembers the bytes sent"""
+    
+    def __init__(self, service, interval=5.0):
+        self.service = service
+        self.interval = interval
+        self.bytes_sent = 0
+        self.total = 0
+        self.last_update = time.time()
+        self.last_bytes = 0
+    
+    def __call__(self, bytes_sent, total):
+        self.bytes_sent, self.total = bytes_sent, total
+        current_time = time.time()
+        if current_time - self.last_update < self.interval:
+            return
+        
+        progress = (bytes_sent / total) * 100 if total else 0
+        time_diff = current_time - self.last_update
+        speed = ((bytes_sent - self.last_bytes) / (1024*1024)) / time_diff if time_diff > 0 else 0
+        
+        bar = '█' * int(40 * progress / 100) + '░' * (40 - int(40 * progress / 100))
+        print(f"[{self.service}] [{bar}] {progress:.1f}% | ↑{speed:.1f} MB/s")
+        sys.stdout.flush()
+        
+        self.last_update = current_time
+        self.last_bytes = bytes_sent
+    
+    @property
+    def complete(self):
+        return self.total > 0 and self.bytes_sent >= self.total
+
+
 def upload_to_lulustream(file_path, code, title, folder_name=None, allow_small_files=False):
     """
     Upload to LuluStream as fallback
@@ -67,7 +123,7 @@ def upload_to_lulustream(file_path, code, title, folder_name=None, allow_small_f
     # Get upload server
     try:
         print(f"[LuluStream] Getting upload server...")
-        server_response = requests.get(
+        server_response = api_session.get(
             "https://lulustream.com/api/upload/server",
             params={'key': LULUSTREAM_API_KEY},
             timeout=30
@@ -87,108 +143,38 @@ def upload_to_lulustream(file_path, code, title, folder_name=None, allow_small_f
     upload_start = time.time()
     
     try:
-        # Use MultipartEncoder for proper large file handling
+        fields = {
+            'key': LULUSTREAM_API_KEY,
+            'title': upload_title,
+        }
+        
+        if folder_name:
+            fields['fld_id'] = folder_name
+            print(f"[LuluStream] ✓ Folder: {folder_name}")
+        
+        print(f"[LuluStream] Uploading to {upload_server}")
+        print(f"[LuluStream] This will take several minutes...")
+        sys.stdout.flush()
+        
+        # Body streamed from disk through one buffer
+        progress = UploadProgress('LuluStream')
         try:
-            from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
-            use_multipart = True
-        except ImportError:
-            print(f"[LuluStream] ⚠️ requests-toolbelt not available, using standard upload")
-            use_multipart = False
+            upload_response = post_multipart(
+                api_session, upload_server, fields, 'file', file_path,
+                flow=upload_flow('lulustream'),
+                callback=progress,
+                timeout=7200
+            )
+        except Exception as e:
+            print(f"[LuluStream] ❌ Upload exception: {str(e)[:200]}")
+            raise
         
-        if use_multipart:
-            # Prepare fields for multipart encoder
-            fields = {
-                'key': LULUSTREAM_API_KEY,
-                'title': upload_title,
-            }
-            
-            if folder_name:
-                fields['fld_id'] = folder_name
-                print(f"[LuluStream] ✓ Folder: {folder_name}")
-            
-            # Add file
-            print(f"[LuluStream] Opening file for multipart encoding...")
-            file_handle = open(file_path, 'rb')
-            fields['file'] = (os.path.basename(file_path), file_handle, 'video/mp4')
-            
-            print(f"[LuluStream] Creating multipart encoder...")
-            encoder = MultipartEncoder(fields=fields)
-            
-            print(f"[LuluStream] Encoder size: {encoder.len:,} bytes ({encoder.len / (1024**3):.2f} GB)")
-            
-            # Verify encoder size
-            if encoder.len < file_size * 0.9:
-                print(f"[LuluStream] ❌ ERROR: Encoder size too small!")
-                file_handle.close()
-                return {'service': 'LuluStream', 'success': False, 'error': 'Encoder size mismatch'}
-            
-            # Create progress monitor
-            last_update = [time.time()]
-            last_bytes = [0]
-            
-            def progress_callback(monitor):
-                current_time = time.time()
-                if current_time - last_update[0] >= 5.0:
-                    progress = (monitor.bytes_read / monitor.len) * 100
-                    elapsed = current_time - upload_start
-                    
-                    bytes_diff = monitor.bytes_read - last_bytes[0]
-                    time_diff = current_time - last_update[0]
-                    speed = (bytes_diff / (1024*1024)) / time_diff if time_diff > 0 else 0
-                    
-                    bar = '█' * int(40 * progress / 100) + '░' * (40 - int(40 * progress / 100))
-                    print(f"[LuluStream] [{bar}] {progress:.1f}% | ↑{speed:.1f} MB/s")
-                    sys.stdout.flush()
-                    
-                    last_update[0] = current_time
-                    last_bytes[0] = monitor.bytes_read
-            
-            monitor = MultipartEncoderMonitor(encoder, progress_callback)
-            
-            print(f"[LuluStream] Uploading to {upload_server}")
-            print(f"[LuluStream] This will take several minutes...")
-            sys.stdout.flush()
-            
-            try:
-                upload_response = requests.post(
-                    upload_server,
-                    data=monitor,
-                    headers={'Content-Type': monitor.content_type},
-                    timeout=7200
-                )
-                
-                print(f"\n[LuluStream] ✓ POST request completed")
-                print(f"[LuluStream] Bytes sent: {monitor.bytes_read:,}")
-                
-                if monitor.bytes_read < file_size * 0.95:
-                    print(f"[LuluStream] ❌ WARNING: Only {monitor.bytes_read:,} bytes sent!")
-                else:
-                    print(f"[LuluStream] ✓ Full file uploaded")
-                
-            except Exception as e:
-                print(f"[LuluStream] ❌ Upload exception: {str(e)[:200]}")
-                raise
-            finally:
-                file_handle.close()
+        print(f"\n[LuluStream] ✓ POST request completed")
+        print(f"[LuluStream] Bytes sent: {progress.bytes_sent:,}")
+        if progress.complete:
+            print(f"[LuluStream] ✓ Full file uploaded")
         else:
-            # Fallback to standard upload
-            print(f"[LuluStream] Using standard file upload...")
-            data = {
-                'key': LULUSTREAM_API_KEY,
-                'title': upload_title
-            }
-            if folder_name:
-                data['fld_id'] = folder_name
-            
-            with open(file_path, 'rb') as video_file:
-                files = {'file': (os.path.basename(file_path), video_file, 'video/mp4')}
-                
-                upload_response = requests.post(
-                    upload_server,
-                    files=files,
-                    data=data,
-                    timeout=7200
-                )
+            print(f"[LuluStream] ❌ WARNING: Only {progress.bytes_sent:,} bytes sent!")
         
         upload_time = time.time() - upload_start
         print(f"[LuluStream] ✓ Upload completed in {int(upload_time//60)}m {int(upload_time%60)}s")
@@ -299,7 +285,7 @@ def upload_to_lulustream(file_path, code, title, folder_name=None, allow_small_f
                     print(f"[LuluStream] Could not parse code from HTML, querying API...")
                     try:
                         # Get list of recent files
-                        list_response = requests.get(
+                        list_response = api_session.get(
                             "https://lulustream.com/api/file/list",
                             params={'key': LULUSTREAM_API_KEY, 'per_page': 10},
                             timeout=30
@@ -412,7 +398,7 @@ def upload_to_streamtape(file_path, code, title, folder_name=None, allow_small_f
     
     for attempt in range(max_retries):
         try:
-            r = requests.get(
+            r = api_session.get(
                 "https://api.streamtape.com/file/ul",
                 params={
                     'login': STREAMTAPE_LOGIN,
@@ -474,12 +460,13 @@ def upload_to_streamtape(file_path, code, title, folder_name=None, allow_small_f
     max_upload_retries = 2
     for upload_attempt in range(max_upload_retries):
         try:
-            with open(file_path, 'rb') as f:
-                response = requests.post(
-                    upload_url,
-                    files={'file1': (os.path.basename(file_path), f, 'video/mp4')},
-                    timeout=7200
-                )
+            # Body streamed from disk through one buffer
+            response = post_multipart(
+                api_session, upload_url, {}, 'file1', file_path,
+                flow=upload_flow('streamtape'),
+                callback=UploadProgress('Streamtape'),
+                timeout=7200
+            )
             
             upload_time = time.time() - upload_start
             print(f"[Streamtape] ✓ Upload completed in {int(upload_time//60)}m {int(upload_time%60)}s")
@@ -576,8 +563,8 @@ def upload_to_streamwish(file_path, code, title, folder_name=None, allow_small_f
             max_pages = 3  # Check first 300 files (3 pages × 100)
             
             while page <= max_pages:
-                search_response = requests.get(
-                    "https://api.streamwish.com/api/file/list",
+                search_response = api_session.get(
+                    f"{STREAMWISH_API_URL}/file/list",
                     params={'key': STREAMWISH_API_KEY, 'per_page': 100, 'page': page},
                     timeout=30
                 )
@@ -652,8 +639,8 @@ def upload_to_streamwish(file_path, code, title, folder_name=None, allow_small_f
                                     if filecode:
                                         print(f"[StreamWish] 🗑️ Attempting to delete corrupted file (filecode: {filecode})...")
                                         try:
-                                            delete_response = requests.get(
-                                                "https://api.streamwish.com/api/file/delete",
+                                            delete_response = api_session.get(
+                                                f"{STREAMWISH_API_URL}/file/delete",
                                                 params={'key': STREAMWISH_API_KEY, 'file_code': filecode},
                                                 timeout=30
                                             )
@@ -783,8 +770,8 @@ def upload_to_streamwish(file_path, code, title, folder_name=None, allow_small_f
     validation_attempts = 3
     for val_attempt in range(validation_attempts):
         try:
-            test_response = requests.get(
-                "https://api.streamwish.com/api/account/info",
+            test_response = api_session.get(
+                f"{STREAMWISH_API_URL}/account/info",
                 params={'key': STREAMWISH_API_KEY},
                 timeout=30
             )
@@ -841,8 +828,8 @@ def upload_to_streamwish(file_path, code, title, folder_name=None, allow_small_f
         try:
             # Step 1: Get upload server
             print(f"[StreamWish] Step 1: Getting upload server...")
-            server_response = requests.get(
-                "https://api.streamwish.com/api/upload/server",
+            server_response = api_session.get(
+                f"{STREAMWISH_API_URL}/upload/server",
                 params={'key': STREAMWISH_API_KEY},
                 timeout=30
             )
@@ -922,115 +909,33 @@ def upload_to_streamwish(file_path, code, title, folder_name=None, allow_small_f
             upload_start = time.time()
             upload_integrity_confirmed = False
             
-            # Use MultipartEncoder for proper large file handling
+            print(f"[StreamWish] Uploading to {upload_server}")
+            print(f"[StreamWish] This will take several minutes...")
+            sys.stdout.flush()
+            
+            # Body streamed from disk through one buffer, exact Content-Length
+            progress = UploadProgress('StreamWish')
             try:
-                from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
-                use_multipart = True
-            except ImportError:
-                print(f"[StreamWish] ⚠️ requests-toolbelt not available, using standard upload")
-                use_multipart = False
+                upload_response = post_multipart(
+                    api_session, upload_server, upload_data, 'file', file_path,
+                    flow=upload_flow('streamwish'),
+                    callback=progress,
+                    timeout=7200
+                )
+            except Exception as e:
+                print(f"[StreamWish] ❌ Upload exception: {str(e)[:200]}")
+                raise
             
-            if use_multipart:
-                # Prepare fields for multipart encoder
-                fields = {
-                    'key': upload_data['key'],
-                    'file_title': upload_data['file_title'],
-                    'file_adult': upload_data['file_adult'],
-                    'file_public': upload_data['file_public'],  # Make file public
-                }
-                
-                if 'fld_id' in upload_data:
-                    fields['fld_id'] = upload_data['fld_id']
-                
-                # Add file - will be read completely
-                print(f"[StreamWish] Opening file for multipart encoding...")
-                file_handle = open(file_path, 'rb')
-                fields['file'] = (os.path.basename(file_path), file_handle, 'video/mp4')
-                
-                print(f"[StreamWish] Creating multipart encoder...")
-                encoder = MultipartEncoder(fields=fields)
-                
-                print(f"[StreamWish] Encoder size: {encoder.len:,} bytes ({encoder.len / (1024**3):.2f} GB)")
-                
-                # Verify encoder size matches file size (approximately)
-                # Allow 1% tolerance for multipart encoding overhead
-                if encoder.len < file_size * 0.99:
-                    print(f"[StreamWish] ❌ ERROR: Encoder size too small!")
-                    print(f"[StreamWish] Expected: ~{file_size:,} bytes")
-                    print(f"[StreamWish] Got: {encoder.len:,} bytes")
-                    print(f"[StreamWish] Difference: {file_size - encoder.len:,} bytes ({((file_size - encoder.len) / file_size * 100):.1f}%)")
-                    file_handle.close()
-                    if attempt < max_retries - 1:
-                        time.sleep(10)
-                        continue
-                    return {'service': 'StreamWish', 'success': False, 'error': 'Encoder size mismatch'}
-                
-                # Create progress monitor
-                last_update = [time.time()]
-                last_bytes = [0]
-                
-                def progress_callback(monitor):
-                    current_time = time.time()
-                    if current_time - last_update[0] >= 5.0:
-                        progress = (monitor.bytes_read / monitor.len) * 100
-                        elapsed = current_time - upload_start
-                        
-                        bytes_diff = monitor.bytes_read - last_bytes[0]
-                        time_diff = current_time - last_update[0]
-                        speed = (bytes_diff / (1024*1024)) / time_diff if time_diff > 0 else 0
-                        
-                        bar = '█' * int(40 * progress / 100) + '░' * (40 - int(40 * progress / 100))
-                        print(f"[StreamWish] [{bar}] {progress:.1f}% | ↑{speed:.1f} MB/s")
-                        sys.stdout.flush()
-                        
-                        last_update[0] = current_time
-                        last_bytes[0] = monitor.bytes_read
-                
-                monitor = MultipartEncoderMonitor(encoder, progress_callback)
-                
-                print(f"[StreamWish] Uploading to {upload_server}")
-                print(f"[StreamWish] This will take several minutes...")
-                sys.stdout.flush()
-                
-                try:
-                    upload_response = requests.post(
-                        upload_server,
-                        data=monitor,
-                        headers={'Content-Type': monitor.content_type},
-                        timeout=7200
-                    )
-                    
-                    print(f"\n[StreamWish] ✓ POST request completed")
-                    print(f"[StreamWish] Bytes sent: {monitor.bytes_read:,}")
-                    
-                    # Verify full file was sent
-                    if monitor.bytes_read < file_size * 0.95:
-                        print(f"[StreamWish] ❌ WARNING: Only {monitor.bytes_read:,} bytes sent!")
-                        print(f"[StreamWish] Expected: {file_size:,} bytes")
-                    else:
-                        print(f"[StreamWish] ✓ Full file uploaded")
-                        upload_integrity_confirmed = True
-                    
-                except Exception as e:
-                    print(f"[StreamWish] ❌ Upload exception: {str(e)[:200]}")
-                    raise
-                finally:
-                    file_handle.close()
+            print(f"\n[StreamWish] ✓ POST request completed")
+            print(f"[StreamWish] Bytes sent: {progress.bytes_sent:,}")
+            
+            # Verify full file was sent
+            if progress.complete:
+                print(f"[StreamWish] ✓ Full file uploaded")
+                upload_integrity_confirmed = True
             else:
-                # Fallback to standard upload
-                print(f"[StreamWish] Using standard file upload...")
-                with open(file_path, 'rb') as video_file:
-                    files = {'file': (os.path.basename(file_path), video_file, 'video/mp4')}
-                    
-                    upload_response = requests.post(
-                        upload_server,
-                        files=files,
-                        data=upload_data,
-                        timeout=7200
-                    )
-                    
-                    print(f"[StreamWish] ✓ POST request completed")
-                    upload_integrity_confirmed = True
+                print(f"[StreamWish] ❌ WARNING: Only {progress.bytes_sent:,} bytes sent!")
+                print(f"[StreamWish] Expected: {file_size:,} bytes")
             
             upload_time = time.time() - upload_start
             print(f"[StreamWish] ✓ Upload completed in {int(upload_time//60)}m {int(upload_time%60)}s")
@@ -1159,8 +1064,8 @@ def upload_to_streamwish(file_path, code, title, folder_name=None, allow_small_f
                     
                     # Try to find the existing file
                     try:
-                        search_response = requests.get(
-                            "https://api.streamwish.com/api/file/list",
+                        search_response = api_session.get(
+                            f"{STREAMWISH_API_URL}/file/list",
                             params={'key': STREAMWISH_API_KEY, 'per_page': 100},
                             timeout=30
                         )
@@ -1207,156 +1112,21 @@ def upload_to_streamwish(file_path, code, title, folder_name=None, allow_small_f
             if folder_name:
                 print(f"[StreamWish] Folder: {folder_name}")
             
-            # Verify upload by checking file info with retry logic
-            print(f"\n[StreamWish] Verifying upload...")
-            verification_passed = False
-            verify_attempts = 3
-            for verify_attempt in range(verify_attempts):
-                try:
-                    verify_response = requests.get(
-                        "https://api.streamwish.com/api/file/info",
-                        params={'key': STREAMWISH_API_KEY, 'file_code': filecode},
-                        timeout=30
-                    )
-                    if verify_response.status_code == 200:
-                        verify_data = verify_response.json()
-                        print(f"[StreamWish] Verification response: {verify_data}")
-                        
-                        if verify_data.get('status') == 200 and 'result' in verify_data:
-                            file_info_verify = verify_data['result']
-
-                            # Handle case where result is a list (StreamWish API inconsistency)
-                            if isinstance(file_info_verify, list):
-                                if len(file_info_verify) > 0:
-                                    file_info_verify = file_info_verify[0]
-                                else:
-                                    file_info_verify = {}
-
-                            # Get file size - StreamWish returns it in file_sizes array
-                            server_size = 0
-                            if 'file_sizes' in file_info_verify:
-                                file_sizes = file_info_verify.get('file_sizes', [])
-                                if isinstance(file_sizes, list) and len(file_sizes) > 0:
-                                    server_size = file_sizes[0].get('size', 0)
-                            else:
-                                # Fallback to direct size field
-                                server_size = file_info_verify.get('size', 0)
-                            
-                            server_size_gb = int(server_size) / (1024**3) if server_size else 0
-                            server_size_mb = int(server_size) / (1024**2) if server_size else 0
-                            print(f"[StreamWish] ✓ Server confirms file size: {server_size_gb:.2f} GB ({server_size:,} bytes)")
-                            
-                            # Check file size based on whether it's a preview or full video
-                            if allow_small_files:
-                                # Preview file - expect 5-100 MB
-                                if server_size_mb < 5:
-                                    print(f"[StreamWish] ❌ WARNING: Preview file too small ({server_size_mb:.1f} MB)!")
-                                    print(f"[StreamWish] ❌ Upload may have failed silently")
-                                    verification_passed = False
-                                else:
-                                    print(f"[StreamWish] ✓ Preview file size valid ({server_size_mb:.1f} MB)")
-                                    verification_passed = True
-                            else:
-                                # Full video - expect > 100 MB
-                                if server_size_gb < 0.1:
-                                    print(f"[StreamWish] ❌ WARNING: Server shows very small file size!")
-                                    print(f"[StreamWish] ❌ Upload may have failed silently")
-                                    verification_passed = False
-                                else:
-                                    verification_passed = True
-                            break  # Success, exit retry loop
-                        else:
-                            print(f"[StreamWish] ❌ Verification failed: {verify_data.get('msg', 'Unknown error')}")
-                            verification_passed = False
-                            if verify_attempt < verify_attempts - 1:
-                                print(f"[StreamWish] Retrying verification in 5s...")
-                                time.sleep(5)
-                    else:
-                        print(f"[StreamWish] ❌ Verification HTTP error: {verify_response.status_code}")
-                        verification_passed = False
-                        if verify_attempt < verify_attempts - 1:
-                            print(f"[StreamWish] Retrying verification in 5s...")
-                            time.sleep(5)
-                except requests.exceptions.Timeout:
-                    print(f"[StreamWish] ⚠️ Verification timeout (attempt {verify_attempt + 1}/{verify_attempts})")
-                    if verify_attempt < verify_attempts - 1:
-                        wait_time = 5 * (verify_attempt + 1)  # 5s, 10s, 15s
-                        print(f"[StreamWish] Retrying in {wait_time}s...")
-                        time.sleep(wait_time)
-                    else:
-                        print(f"[StreamWish] ⚠️ Verification timed out after {verify_attempts} attempts")
-                        verification_passed = False
-                except Exception as e:
-                    print(f"[StreamWish] ❌ Verification exception: {str(e)[:100]}")
-                    if verify_attempt < verify_attempts - 1:
-                        print(f"[StreamWish] Retrying verification in 5s...")
-                        time.sleep(5)
-                    else:
-                        verification_passed = False
-            
-            # Test direct access to file (Double check even if verification failed)
-            print(f"\n[StreamWish] Testing direct access...")
-            direct_access_passed = False
-            access_attempts = 3
-            for access_attempt in range(access_attempts):
-                try:
-                    test_url = f"https://streamwish.com/{filecode}"
-                    test_response = requests.head(test_url, timeout=30, allow_redirects=True)
-                    print(f"[StreamWish] Direct access test: HTTP {test_response.status_code}")
-                    
-                    if test_response.status_code == 403:
-                        print(f"[StreamWish] ⚠️ 403 Forbidden - File is still processing")
-                        print(f"[StreamWish] ℹ️ This is normal for newly uploaded files")
-                        print(f"[StreamWish] ℹ️ File will be accessible once processing completes")
-                        break
-                    elif test_response.status_code == 404:
-                        print(f"[StreamWish] ❌ 404 Not Found - File doesn't exist!")
-                        if access_attempt < access_attempts - 1:
-                            print(f"[StreamWish] Retrying in 5s...")
-                            time.sleep(5)
-                    elif test_response.status_code in [200, 302]:
-                        print(f"[StreamWish] ✓ File is accessible!")
-                        direct_access_passed = True
-                        break
-                    else:
-                        print(f"[StreamWish] ⚠️ Unexpected status: {test_response.status_code}")
-                        if access_attempt < access_attempts - 1:
-                            print(f"[StreamWish] Retrying in 5s...")
-                            time.sleep(5)
-                except requests.exceptions.Timeout:
-                    print(f"[StreamWish] ⚠️ Access test timeout (attempt {access_attempt + 1}/{access_attempts})")
-                    if access_attempt < access_attempts - 1:
-                        wait_time = 5 * (access_attempt + 1)  # 5s, 10s, 15s
-                        print(f"[StreamWish] Retrying in {wait_time}s...")
-                        time.sleep(wait_time)
-                    else:
-                        print(f"[StreamWish] ⚠️ Access test timed out after {access_attempts} attempts")
-                except Exception as e:
-                    print(f"[StreamWish] ⚠️ Access test error: {str(e)[:100]}")
-                    if access_attempt < access_attempts - 1:
-                        print(f"[StreamWish] Retrying in 5s...")
-                        time.sleep(5)
-
-            # Decision Logic
-            # CRITICAL: If we got a filecode, the upload succeeded on StreamWish's side
-            # Even if verification fails, we should NOT retry to avoid duplicates
-            if verification_passed:
-                print(f"[StreamWish] ✓ API Verification Passed")
-            elif direct_access_passed:
-                print(f"[StreamWish] ⚠️ API Verification Failed but Direct Access Passed")
-                print(f"[StreamWish] ✓ Marking as SUCCESS (Ignoring API metadata issues)")
-            elif upload_integrity_confirmed:
-                print(f"[StreamWish] ⚠️ Verification failed but upload integrity confirmed locally")
-                print(f"[StreamWish] ℹ️ File is likely processing or API is lagging")
-                print(f"[StreamWish] ✓ Marking as SUCCESS to avoid duplicates")
+            # Server-side checks (file info, direct access) run in the background;
+            # the file code alone means StreamWish has the file - never retry (duplicates).
+            # Previews/GIFs share the video code but not its hosting entry - not queued
+            if is_preview_upload:
+                verification = 'skipped'
+                print(f"[StreamWish] Preview upload - no background verification")
             else:
-                # Even if verification failed, if we have a filecode, the file was uploaded
-                # Retrying would create duplicates on StreamWish
-                print(f"[StreamWish] ⚠️ Verification failed but filecode received: {filecode}")
-                print(f"[StreamWish] ℹ️ File was uploaded to StreamWish but verification timed out")
-                print(f"[StreamWish] ✓ Marking as SUCCESS to avoid duplicate uploads")
-                print(f"[StreamWish] ℹ️ File will be accessible once StreamWish finishes processing")
-            
+                if not upload_integrity_confirmed:
+                    print(f"[StreamWish] ⚠️ Upload integrity not confirmed locally - server check queued")
+                verification_queue.enqueue(
+                    'streamwish', 'streamwish', filecode, video_code=code,
+                    params={'expected_size': file_size, 'allow_small_files': allow_small_files}
+                )
+                verification = 'queued'
+                print(f"[StreamWish] 🔎 Verification queued (runs in the background)")
             print(f"[StreamWish] ═══════════════════════════════════════")
             
             return {
@@ -1370,7 +1140,8 @@ def upload_to_streamwish(file_path, code, title, folder_name=None, allow_small_f
                 'api_url': f"https://api.streamwish.com/api/file/direct_link?key={STREAMWISH_API_KEY}&file_code={filecode}",
                 'time': upload_time,
                 'folder': folder_name,
-                'file_size': file_size
+                'file_size': file_size,
+                'verification': verification
             }
             
         except requests.exceptions.Timeout:
@@ -1395,10 +1166,111 @@ def upload_to_streamwish(file_path, code, title, folder_name=None, allow_small_f
     return {'service': 'StreamWish', 'success': False, 'error': 'All retries failed'}
 
 
+def verify_streamwish(job):
+    """
+    Background check of a StreamWish upload (see verification_queue)
+    File info API first (server-side size), direct access as fallback.
+    403 / missing size = still processing, checked again later.
+    """
+    filecode = job['file_code']
+    params = job['params']
+
+    try:
+        response = api_session.get(
+            f"{STREAMWISH_API_URL}/file/info",
+            params={'key': STREAMWISH_API_KEY, 'file_code': filecode},
+            timeout=30
+        )
+        data = response.json() if response.status_code == 200 else {}
+    except Exception as e:
+        print(f"[StreamWish] ⚠️ Verification request failed for {filecode}: {str(e)[:100]}")
+        data = {}
+
+    if data.get('status') == 200 and 'result' in data:
+        file_info = data['result']
+
+        # Handle case where result is a list (StreamWish API inconsistency)
+        if isinstance(file_info, list):
+            file_info = file_info[0] if file_info else {}
+
+        # Get file size - StreamWish returns it in file_sizes array
+        server_size = 0
+        file_sizes = file_info.get('file_sizes')
+        if isinstance(file_sizes, list) and file_sizes:
+            server_size = int(file_sizes[0].get('size', 0) or 0)
+        elif 'size' in file_info:
+            server_size = int(file_info.get('size', 0) or 0)
+
+        if server_size:
+            # Preview files are expected to be 5-100 MB, full videos > 100 MB
+            minimum = 5 * 1024**2 if params.get('allow_small_files') else 0.1 * 1024**3
+            if server_size < minimum:
+                return {'state': 'failed', 'server_size': server_size,
+                        'error': f"Server file too small ({server_size / 1024**2:.1f} MB)"}
+            return {'state': 'verified', 'method': 'file_info', 'server_size': server_size,
+                    'expected_size': params.get('expected_size')}
+
+    # Double check through direct access
+    try:
+        test_response = api_session.head(f"https://streamwish.com/{filecode}", timeout=30, allow_redirects=True)
+    except Exception as e:
+        return {'state': 'pending', 'error': f"Access test error: {str(e)[:100]}"}
+
+    if test_response.status_code in [200, 302]:
+        return {'state': 'verified', 'method': 'direct_access'}
+    if test_response.status_code == 403:
+        return {'state': 'pending', 'error': 'Still processing (HTTP 403)'}
+    return {'state': 'pending', 'error': f"HTTP {test_response.status_code}"}
+
+
+verification_queue.register('streamwish', verify_streamwish)
+
+
+# key (hosting_status.json) -> (display name, upload function), default order
+SERVICES = {
+    'streamwish': ('StreamWish', upload_to_streamwish),
+    'lulustream': ('LuluStream', upload_to_lulustream),
+    'streamtape': ('Streamtape', upload_to_streamtape),
+}
+
+# Failures caused by the local file/config, not by the host
+LOCAL_ERRORS = ('File not found', 'File too small', 'Missing API key', 'Missing credentials', 'Encoder size mismatch')
+
+
+def _service_order(file_size):
+    """Service keys in upload order - healthiest first, static priority without history"""
+    keys = list(SERVICES)
+    try:
+        from database_manager import db_manager
+        return db_manager.rank_hosts(keys, file_size=file_size)
+    except Exception as e:
+        print(f"⚠️ Host health unavailable, using default order: {e}")
+        return keys
+
+
+def _record_attempt(key, result, duration, file_size):
+    """Feed one attempt into the host health model"""
+    if result.get('error') in LOCAL_ERRORS:
+        return
+    try:
+        from database_manager import db_manager
+        db_manager.record_host_attempt(
+            key, result.get('success', False),
+            duration=result.get('time') or duration,
+            bytes_sent=file_size,
+            error=result.get('error_msg') or result.get('error'),
+            rate_limited_until=result.get('wait_until'),
+            status=result.get('status_code')
+        )
+    except Exception as e:
+        print(f"⚠️ Could not record host health: {e}")
+
+
 def upload_all(file_path, code, title, video_data=None, allow_small_files=False, folder_name=None):
     """
     Main upload function - tries all hosting services with automatic fallback
-    Priority: StreamWish → LuluStream → Streamtape
+    Default priority: StreamWish → LuluStream → Streamtape; the host health
+    model moves hosts that failed or were slow recently to the back
     Includes proper cleanup on failure and transaction-like semantics
     
     Args:
@@ -1452,148 +1324,46 @@ def upload_all(file_path, code, title, video_data=None, allow_small_files=False,
     all_results = []
     created_folder_id = None
     
+    order = _service_order(file_size)
+    print(f"📊 Host order: {' → '.join(SERVICES[key][0] for key in order)}")
+    
     try:
-        # ATTEMPT 1: StreamWish (Primary)
-        print(f"\n{'='*60}")
-        print(f"ATTEMPT 1: StreamWish (Primary)")
-        print(f"{'='*60}")
-        streamwish_result = upload_to_streamwish(file_path, code, title, folder_name, allow_small_files)
-        all_results.append(streamwish_result)
-        
-        # Track folder ID for cleanup if needed
-        if streamwish_result.get('folder_id'):
-            created_folder_id = streamwish_result.get('folder_id')
-        
-        # Check if StreamWish succeeded
-        if streamwish_result.get('success'):
-            total_time = time.time() - start_time
-            print(f"\n{'='*60}")
-            print(f"UPLOAD SUMMARY")
-            print(f"{'='*60}")
-            print(f"Total time: {int(total_time//60)}m {int(total_time%60)}s")
-            print(f"✅ StreamWish (primary)")
-            print(f"   Embed: {streamwish_result['embed_url']}")
-            print(f"   Watch: {streamwish_result['watch_url']}")
-            print(f"   Time: {int(streamwish_result['time']//60)}m {int(streamwish_result['time']%60)}s")
-            print(f"{'='*60}")
+        for attempt, key in enumerate(order, 1):
+            name, upload_func = SERVICES[key]
+            role = 'Primary' if attempt == 1 else ('Final Fallback' if attempt == len(order) else 'Fallback')
             
-            return {
-                'successful': [streamwish_result],
-                'failed': [],
-                'total_time': total_time,
-                'primary_service': 'StreamWish',
-                'folder_id': created_folder_id
-            }
-        
-        # StreamWish failed - check if it's a rate limit
-        if streamwish_result.get('error') in ['RATE_LIMIT', 'QUOTA_EXCEEDED']:
             print(f"\n{'='*60}")
-            print(f"🚫 STREAMWISH QUOTA EXCEEDED - TRYING FALLBACKS")
+            print(f"ATTEMPT {attempt}: {name} ({role})")
             print(f"{'='*60}")
-            print(f"StreamWish error: {streamwish_result.get('error_msg', 'Upload quota exceeded')}")
             
-            from datetime import datetime
-            if streamwish_result.get('wait_until'):
-                resume_time = datetime.fromtimestamp(streamwish_result['wait_until'])
-                print(f"StreamWish resume at: {resume_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        else:
-            print(f"\n{'='*60}")
-            print(f"⚠️ STREAMWISH FAILED - TRYING FALLBACKS")
-            print(f"{'='*60}")
-            print(f"StreamWish error: {streamwish_result.get('error', 'Unknown error')}")
-        
-        # ATTEMPT 2: LuluStream (First Fallback)
-        print(f"\n{'='*60}")
-        print(f"ATTEMPT 2: LuluStream (First Fallback)")
-        print(f"{'='*60}")
-        lulustream_result = upload_to_lulustream(file_path, code, title, folder_name, allow_small_files)
-        all_results.append(lulustream_result)
-        
-        # Check if LuluStream succeeded
-        if lulustream_result.get('success'):
-            total_time = time.time() - start_time
-            print(f"\n{'='*60}")
-            print(f"UPLOAD SUMMARY")
-            print(f"{'='*60}")
-            print(f"Total time: {int(total_time//60)}m {int(total_time%60)}s")
-            print(f"❌ StreamWish: {streamwish_result.get('error', 'Failed')}")
-            print(f"✅ LuluStream (fallback)")
-            print(f"   Embed: {lulustream_result['embed_url']}")
-            print(f"   Watch: {lulustream_result['watch_url']}")
-            print(f"   Time: {int(lulustream_result['time']//60)}m {int(lulustream_result['time']%60)}s")
-            print(f"{'='*60}")
+            attempt_start = time.time()
+            result = upload_func(file_path, code, title, folder_name, allow_small_files)
+            all_results.append(result)
+            _record_attempt(key, result, time.time() - attempt_start, file_size)
             
-            return {
-                'successful': [lulustream_result],
-                'failed': [streamwish_result],
-                'total_time': total_time,
-                'fallback_used': 'LuluStream',
-                'rate_limited': streamwish_result.get('error') in ['RATE_LIMIT', 'QUOTA_EXCEEDED'],
-                'wait_until': streamwish_result.get('wait_until'),
-                'wait_seconds': streamwish_result.get('wait_seconds'),
-                'folder_id': created_folder_id
-            }
-        
-        # LuluStream also failed - try Streamtape
-        print(f"\n{'='*60}")
-        print(f"⚠️ LULUSTREAM FAILED - TRYING FINAL FALLBACK")
-        print(f"{'='*60}")
-        print(f"LuluStream error: {lulustream_result.get('error', 'Unknown error')}")
-        
-        # ATTEMPT 3: Streamtape (Second Fallback)
-        print(f"\n{'='*60}")
-        print(f"ATTEMPT 3: Streamtape (Final Fallback)")
-        print(f"{'='*60}")
-        streamtape_result = upload_to_streamtape(file_path, code, title, folder_name, allow_small_files)
-        all_results.append(streamtape_result)
-        
-        total_time = time.time() - start_time
-        
-        # Check if Streamtape succeeded
-        if streamtape_result.get('success'):
-            print(f"\n{'='*60}")
-            print(f"UPLOAD SUMMARY")
-            print(f"{'='*60}")
-            print(f"Total time: {int(total_time//60)}m {int(total_time%60)}s")
-            print(f"❌ StreamWish: {streamwish_result.get('error', 'Failed')}")
-            print(f"❌ LuluStream: {lulustream_result.get('error', 'Failed')}")
-            print(f"✅ Streamtape (final fallback)")
-            print(f"   Embed: {streamtape_result['embed_url']}")
-            print(f"   Watch: {streamtape_result['watch_url']}")
-            print(f"   Time: {int(streamtape_result['time']//60)}m {int(streamtape_result['time']%60)}s")
-            print(f"{'='*60}")
+            # Track folder ID for cleanup if needed
+            if result.get('folder_id'):
+                created_folder_id = result.get('folder_id')
             
-            return {
-                'successful': [streamtape_result],
-                'failed': [streamwish_result, lulustream_result],
-                'total_time': total_time,
-                'fallback_used': 'Streamtape',
-                'rate_limited': streamwish_result.get('error') in ['RATE_LIMIT', 'QUOTA_EXCEEDED'],
-                'wait_until': streamwish_result.get('wait_until'),
-                'wait_seconds': streamwish_result.get('wait_seconds'),
-                'folder_id': created_folder_id
-            }
-        
-        # All three services failed
-        print(f"\n{'='*60}")
-        print(f"❌ ALL UPLOAD SERVICES FAILED")
-        print(f"{'='*60}")
-        print(f"Total time: {int(total_time//60)}m {int(total_time%60)}s")
-        print(f"❌ StreamWish: {streamwish_result.get('error', 'Unknown error')}")
-        print(f"❌ LuluStream: {lulustream_result.get('error', 'Unknown error')}")
-        print(f"❌ Streamtape: {streamtape_result.get('error', 'Unknown error')}")
-        print(f"{'='*60}")
+            if result.get('success'):
+                return _upload_summary(all_results, start_time, created_folder_id)
+            
+            if result.get('error') in ['RATE_LIMIT', 'QUOTA_EXCEEDED']:
+                print(f"\n{'='*60}")
+                print(f"🚫 {name.upper()} QUOTA EXCEEDED")
+                print(f"{'='*60}")
+                print(f"{name} error: {result.get('error_msg', 'Upload quota exceeded')}")
+                
+                if result.get('wait_until'):
+                    resume_time = datetime.fromtimestamp(result['wait_until'])
+                    print(f"{name} resume at: {resume_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            else:
+                print(f"\n{'='*60}")
+                print(f"⚠️ {name.upper()} FAILED")
+                print(f"{'='*60}")
+                print(f"{name} error: {result.get('error', 'Unknown error')}")
         
-        return {
-            'successful': [],
-            'failed': all_results,
-            'total_time': total_time,
-            'all_failed': True,
-            'rate_limited': streamwish_result.get('error') in ['RATE_LIMIT', 'QUOTA_EXCEEDED'],
-            'wait_until': streamwish_result.get('wait_until'),
-            'wait_seconds': streamwish_result.get('wait_seconds'),
-            'folder_id': created_folder_id
-        }
+        return _upload_summary(all_results, start_time, created_folder_id)
     
     except Exception as e:
         # Unexpected error - cleanup and return
@@ -1612,6 +1382,58 @@ def upload_all(file_path, code, title, video_data=None, allow_small_files=False,
         }
 
 
+def _upload_summary(all_results, start_time, folder_id):
+    """Print the summary and build upload_all's return value"""
+    total_time = time.time() - start_time
+    succeeded = all_results[-1] if all_results and all_results[-1].get('success') else None
+    failed = [r for r in all_results if not r.get('success')]
+    
+    # StreamWish rate limits are reported to the caller (workflow pause logic)
+    streamwish = next((r for r in all_results if r.get('service') == 'StreamWish'), {})
+    rate_info = {
+        'rate_limited': streamwish.get('error') in ['RATE_LIMIT', 'QUOTA_EXCEEDED'],
+        'wait_until': streamwish.get('wait_until'),
+        'wait_seconds': streamwish.get('wait_seconds')
+    }
+    
+    print(f"\n{'='*60}")
+    print(f"UPLOAD SUMMARY" if succeeded else f"❌ ALL UPLOAD SERVICES FAILED")
+    print(f"{'='*60}")
+    print(f"Total time: {int(total_time//60)}m {int(total_time%60)}s")
+    for r in failed:
+        print(f"❌ {r.get('service', 'Unknown')}: {r.get('error', 'Failed')}")
+    
+    if not succeeded:
+        print(f"{'='*60}")
+        return {
+            'successful': [],
+            'failed': all_results,
+            'total_time': total_time,
+            'all_failed': True,
+            'folder_id': folder_id,
+            **rate_info
+        }
+    
+    primary = len(all_results) == 1
+    print(f"✅ {succeeded['service']} ({'primary' if primary else 'fallback'})")
+    print(f"   Embed: {succeeded['embed_url']}")
+    print(f"   Watch: {succeeded['watch_url']}")
+    print(f"   Time: {int(succeeded['time']//60)}m {int(succeeded['time']%60)}s")
+    print(f"{'='*60}")
+    
+    summary = {
+        'successful': [succeeded],
+        'failed': failed,
+        'total_time': total_time,
+        'folder_id': folder_id
+    }
+    if primary:
+        summary['primary_service'] = succeeded['service']
+    else:
+        summary['fallback_used'] = succeeded['service']
+        summary.update(rate_info)
+    return summary
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python upload_all_hosts.py <video_file>")
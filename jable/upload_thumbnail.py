@@ -3,9 +3,14 @@
 Upload thumbnail to StreamWish
 """
 import os
-import requests
+import sys
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_client import get_session
+
+api_session = get_session('api')
+
 def upload_thumbnail_to_streamwish(thumbnail_path, api_key, folder_name=None):
     """
     Upload thumbnail image to StreamWish
@@ -42,7 +47,7 @@ def upload_thumbnail_to_streamwish(thumbnail_path, api_key, folder_name=None):
                 print(f"   [File Upload] ⚠️ Could not get folder ID, uploading to root")
         
         # Get upload server
-        r = requests.get("https://api.streamwish.com/api/upload/server",
+        r = api_session.get("https://api.streamwish.com/api/upload/server",
                         params={'key': api_key}, timeout=30)
         
         if r.status_code != 200:
@@ -80,7 +85,7 @@ def upload_thumbnail_to_streamwish(thumbnail_path, api_key, folder_name=None):
             if folder_id:
                 data['fld_id'] = folder_id
             
-            response = requests.post(
+            response = api_session.post(
                 server,
                 files=files,
                 data=data,
@@ -8,6 +8,9 @@ import re
 import shutil
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from normalize import normalize_url as _normalize_url, resolve_titles
+
 # Import fcntl only on Unix systems
 if sys.platform != 'win32':
     import fcntl
@@ -27,27 +30,7 @@ def normalize_url(url):
     Returns:
         Normalized URL string
     """
-    if not url:
-        return ""
-    
-    # Convert to lowercase
-    url = url.lower()
-    
-    # Remove query parameters
-    if '?' in url:
-        url = url.split('?')[0]
-    
-    # Remove fragment
-    if '#' in url:
-        url = url.split('#')[0]
-    
-    # Remove trailing slash
-    url = url.rstrip('/')
-    
-    # Normalize http/https
-    url = url.replace('http://', 'https://')
-    
-    return url
+    return _normalize_url(url)
 
 
 def sanitize_filename(filename):
@@ -533,27 +516,8 @@ def fix_video_title(video_data):
     title = video_data.get('title', '')
     title_japanese = video_data.get('title_japanese', '')
     
-    # Issue 1: Title is just the code
-    if title == code or not title:
-        # Try to extract from title_japanese
-        if title_japanese and ' - ' in title_japanese:
-            parts = title_japanese.split(' - ', 1)
-            if parts[0].strip() == code:
-                # Format: "CODE - English title"
-                title = parts[1].strip()
-                title_japanese = ''  # No actual Japanese text
-        elif title_japanese and title_japanese != code:
-            # Use title_japanese as title if it's not the code
-            title = title_japanese
-            title_japanese = ''
-    
-    # Issue 2: Detect if title_japanese is actually English
-    japanese_pattern = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]')
-    if title_japanese and not japanese_pattern.search(title_japanese):
-        # It's not Japanese, move to title if title is empty
-        if not title or title == code:
-            title = title_japanese
-        title_japanese = ''
+    # Issues 1-2: title is the code/empty, title_japanese is actually English
+    title, title_japanese = resolve_titles(code, title or '', title_japanese or '')
     
     # Update video data
     video_data['title'] = title
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Bulk JAVDatabase Backfill
+Enriches every catalog video that has no JAVDatabase metadata yet, in place
+of walking the catalog serially (scrape_clean / scrape_by_code):
+- The codes to do are read from the database (videos without
+  javdb_available, FC2/amateur codes left out) and bulk-added to the retry
+  queue (retry_manager.py) - codes already queued keep their schedule, and
+  codes the retry manager gave up on (max retries) are not re-added
+- BACKFILL_WORKERS enrichment workers (enrichment_workers.py) process them;
+  each result is merged into the database as soon as it is scraped, in one
+  locked read-modify-write (db_manager.update_video), so parallel saves
+  cannot drop each other's videos
+- Polite to JAVDatabase: at most BACKFILL_DOMAIN_CONCURRENCY page fetches at
+  once, started at least BACKFILL_MIN_INTERVAL seconds apart - a DomainGate
+  registered with the tiered fetcher, so every page a video needs (movie,
+  search, idol pages) is paced, not just the start of each video
+- Progress with rate and ETA every --report seconds
+- Resumable: stop it any time (Ctrl+C) and run it again - enriched videos
+  are in the database, videos not on JAVDatabase yet are scheduled by the
+  retry manager's 2-day rule, videos still being scraped on Ctrl+C are
+  handed back at once, and a video a killed run held comes back when its
+  lease runs out
+
+Usage:
+    python backfill.py                    # backfill the whole catalog
+    python backfill.py --limit 500 --workers 6
+    python backfill.py --dry-run          # only count what is left
+
+Configured from .env:
+    BACKFILL_WORKERS=4
+    BACKFILL_DOMAIN_CONCURRENCY=2
+    BACKFILL_MIN_INTERVAL=1.0
+"""
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add parent directory to path for imports
+parent_path = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_path))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from retry_manager import retry_manager
+from enrichment_workers import EnrichmentWorkers
+from integrated_pipeline import IntegratedPipeline
+from tiered_fetch import DomainGate, set_domain_gate
+
+try:
+    from database_manager import db_manager
+    DATABASE_MANAGER_AVAILABLE = True
+except ImportError:
+    DATABASE_MANAGER_AVAILABLE = False
+
+WORKERS = int(os.getenv('BACKFILL_WORKERS', '4') or 4)
+DOMAIN_CONCURRENCY = int(os.getenv('BACKFILL_DOMAIN_CONCURRENCY', '2') or 2)
+MIN_INTERVAL = float(os.getenv('BACKFILL_MIN_INTERVAL', '1.0') or 1.0)
+JAVDB_DOMAIN = 'www.javdatabase.com'
+INTERRUPT_GRACE = 5  # Seconds workers get to finish their video after Ctrl+C
+
+
+def needs_enrichment(video: Dict) -> bool:
+    """Catalog video without JAVDatabase metadata that JAVDatabase can have"""
+    code = video.get('code')
+    if not code or video.get('javdb_available'):
+        return False
+    should_skip, _ = IntegratedPipeline.should_skip_javdb_enrichment(code)
+    return not should_skip
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class Backfill:
+    """Resumable bulk enrichment of the catalog through the retry queue"""
+
+    def __init__(self, workers: int = None, domain_concurrency: int = None, min_interval: float = None,
+                 manager=None, scrape: Callable = None, save: Callable = None,
+                 load_videos: Callable = None, report_interval: float = 30, headless: bool = True):
+        """
+        Args:
+            manager: JAVDBRetryManager holding the queue (default: the global one)
+            scrape / save: as for EnrichmentWorkers (default: JAVDatabase scraper / merge into the database)
+            load_videos: () -> catalog video list (default: db_manager.get_all_videos)
+        """
+        self.manager = manager or retry_manager
+        self.load_videos = load_videos or self._load_videos
+        self.report_interval = report_interval
+        self.gate = DomainGate(JAVDB_DOMAIN,
+                               DOMAIN_CONCURRENCY if domain_concurrency is None else domain_concurrency,
+                               MIN_INTERVAL if min_interval is None else min_interval)
+        self.pool = EnrichmentWorkers(workers=workers or WORKERS, manager=self.manager, scrape=scrape,
+                                      save=save, poll_interval=1.0, headless=headless)
+
+    @staticmethod
+    def _load_videos() -> List[Dict]:
+        if not DATABASE_MANAGER_AVAILABLE:
+            print("⚠️ Database manager not available, nothing to backfill")
+            return []
+        return db_manager.get_all_videos()
+
+    def pending(self, limit: Optional[int] = None) -> List[Dict]:
+        """Catalog videos that still need JAVDatabase metadata"""
+        videos = [v for v in self.load_videos() if needs_enrichment(v)]
+        return videos[:limit] if limit else videos
+
+    def queue(self, limit: Optional[int] = None) -> Dict:
+        """Add the videos still to do to the queue; returns pending / newly queued counts"""
+        videos = self.pending(limit)
+        added = self.manager.add_many_to_queue(videos, reason='backfill', delay_days=0)
+        return {'pending': len(videos), 'queued': added}
+
+    def run(self, limit: Optional[int] = None, timeout: Optional[float] = None) -> Dict:
+        """
+        Queue the catalog's unenriched videos and enrich them until nothing is due
+
+        Returns:
+            Summary: pending, queued, processed, outcome counts, elapsed, completed
+        """
+        counts = self.queue(limit)
+        stats = self.manager.get_queue_stats()
+        total = stats['ready_for_retry'] + stats.get('in_progress', 0)
+        print(f"[Backfill] {counts['pending']} videos without JAVDatabase metadata, {counts['queued']} newly queued, "
+              f"{total} due now ({stats['pending']} scheduled for later retries, "
+              f"{stats['max_retries_reached']} given up)")
+        print(f"[Backfill] {self.pool.workers} workers, at most {self.gate.concurrency} requests at once to "
+              f"{self.gate.domain}, {self.gate.min_interval:g}s apart")
+
+        start = time.time()
+        before = dict(self.pool.counts)
+        completed = False
+        stop_timeout = 30
+        next_report = start + self.report_interval
+        previous_gate = set_domain_gate(self.gate.domain, self.gate)
+        try:
+            if total:
+                self.pool.start()
+            while True:
+                stats = self.manager.get_queue_stats()
+                remaining = stats['ready_for_retry'] + stats.get('in_progress', 0)
+                if not remaining:
+                    completed = True
+                    break
+                if timeout is not None and time.time() - start >= timeout:
+                    print(f"[Backfill] ⚠️ Timeout - {remaining} left in the queue for the next run")
+                    break
+                if time.time() >= next_report:
+                    self._report(before, start, remaining)
+                    next_report = time.time() + self.report_interval
+                time.sleep(min(1.0, self.report_interval))
+        except KeyboardInterrupt:
+            print("\n[Backfill] Interrupted - run again to continue where it stopped")
+            stop_timeout = INTERRUPT_GRACE
+        finally:
+            try:
+                self.pool.stop(stop_timeout)
+            finally:
+                set_domain_gate(self.gate.domain, previous_gate)
+
+        done = {key: self.pool.counts[key] - before[key] for key in before}
+        summary = {
+            **counts,
+            **done,
+            'processed': sum(done.values()),
+            'elapsed': round(time.time() - start, 1),
+            'peak_domain_concurrency': self.gate.peak,
+            'completed': completed
+        }
+        print(f"[Backfill] {'Done' if completed else 'Stopped'}: {summary['processed']} processed in "
+              f"{format_duration(summary['elapsed'])} - {done['enriched']} enriched, "
+              f"{done['not_found']} not on JAVDatabase yet, {done['skipped']} skipped, {done['errors']} errors")
+        return summary
+
+    def _report(self, before: Dict, start: float, remaining: int):
+        processed = sum(self.pool.counts[key] - before[key] for key in before)
+        elapsed = time.time() - start
+        rate = processed / elapsed if elapsed > 0 else 0
+        eta = format_duration(remaining / rate) if rate > 0 else '?'
+        print(f"[Backfill] {processed} processed, {remaining} left - {rate * 60:.1f}/min, ETA {eta} "
+              f"({self.pool.counts['enriched'] - before['enriched']} enriched)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill JAVDatabase metadata for the whole catalog')
+    parser.add_argument('--workers', type=int, default=None, help=f'Enrichment workers (default: {WORKERS})')
+    parser.add_argument('--domain-concurrency', type=int, default=None,
+                        help=f'Requests at once to JAVDatabase (default: {DOMAIN_CONCURRENCY})')
+    parser.add_argument('--min-interval', type=float, default=None,
+                        help=f'Seconds between request starts (default: {MIN_INTERVAL:g})')
+    parser.add_argument('--limit', type=int, default=None, help='Queue at most this many videos')
+    parser.add_argument('--timeout', type=float, default=None, help='Stop after this many seconds')
+    parser.add_argument('--report', type=float, default=30, help='Progress report interval in seconds')
+    parser.add_argument('--dry-run', action='store_true', help='Only count the videos still to do')
+    parser.add_argument('--no-headless', action='store_true', help='Show the browser when it is needed')
+    args = parser.parse_args()
+
+    backfill = Backfill(workers=args.workers, domain_concurrency=args.domain_concurrency,
+                        min_interval=args.min_interval, report_interval=args.report,
+                        headless=not args.no_headless)
+    if args.dry_run:
+        print(f"[Backfill] {len(backfill.pending(args.limit))} videos without JAVDatabase metadata")
+        return
+
+    summary = backfill.run(limit=args.limit, timeout=args.timeout)
+    sys.exit(0 if summary['completed'] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+JAVDatabase Parse Throughput Benchmark
+Parses every saved page in fixtures/ with javdb_parser - no browser, no network:
+- Each fixture is parsed --iterations times per BeautifulSoup backend
+  (lxml and the stdlib html.parser, when lxml is installed)
+- Reports ms/page and pages/s per fixture and overall, as JSON
+
+Usage:
+    python benchmark_parser.py                   # 200 iterations per fixture
+    python benchmark_parser.py --iterations 1000
+    python benchmark_parser.py --backends html.parser
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+from datetime import datetime
+
+import javdb_parser
+from javdb_parser import find_idol_links, parse_actress_page, parse_video_page
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(SCRIPT_DIR, 'fixtures')
+DEFAULT_OUTPUT = os.path.join(SCRIPT_DIR, 'benchmark_parser_results.json')
+
+
+def load_cases():
+    """Fixture cases from expected.json, with the page HTML loaded"""
+    with open(os.path.join(FIXTURES, 'expected.json'), 'r', encoding='utf-8') as f:
+        cases = json.load(f)
+    for case in cases:
+        with open(os.path.join(FIXTURES, case['file']), 'r', encoding='utf-8') as f:
+            case['html'] = f.read()
+    return cases
+
+
+def parse_once(case):
+    if case['type'] == 'video':
+        return parse_video_page(case['html'], case['code'])
+    if case['type'] == 'actress':
+        return parse_actress_page(case['html'], case['name'], case['url'])
+    return find_idol_links(case['html'])
+
+
+def benchmark_backend(backend, cases, iterations):
+    """Parse every fixture `iterations` times with one BeautifulSoup backend"""
+    javdb_parser.PARSER = backend
+    fixtures = []
+
+    for case in cases:
+        parse_once(case)  # warm-up
+        start = time.perf_counter()
+        for _ in range(iterations):
+            parse_once(case)
+        elapsed = time.perf_counter() - start
+
+        fixtures.append({
+            'file': case['file'],
+            'type': case['type'],
+            'size_kb': round(len(case['html'].encode('utf-8')) / 1024, 1),
+            'ms_per_page': round(elapsed / iterations * 1000, 3),
+            'pages_per_s': round(iterations / elapsed, 1) if elapsed > 0 else None
+        })
+
+    total_ms = sum(f['ms_per_page'] for f in fixtures)
+    return {
+        'backend': backend,
+        'fixtures': fixtures,
+        'mean_ms_per_page': round(total_ms / len(fixtures), 3),
+        'pages_per_s': round(len(fixtures) / total_ms * 1000, 1) if total_ms > 0 else None
+    }
+
+
+def print_summary(results):
+    print("\n" + "=" * 70)
+    print("PARSER BENCHMARK RESULTS")
+    print("=" * 70)
+
+    for backend in results['backends']:
+        print(f"\n{backend['backend']}:")
+        print(f"  {'fixture':<30}{'KB':>8}{'ms/page':>12}{'pages/s':>12}")
+        print("  " + "-" * 62)
+        for f in backend['fixtures']:
+            print(f"  {f['file']:<30}{f['size_kb']:>8.1f}{f['ms_per_page']:>12.3f}{(f['pages_per_s'] or 0):>12.1f}")
+        print(f"  {'mean':<30}{'':>8}{backend['mean_ms_per_page']:>12.3f}{(backend['pages_per_s'] or 0):>12.1f}")
+
+    print("\n" + "=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JAVDatabase page parsing on the saved fixtures')
+    parser.add_argument('--iterations', type=int, default=200, help='Parses per fixture (default: 200)')
+    parser.add_argument('--backends', default=None,
+                        help='Comma-separated BeautifulSoup backends (default: lxml,html.parser)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Results JSON path')
+    args = parser.parse_args()
+
+    default_parser = javdb_parser.PARSER
+    if args.backends:
+        backends = [b.strip() for b in args.backends.split(',') if b.strip()]
+    else:
+        backends = ['lxml', 'html.parser'] if default_parser == 'lxml' else ['html.parser']
+        if default_parser != 'lxml':
+            print("⚠️ lxml not installed - benchmarking html.parser only")
+
+    cases = load_cases()
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'host': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count()
+        },
+        'settings': {
+            'iterations': args.iterations,
+            'fixtures': len(cases),
+            'default_parser': default_parser
+        },
+        'backends': []
+    }
+
+    try:
+        for backend in backends:
+            print(f"[Benchmark] {backend}: {len(cases)} fixtures x {args.iterations}...")
+            results['backends'].append(benchmark_backend(backend, cases, args.iterations))
+    except Exception as e:
+        print(f"✗ Benchmark failed: {e}")
+        sys.exit(1)
+    finally:
+        javdb_parser.PARSER = default_parser
+
+    print_summary(results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Background JAVDatabase Enrichment Workers
+- The download/upload loops save the source data right away and enqueue the
+  video; ENRICH_WORKERS (default 2) threads fetch the JAVDatabase metadata
+  and merge it in (merge_single.merge_and_validate), so video throughput no
+  longer waits on JAVDatabase latency
+- The queue is the retry manager's database (database/javdb_retry_queue.db):
+  new entries are due at once, a video not found on JAVDatabase is
+  rescheduled by the retry manager's 2-day rule, and pending work survives
+  restarts. A claimed entry has a lease, so a crashed worker's video comes
+  back when it runs out
+- The merge is written over the current database entry in one locked
+  read-modify-write (db_manager.update_video), so fields added in the meantime
+  (hosting, previews, verification) and other threads' saves are kept
+- A JavaGG video JAVDatabase does not have gets the JavaGG page metadata
+  instead (categories, tags, release date, models, studio - javgg_fallback)
+
+Usage:
+    from enrichment_workers import enrichment_workers
+    enrichment_workers.enqueue(video_code, video_data)   # starts the workers
+    ...
+    enrichment_workers.drain(timeout=900)                # before the final commit
+    enrichment_workers.stop()
+
+CLI: python enrichment_workers.py [--drain]   (queue status / process due entries)
+"""
+import os
+import sys
+import time
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+# Add parent directory to path for imports
+parent_path = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_path))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from normalize import javdb_lookup_code
+from retry_manager import retry_manager
+from merge_single import merge_and_validate
+from integrated_pipeline import IntegratedPipeline
+
+try:
+    from database_manager import db_manager
+    DATABASE_MANAGER_AVAILABLE = True
+except ImportError:
+    DATABASE_MANAGER_AVAILABLE = False
+
+WORKERS = int(os.getenv('ENRICH_WORKERS', '2') or 2)
+DRAIN_TIMEOUT = float(os.getenv('ENRICH_DRAIN_TIMEOUT', '900') or 900)
+LEASE_SECONDS = 1800     # A claimed video is due again after this if its worker died
+ERROR_BACKOFF = 600      # Seconds before retrying after a scrape/save error
+
+def merge_into_database(video_code: str, source_data: Dict, javdb_data: Dict) -> bool:
+    """Merge JAVDatabase data into the video's current database entry"""
+    if not DATABASE_MANAGER_AVAILABLE:
+        print(f"  ⚠️ Database manager not available, cannot save {video_code}")
+        return False
+
+    def merge(current):
+        current = current or {}
+        source = {**source_data, **current}
+        merged = merge_and_validate(source, javdb_data)
+        if 'source' not in source:
+            merged.pop('source', None)  # merge_and_validate's 'javgg' default
+        # Empty merge fields (no value on either side) do not blank the entry
+        merged = {key: value for key, value in merged.items() if value not in (None, '', [], {})}
+        return {**current, **merged}
+
+    # Read, merge and write under one lock - other threads save to the same file
+    if not db_manager.update_video(video_code, merge):
+        return False
+    db_manager.update_stats()
+    db_manager.update_progress()
+    return True
+
+
+def javgg_fallback(video_code: str, source_data: Dict) -> bool:
+    """
+    JavaGG page metadata for a JavaGG video not on JAVDatabase
+    (javgg/javdb_enrichment.scrape_enhanced_from_javgg), saved over the current entry
+
+    Returns:
+        True if the entry was updated
+    """
+    current = db_manager.get_video_by_code(video_code) if DATABASE_MANAGER_AVAILABLE else None
+    video = {**source_data, **(current or {})}
+    if 'javgg' not in (video.get('source_url') or '') or video.get('enhanced_from_javgg'):
+        return False
+
+    sys.path.insert(0, str(parent_path / 'javgg'))
+    from javdb_enrichment import scrape_enhanced_from_javgg
+    enhanced = scrape_enhanced_from_javgg(video)
+    if not enhanced.get('enhanced_from_javgg') or not DATABASE_MANAGER_AVAILABLE:
+        return False
+    # Over the entry as it is now: hosting etc. may have been written while the page was scraped
+    return db_manager.update_video(video_code, lambda current: {**(current or {}), **enhanced})
+
+
+class EnrichmentWorkers:
+    """Worker threads that enrich queued videos with JAVDatabase metadata"""
+
+    def __init__(self, workers: int = None, manager=None, scrape: Callable = None, save: Callable = None,
+                 fallback: Callable = None, poll_interval: float = 5.0, headless: bool = True):
+        """
+        Args:
+            manager: JAVDBRetryManager holding the queue (default: the global one)
+            scrape: code -> JAVDatabase dict or None (default: a SingleVideoScraper per worker)
+            save: (code, source_data, javdb_data) -> bool (default: merge_into_database)
+            fallback: (code, source_data) -> bool, run when JAVDatabase has no
+                      result (default: javgg_fallback)
+        """
+        self.workers = max(1, workers or WORKERS)
+        self.manager = manager or retry_manager
+        self.scrape = scrape or self._scrape
+        self.save = save or merge_into_database
+        self.fallback = fallback or javgg_fallback
+        self.poll_interval = poll_interval
+        self.headless = headless
+
+        self.threads = []
+        self.local = threading.local()
+        self.scrapers = []
+        self.claimed = {}  # code -> worker, videos being processed right now
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.counts = {'enriched': 0, 'not_found': 0, 'skipped': 0, 'errors': 0}
+
+    # -- API ------------------------------------------------------------------
+
+    def enqueue(self, video_code: str, video_data: Dict, start: bool = True) -> bool:
+        """Queue a video for enrichment (due at once) and wake the workers"""
+        queued = self.manager.add_to_queue(video_code, video_data, reason='enrich', delay_days=0)
+        if start:
+            self.start()
+        self._wake.set()
+        return queued
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self.lock:
+            self.threads = [t for t in self.threads if t.is_alive()]
+            if self.threads:
+                return
+            self._stop.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, args=(f"enrich-{i + 1}",),
+                                          name=f"enrich-{i + 1}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+        print(f"[Enrich] Started {self.workers} enrichment worker(s)")
+
+    def drain(self, timeout: float = None) -> bool:
+        """
+        Wait until no queued video is due or in progress (later retries stay queued)
+
+        Returns:
+            True if drained, False if the timeout was reached
+        """
+        timeout = DRAIN_TIMEOUT if timeout is None else timeout
+        deadline = time.time() + timeout
+        self.start()
+        while True:
+            stats = self.manager.get_queue_stats()
+            if not stats['ready_for_retry'] and not stats.get('in_progress'):
+                return True
+            if time.time() >= deadline:
+                print(f"[Enrich] ⚠️ Still {stats['ready_for_retry']} due / {stats.get('in_progress', 0)} in progress "
+                      f"after {timeout:.0f}s - left in the queue for the next run")
+                return False
+            self._wake.set()
+            time.sleep(min(1.0, self.poll_interval))
+
+    def stop(self, timeout: float = 30):
+        """
+        Stop the workers after their current video and close their browsers
+
+        Videos of workers that did not finish within timeout (or when the wait
+        itself is interrupted) are handed back to the queue, due at once,
+        instead of staying leased until LEASE_SECONDS run out.
+        """
+        self._stop.set()
+        self._wake.set()
+        try:
+            for thread in self.threads:
+                thread.join(timeout)
+        finally:
+            self.threads = []
+            self.release_claims()
+            for scraper in self.scrapers:
+                try:
+                    scraper.close()
+                except Exception:
+                    pass
+            self.scrapers = []
+        self.print_stats()
+
+    def release_claims(self) -> int:
+        """Hand the videos still being processed back to the queue; returns how many"""
+        with self.lock:
+            claimed, self.claimed = self.claimed, {}
+        for code in claimed:
+            self.manager.release(code)
+        if claimed:
+            print(f"[Enrich] Handed {len(claimed)} unfinished video(s) back to the queue: {', '.join(claimed)}")
+        return len(claimed)
+
+    # -- processing -----------------------------------------------------------
+
+    def _scrape(self, lookup_code: str) -> Optional[Dict]:
+        """One SingleVideoScraper per worker thread (its HTTP session / browser stay warm)"""
+        scraper = getattr(self.local, 'scraper', None)
+        if scraper is None:
+            from scrape_single import SingleVideoScraper
+            scraper = self.local.scraper = SingleVideoScraper(headless=self.headless)
+            with self.lock:
+                self.scrapers.append(scraper)
+        return scraper.scrape(lookup_code)
+
+    def _count(self, outcome: str):
+        with self.lock:
+            self.counts[outcome] += 1
+
+    def run_one(self, worker: str = 'main') -> Optional[str]:
+        """
+        Claim and enrich one due video
+
+        Returns:
+            'enriched', 'not_found', 'skipped', 'errors', or None if nothing was due
+        """
+        entry = self.manager.claim_next(worker, LEASE_SECONDS)
+        if entry is None:
+            return None
+
+        with self.lock:
+            self.claimed[entry['code']] = worker
+        try:
+            outcome = self._process(entry)
+        finally:
+            with self.lock:
+                self.claimed.pop(entry['code'], None)
+        self._count(outcome)
+        return outcome
+
+    def _give_back(self, code: str, delay: float):
+        """Release a claimed video after an error, unless stop() already handed it back"""
+        with self.lock:
+            if code not in self.claimed:
+                return
+        self.manager.release(code, delay)
+
+    def _process(self, entry: Dict) -> str:
+        code = entry['code']
+
+        should_skip, skip_reason = IntegratedPipeline.should_skip_javdb_enrichment(code)
+        if should_skip:
+            print(f"[Enrich] ⏭️ {code}: {skip_reason}")
+            self.manager.remove_from_queue(code)
+            return 'skipped'
+
+        print(f"[Enrich] 🔍 {code}: fetching JAVDatabase metadata "
+              f"(attempt {entry.get('retry_count', 0) + 1}/{self.manager.max_retries})")
+        try:
+            javdb_data = self.scrape(javdb_lookup_code(code))
+        except Exception as e:
+            print(f"[Enrich] ❌ {code}: {str(e)[:100]} - retry in {ERROR_BACKOFF // 60} min")
+            self._give_back(code, ERROR_BACKOFF)
+            return 'errors'
+
+        if not javdb_data:
+            print(f"[Enrich] ⚠️ {code}: not on JAVDatabase yet")
+            try:
+                if self.fallback(code, entry.get('video_data') or {}):
+                    print(f"[Enrich] 📝 {code}: saved source page metadata instead")
+            except Exception as e:
+                print(f"[Enrich] ⚠️ {code}: fallback failed: {str(e)[:100]}")
+            self.manager.update_retry_status(code, success=False, found_in_javdb=False)
+            return 'not_found'
+
+        try:
+            saved = self.save(code, entry.get('video_data') or {}, javdb_data)
+        except Exception as e:
+            print(f"[Enrich] ❌ {code}: save failed: {str(e)[:100]}")
+            saved = False
+
+        if not saved:
+            self._give_back(code, ERROR_BACKOFF)
+            return 'errors'
+
+        print(f"[Enrich] ✅ {code}: merged JAVDatabase metadata "
+              f"({len(javdb_data.get('cast', []))} cast, {len(javdb_data.get('genres', []))} genres)")
+        self.manager.update_retry_status(code, success=True, found_in_javdb=True)
+        return 'enriched'
+
+    def _run(self, worker: str):
+        while not self._stop.is_set():
+            try:
+                if self.run_one(worker) is not None:
+                    continue
+            except Exception as e:
+                print(f"[Enrich] ⚠️ Worker error: {e}")
+
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    # -- stats ----------------------------------------------------------------
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {**self.counts, 'queue': self.manager.get_queue_stats()}
+
+    def print_stats(self):
+        s = self.stats()
+        q = s['queue']
+        print(f"[Enrich] {s['enriched']} enriched, {s['not_found']} not found yet, {s['skipped']} skipped, "
+              f"{s['errors']} errors - queue: {q['ready_for_retry']} due, {q.get('in_progress', 0)} in progress, "
+              f"{q['pending']} waiting for retry")
+
+
+# Global instance
+enrichment_workers = EnrichmentWorkers()
+
+
+if __name__ == "__main__":
+    enrichment_workers.print_stats()
+    if '--drain' in sys.argv:
+        enrichment_workers.drain()
+        enrichment_workers.stop()
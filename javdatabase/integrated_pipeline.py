@@ -155,7 +155,8 @@ class IntegratedPipeline:
             db_manager.update_stats()
             db_manager.update_progress()
     
-    def should_skip_javdb_enrichment(self, video_code: str) -> tuple[bool, str]:
+    @staticmethod
+    def should_skip_javdb_enrichment(video_code: str) -> tuple[bool, str]:
         """
         Check if video should skip JAVDatabase enrichment
         
@@ -385,13 +386,13 @@ class IntegratedPipeline:
         print(f"{'='*70}")
         
         # Get videos ready for retry
-        ready_videos = retry_manager.get_videos_ready_for_retry()
+        ready_videos = retry_manager.get_videos_ready_for_retry(limit=max_videos)
         
         if not ready_videos:
             print("   No videos ready for retry")
             return {'processed': 0, 'success': 0, 'failed': 0}
         
-        print(f"   Found {len(ready_videos)} videos ready for retry")
+        print(f"   Found {retry_manager.get_queue_stats()['ready_for_retry']} videos ready for retry")
         print(f"   Processing up to {max_videos} videos...")
         
         processed = 0
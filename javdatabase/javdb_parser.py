@@ -0,0 +1,610 @@
+"""
+JAVDatabase Page Parser
+Turns saved JAVDatabase HTML into metadata - no browser, no network:
+- parse_video_page(html, video_code, url)   movie page  -> VideoMetadata
+- parse_actress_page(html, name, url)       idol page   -> ActressData
+- find_idol_links(html) / best_idol_match   idol search results
+The scrapers only fetch pages (Selenium) and hand page_source to these
+functions, so parsing can be tested and profiled offline (fixtures/,
+benchmark_parser.py). Fixtures are exported from captured pages with
+html_snapshots.py (capture / export-fixtures); expected.json entries
+without a "source" are hand-written pages still waiting to be replaced.
+
+Structured markup (<b>Label:</b> rows, idol links, data-image-href
+screenshots) is read first; page-text patterns are the fallback.
+Uses the lxml parser when installed (html.parser otherwise); CSS selectors
+and regexes are compiled once at import.
+
+Usage: python javdb_parser.py page.html [--code MIDA-486] [--actress "Name"]
+"""
+
+import re
+import json
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+BASE_URL = "https://www.javdatabase.com"
+
+
+@dataclass
+class ActressData:
+    """Actress profile data"""
+    name: str
+    name_jp: str
+    image_url: str
+    profile_url: str
+    age: Optional[str] = None
+    birthdate: Optional[str] = None
+    measurements: Optional[str] = None
+    height: Optional[str] = None
+    debut_date: Optional[str] = None
+    debut_age: Optional[str] = None
+    birthplace: Optional[str] = None
+    zodiac_sign: Optional[str] = None
+    blood_type: Optional[str] = None
+    cup_size: Optional[str] = None
+    shoe_size: Optional[str] = None
+    hair_length: Optional[str] = None
+    hair_color: Optional[str] = None
+    name_alt: Optional[str] = None
+
+
+@dataclass
+class VideoMetadata:
+    """Complete video metadata from JAVDatabase"""
+    code: str
+    title: str
+    title_jp: str
+    release_date: str
+    runtime: str
+    director: str
+    studio: str
+    label: str
+    series: str
+    cover_url: str
+    thumbnail_url: str
+    screenshots: List[str]
+    actresses: List[str]  # Actress names
+    actress_images: Dict[str, str]  # name -> image_url
+    categories: List[str]
+    description: str
+    rating: float
+    scraped_at: str
+    javdb_url: str
+    actress_details: Dict[str, Dict] = None  # name -> full ActressData dict (must be last with default)
+    actress_urls: Dict[str, str] = None  # name -> profile URL (from the movie page)
+    cover_url_dmm: Optional[str] = None  # DMM/FANZA cover (alternative)
+    rating_count: Optional[int] = None
+
+
+# -- compiled once -------------------------------------------------------------
+
+SEL_H1 = soupsieve.compile('h1')
+SEL_IDOL_NAME = soupsieve.compile('h1.idol-name')
+SEL_BOLD = soupsieve.compile('b')
+SEL_LINKS = soupsieve.compile('a[href]')
+SEL_IMAGES = soupsieve.compile('img[src]')
+SEL_H2 = soupsieve.compile('h2')
+SEL_META_COVER = soupsieve.compile('meta[property="og:image"], meta[name="twitter:image"]')
+SEL_DESCRIPTION = soupsieve.compile('div.movie-description, p.description, '
+                                    '[class*="plot"], [class*="synopsis"]')
+SEL_PARAGRAPHS = soupsieve.compile('p')
+SEL_RATING = soupsieve.compile('span.rating, div.rating, span.score, div.score')
+SEL_RATING_COUNT = soupsieve.compile('[class*="rating-count"], [class*="votes"]')
+SEL_SCREENSHOT_HREF = soupsieve.compile('a[data-image-href]')
+SEL_SCREENSHOT_SRC = soupsieve.compile('a[data-image-src]')
+SEL_SCREENSHOT_ALT = soupsieve.compile('img[alt*="screenshot" i]')
+SEL_TITLE = soupsieve.compile('title')
+
+RE_IDOL_HREF = re.compile(r'/idols/[a-z0-9-]+/$')
+RE_JAPANESE = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]')
+RE_JAPANESE_RUN = re.compile(r'[ぁ-んァ-ヶー一-龯]+')
+RE_DATE = re.compile(r'(\d{4})[-/](\d{1,2})[-/](\d{1,2})')
+RE_MINUTES = re.compile(r'(\d+)\s*min', re.I)
+RE_NUMBER = re.compile(r'(\d+\.?\d*)')
+RE_MEASUREMENTS = re.compile(r'(\d{2,3})[-\s]+(\d{2,3})[-\s]+(\d{2,3})')
+RE_MEASUREMENTS_BWH = re.compile(r'B(\d{2,3})[-\s]*W(\d{2,3})[-\s]*H(\d{2,3})', re.I)
+RE_PROFILE_SUFFIX = re.compile(r'\s*-\s*JAV Profile\s*$')
+RE_COVER_ALT = re.compile(r'JAV Movie|Cover', re.I)
+RE_GENRE_SPLIT = re.compile(r'\s{2,}|[,;]\s*')
+
+# Page-text fallbacks when a page has no <b>Label:</b> rows
+TEXT_PATTERNS = {
+    'release date': re.compile(r'Release[d]?\s*Date[:\s]+(\d{4}[-/]\d{1,2}[-/]\d{1,2})', re.I),
+    'runtime': re.compile(r'(?:Runtime|Duration)[:\s]+(\d+)\s*min', re.I),
+    'director': re.compile(r'Director[:\s]+([^\n]+)', re.I),
+    'studio': re.compile(r'Studio[:\s]+([^\n]+)', re.I),
+    'label': re.compile(r'Label[:\s]+([^\n]+)', re.I),
+    'series': re.compile(r'Series[:\s]+([^\n]+)', re.I),
+    'genre(s)': re.compile(r'Genre\(s\)[:\s]+([^\n]+)', re.I),
+}
+ACTRESS_TEXT_PATTERNS = {
+    'age': re.compile(r'Age[:\s]*(\d+)', re.I),
+    'dob': re.compile(r'(?:DOB|Birth|Born)[:\s]*(\d{4}-\d{2}-\d{2})', re.I),
+    'debut': re.compile(r'Debut[:\s]*(\d{4}-\d{2}-\d{2})', re.I),
+    'debut age': re.compile(r'Debut Age[:\s]*(\d+)', re.I),
+    'birthplace': re.compile(r'Birthplace[:\s]*([^\s-]+)', re.I),
+    'sign': re.compile(r'Sign[:\s]*([^\s-]+)', re.I),
+    'blood': re.compile(r'Blood(?:\s*Type)?[:\s]*([ABO]{1,2})\b', re.I),
+    'cup': re.compile(r'Cup[:\s]*([A-Z])\b', re.I),
+    'height': re.compile(r'Height[:\s]*(\d+)\s*cm', re.I),
+    'measurements': re.compile(r'(?:Measurements|BWH)[:\s]*(\d{2,3}[-\s]+\d{2,3}[-\s]+\d{2,3})', re.I),
+}
+# Labels that end a value in page-text fallbacks ("Studio: S1 Label: ...")
+FIELD_LABELS = ('Genre(s):', 'Studio:', 'Label:', 'Series:', 'Director:')
+
+NAV_NAMES = {'All Idols', 'Most Favorited', 'Teen', 'Twenties', 'Thirties', 'MILF'}
+NAV_GENRES = {'All Genres', 'Most Popular', 'Genres'}
+PLACEHOLDERS = {'', '?', '-', 'N/A'}
+
+
+# -- helpers -------------------------------------------------------------------
+
+def make_soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, PARSER)
+
+
+def absolute_url(url: str) -> str:
+    if url.startswith('//'):
+        return 'https:' + url
+    if url.startswith('/'):
+        return BASE_URL + url
+    return url
+
+
+def _clean(value: Optional[str]) -> Optional[str]:
+    value = (value or '').strip()
+    return None if value in PLACEHOLDERS else value
+
+
+def _labels(soup) -> Dict[str, object]:
+    """'release date' -> <b> tag for every <b>Label:</b> on the page (first wins)"""
+    labels = {}
+    for b_tag in SEL_BOLD.select(soup):
+        labels.setdefault(b_tag.get_text(strip=True).rstrip(':').strip().lower(), b_tag)
+    return labels
+
+
+def _value_after(b_tag) -> Optional[str]:
+    """First link text or text node after a <b>Label:</b>, up to the next label"""
+    for sibling in b_tag.next_siblings:
+        if sibling.name == 'a':
+            return _clean(sibling.get_text(strip=True))
+        if sibling.name == 'b':
+            return None
+        if isinstance(sibling, str):
+            text = sibling.strip().strip('-').strip()
+            if text:
+                return _clean(text)
+    return None
+
+
+def _links_after(b_tag, href_contains: str = '') -> List[str]:
+    """All link texts after a <b>Label:</b>, up to the next label"""
+    values = []
+    for sibling in b_tag.next_siblings:
+        if sibling.name == 'b':
+            break
+        if sibling.name == 'a' and href_contains in sibling.get('href', ''):
+            text = sibling.get_text(strip=True)
+            if text and text not in values:
+                values.append(text)
+    return values
+
+
+def _text_field(page_text: str, key: str) -> Optional[str]:
+    """Page-text fallback, cut at the next field label"""
+    match = TEXT_PATTERNS[key].search(page_text)
+    if not match:
+        return None
+    value = match.group(1).strip()
+    for label in FIELD_LABELS:
+        if label in value:
+            value = value.split(label)[0].strip()
+    return _clean(value)
+
+
+def _date(text: Optional[str]) -> Optional[str]:
+    match = RE_DATE.search(text or '')
+    if not match:
+        return None
+    year, month, day = match.groups()
+    return f"{year}-{int(month):02d}-{int(day):02d}"
+
+
+def _add(urls: List[str], url: str):
+    url = absolute_url(url)
+    if url and url not in urls:
+        urls.append(url)
+
+
+def full_size_screenshot(src: str) -> str:
+    """Thumbnail URL -> full-size URL (mgstage cap_t1_ -> cap_e_, DMM -1.jpg -> jp-1.jpg)"""
+    if 'cap_t1_' in src:
+        return src.replace('cap_t1_', 'cap_e_')
+    if 'dmm.co.jp' in src and '-' in src and 'jp-' not in src:
+        head, tail = src.rsplit('-', 1)
+        return f"{head}jp-{tail}"
+    return src
+
+
+# -- search results ------------------------------------------------------------
+
+def find_idol_links(html_or_soup) -> List[Tuple[str, str]]:
+    """(name, absolute profile URL) for every idol link, navigation filtered, in page order"""
+    soup = make_soup(html_or_soup) if isinstance(html_or_soup, str) else html_or_soup
+    links = []
+    seen = set()
+    for link in SEL_LINKS.select(soup):
+        href = link.get('href', '')
+        if not RE_IDOL_HREF.search(href) or '/idols/?_' in href or '/idols/page/' in href or href in seen:
+            continue
+        name = link.get_text(strip=True)
+        if not name or name in NAV_NAMES:
+            continue
+        seen.add(href)
+        links.append((name, absolute_url(href)))
+    return links
+
+
+def best_idol_match(links: List[Tuple[str, str]], actress_name: str) -> Optional[Tuple[str, str]]:
+    """Exact name match, else the most shared words, else the first result"""
+    if not links:
+        return None
+    wanted = actress_name.lower()
+    best, best_score = None, 0
+    for name, url in links:
+        text = name.lower()
+        if text == wanted:
+            return name, url
+        if wanted in text or text in wanted:
+            score = len(set(wanted.split()) & set(text.split()))
+            if score > best_score:
+                best, best_score = (name, url), score
+    return best or links[0]
+
+
+# -- movie page ----------------------------------------------------------------
+
+def is_not_found(soup) -> bool:
+    h1 = SEL_H1.select_one(soup)
+    if not h1:
+        return True
+    title = h1.get_text(strip=True)
+    return '404' in title or 'not found' in title.lower()
+
+
+def _cast(soup) -> Tuple[List[str], Dict[str, str], Dict[str, str]]:
+    """Names, name -> profile URL, name -> inline image"""
+    names, urls, images = [], {}, {}
+    for link in SEL_LINKS.select(soup):
+        href = link.get('href', '')
+        if not RE_IDOL_HREF.search(href) or '/idols/?_' in href:
+            continue
+        name = link.get_text(strip=True)
+        if not name or len(name) <= 2 or name in NAV_NAMES or name in urls:
+            continue
+        names.append(name)
+        urls[name] = absolute_url(href)
+        img = link.find('img')
+        if img and img.get('src'):
+            images[name] = absolute_url(img['src'])
+    return names, urls, images
+
+
+def _screenshots(soup) -> List[str]:
+    screenshots = []
+
+    # Full-size URL provided for the lightbox
+    for link in SEL_SCREENSHOT_HREF.select(soup):
+        if link.get('data-image-href'):
+            _add(screenshots, link['data-image-href'])
+    if screenshots:
+        return screenshots
+
+    for link in SEL_SCREENSHOT_SRC.select(soup):
+        if 'pics.dmm.co.jp' in link.get('data-image-src', ''):
+            _add(screenshots, link['data-image-src'])
+    if screenshots:
+        return screenshots
+
+    # Thumbnails -> full size
+    for img in SEL_SCREENSHOT_ALT.select(soup):
+        if img.get('src'):
+            _add(screenshots, full_size_screenshot(img['src']))
+    if screenshots:
+        return screenshots
+
+    for img in SEL_IMAGES.select(soup):
+        src = img['src']
+        if 'cap_t1_' in src or '/screenshots/' in src:
+            _add(screenshots, full_size_screenshot(src))
+    return screenshots
+
+
+def _cover(soup, video_code: str) -> str:
+    code = video_code.lower()
+    fallback = ''
+    for img in SEL_IMAGES.select(soup):
+        src, alt = img['src'], img.get('alt', '')
+        if code in alt.lower() or RE_COVER_ALT.search(alt):
+            return absolute_url(src)
+        if not fallback and '/covers/' in src:
+            fallback = src
+    return absolute_url(fallback) if fallback else ''
+
+
+def _genres(soup, labels, page_text) -> List[str]:
+    b_tag = labels.get('genre(s)') or labels.get('genres') or labels.get('categories')
+    if b_tag:
+        return _links_after(b_tag)
+
+    text = _text_field(page_text, 'genre(s)')
+    if text:
+        return [g.strip() for g in RE_GENRE_SPLIT.split(text) if len(g.strip()) > 1]
+
+    # Last resort: every genre link on the page (may include navigation)
+    genres = []
+    for link in SEL_LINKS.select(soup):
+        if '/genres/' in link['href'] or '/categories/' in link['href']:
+            text = link.get_text(strip=True)
+            if text and len(text) > 1 and text not in NAV_GENRES and text not in genres:
+                genres.append(text)
+    return genres
+
+
+def parse_video_page(html: str, video_code: str, url: Optional[str] = None) -> Optional[VideoMetadata]:
+    """
+    Parse a JAVDatabase movie page
+
+    Args:
+        html: Page source
+        video_code: Video code (e.g. "MIDA-486")
+        url: Page URL (default: the canonical /movies/<code>/ URL)
+
+    Returns:
+        VideoMetadata (actress_details empty - profiles are separate pages),
+        or None for a 404 / empty page
+    """
+    soup = make_soup(html)
+    if is_not_found(soup):
+        return None
+
+    url = url or f"{BASE_URL}/movies/{video_code.lower().replace('_', '-')}/"
+    title = SEL_H1.select_one(soup).get_text(strip=True)
+    labels = _labels(soup)
+    page_text = soup.get_text('\n')
+
+    def field(key, *names):
+        if not labels:
+            return _text_field(page_text, key)
+        for name in names or (key,):
+            if name in labels:
+                return _value_after(labels[name])
+        return None
+
+    title_jp = None
+    for h2 in SEL_H2.select(soup):
+        text = h2.get_text(strip=True)
+        if RE_JAPANESE.search(text):
+            title_jp = text
+            break
+
+    cover_url_dmm = None
+    for meta in SEL_META_COVER.select(soup):
+        if 'pics.dmm.co.jp' in meta.get('content', ''):
+            cover_url_dmm = meta['content']
+            break
+
+    release_date = _date(labels['release date'].parent.get_text()) if 'release date' in labels else None
+    release_date = release_date or _date(_text_field(page_text, 'release date'))
+
+    runtime = None
+    if 'runtime' in labels:
+        match = RE_MINUTES.search(labels['runtime'].parent.get_text())
+        runtime = f"{match.group(1)} min" if match else None
+    if not runtime:
+        minutes = _text_field(page_text, 'runtime')
+        runtime = f"{minutes} min" if minutes else None
+
+    series = field('series', 'jav series', 'series')
+    if series in ('Studios', 'Series'):
+        series = None
+
+    description = ''
+    desc_elem = SEL_DESCRIPTION.select_one(soup)
+    if not desc_elem:
+        for p in SEL_PARAGRAPHS.select(soup):
+            if p.find('b'):  # <b>Label:</b> rows are fields, not the plot
+                continue
+            text = p.get_text(strip=True)
+            if len(text) > 100 and video_code.upper() not in text.upper():
+                desc_elem = p
+                break
+    if desc_elem:
+        description = desc_elem.get_text(strip=True)
+
+    rating = 0.0
+    rating_elem = SEL_RATING.select_one(soup)
+    match = RE_NUMBER.search(rating_elem.get_text()) if rating_elem else None
+    if match:
+        rating = float(match.group(1))
+
+    rating_count = None
+    count_elem = SEL_RATING_COUNT.select_one(soup)
+    match = re.search(r'\d+', count_elem.get_text()) if count_elem else None
+    if match:
+        rating_count = int(match.group(0))
+
+    actresses, actress_urls, actress_images = _cast(soup)
+    cover_url = _cover(soup, video_code)
+
+    return VideoMetadata(
+        code=video_code.upper(),
+        title=title,
+        title_jp=title_jp or title,
+        release_date=release_date or '',
+        runtime=runtime or '',
+        director=field('director') or '',
+        studio=field('studio') or '',
+        label=field('label') or '',
+        series=series or '',
+        cover_url=cover_url,
+        thumbnail_url=cover_url,
+        screenshots=_screenshots(soup),
+        actresses=actresses,
+        actress_images=actress_images,
+        categories=_genres(soup, labels, page_text),
+        description=description,
+        rating=rating,
+        scraped_at=datetime.now().isoformat(),
+        javdb_url=url,
+        actress_details={},
+        actress_urls=actress_urls,
+        cover_url_dmm=cover_url_dmm,
+        rating_count=rating_count
+    )
+
+
+# -- idol profile page ---------------------------------------------------------
+
+def parse_measurements(text: Optional[str]) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """'88-58-86' or 'B88-W58-H86' -> (88, 58, 86)"""
+    match = RE_MEASUREMENTS.search(text or '') or RE_MEASUREMENTS_BWH.search(text or '')
+    return tuple(int(g) for g in match.groups()) if match else (None, None, None)
+
+
+def parse_actress_page(html: str, actress_name: str, profile_url: str) -> Optional[ActressData]:
+    """
+    Parse a JAVDatabase idol profile page
+
+    Args:
+        html: Page source
+        actress_name: Name the profile was looked up by (fallback name)
+        profile_url: Profile URL
+
+    Returns:
+        ActressData or None if the page has no profile
+    """
+    soup = make_soup(html)
+    h1 = SEL_IDOL_NAME.select_one(soup) or SEL_H1.select_one(soup)
+    if not h1:
+        return None
+    name = RE_PROFILE_SUFFIX.sub('', h1.get_text(strip=True)) or actress_name
+
+    image_url = ''
+    images = [img['src'] for img in SEL_IMAGES.select(soup) if '/idolimages/' in img['src']]
+    if images:
+        image_url = absolute_url(next((src for src in images if '/idolimages/full/' in src), images[0]))
+
+    labels = _labels(soup)
+    values = {label: _value_after(b_tag) for label, b_tag in labels.items()}
+
+    for label, href in (('hair length(s)', '_hair_length='), ('hair color(s)', '_hair_color=')):
+        if label in labels:
+            values[label] = ', '.join(_links_after(labels[label], href)) or None
+
+    # Pages without <b> rows: page-text patterns
+    if not any(values.get(key) for key in ACTRESS_TEXT_PATTERNS):
+        page_text = soup.get_text('\n')
+        for key, pattern in ACTRESS_TEXT_PATTERNS.items():
+            match = pattern.search(page_text)
+            if match:
+                values[key] = _clean(match.group(1))
+        if not values.get('measurements'):
+            match = RE_MEASUREMENTS_BWH.search(page_text)
+            values['measurements'] = match.group(0) if match else None
+
+    measurements = None
+    bust, waist, hips = parse_measurements(values.get('measurements'))
+    if bust:
+        measurements = f"{bust}-{waist}-{hips}"
+
+    height = values.get('height')
+    match = re.search(r'\d+', height or '')
+    height = f"{match.group(0)} cm" if match else None
+
+    name_jp = values.get('jp')
+    if not name_jp:
+        title = SEL_TITLE.select_one(soup)
+        match = RE_JAPANESE_RUN.search(title.get_text()) if title else None
+        name_jp = match.group(0) if match else actress_name
+
+    return ActressData(
+        name=name,
+        name_jp=name_jp,
+        image_url=image_url,
+        profile_url=profile_url,
+        age=values.get('age'),
+        birthdate=_date(values.get('dob')) or values.get('dob'),
+        measurements=measurements,
+        height=height,
+        debut_date=_date(values.get('debut')) or values.get('debut'),
+        debut_age=values.get('debut age'),
+        birthplace=values.get('birthplace'),
+        zodiac_sign=values.get('sign'),
+        blood_type=values.get('blood'),
+        cup_size=values.get('cup'),
+        shoe_size=values.get('shoe size'),
+        hair_length=values.get('hair length(s)'),
+        hair_color=values.get('hair color(s)'),
+        name_alt=values.get('alt')
+    )
+
+
+def actress_details(actress: ActressData) -> Dict:
+    """ActressData -> the actress_details entry stored with a video"""
+    return {
+        'name': actress.name,
+        'name_jp': actress.name_jp,
+        'image': actress.image_url,
+        'profile_url': actress.profile_url,
+        'age': actress.age,
+        'birthdate': actress.birthdate,
+        'measurements': actress.measurements,
+        'height': actress.height,
+        'debut_date': actress.debut_date,
+        'debut_age': actress.debut_age,
+        'birthplace': actress.birthplace,
+        'zodiac_sign': actress.zodiac_sign,
+        'blood_type': actress.blood_type,
+        'cup_size': actress.cup_size,
+        'shoe_size': actress.shoe_size,
+        'hair_length': actress.hair_length,
+        'hair_color': actress.hair_color
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Parse a saved JAVDatabase page')
+    parser.add_argument('html_file', help='Saved page (movie or idol profile)')
+    parser.add_argument('--code', help='Video code (movie page)')
+    parser.add_argument('--actress', help='Actress name (idol profile page)')
+    parser.add_argument('--url', default='', help='Page URL')
+    args = parser.parse_args()
+
+    with open(args.html_file, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    if args.code:
+        result = parse_video_page(html, args.code, args.url or None)
+    else:
+        result = parse_actress_page(html, args.actress or '', args.url)
+
+    print(json.dumps(asdict(result) if result else None, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
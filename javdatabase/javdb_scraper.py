@@ -2,64 +2,27 @@
 JAVDatabase Complete Scraper
 Scrapes complete metadata including actress images from JAVDatabase.com
 Videos are downloaded from Jable.tv
+Page parsing lives in javdb_parser.py; this module fetches the pages.
+Movie / idol / search pages are fetched over plain HTTP first (tiered_fetch.py);
+the browser is only started when a page is blocked or incomplete.
 """
 
-import re
+import sys
 import time
 import json
-from datetime import datetime
-from typing import Optional, List, Dict
-from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Optional, List
+from dataclasses import asdict
 
-from bs4 import BeautifulSoup
 from seleniumbase import Driver
 
+from javdb_parser import (ActressData, VideoMetadata, absolute_url, actress_details, best_idol_match,
+                          find_idol_links, make_soup, parse_actress_page, parse_video_page)
 
-@dataclass
-class ActressData:
-    """Actress profile data"""
-    name: str
-    name_jp: str
-    image_url: str
-    profile_url: str
-    age: Optional[str] = None
-    birthdate: Optional[str] = None
-    measurements: Optional[str] = None
-    height: Optional[str] = None
-    debut_date: Optional[str] = None
-    debut_age: Optional[str] = None
-    birthplace: Optional[str] = None
-    zodiac_sign: Optional[str] = None
-    blood_type: Optional[str] = None
-    cup_size: Optional[str] = None
-    shoe_size: Optional[str] = None
-    hair_length: Optional[str] = None
-    hair_color: Optional[str] = None
-
-
-@dataclass
-class VideoMetadata:
-    """Complete video metadata from JAVDatabase"""
-    code: str
-    title: str
-    title_jp: str
-    release_date: str
-    runtime: str
-    director: str
-    studio: str
-    label: str
-    series: str
-    cover_url: str
-    thumbnail_url: str
-    screenshots: List[str]
-    actresses: List[str]  # Actress names
-    actress_images: Dict[str, str]  # name -> image_url
-    categories: List[str]
-    description: str
-    rating: float
-    scraped_at: str
-    javdb_url: str
-    actress_details: Dict[str, Dict] = None  # name -> full ActressData dict (must be last with default)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from actress_profiles import actress_profiles, profile_key, restore, MISSING
+from page_readiness import page_readiness, element_present
+from tiered_fetch import TieredFetcher
 
 
 class JAVDatabaseScraper:
@@ -71,6 +34,7 @@ class JAVDatabaseScraper:
         self.headless = headless
         self.driver = None
         self.actress_cache = {}  # Cache actress data
+        self.fetcher = TieredFetcher('javdb')
         
     def _init_driver(self):
         """Initialize browser"""
@@ -107,6 +71,13 @@ class JAVDatabaseScraper:
                 self.driver = None
                 self._init_driver()
     
+    def _browser_page(self, url: str, wait_name: str) -> str:
+        """Load a page in the browser (started on first use) and return its source"""
+        self._ensure_driver()
+        self.driver.get(url)
+        page_readiness.wait(self.driver, wait_name, element_present('h1'), timeout=3)
+        return self.driver.page_source
+    
     def close(self):
         """Close browser"""
         if self.driver:
@@ -120,7 +91,6 @@ class JAVDatabaseScraper:
     def scrape_actress_profile(self, actress_name: str, profile_url: Optional[str] = None) -> Optional[ActressData]:
         """
         Scrape actress profile from JAVDatabase
-        Based on actual HTML structure with <b> tag parsing
         
         Args:
             actress_name: Name of actress (Japanese or English)
@@ -133,200 +103,62 @@ class JAVDatabaseScraper:
         if actress_name in self.actress_cache:
             return self.actress_cache[actress_name]
         
+        # Shared cache: profiles scraped by any earlier run / scraper
+        cache_key = profile_key('javdb', actress_name, profile_url)
+        cached = actress_profiles.get(cache_key)
+        if cached is not MISSING:
+            print(f"    Cached profile: {actress_name}" if cached else f"    Cached: no profile for {actress_name}")
+            self.actress_cache[actress_name] = restore(ActressData, cached)
+            return self.actress_cache[actress_name]
+        
         try:
-            self._ensure_driver()
-            
             # If profile URL is provided, use it directly
             if profile_url:
                 print(f"    Using direct profile URL: {actress_name}")
-                if not profile_url.startswith('http'):
-                    profile_url = self.BASE_URL + profile_url
-                
-                print(f"    Visiting: {profile_url}")
-                self.driver.get(profile_url)
-                time.sleep(3)
-                
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                profile_url = absolute_url(profile_url)
             else:
                 # Fall back to search
                 from urllib.parse import quote
                 search_url = f"{self.BASE_URL}/idols/?q={quote(actress_name)}"
                 
                 print(f"    Searching actress: {actress_name}")
-                self.driver.get(search_url)
-                time.sleep(3)
+                idol_links, tier = self.fetcher.fetch(
+                    search_url, kind='search', parse=find_idol_links,
+                    browser=lambda url: find_idol_links(self._browser_page(url, 'javdb.search')))
                 
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                
-                # Find all profile links (exclude pagination and filter links)
-                idol_links = soup.find_all('a', href=re.compile(r'/idols/[a-z0-9-]+/$'))
-                valid_links = [l for l in idol_links if '/idols/?_' not in l.get('href', '') and '/idols/page/' not in l.get('href', '')]
-                
-                if not valid_links:
+                match = best_idol_match(idol_links or [], actress_name)
+                if not match:
                     print(f"    XX No profile found")
+                    # Search page never loaded: nothing to cache. Misses only seen
+                    # over HTTP (no browser check) are kept for a short while.
+                    if tier is not None:
+                        actress_profiles.put(cache_key, None, confirmed=tier == 'browser')
+                    self.actress_cache[actress_name] = None
                     return None
                 
-                # Try to find best match by name similarity
-                best_link = None
-                best_score = 0
-                search_name_lower = actress_name.lower()
-                
-                for link in valid_links:
-                    link_text = link.get_text(strip=True).lower()
-                    # Exact match
-                    if link_text == search_name_lower:
-                        best_link = link
-                        break
-                    # Partial match - calculate score
-                    if search_name_lower in link_text or link_text in search_name_lower:
-                        score = len(set(search_name_lower.split()) & set(link_text.split()))
-                        if score > best_score:
-                            best_score = score
-                            best_link = link
-                
-                # Fallback to first link
-                if not best_link:
-                    best_link = valid_links[0]
-                    print(f"    ⚠️ No exact match, using first result")
-                
-                # Visit profile
-                profile_url = best_link.get('href')
-                if not profile_url.startswith('http'):
-                    profile_url = self.BASE_URL + profile_url
-                
-                print(f"    Visiting: {profile_url}")
-                self.driver.get(profile_url)
-                time.sleep(3)
-                
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Extract name from h1 (remove " - JAV Profile" suffix)
-            name_elem = soup.find('h1', class_='idol-name')
-            name = name_elem.get_text(strip=True).replace(' - JAV Profile', '') if name_elem else actress_name
-            
-            # Get profile image (look for full-size image first)
-            img = soup.find('img', src=re.compile(r'/idolimages/full/'))
-            if not img:
-                img = soup.find('img', src=re.compile(r'/idolimages/'))
-            image_url = ""
-            if img:
-                image_url = img.get('src', '')
-                if image_url.startswith('//'):
-                    image_url = 'https:' + image_url
-                elif image_url.startswith('/'):
-                    image_url = self.BASE_URL + image_url
-            
-            # Initialize all fields
-            name_jp = actress_name
-            age = None
-            birthdate = None
-            debut_date = None
-            debut_age = None
-            birthplace = None
-            zodiac_sign = None
-            blood_type = None
-            measurements = None
-            cup_size = None
-            height = None
-            shoe_size = None
-            hair_length = None
-            hair_color = None
-            
-            # Extract data from <b> tags (JAVDatabase structure)
-            bold_tags = soup.find_all('b')
-            
-            for b_tag in bold_tags:
-                label = b_tag.get_text(strip=True).rstrip(':')
-                
-                # Find value after the <b> tag
-                value = None
-                for sibling in b_tag.next_siblings:
-                    if sibling.name == 'a':
-                        value = sibling.get_text(strip=True)
-                        break
-                    elif sibling.name == 'b':  # Next label
-                        break
-                    elif isinstance(sibling, str):
-                        text = sibling.strip().strip('-').strip()
-                        if text and text not in ['', '-']:
-                            value = text
-                            break
-                
-                # Map fields based on label
-                if label == 'Age' and value:
-                    age = value
-                elif label == 'DOB' and value:
-                    birthdate = value
-                elif label == 'Debut' and value:
-                    debut_date = value
-                elif label == 'Debut Age' and value:
-                    debut_age = value
-                elif label == 'Birthplace' and value:
-                    birthplace = value
-                elif label == 'Sign' and value:
-                    zodiac_sign = value
-                elif label == 'Blood' and value:
-                    blood_type = value
-                elif label == 'Cup' and value:
-                    cup_size = value
-                elif label == 'Height' and value:
-                    height = value
-                elif label == 'Shoe Size' and value:
-                    shoe_size = value if value != '?' else None
-                elif label == 'Measurements':
-                    # Measurements is plain text after <b>
-                    text_after = b_tag.next_sibling
-                    if isinstance(text_after, str):
-                        meas = text_after.strip().split()[0]
-                        if re.match(r'\d{2,3}-\d{2,3}-\d{2,3}', meas):
-                            measurements = meas
-                elif label == 'Hair Length(s)':
-                    # Can have multiple values
-                    hair_lengths = []
-                    for sibling in b_tag.next_siblings:
-                        if sibling.name == 'a' and '/idols/?_hair_length=' in sibling.get('href', ''):
-                            hair_lengths.append(sibling.get_text(strip=True))
-                        elif sibling.name == 'b':
-                            break
-                    hair_length = ', '.join(hair_lengths) if hair_lengths else None
-                elif label == 'Hair Color(s)':
-                    # Can have multiple values
-                    hair_colors = []
-                    for sibling in b_tag.next_siblings:
-                        if sibling.name == 'a' and '/idols/?_hair_color=' in sibling.get('href', ''):
-                            hair_colors.append(sibling.get_text(strip=True))
-                        elif sibling.name == 'b':
-                            break
-                    hair_color = ', '.join(hair_colors) if hair_colors else None
-                elif label == 'JP' and value:
-                    name_jp = value
-            
-            print(f"      ✓ {name}")
-            print(f"      ✓ Age: {age}, DOB: {birthdate}, Debut: {debut_date}")
-            print(f"      ✓ Measurements: {measurements}, Cup: {cup_size}, Height: {height}")
+                if match[0].lower() != actress_name.lower():
+                    print(f"    ⚠️ No exact match, using: {match[0]}")
+                profile_url = match[1]
+            
+            print(f"    Visiting: {profile_url}")
+            actress_data, _ = self.fetcher.fetch(
+                profile_url, kind='idol', required=('name',),
+                parse=lambda html: parse_actress_page(html, actress_name, profile_url),
+                browser=lambda url: parse_actress_page(
+                    self.fetcher.snapshot(url, 'idol', self._browser_page(url, 'javdb.idol'), {'name': actress_name}),
+                    actress_name, url),
+                snapshot_extra={'name': actress_name})
+            if not actress_data:
+                print(f"    XX Profile page has no data")
+                return None
             
-            actress_data = ActressData(
-                name=name,
-                name_jp=name_jp,
-                image_url=image_url,
-                profile_url=profile_url,
-                age=age,
-                birthdate=birthdate,
-                measurements=measurements,
-                height=height,
-                debut_date=debut_date,
-                debut_age=debut_age,
-                birthplace=birthplace,
-                zodiac_sign=zodiac_sign,
-                blood_type=blood_type,
-                cup_size=cup_size,
-                shoe_size=shoe_size,
-                hair_length=hair_length,
-                hair_color=hair_color
-            )
+            print(f"      ✓ {actress_data.name}")
+            print(f"      ✓ Age: {actress_data.age}, DOB: {actress_data.birthdate}, Debut: {actress_data.debut_date}")
+            print(f"      ✓ Measurements: {actress_data.measurements}, Cup: {actress_data.cup_size}, Height: {actress_data.height}")
             
             # Cache it
             self.actress_cache[actress_name] = actress_data
+            actress_profiles.put(cache_key, asdict(actress_data))
             
             return actress_data
             
@@ -347,8 +179,6 @@ class JAVDatabaseScraper:
             VideoMetadata object or None
         """
         try:
-            self._ensure_driver()
-            
             print(f"  Scraping: {video_code}")
             
             # Try direct URL first (convert code to URL format)
@@ -357,342 +187,55 @@ class JAVDatabaseScraper:
             direct_url = f"{self.BASE_URL}/movies/{code_lower}/"
             
             print(f"  Trying direct URL: {direct_url}")
-            self.driver.get(direct_url)
-            time.sleep(3)
-            
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Check if page exists (not 404)
-            title_elem = soup.find('h1')
-            if not title_elem or '404' in title_elem.get_text() or 'not found' in title_elem.get_text().lower():
+            metadata, tier = self.fetcher.fetch(
+                direct_url, kind='movie', required=('title', 'release_date'),
+                parse=lambda html: parse_video_page(html, video_code, direct_url),
+                browser=lambda url: parse_video_page(
+                    self.fetcher.snapshot(url, 'movie', self._browser_page(url, 'javdb.movie'), {'code': video_code}),
+                    video_code, url),
+                snapshot_extra={'code': video_code})
+            if not metadata:
                 print(f"  XX Not found (404)")
                 return None
             
-            title = title_elem.get_text(strip=True)
-            
             # Verify this is the right video by checking if code is in title
-            if video_code.upper() not in title.upper():
-                print(f"  XX Code mismatch in title: {title}")
+            if video_code.upper() not in metadata.title.upper():
+                print(f"  XX Code mismatch in title: {metadata.title}")
                 return None
             
-            movie_url = direct_url
-            
-            # Extract metadata
-            print(f"  >> Found: {title[:60]}...")
-            
-            # Get cover image
-            cover_url = ""
-            cover_img = soup.find('img', alt=re.compile(video_code, re.IGNORECASE))
-            if not cover_img:
-                # Try finding large images
-                imgs = soup.find_all('img', src=True)
-                for img in imgs:
-                    src = img.get('src', '')
-                    if '/covers/' in src and video_code.lower() in src.lower():
-                        cover_img = img
-                        break
-            
-            if cover_img:
-                cover_url = cover_img.get('src', '')
-                if cover_url.startswith('//'):
-                    cover_url = 'https:' + cover_url
-                elif cover_url.startswith('/'):
-                    cover_url = self.BASE_URL + cover_url
-            
-            # Get actresses
-            actresses = []
-            actress_images = {}
-            
-            # Look for actress links in the page
-            actress_links = soup.find_all('a', href=re.compile(r'/idols/[a-z0-9-]+/$'))
-            # Filter out navigation links and deduplicate by href
-            seen_hrefs = set()
-            valid_actress_links = []
-            for link in actress_links:
-                href = link.get('href', '')
-                if href not in ['/idols/', '/idols/?_sort_=most_favorited'] and '/idols/?_' not in href:
-                    if href not in seen_hrefs:
-                        seen_hrefs.add(href)
-                        valid_actress_links.append(link)
-            
-            print(f"  Found {len(valid_actress_links)} unique actress links")
-            
-            actress_details = {}  # Store full actress data
-            
-            for link in valid_actress_links:
-                actress_name = link.get_text(strip=True)
-                if actress_name and actress_name not in ['All Idols', 'Most Favorited', 'Teen', 'Twenties', 'MILF']:
-                    actresses.append(actress_name)
+            print(f"  >> Found ({tier}): {metadata.title[:60]}...")
+            print(f"  Found {len(metadata.actresses)} unique actress links")
+            
+            # Full actress profiles (separate pages, cached)
+            for actress_name in metadata.actresses:
+                print(f"    Getting profile for: {actress_name}")
+                actress_data = self.scrape_actress_profile(actress_name, profile_url=metadata.actress_urls[actress_name])
+                if actress_data:
+                    # Store image URL for backward compatibility
+                    if actress_data.image_url:
+                        metadata.actress_images[actress_name] = actress_data.image_url
                     
-                    # Get the direct profile URL from the link
-                    profile_url = link.get('href', '')
-                    if not profile_url.startswith('http'):
-                        profile_url = self.BASE_URL + profile_url
-                    
-                    # Get full actress profile data using direct URL
-                    print(f"    Getting profile for: {actress_name}")
-                    actress_data = self.scrape_actress_profile(actress_name, profile_url=profile_url)
-                    if actress_data:
-                        # Store image URL for backward compatibility
-                        if actress_data.image_url:
-                            actress_images[actress_name] = actress_data.image_url
-                        
-                        # Store full actress details
-                        actress_details[actress_name] = {
-                            'name': actress_data.name,
-                            'name_jp': actress_data.name_jp,
-                            'image': actress_data.image_url,
-                            'profile_url': actress_data.profile_url,
-                            'age': actress_data.age,
-                            'birthdate': actress_data.birthdate,
-                            'measurements': actress_data.measurements,
-                            'height': actress_data.height,
-                            'debut_date': actress_data.debut_date,
-                            'debut_age': actress_data.debut_age,
-                            'birthplace': actress_data.birthplace,
-                            'zodiac_sign': actress_data.zodiac_sign,
-                            'blood_type': actress_data.blood_type,
-                            'cup_size': actress_data.cup_size,
-                            'shoe_size': actress_data.shoe_size,
-                            'hair_length': actress_data.hair_length,
-                            'hair_color': actress_data.hair_color
-                        }
-                        print(f"      ✓ Profile saved: {actress_data.name}")
-                        print(f"      ✓ Age: {actress_data.age}, Cup: {actress_data.cup_size}, Height: {actress_data.height}")
-            
-            # Get other metadata from page
-            release_date = ""
-            runtime = ""
-            director = ""
-            studio = ""
-            label = ""
-            series = ""
-            categories = []
-            description = ""
-            rating = 0.0
-            
-            # Look for metadata in structured format using HTML parsing
-            # JAVDatabase uses <p class="mb-1"><b>Field:</b> value</p> format
-            
-            # Try to find release date
-            release_date = ""
-            date_elem = soup.find('b', string=re.compile(r'Release Date:', re.I))
-            if date_elem and date_elem.parent:
-                date_text = date_elem.parent.get_text()
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', date_text)
-                if date_match:
-                    release_date = date_match.group(1)
-            
-            # Try to find runtime
-            runtime = ""
-            runtime_elem = soup.find('b', string=re.compile(r'Runtime:', re.I))
-            if runtime_elem and runtime_elem.parent:
-                runtime_text = runtime_elem.parent.get_text()
-                runtime_match = re.search(r'(\d+)\s*min', runtime_text)
-                if runtime_match:
-                    runtime = runtime_match.group(1) + ' min'
-            
-            # Try to find director
-            director = ""
-            director_elem = soup.find('b', string=re.compile(r'Director:', re.I))
-            if director_elem and director_elem.parent:
-                # Get the parent <p> tag
-                p_tag = director_elem.parent
-                # Look for <a> tag after the <b> tag
-                link = p_tag.find('a')
-                if link:
-                    director = link.get_text(strip=True)
-            
-            # Try to find studio
-            studio = ""
-            studio_elem = soup.find('b', string=re.compile(r'Studio:', re.I))
-            if studio_elem and studio_elem.parent:
-                p_tag = studio_elem.parent
-                link = p_tag.find('a')
-                if link:
-                    studio = link.get_text(strip=True)
-            
-            # Try to find label (not present in this video, but keep for others)
-            label = ""
-            label_elem = soup.find('b', string=re.compile(r'Label:', re.I))
-            if label_elem and label_elem.parent:
-                p_tag = label_elem.parent
-                link = p_tag.find('a')
-                if link:
-                    label = link.get_text(strip=True)
-            
-            # Try to find series
-            series = ""
-            series_elem = soup.find('b', string=re.compile(r'JAV Series:', re.I))
-            if series_elem and series_elem.parent:
-                p_tag = series_elem.parent
-                link = p_tag.find('a')
-                if link:
-                    series = link.get_text(strip=True)
-            
-            # Get categories/genres
-            categories = []
-            # Pattern 1: Look for "Genres:" or "Categories:" label
-            genre_elem = soup.find('b', string=re.compile(r'Genres?:|Categories:', re.I))
-            if genre_elem and genre_elem.parent:
-                p_tag = genre_elem.parent
-                # Get all <a> tags after the <b> tag
-                genre_links = p_tag.find_all('a')
-                for link in genre_links:
-                    genre = link.get_text(strip=True)
-                    if genre and genre not in categories:
-                        categories.append(genre)
-            
-            # Pattern 2: Look for links with /genres/ in href
-            if not categories:
-                genre_links = soup.find_all('a', href=re.compile(r'/genres/'))
-                for link in genre_links:
-                    genre = link.get_text(strip=True)
-                    # Filter out navigation items
-                    if genre and genre not in ['All Genres', 'Most Popular'] and genre not in categories:
-                        categories.append(genre)
-            
-            # Get description
-            description = ""
-            # Look for description in various places
-            desc_elem = soup.find('div', class_='movie-description')
-            if not desc_elem:
-                desc_elem = soup.find('p', class_='description')
-            if not desc_elem:
-                # Look for any paragraph with substantial text
-                paragraphs = soup.find_all('p')
-                for p in paragraphs:
-                    text = p.get_text(strip=True)
-                    if len(text) > 100 and video_code.upper() not in text.upper():
-                        desc_elem = p
-                        break
-            
-            if desc_elem:
-                description = desc_elem.get_text(strip=True)
-            
-            # Get rating
-            rating = 0.0
-            # Look for rating in various formats
-            rating_elem = soup.find('span', class_='rating')
-            if not rating_elem:
-                rating_elem = soup.find('div', class_='rating')
-            if rating_elem:
-                rating_text = rating_elem.get_text(strip=True)
-                rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                if rating_match:
-                    try:
-                        rating = float(rating_match.group(1))
-                    except:
-                        pass
-            
-            # Get screenshots - look for multiple patterns and try to get full-size
-            screenshots = []
-            
-            # Pattern 1: Look for <a> tags with data-image-href (full-size URL already provided)
-            screenshot_links = soup.find_all('a', attrs={'data-image-href': True})
-            for link in screenshot_links:
-                full_size = link.get('data-image-href', '')
-                if full_size:
-                    # Handle different CDN patterns
-                    if full_size.startswith('//'):
-                        full_size = 'https:' + full_size
-                    elif full_size.startswith('/'):
-                        full_size = 'https://www.javdatabase.com' + full_size
-                    if full_size not in screenshots:
-                        screenshots.append(full_size)
-            
-            # Pattern 2: Look for images with "Screenshot" in alt text and convert to full-size
-            if not screenshots:
-                screenshot_imgs = soup.find_all('img', alt=re.compile(r'Screenshot', re.I))
-                for img in screenshot_imgs:
-                    src = img.get('src', '')
-                    if src:
-                        # Handle mgstage thumbnails (cap_t1_ -> cap_e_)
-                        if 'cap_t1_' in src:
-                            full_size = src.replace('cap_t1_', 'cap_e_')
-                        # Handle DMM thumbnails (mikr00066-1.jpg -> mikr00066jp-1.jpg)
-                        elif 'dmm.co.jp' in src and '-' in src:
-                            # Replace the last occurrence of the code pattern with 'jp' suffix
-                            # e.g., mikr00066-1.jpg -> mikr00066jp-1.jpg
-                            parts = src.rsplit('-', 1)
-                            if len(parts) == 2:
-                                full_size = parts[0] + 'jp-' + parts[1]
-                            else:
-                                full_size = src
-                        else:
-                            full_size = src
-                        
-                        if full_size.startswith('//'):
-                            full_size = 'https:' + full_size
-                        elif full_size.startswith('/'):
-                            full_size = 'https://www.javdatabase.com' + full_size
-                        if full_size not in screenshots:
-                            screenshots.append(full_size)
-            
-            # Pattern 3: Look for images from mgstage with cap_t1_ pattern
-            if not screenshots:
-                all_imgs = soup.find_all('img', src=re.compile(r'cap_t1_'))
-                for img in all_imgs:
-                    src = img.get('src', '')
-                    if src:
-                        # Convert to full-size version
-                        full_size = src.replace('cap_t1_', 'cap_e_')
-                        if full_size.startswith('//'):
-                            full_size = 'https:' + full_size
-                        elif full_size.startswith('/'):
-                            full_size = 'https://www.javdatabase.com' + full_size
-                        if full_size not in screenshots:
-                            screenshots.append(full_size)
-            
-            # Pattern 4: Original pattern for /screenshots/ URLs
-            if not screenshots:
-                screenshot_imgs = soup.find_all('img', src=re.compile(r'/screenshots/'))
-                for img in screenshot_imgs:
-                    src = img.get('src', '')
-                    if src:
-                        if src.startswith('//'):
-                            src = 'https:' + src
-                        elif src.startswith('/'):
-                            src = self.BASE_URL + src
-                        if src not in screenshots:
-                            screenshots.append(src)
-            
-            print(f"  >> Actresses: {', '.join(actresses) if actresses else 'None'}")
-            print(f"  >> Actress images: {len(actress_images)}")
-            print(f"  >> Actress details: {len(actress_details)}")
-            print(f"  >> Screenshots: {len(screenshots)}")
-            print(f"  >> Categories: {len(categories)} - {', '.join(categories[:5]) if categories else 'None'}")
-            print(f"  >> Director: {director if director else 'None'}")
-            print(f"  >> Studio: {studio if studio else 'None'}")
-            print(f"  >> Label: {label if label else 'None'}")
-            print(f"  >> Series: {series if series else 'None'}")
-            print(f"  >> Release Date: {release_date if release_date else 'None'}")
-            print(f"  >> Runtime: {runtime if runtime else 'None'}")
-            print(f"  >> Rating: {rating if rating > 0 else 'None'}")
-            print(f"  >> Description: {description[:100] if description else 'None'}...")
-            
-            return VideoMetadata(
-                code=video_code.upper(),
-                title=title,
-                title_jp=title,
-                release_date=release_date,
-                runtime=runtime,
-                director=director,
-                studio=studio,
-                label=label,
-                series=series,
-                cover_url=cover_url,
-                thumbnail_url=cover_url,
-                screenshots=screenshots,
-                actresses=actresses,
-                actress_images=actress_images,
-                actress_details=actress_details,  # Add full actress details
-                categories=categories,
-                description=description,
-                rating=rating,
-                scraped_at=datetime.now().isoformat(),
-                javdb_url=movie_url
-            )
+                    metadata.actress_details[actress_name] = actress_details(actress_data)
+                    print(f"      ✓ Profile saved: {actress_data.name}")
+                    print(f"      ✓ Age: {actress_data.age}, Cup: {actress_data.cup_size}, Height: {actress_data.height}")
+            
+            print(f"  >> Actresses: {', '.join(metadata.actresses) if metadata.actresses else 'None'}")
+            print(f"  >> Actress images: {len(metadata.actress_images)}")
+            print(f"  >> Actress details: {len(metadata.actress_details)}")
+            print(f"  >> Screenshots: {len(metadata.screenshots)}")
+            print(f"  >> Categories: {len(metadata.categories)} - {', '.join(metadata.categories[:5]) if metadata.categories else 'None'}")
+            print(f"  >> Director: {metadata.director or 'None'}")
+            print(f"  >> Studio: {metadata.studio or 'None'}")
+            print(f"  >> Label: {metadata.label or 'None'}")
+            print(f"  >> Series: {metadata.series or 'None'}")
+            print(f"  >> Release Date: {metadata.release_date or 'None'}")
+            print(f"  >> Runtime: {metadata.runtime or 'None'}")
+            print(f"  >> Rating: {metadata.rating if metadata.rating > 0 else 'None'}")
+            print(f"  >> Description: {metadata.description[:100] if metadata.description else 'None'}...")
+            actress_profiles.print_stats()
+            self.fetcher.print_stats()
+            
+            return metadata
             
         except Exception as e:
             print(f"  !! Error: {e}")
@@ -726,9 +269,9 @@ class JAVDatabaseScraper:
                     url = f"{self.BASE_URL}/movies/?page={page}"
                 
                 self.driver.get(url)
-                time.sleep(3)
+                page_readiness.wait(self.driver, 'javdb.movies_list', element_present('div.movie-card'), timeout=3)
                 
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                soup = make_soup(self.driver.page_source)
                 
                 # Find all movie cards
                 movie_cards = soup.find_all('div', class_='movie-card')
@@ -2,6 +2,12 @@
 Merge single video data from Jable/JavaGG and JAVDatabase
 Priority: JAVDatabase metadata first, JavaGG as fallback
 """
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from normalize import pick_title
+
 
 def merge_and_validate(source_data: dict, javdb_data: dict = None) -> dict:
     """
@@ -43,15 +49,8 @@ def merge_and_validate(source_data: dict, javdb_data: dict = None) -> dict:
     source_title = source_data.get('title', '')
     code = source_data.get('code', '')
     
-    # Use JAVDatabase title if it's not empty and not just the code
-    if javdb_title and javdb_title != code:
-        merged['title'] = javdb_title
-    # Otherwise use source title if it's not just the code
-    elif source_title and source_title != code:
-        merged['title'] = source_title
-    # Last resort: use code (but this shouldn't happen)
-    else:
-        merged['title'] = code
+    # JAVDatabase title, else the source title, else the code (shouldn't happen)
+    merged['title'] = pick_title(code, javdb_title, source_title)
     
     # Japanese title from JAVDatabase
     merged['title_japanese'] = javdb_data.get('title_jp', '') or source_data.get('title_japanese', '')
@@ -1,11 +1,31 @@
 """
 JAVDatabase Retry Manager
 Tracks videos not found in JAVDatabase and retries them after 2 days
+Also the durable queue of the background enrichment workers
+(enrichment_workers.py): entries added with delay_days=0 are due at once,
+and a worker claims an entry with a lease so no two workers take the same
+video and a crashed worker's entry comes back when the lease runs out
+
+Storage: SQLite (database/javdb_retry_queue.db)
+- queue: one narrow row per video, primary key on code and an index on
+  retry_after (epoch seconds), so duplicate checks and "next N due" are
+  index lookups instead of a scan parsing every entry's ISO timestamp
+- payload: the full video_data JSON, only read for entries handed out
+- A claim moves retry_after to the end of the lease, so an entry whose
+  worker died is simply due again - the same index serves both
+- An entry that reached max_retries stays as a final failure (never due),
+  so re-adding its code is a no-op until cleanup_old_entries() drops it
+- An old javdb_retry_queue.json next to the database is imported once
+- The file is only created on first use (not on import), and is committed
+  by the CI runs after check_integrity() - see `python retry_manager.py --check`
 """
 
 import json
-import os
+import sqlite3
 import sys
+import time
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -17,45 +37,155 @@ sys.path.insert(0, str(parent_path))
 # Use absolute path to project root database
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
-RETRY_QUEUE_FILE = PROJECT_ROOT / "database" / "javdb_retry_queue.json"
+RETRY_QUEUE_FILE = PROJECT_ROOT / "database" / "javdb_retry_queue.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    code TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    source_url TEXT NOT NULL DEFAULT '',
+    reason TEXT NOT NULL DEFAULT '',
+    added_at REAL NOT NULL,
+    retry_after REAL NOT NULL,
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    last_retry REAL,
+    claimed_by TEXT
+);
+CREATE INDEX IF NOT EXISTS queue_retry_after ON queue (retry_after);
+CREATE TABLE IF NOT EXISTS payload (
+    code TEXT PRIMARY KEY REFERENCES queue (code) ON DELETE CASCADE,
+    video_data TEXT NOT NULL
+);
+"""
+
+ENTRY_COLUMNS = "code, title, source_url, reason, added_at, retry_after, retry_count, last_retry, claimed_by"
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp is not None else None
 
-# Ensure database directory exists
-RETRY_QUEUE_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+def _timestamp(iso: Optional[str], default: Optional[float] = None) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(iso).timestamp() if iso else default
+    except (TypeError, ValueError):
+        return default
 
 
 class JAVDBRetryManager:
     """Manages retry queue for videos not found in JAVDatabase"""
     
-    def __init__(self):
-        self.retry_queue_file = RETRY_QUEUE_FILE
+    def __init__(self, queue_file=None):
+        self.retry_queue_file = Path(queue_file) if queue_file else RETRY_QUEUE_FILE
         self.retry_delay_days = 2  # Retry after 2 days
         self.max_retries = 5  # Maximum retry attempts
+        self._ready = False
+        self._ready_lock = threading.Lock()
     
-    def load_queue(self) -> List[Dict]:
-        """Load retry queue from file"""
+    def _setup(self):
+        """Create the database and import the old JSON queue on first use"""
+        with self._ready_lock:
+            if self._ready:
+                return
+            self.retry_queue_file.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.retry_queue_file), timeout=30)
+            try:
+                with conn:
+                    for statement in SCHEMA.split(';'):
+                        if statement.strip():
+                            conn.execute(statement)
+            finally:
+                conn.close()
+            self._ready = True
+        legacy_file = self.retry_queue_file.with_suffix('.json')
+        if legacy_file != self.retry_queue_file:
+            self._import_legacy_queue(legacy_file)
+    
+    @contextmanager
+    def _connect(self, immediate: bool = False):
+        """
+        Connection for one operation (safe across threads and processes);
+        commits on success. immediate=True takes the write lock up front for
+        read-then-update operations (claims)
+        """
+        if not self._ready:
+            self._setup()
+        conn = sqlite3.connect(str(self.retry_queue_file), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
         try:
-            if self.retry_queue_file.exists():
-                with open(self.retry_queue_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
-        except Exception as e:
-            print(f"⚠️ Error loading retry queue: {e}")
-            return []
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+    
+    def _entry(self, row: sqlite3.Row, video_data: Optional[str] = None) -> Dict:
+        """Queue row as the entry dict callers use (ISO timestamps, payload if given)"""
+        entry = {
+            'code': row['code'],
+            'title': row['title'],
+            'source_url': row['source_url'],
+            'reason': row['reason'],
+            'added_at': _iso(row['added_at']),
+            'retry_after': _iso(row['retry_after']),
+            'retry_count': row['retry_count'],
+            'last_retry': _iso(row['last_retry'])
+        }
+        if row['claimed_by']:
+            entry['claimed_by'] = row['claimed_by']
+        if video_data is not None:
+            entry['video_data'] = json.loads(video_data)
+        return entry
     
-    def save_queue(self, queue: List[Dict]) -> bool:
-        """Save retry queue to file"""
+    def _import_legacy_queue(self, json_file: Path):
+        """One-time import of the old JSON queue file (renamed to *.migrated after)"""
+        if not json_file.exists():
+            return
         try:
-            # Ensure directory exists
-            self.retry_queue_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(json_file, 'r', encoding='utf-8') as f:
+                items = json.load(f)
             
-            with open(self.retry_queue_file, 'w', encoding='utf-8') as f:
-                json.dump(queue, f, indent=2, ensure_ascii=False)
-            return True
+            now = time.time()
+            with self._connect() as conn:
+                for item in items:
+                    if not item.get('code'):
+                        continue
+                    inserted = conn.execute(
+                        "INSERT OR IGNORE INTO queue (code, title, source_url, reason, added_at, retry_after, "
+                        "retry_count, last_retry) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (item['code'], item.get('title') or '', item.get('source_url') or '', item.get('reason') or '',
+                         _timestamp(item.get('added_at'), now), _timestamp(item.get('retry_after'), now),
+                         item.get('retry_count', 0), _timestamp(item.get('last_retry')))
+                    ).rowcount
+                    if inserted:
+                        conn.execute("INSERT INTO payload (code, video_data) VALUES (?, ?)",
+                                     (item['code'], json.dumps(item.get('video_data') or {}, ensure_ascii=False)))
+            
+            json_file.rename(json_file.with_name(json_file.name + '.migrated'))
+            print(f"   ✅ Imported {len(items)} entries from {json_file.name} into the retry queue database")
         except Exception as e:
-            print(f"❌ Error saving retry queue: {e}")
-            return False
+            print(f"⚠️ Error importing old retry queue {json_file}: {e}")
     
-    def add_to_queue(self, video_code: str, video_data: Dict, reason: str = "not_found") -> bool:
+    def load_queue(self) -> List[Dict]:
+        """All entries with their video data, soonest retry first (export / inspection)"""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT {', '.join('q.' + c.strip() for c in ENTRY_COLUMNS.split(','))}, p.video_data "
+                    "FROM queue q LEFT JOIN payload p USING (code) ORDER BY q.retry_after"
+                ).fetchall()
+            return [self._entry(row, row['video_data'] or '{}') for row in rows]
+        except Exception as e:
+            print(f"⚠️ Error loading retry queue: {e}")
+            return []
+    
+    def add_to_queue(self, video_code: str, video_data: Dict, reason: str = "not_found",
+                     delay_days: Optional[float] = None) -> bool:
         """
         Add video to retry queue
         
@@ -63,81 +193,150 @@ class JAVDBRetryManager:
             video_code: Video code (e.g., "FNS-149")
             video_data: Full video data from Jable
             reason: Reason for retry (default: "not_found")
+            delay_days: Days until the first attempt (default: retry_delay_days, 0 = due now)
         
         Returns:
             bool: True if added successfully
         """
         try:
-            queue = self.load_queue()
-            
-            # Check if already in queue
-            for item in queue:
-                if item.get('code') == video_code:
-                    print(f"   ℹ️ {video_code} already in retry queue")
-                    return True
-            
-            # Add new entry
             now = datetime.now()
-            retry_after = now + timedelta(days=self.retry_delay_days)
-            
-            entry = {
-                'code': video_code,
-                'title': video_data.get('title', ''),
-                'source_url': video_data.get('source_url', ''),
-                'reason': reason,
-                'added_at': now.isoformat(),
-                'retry_after': retry_after.isoformat(),
-                'retry_count': 0,
-                'last_retry': None,
-                'video_data': video_data  # Store full video data for retry
-            }
+            retry_after = now + timedelta(days=self.retry_delay_days if delay_days is None else delay_days)
             
-            queue.append(entry)
+            with self._connect() as conn:
+                # Primary key does the duplicate check
+                added = conn.execute(
+                    "INSERT OR IGNORE INTO queue (code, title, source_url, reason, added_at, retry_after) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (video_code, video_data.get('title') or '', video_data.get('source_url') or '', reason,
+                     now.timestamp(), retry_after.timestamp())
+                ).rowcount
+                if added:
+                    conn.execute("INSERT OR REPLACE INTO payload (code, video_data) VALUES (?, ?)",
+                                 (video_code, json.dumps(video_data, ensure_ascii=False)))
             
-            if self.save_queue(queue):
-                print(f"   ✅ Added {video_code} to retry queue")
-                print(f"      Retry after: {retry_after.strftime('%Y-%m-%d %H:%M')}")
+            if not added:
+                print(f"   ℹ️ {video_code} already in retry queue")
                 return True
-            return False
+            
+            print(f"   ✅ Added {video_code} to retry queue")
+            print(f"      Retry after: {retry_after.strftime('%Y-%m-%d %H:%M')}")
+            return True
             
         except Exception as e:
             print(f"❌ Error adding to retry queue: {e}")
             return False
     
-    def get_videos_ready_for_retry(self) -> List[Dict]:
+    def add_many_to_queue(self, videos: List[Dict], reason: str = "not_found",
+                          delay_days: Optional[float] = None) -> int:
         """
-        Get videos that are ready for retry (past retry_after time)
+        Add many videos in one transaction (codes already queued keep their
+        schedule, codes that reached max retries stay given up)
+
+        Args:
+            videos: Video data dicts with a 'code'
+            reason: Reason for retry
+            delay_days: Days until the first attempt (default: retry_delay_days, 0 = due now)
+
+        Returns:
+            int: Number of videos newly added
+        """
+        now = datetime.now()
+        retry_after = now + timedelta(days=self.retry_delay_days if delay_days is None else delay_days)
+        added = 0
+
+        try:
+            with self._connect() as conn:
+                for video_data in videos:
+                    code = video_data.get('code')
+                    if not code:
+                        continue
+                    if conn.execute(
+                        "INSERT OR IGNORE INTO queue (code, title, source_url, reason, added_at, retry_after) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (code, video_data.get('title') or '', video_data.get('source_url') or '', reason,
+                         now.timestamp(), retry_after.timestamp())
+                    ).rowcount:
+                        conn.execute("INSERT OR REPLACE INTO payload (code, video_data) VALUES (?, ?)",
+                                     (code, json.dumps(video_data, ensure_ascii=False)))
+                        added += 1
+            return added
+        except Exception as e:
+            print(f"❌ Error adding to retry queue: {e}")
+            return 0
+
+    def get_videos_ready_for_retry(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get videos that are ready for retry (past retry_after time), soonest first
+        
+        Args:
+            limit: Return at most this many (read off the retry_after index)
         
         Returns:
             List of video entries ready for retry
         """
         try:
-            queue = self.load_queue()
-            now = datetime.now()
-            ready = []
-            
-            for item in queue:
-                retry_after_str = item.get('retry_after')
-                retry_count = item.get('retry_count', 0)
-                
-                if not retry_after_str:
-                    continue
-                
-                # Skip if max retries reached
-                if retry_count >= self.max_retries:
-                    continue
-                
-                retry_after = datetime.fromisoformat(retry_after_str)
-                
-                if now >= retry_after:
-                    ready.append(item)
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT {ENTRY_COLUMNS} FROM queue WHERE retry_after <= ? AND retry_count < ? "
+                    "ORDER BY retry_after LIMIT ?",
+                    (time.time(), self.max_retries, -1 if limit is None else limit)
+                ).fetchall()
+                payloads = dict(conn.execute(
+                    f"SELECT code, video_data FROM payload WHERE code IN ({', '.join('?' * len(rows))})",
+                    [row['code'] for row in rows]
+                ).fetchall()) if rows else {}
             
-            return ready
+            return [self._entry(row, payloads.get(row['code'], '{}')) for row in rows]
             
         except Exception as e:
             print(f"❌ Error getting ready videos: {e}")
             return []
     
+    def claim_next(self, worker: str, lease_seconds: int = 900) -> Optional[Dict]:
+        """
+        Claim the oldest entry that is due (and not claimed by another worker)
+        
+        Args:
+            worker: Name of the claiming worker
+            lease_seconds: The entry is due again after this if the worker never reports back
+        
+        Returns:
+            The claimed entry, or None if nothing is due
+        """
+        try:
+            with self._connect(immediate=True) as conn:
+                now = time.time()
+                row = conn.execute(
+                    f"SELECT {ENTRY_COLUMNS} FROM queue WHERE retry_after <= ? AND retry_count < ? "
+                    "ORDER BY retry_after LIMIT 1",
+                    (now, self.max_retries)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE queue SET claimed_by = ?, retry_after = ? WHERE code = ?",
+                             (worker, now + lease_seconds, row['code']))
+                payload = conn.execute("SELECT video_data FROM payload WHERE code = ?", (row['code'],)).fetchone()
+            
+            entry = self._entry(row, payload['video_data'] if payload else '{}')
+            entry['claimed_by'] = worker
+            entry['claimed_until'] = _iso(now + lease_seconds)
+            return entry
+        except Exception as e:
+            print(f"❌ Error claiming from retry queue: {e}")
+            return None
+    
+    def release(self, video_code: str, delay_seconds: float = 0) -> bool:
+        """Give a claimed entry back without counting an attempt (e.g. transient error)"""
+        try:
+            with self._connect() as conn:
+                return conn.execute(
+                    "UPDATE queue SET claimed_by = NULL, retry_after = ? WHERE code = ?",
+                    (time.time() + delay_seconds, video_code)
+                ).rowcount > 0
+        except Exception as e:
+            print(f"❌ Error releasing {video_code}: {e}")
+            return False
+    
     def update_retry_status(self, video_code: str, success: bool, found_in_javdb: bool = False) -> bool:
         """
         Update retry status after attempt
@@ -151,36 +350,36 @@ class JAVDBRetryManager:
             bool: True if updated successfully
         """
         try:
-            queue = self.load_queue()
-            updated = False
-            
-            for item in queue:
-                if item.get('code') == video_code:
-                    now = datetime.now()
-                    item['last_retry'] = now.isoformat()
-                    item['retry_count'] = item.get('retry_count', 0) + 1
-                    
-                    if success and found_in_javdb:
-                        # Remove from queue - successfully enriched
-                        queue.remove(item)
-                        print(f"   ✅ {video_code} successfully enriched, removed from retry queue")
-                    elif item['retry_count'] >= self.max_retries:
-                        # Max retries reached - remove from queue
-                        queue.remove(item)
-                        print(f"   ⚠️ {video_code} max retries reached ({self.max_retries}), removed from queue")
-                    else:
-                        # Schedule next retry
-                        next_retry = now + timedelta(days=self.retry_delay_days)
-                        item['retry_after'] = next_retry.isoformat()
-                        print(f"   ⏰ {video_code} retry scheduled for {next_retry.strftime('%Y-%m-%d %H:%M')}")
-                    
-                    updated = True
-                    break
-            
-            if updated:
-                return self.save_queue(queue)
-            return False
-            
+            with self._connect(immediate=True) as conn:
+                row = conn.execute("SELECT retry_count FROM queue WHERE code = ?", (video_code,)).fetchone()
+                if row is None:
+                    return False
+                
+                now = datetime.now()
+                retry_count = row['retry_count'] + 1
+                
+                if success and found_in_javdb:
+                    # Remove from queue - successfully enriched
+                    conn.execute("DELETE FROM queue WHERE code = ?", (video_code,))
+                    print(f"   ✅ {video_code} successfully enriched, removed from retry queue")
+                elif retry_count >= self.max_retries:
+                    # Max retries reached - kept as a final failure (never due again),
+                    # so bulk adds skip it until cleanup_old_entries() drops it
+                    conn.execute(
+                        "UPDATE queue SET claimed_by = NULL, last_retry = ?, retry_count = ? WHERE code = ?",
+                        (now.timestamp(), retry_count, video_code)
+                    )
+                    print(f"   ⚠️ {video_code} max retries reached ({self.max_retries}), no further retries")
+                else:
+                    # Schedule next retry
+                    next_retry = now + timedelta(days=self.retry_delay_days)
+                    conn.execute(
+                        "UPDATE queue SET claimed_by = NULL, last_retry = ?, retry_count = ?, retry_after = ? "
+                        "WHERE code = ?",
+                        (now.timestamp(), retry_count, next_retry.timestamp(), video_code)
+                    )
+                    print(f"   ⏰ {video_code} retry scheduled for {next_retry.strftime('%Y-%m-%d %H:%M')}")
+                return True
         except Exception as e:
             print(f"❌ Error updating retry status: {e}")
             return False
@@ -188,15 +387,12 @@ class JAVDBRetryManager:
     def remove_from_queue(self, video_code: str) -> bool:
         """Remove video from retry queue"""
         try:
-            queue = self.load_queue()
-            original_len = len(queue)
-            
-            queue = [item for item in queue if item.get('code') != video_code]
+            with self._connect() as conn:
+                removed = conn.execute("DELETE FROM queue WHERE code = ?", (video_code,)).rowcount
             
-            if len(queue) < original_len:
-                if self.save_queue(queue):
-                    print(f"   ✅ Removed {video_code} from retry queue")
-                    return True
+            if removed:
+                print(f"   ✅ Removed {video_code} from retry queue")
+                return True
             return False
             
         except Exception as e:
@@ -206,36 +402,52 @@ class JAVDBRetryManager:
     def get_queue_stats(self) -> Dict:
         """Get statistics about retry queue"""
         try:
-            queue = self.load_queue()
-            now = datetime.now()
-            
-            ready_count = 0
-            pending_count = 0
-            max_retries_count = 0
-            
-            for item in queue:
-                retry_count = item.get('retry_count', 0)
-                retry_after_str = item.get('retry_after')
-                
-                if retry_count >= self.max_retries:
-                    max_retries_count += 1
-                elif retry_after_str:
-                    retry_after = datetime.fromisoformat(retry_after_str)
-                    if now >= retry_after:
-                        ready_count += 1
-                    else:
-                        pending_count += 1
+            with self._connect() as conn:
+                row = conn.execute(
+                    """
+                    SELECT COUNT(*) AS total,
+                           COALESCE(SUM(retry_count >= :max), 0) AS max_retries_reached,
+                           COALESCE(SUM(retry_count < :max AND claimed_by IS NOT NULL AND retry_after > :now), 0)
+                               AS in_progress,
+                           COALESCE(SUM(retry_count < :max AND retry_after <= :now), 0) AS ready_for_retry,
+                           COALESCE(SUM(retry_count < :max AND claimed_by IS NULL AND retry_after > :now), 0)
+                               AS pending
+                    FROM queue
+                    """,
+                    {'max': self.max_retries, 'now': time.time()}
+                ).fetchone()
             
             return {
-                'total': len(queue),
-                'ready_for_retry': ready_count,
-                'pending': pending_count,
-                'max_retries_reached': max_retries_count
+                'total': row['total'],
+                'ready_for_retry': row['ready_for_retry'],
+                'pending': row['pending'],
+                'in_progress': row['in_progress'],
+                'max_retries_reached': row['max_retries_reached']
             }
             
         except Exception as e:
             print(f"❌ Error getting queue stats: {e}")
-            return {'total': 0, 'ready_for_retry': 0, 'pending': 0, 'max_retries_reached': 0}
+            return {'total': 0, 'ready_for_retry': 0, 'pending': 0, 'in_progress': 0, 'max_retries_reached': 0}
+    
+    def check_integrity(self) -> bool:
+        """
+        True if the queue file is absent or passes PRAGMA integrity_check
+        (checked before the CI runs commit it, like the JSON files are parsed)
+        """
+        if not self.retry_queue_file.exists():
+            return True
+        try:
+            conn = sqlite3.connect(str(self.retry_queue_file), timeout=30)
+            try:
+                result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            result = str(e)
+        if result != 'ok':
+            print(f"❌ Retry queue {self.retry_queue_file.name} failed the integrity check: {result}")
+            return False
+        return True
     
     def cleanup_old_entries(self, days: int = 30) -> int:
         """
@@ -247,26 +459,16 @@ class JAVDBRetryManager:
         Returns:
             int: Number of entries removed
         """
+        cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+        
         try:
-            queue = self.load_queue()
-            now = datetime.now()
-            cutoff = now - timedelta(days=days)
-            
-            original_len = len(queue)
-            
-            # Keep entries that are either:
-            # 1. Not at max retries yet
-            # 2. Added recently (within cutoff period)
-            queue = [
-                item for item in queue
-                if (item.get('retry_count', 0) < self.max_retries or
-                    datetime.fromisoformat(item.get('added_at', now.isoformat())) > cutoff)
-            ]
-            
-            removed = original_len - len(queue)
+            with self._connect() as conn:
+                removed = conn.execute(
+                    "DELETE FROM queue WHERE retry_count >= ? AND added_at <= ?",
+                    (self.max_retries, cutoff)
+                ).rowcount
             
             if removed > 0:
-                self.save_queue(queue)
                 print(f"   🗑️ Cleaned up {removed} old entries from retry queue")
             
             return removed
@@ -281,6 +483,9 @@ retry_manager = JAVDBRetryManager()
 
 
 if __name__ == "__main__":
+    if '--check' in sys.argv:
+        sys.exit(0 if retry_manager.check_integrity() else 1)
+    
     # Test the retry manager
     print("Testing JAVDatabase Retry Manager...")
     
@@ -4,15 +4,22 @@ Scrapes complete metadata with well-organized format
 """
 
 import json
+import sys
 import time
 import re
+from pathlib import Path
 from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict, field
-from bs4 import BeautifulSoup
+from javdb_parser import parse_actress_page, parse_measurements, parse_video_page
 from seleniumbase import Driver
 from selenium.common.exceptions import TimeoutException
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from actress_profiles import actress_profiles, profile_key, restore, MISSING
+from page_readiness import page_readiness, element_present
+from tiered_fetch import TieredFetcher
+
 
 @dataclass
 class ActressProfile:
@@ -90,6 +97,7 @@ class CleanJAVDBScraper:
         self.headless = headless
         self.driver = None
         self.actress_cache = {}
+        self.fetcher = TieredFetcher('javdb')
         
     def _init_driver(self):
         """Initialize browser with optimized settings"""
@@ -137,145 +145,89 @@ class CleanJAVDBScraper:
                 pass
             self.driver = None
     
-    def _parse_measurements(self, text: str) -> tuple:
-        """Parse measurements string like '88-58-86' into tuple"""
-        try:
-            match = re.search(r'(\d{2,3})[-\s]+(\d{2,3})[-\s]+(\d{2,3})', text)
-            if match:
-                return (int(match.group(1)), int(match.group(2)), int(match.group(3)))
-        except:
-            pass
-        return (None, None, None)
-    
-    def _extract_actress_profile(self, soup: BeautifulSoup, profile_url: str, actress_name: str) -> Optional[ActressProfile]:
+    def _extract_actress_profile(self, html: str, profile_url: str, actress_name: str) -> Optional[ActressProfile]:
         """Extract actress profile with clean structure"""
         try:
-            # Get name from page
-            h1 = soup.find('h1')
-            name_on_page = h1.get_text(strip=True) if h1 else actress_name
-            # Remove " - JAV Profile" suffix
-            name_on_page = re.sub(r'\s*-\s*JAV Profile\s*$', '', name_on_page)
-            
-            # Get image
-            image_url = None
-            img = soup.find('img', src=re.compile(r'/idolimages/'))
-            if img:
-                image_url = img.get('src', '')
-                if image_url.startswith('//'):
-                    image_url = 'https:' + image_url
-                elif image_url.startswith('/'):
-                    image_url = 'https://www.javdatabase.com' + image_url
-            
-            page_text = soup.get_text()
-            
-            # Helper function to extract value (returns None if value is '?')
-            def extract_value(pattern, text, group=1, convert=None):
-                match = re.search(pattern, text, re.I)
-                if match:
-                    value = match.group(group).strip()
-                    if value and value != '?':
-                        if convert:
-                            try:
-                                return convert(value)
-                            except:
-                                return None
-                        return value
-                return None
-            
-            # Age
-            age = extract_value(r'Age[:\s]*([^\s-]+)', page_text, convert=lambda x: int(x) if x != '?' else None)
-            
-            # DOB (Date of Birth)
-            dob = extract_value(r'DOB[:\s]*([^\s-]+)', page_text)
-            
-            # Debut date
-            debut_date = extract_value(r'Debut[:\s]*(\d{4}-\d{2}-\d{2})', page_text)
-            
-            # Debut age
-            debut_age = extract_value(r'Debut Age[:\s]*([^\s-]+)', page_text, convert=lambda x: int(x) if x != '?' else None)
-            
-            # Birthplace
-            birthplace = extract_value(r'Birthplace[:\s]*([^\s-]+)', page_text)
-            
-            # Zodiac sign
-            zodiac_sign = extract_value(r'Sign[:\s]*([^\s-]+)', page_text)
-            
-            # Blood type
-            blood_type = extract_value(r'Blood[:\s]*([^\s-]+)', page_text)
-            
-            # Measurements - try multiple patterns
-            measurements_text = extract_value(r'Measurements[:\s]*([^\s-]+)', page_text)
-            bust_cm, waist_cm, hips_cm = None, None, None
-            if measurements_text and measurements_text != '?':
-                bust_cm, waist_cm, hips_cm = self._parse_measurements(measurements_text)
-            
-            # If not found, try alternative format like "B88-W58-H86"
-            if not bust_cm:
-                alt_measurements = re.search(r'B(\d{2,3})[-\s]*W(\d{2,3})[-\s]*H(\d{2,3})', page_text, re.I)
-                if alt_measurements:
-                    bust_cm = int(alt_measurements.group(1))
-                    waist_cm = int(alt_measurements.group(2))
-                    hips_cm = int(alt_measurements.group(3))
-            
-            # Cup size
-            cup_size = extract_value(r'Cup[:\s]*([^\s-]+)', page_text)
-            
-            # Height
-            height_cm = extract_value(r'Height[:\s]*(\d+)\s*cm', page_text, convert=int)
-            
-            # Shoe size
-            shoe_size = extract_value(r'Shoe Size[:\s]*([^\s-]+)', page_text)
-            
-            # Hair length - clean up trailing commas
-            hair_length = extract_value(r'Hair Length\(s\)[:\s]*([^\s-]+)', page_text)
-            if hair_length:
-                hair_length = hair_length.rstrip(',')
-            
-            # Hair color - clean up trailing commas
-            hair_color = extract_value(r'Hair Color\(s\)[:\s]*([^\n-]+)', page_text)
-            if hair_color:
-                hair_color = hair_color.rstrip(',')
-            
-            # Tags - filter out "Suggest Tags"
-            tags = []
-            tags_match = re.search(r'Tags[:\s]+([^\n]+)', page_text, re.I)
-            if tags_match:
-                tags_text = tags_match.group(1)
-                tag_list = re.split(r'\s*-\s*', tags_text)
-                tags = [t.strip() for t in tag_list if t.strip() and t.strip() != '?' and 'Suggest Tags' not in t]
-            
-            # Japanese name
-            name_jp = extract_value(r'JP[:\s]+([^\s-]+)', page_text)
-            
-            # Alternate name
-            name_alt = extract_value(r'Alt[:\s]+([^\n]+)', page_text)
-            
-            return ActressProfile(
-                actress_name=name_on_page,
-                actress_name_jp=name_jp,
-                actress_name_alt=name_alt,
-                actress_image_url=image_url,
-                actress_age=age,
-                actress_birthdate=dob or debut_date,  # Use debut date if DOB not available
-                actress_birthplace=birthplace,
-                actress_height_cm=height_cm,
-                actress_shoe_size=shoe_size,
-                actress_bust_cm=bust_cm,
-                actress_waist_cm=waist_cm,
-                actress_hips_cm=hips_cm,
-                actress_cup_size=cup_size,
-                actress_hair_length=hair_length,
-                actress_hair_color=hair_color,
-                actress_blood_type=blood_type,
-                actress_zodiac_sign=zodiac_sign,
-                actress_debut_date=debut_date,
-                actress_debut_age=debut_age
-            )
+            actress = parse_actress_page(html, actress_name, profile_url)
         except Exception as e:
             print(f"         Error extracting profile: {e}")
-            import traceback
-            traceback.print_exc()
             return None
+        if not actress:
+            return None
+        
+        def number(value):
+            match = re.search(r'\d+', value or '')
+            return int(match.group(0)) if match else None
+        
+        bust_cm, waist_cm, hips_cm = parse_measurements(actress.measurements)
+        
+        return ActressProfile(
+            actress_name=actress.name,
+            actress_name_jp=actress.name_jp,
+            actress_name_alt=actress.name_alt,
+            actress_image_url=actress.image_url or None,
+            actress_age=number(actress.age),
+            actress_birthdate=actress.birthdate or actress.debut_date,  # Use debut date if DOB not available
+            actress_birthplace=actress.birthplace,
+            actress_height_cm=number(actress.height),
+            actress_shoe_size=actress.shoe_size,
+            actress_bust_cm=bust_cm,
+            actress_waist_cm=waist_cm,
+            actress_hips_cm=hips_cm,
+            actress_cup_size=actress.cup_size,
+            actress_hair_length=actress.hair_length,
+            actress_hair_color=actress.hair_color,
+            actress_blood_type=actress.blood_type,
+            actress_zodiac_sign=actress.zodiac_sign,
+            actress_debut_date=actress.debut_date,
+            actress_debut_age=number(actress.debut_age)
+        )
+    
+    def _ensure_driver(self):
+        """Start the browser on first use (most pages never need it)"""
+        if self.driver is None:
+            self._init_driver()
+    
+    def _browser_movie_page(self, url: str, video_code: str) -> Optional[VideoMetadata]:
+        """Load a movie page in the browser, with retries and partial-load handling"""
+        self._ensure_driver()
+        
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                self.driver.set_page_load_timeout(20)
+                self.driver.get(url)
+                break
+            except TimeoutException:
+                # Page is loading slowly, stop and use what we have
+                print(f"  .. Timeout on attempt {attempt + 1}/{max_retries}, stopping page load...")
+                try:
+                    self.driver.execute_script("window.stop();")
+                    time.sleep(1)
+                    # Check if we got enough content
+                    if len(self.driver.page_source) > 5000:  # If we got substantial content
+                        print(f"  .. Got partial content, continuing...")
+                        break
+                except:
+                    pass
+                
+                if attempt < max_retries - 1:
+                    print(f"  .. Retrying...")
+                    time.sleep(3)
+                else:
+                    print(f"  XX Failed to load page after {max_retries} attempts")
+                    return None
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    print(f"  .. Error: {str(e)[:50]}, retrying...")
+                    time.sleep(3)
+                else:
+                    print(f"  XX Error loading page: {str(e)[:50]}")
+                    return None
+        
+        page_readiness.wait(self.driver, 'javdb.movie', element_present('h1'), timeout=2)
+        page_source = self.fetcher.snapshot(url, 'movie', self.driver.page_source, {'code': video_code})
+        return parse_video_page(page_source, video_code, url)
     
     def scrape_video_by_code(self, video_code: str) -> Optional[VideoMetadata]:
         """
@@ -288,386 +240,132 @@ class CleanJAVDBScraper:
             VideoMetadata object or None
         """
         try:
-            # Ensure driver is initialized
-            if self.driver is None:
-                self._init_driver()
-            
             # Build direct URL
             code_lower = video_code.lower()
             url = f"https://www.javdatabase.com/movies/{code_lower}/"
             
             print(f"  Fetching: {url}")
             
-            # Try with retry and better timeout handling
-            max_retries = 3
-            page_loaded = False
-            
-            for attempt in range(max_retries):
-                try:
-                    self.driver.set_page_load_timeout(20)
-                    self.driver.get(url)
-                    page_loaded = True
-                    break
-                except TimeoutException:
-                    # Page is loading slowly, stop and use what we have
-                    print(f"  .. Timeout on attempt {attempt + 1}/{max_retries}, stopping page load...")
-                    try:
-                        self.driver.execute_script("window.stop();")
-                        time.sleep(1)
-                        # Check if we got enough content
-                        page_source = self.driver.page_source
-                        if len(page_source) > 5000:  # If we got substantial content
-                            print(f"  .. Got partial content, continuing...")
-                            page_loaded = True
-                            break
-                    except:
-                        pass
-                    
-                    if attempt < max_retries - 1:
-                        print(f"  .. Retrying...")
-                        time.sleep(3)
-                    else:
-                        print(f"  XX Failed to load page after {max_retries} attempts")
-                        return None
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        print(f"  .. Error: {str(e)[:50]}, retrying...")
-                        time.sleep(3)
-                    else:
-                        print(f"  XX Error loading page: {str(e)[:50]}")
-                        return None
-            
-            if not page_loaded:
-                print(f"  XX Could not load page")
-                return None
-            
-            time.sleep(2)
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            # Plain HTTP first, the browser only if blocked / incomplete
+            page, tier = self.fetcher.fetch(
+                url, kind='movie', required=('title', 'release_date'),
+                parse=lambda html: parse_video_page(html, video_code, url),
+                browser=lambda url: self._browser_movie_page(url, video_code),
+                snapshot_extra={'code': video_code})
             
             # Check if found
-            h1 = soup.find('h1')
-            if not h1:
-                print(f"  XX Not found")
-                return None
-            
-            title = h1.get_text(strip=True)
-            
-            if '404' in title or 'not found' in title.lower():
+            if not page:
                 print(f"  XX Not found (404)")
                 return None
             
-            print(f"  >> Found: {title[:60]}...")
-            
-            # Japanese title - look in multiple places
-            title_jp = None
-            jp_title_elem = soup.find('h2', class_=re.compile(r'jp|japanese', re.I))
-            if not jp_title_elem:
-                # Try finding by text pattern (Japanese characters)
-                h2_tags = soup.find_all('h2')
-                for h2 in h2_tags:
-                    text = h2.get_text(strip=True)
-                    # Check if contains Japanese characters
-                    if re.search(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]', text):
-                        jp_title_elem = h2
-                        break
-            if jp_title_elem:
-                title_jp = jp_title_elem.get_text(strip=True)
-            
-            # Cover image
-            cover_url = None
-            cover_url_dmm = None
-            
-            # Get JAVDatabase cover (high quality webp)
-            cover_img = soup.find('img', alt=re.compile(r'JAV Movie|Cover', re.I))
-            if not cover_img:
-                imgs = soup.find_all('img', src=True)
-                for img in imgs:
-                    src = img.get('src', '')
-                    if '/covers/' in src:
-                        cover_img = img
-                        break
-            
-            if cover_img:
-                cover_url = cover_img.get('src', '')
-                if cover_url.startswith('//'):
-                    cover_url = 'https:' + cover_url
-                elif cover_url.startswith('/'):
-                    cover_url = 'https://www.javdatabase.com' + cover_url
-            
-            # Get DMM cover (alternative source)
-            # Look in meta tags or images
-            dmm_meta = soup.find('meta', property='og:image')
-            if dmm_meta:
-                dmm_url = dmm_meta.get('content', '')
-                if 'pics.dmm.co.jp' in dmm_url:
-                    cover_url_dmm = dmm_url
-            
-            # Also check twitter:image meta tag
-            if not cover_url_dmm:
-                twitter_meta = soup.find('meta', attrs={'name': 'twitter:image'})
-                if twitter_meta:
-                    dmm_url = twitter_meta.get('content', '')
-                    if 'pics.dmm.co.jp' in dmm_url:
-                        cover_url_dmm = dmm_url
+            title = page.title
+            print(f"  >> Found ({tier}): {title[:60]}...")
             
-            # Cast profiles
+            # Cast profiles (the movie page is already parsed, so no navigating back)
             cast = []
-            actress_links = soup.find_all('a', href=re.compile(r'/idols/[a-z0-9-]+/$'))
             
-            for link in actress_links:
-                href = link.get('href', '')
-                if '/idols/?_' in href or href == '/idols/':
+            for name in page.actresses:
+                print(f"     Actress: {name}")
+                
+                # Known actress (shared cache): no profile page load
+                profile_href = page.actress_urls[name]
+                cache_key = profile_key('clean', name, profile_href)
+                cached = actress_profiles.get(cache_key)
+                if cached is not MISSING:
+                    if cached:
+                        cast.append(restore(ActressProfile, cached))
+                        print(f"       (cached profile)")
+                    else:
+                        print(f"       (cached: no profile data)")
                     continue
                 
-                name = link.get_text(strip=True)
-                if name and len(name) > 2:
-                    if name in ['All Idols', 'Most Favorited', 'Teen', 'Twenties', 'MILF', 'Thirties']:
-                        continue
-                    
-                    # Check if already added
-                    if any(actress.actress_name == name for actress in cast):
-                        continue
-                    
-                    print(f"     Actress: {name}")
-                    
-                    # Visit profile with retry logic
-                    profile = None
-                    max_retries = 2
-                    
-                    for attempt in range(max_retries):
-                        try:
-                            profile_href = href if href.startswith('http') else 'https://www.javdatabase.com' + href
-                            
-                            # Set page load timeout
-                            self.driver.set_page_load_timeout(15)
-                            
-                            # Try to load page
-                            try:
-                                self.driver.get(profile_href)
-                                time.sleep(2)
-                            except TimeoutException:
-                                # Page is taking too long, stop loading and use what we have
-                                print(f"       Timeout loading page, stopping...")
-                                try:
-                                    self.driver.execute_script("window.stop();")
-                                    time.sleep(1)
-                                except:
-                                    pass
-                            
-                            # Try to extract profile even if page didn't fully load
-                            profile_soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                            profile = self._extract_actress_profile(profile_soup, profile_href, name)
-                            
-                            if profile:
-                                cast.append(profile)
-                                details = []
-                                if profile.actress_age:
-                                    details.append(f"Age: {profile.actress_age}")
-                                if profile.actress_height_cm:
-                                    details.append(f"Height: {profile.actress_height_cm}cm")
-                                if profile.actress_bust_cm:
-                                    details.append(f"B{profile.actress_bust_cm}-W{profile.actress_waist_cm}-H{profile.actress_hips_cm}")
-                                if details:
-                                    print(f"       {', '.join(details)}")
-                                break  # Success, exit retry loop
-                            else:
-                                if attempt < max_retries - 1:
-                                    print(f"       No profile data, retrying...")
-                                    time.sleep(2)
-                                else:
-                                    print(f"       No profile data found")
-                            
-                        except Exception as e:
-                            if attempt < max_retries - 1:
-                                print(f"       Error: {str(e)[:50]}, retrying...")
-                                time.sleep(2)
-                            else:
-                                print(f"       Error: {str(e)[:50]}, skipping")
-                    
-                    # Navigate back to video page
+                # Visit profile with retry logic
+                profile = None
+                load_error = False
+                max_retries = 2
+                
+                def browser_profile(profile_url):
+                    nonlocal load_error
+                    self._ensure_driver()
+                    self.driver.set_page_load_timeout(15)
                     try:
-                        # Increase timeout for going back
-                        self.driver.set_page_load_timeout(10)
-                        self.driver.back()
-                        time.sleep(1)
+                        self.driver.get(profile_url)
+                        page_readiness.wait(self.driver, 'javdb.idol', element_present('h1'), timeout=2)
                     except TimeoutException:
-                        # If back() times out, reload the video page
-                        print(f"       Timeout going back, reloading video page...")
+                        # Page is taking too long, stop loading and use what we have
+                        print(f"       Timeout loading page, stopping...")
+                        load_error = True
                         try:
                             self.driver.execute_script("window.stop();")
                             time.sleep(1)
-                            self.driver.get(url)
-                            time.sleep(2)
-                            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
                         except:
                             pass
-                    except Exception as e:
-                        print(f"       Error navigating back: {str(e)[:50]}")
-            
-            # Extract metadata
-            page_text = soup.get_text()
-            
-            # Release date
-            release_date = None
-            release_match = re.search(r'Release[d]?\s*Date[:\s]+(\d{4}[-/]\d{1,2}[-/]\d{1,2})', page_text, re.I)
-            if release_match:
-                release_date = release_match.group(1).replace('/', '-')
-            
-            # Runtime
-            runtime_minutes = None
-            runtime_match = re.search(r'(?:Runtime|Duration)[:\s]+(\d+)\s*min', page_text, re.I)
-            if runtime_match:
-                runtime_minutes = int(runtime_match.group(1))
-            
-            # Director
-            director = None
-            director_match = re.search(r'Director[:\s]+([^\n]+)', page_text, re.I)
-            if director_match:
-                director = director_match.group(1).strip()
-                # Clean up if it contains other fields
-                for field in ['Genre(s):', 'Studio:', 'Label:', 'Series:']:
-                    if field in director:
-                        director = director.split(field)[0].strip()
-                # Filter out if it's just a placeholder
-                if director in ['?', '-', 'N/A', '']:
-                    director = None
-            
-            # Studio
-            studio = None
-            studio_match = re.search(r'Studio[:\s]+([^\n]+)', page_text, re.I)
-            if studio_match:
-                studio = studio_match.group(1).strip()
-                # Clean up
-                for field in ['Label:', 'Series:', 'Genre(s):']:
-                    if field in studio:
-                        studio = studio.split(field)[0].strip()
-                if studio in ['?', '-', 'N/A', '']:
-                    studio = None
-            
-            # Label
-            label = None
-            label_match = re.search(r'Label[:\s]+([^\n]+)', page_text, re.I)
-            if label_match:
-                label = label_match.group(1).strip()
-                # Clean up
-                for field in ['Series:', 'Genre(s):', 'Studio:']:
-                    if field in label:
-                        label = label.split(field)[0].strip()
-                if label in ['?', '-', 'N/A', '']:
-                    label = None
-            
-            # Series
-            series = None
-            series_match = re.search(r'Series[:\s]+([^\n]+)', page_text, re.I)
-            if series_match:
-                series = series_match.group(1).strip()
-                # Clean up
-                for field in ['Genre(s):', 'Studio:', 'Label:']:
-                    if field in series:
-                        series = series.split(field)[0].strip()
-                # Filter out navigation text and placeholders
-                if series in ['Studios', 'Series', '?', '-', 'N/A', '']:
-                    series = None
-            
-            # Genres - split by spaces and clean up
-            genres = []
-            genre_match = re.search(r'Genre\(s\)[:\s]+([^\n]+)', page_text, re.I)
-            if genre_match:
-                genre_text = genre_match.group(1)
-                # Split by multiple spaces or common separators
-                genre_list = re.split(r'\s{2,}|,\s*', genre_text)
-                for genre in genre_list:
-                    genre = genre.strip()
-                    # Further split camelCase or concatenated words
-                    if genre and len(genre) > 1:
-                        # Split by capital letters for things like "BigTitsCreampie"
-                        words = re.findall(r'[A-Z][a-z]*|[a-z]+', genre)
-                        if len(words) > 1:
-                            genres.extend([w for w in words if len(w) > 1])
-                        else:
-                            genres.append(genre)
-            
-            # Screenshots - extract both thumbnail and high-quality versions
-            screenshots = []
-            
-            # Method 1: Look for <a> tags with data-image-href (full-size URL already provided)
-            # This works for mgstage.com (Prestige studio) and other sources
-            screenshot_links = soup.find_all('a', attrs={'data-image-href': True})
-            for link in screenshot_links:
-                full_size = link.get('data-image-href', '')
-                # Support multiple CDNs: mgstage.com, pics.dmm.co.jp, etc.
-                if full_size and ('cap_e_' in full_size or 'pics.dmm.co.jp' in full_size):
-                    if full_size.startswith('//'):
-                        full_size = 'https:' + full_size
-                    elif full_size.startswith('/'):
-                        full_size = 'https://www.javdatabase.com' + full_size
-                    if full_size not in screenshots:
-                        screenshots.append(full_size)
-            
-            # Method 2: Look for data-image-src attribute (standard quality)
-            if not screenshots:
-                modal_imgs = soup.find_all('a', attrs={'data-image-src': True})
-                for link in modal_imgs:
-                    src = link.get('data-image-src', '')
-                    if src and 'pics.dmm.co.jp' in src:
-                        if src.startswith('//'):
-                            src = 'https:' + src
-                        if src not in screenshots:
-                            screenshots.append(src)
-            
-            # Method 3: Look for images with "Screenshot" alt text and convert thumbnails to full-size
-            if not screenshots:
-                screenshot_imgs = soup.find_all('img', alt=re.compile(r'Screenshot', re.I))
-                for img in screenshot_imgs:
-                    src = img.get('src', '')
-                    if src:
-                        # Convert mgstage thumbnails (cap_t1_) to full-size (cap_e_)
-                        if 'cap_t1_' in src:
-                            src = src.replace('cap_t1_', 'cap_e_')
+                    # Try to extract profile even if page didn't fully load
+                    page_source = self.fetcher.snapshot(profile_url, 'idol', self.driver.page_source, {'name': name})
+                    return self._extract_actress_profile(page_source, profile_url, name)
+                
+                for attempt in range(max_retries):
+                    try:
+                        profile, _ = self.fetcher.fetch(
+                            profile_href, kind='idol', required=('actress_name',),
+                            parse=lambda html: self._extract_actress_profile(html, profile_href, name),
+                            browser=browser_profile, snapshot_extra={'name': name})
                         
-                        # Ensure proper URL format
-                        if src.startswith('//'):
-                            src = 'https:' + src
-                        elif src.startswith('/'):
-                            src = 'https://www.javdatabase.com' + src
+                        if profile:
+                            cast.append(profile)
+                            details = []
+                            if profile.actress_age:
+                                details.append(f"Age: {profile.actress_age}")
+                            if profile.actress_height_cm:
+                                details.append(f"Height: {profile.actress_height_cm}cm")
+                            if profile.actress_bust_cm:
+                                details.append(f"B{profile.actress_bust_cm}-W{profile.actress_waist_cm}-H{profile.actress_hips_cm}")
+                            if details:
+                                print(f"       {', '.join(details)}")
+                            actress_profiles.put(cache_key, asdict(profile))
+                            break  # Success, exit retry loop
+                        else:
+                            if attempt < max_retries - 1:
+                                print(f"       No profile data, retrying...")
+                                time.sleep(2)
+                            else:
+                                print(f"       No profile data found")
+                                if not load_error:
+                                    actress_profiles.put(cache_key, None)
                         
-                        if src not in screenshots:
-                            screenshots.append(src)
+                    except Exception as e:
+                        load_error = True
+                        if attempt < max_retries - 1:
+                            print(f"       Error: {str(e)[:50]}, retrying...")
+                            time.sleep(2)
+                        else:
+                            print(f"       Error: {str(e)[:50]}, skipping")
             
-            # Method 4: Look for all mgstage images with cap_t1_ pattern
-            if not screenshots:
-                all_imgs = soup.find_all('img', src=re.compile(r'cap_t1_'))
-                for img in all_imgs:
-                    src = img.get('src', '')
-                    if src:
-                        # Convert to full-size version
-                        full_size = src.replace('cap_t1_', 'cap_e_')
-                        if full_size.startswith('//'):
-                            full_size = 'https:' + full_size
-                        elif full_size.startswith('/'):
-                            full_size = 'https://www.javdatabase.com' + full_size
-                        if full_size not in screenshots:
-                            screenshots.append(full_size)
+            runtime_minutes = int(page.runtime.split()[0]) if page.runtime else None
             
-            print(f"     Release: {release_date}, Runtime: {runtime_minutes}min")
-            print(f"     Studio: {studio}, Genres: {len(genres)}")
-            print(f"     Cast: {len(cast)}, Screenshots: {len(screenshots)}")
+            print(f"     Release: {page.release_date or None}, Runtime: {runtime_minutes}min")
+            print(f"     Studio: {page.studio or None}, Genres: {len(page.categories)}")
+            print(f"     Cast: {len(cast)}, Screenshots: {len(page.screenshots)}")
+            self.fetcher.print_stats()
             
             return VideoMetadata(
                 code=video_code.upper(),
                 title=title,
-                title_jp=title_jp,
-                cover_url=cover_url,
-                cover_url_dmm=cover_url_dmm,
-                screenshots=screenshots,
+                title_jp=page.title_jp if page.title_jp != title else None,
+                cover_url=page.cover_url or None,
+                cover_url_dmm=page.cover_url_dmm,
+                screenshots=page.screenshots,
                 cast=cast,
-                release_date=release_date,
+                release_date=page.release_date or None,
                 runtime_minutes=runtime_minutes,
-                director=director,
-                studio=studio,
-                label=label,
-                series=series,
-                genres=genres,
+                director=page.director or None,
+                studio=page.studio or None,
+                label=page.label or None,
+                series=page.series or None,
+                genres=page.categories,
+                description=page.description or None,
+                rating=page.rating or None,
+                rating_count=page.rating_count,
                 source_url=url,
                 scraped_at=datetime.now().isoformat()
             )
@@ -679,8 +377,7 @@ class CleanJAVDBScraper:
             return None
     
     def scrape_from_jable_database(self, jable_db_path: str) -> List[VideoMetadata]:
-        """Scrape all videos from Jable database"""
-        self._init_driver()
+        """Scrape all videos from Jable database (serial - backfill.py does the catalog in parallel, resumably)"""
         
         print("="*60)
         print("Clean JAVDatabase Scraper")
@@ -730,7 +427,6 @@ def main():
     
     try:
         if args.code:
-            scraper._init_driver()
             print(f"\nScraping: {args.code}\n")
             video_data = scraper.scrape_video_by_code(args.code)
             if video_data:
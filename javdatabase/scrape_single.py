@@ -44,11 +44,7 @@ class SingleVideoScraper:
                 
                 # Initialize scraper if needed
                 if self.scraper is None:
-                    self.scraper = CleanJAVDBScraper(headless=self.headless)
-                    self.scraper._init_driver()
-                
-                # Set timeout
-                self.scraper.driver.set_page_load_timeout(self.timeout)
+                    self.scraper = CleanJAVDBScraper(headless=self.headless)  # Browser starts only if HTTP is not enough
                 
                 # Scrape video
                 video_data = self.scraper.scrape_video_by_code(video_code)
@@ -0,0 +1,191 @@
+"""
+Test the shared actress profile cache
+- A profile stored by one scraper process is a hit in a fresh process:
+  a known cast needs zero profile page loads
+- "No profile" is cached with the shorter negative TTL, profiles with the
+  long one; expired entries are misses and are purged from the file
+- A search miss only seen over HTTP gets the short unconfirmed TTL, one the
+  browser confirmed the negative TTL, and a failed search is not cached
+- Concurrent processes writing different actresses keep each other's entries
+
+Uses a temporary cache file, never database/actress_profiles.json.
+
+Usage: python test_actress_profiles.py
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import subprocess
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Optional
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import javdb_scraper
+from actress_profiles import ActressProfileCache, profile_key, restore, MISSING
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class Profile:
+    name: str
+    profile_url: str
+    age: Optional[str] = None
+
+
+def scrape_cast(cache, cast, loads):
+    """Scraper-style lookup: page load (counted) only on a cache miss"""
+    profiles = {}
+    for name, url in cast:
+        key = profile_key('test', name, url)
+        cached = cache.get(key)
+        if cached is not MISSING:
+            profiles[name] = restore(Profile, cached)
+            continue
+
+        loads.append(url)
+        if url.endswith('/unknown/'):
+            cache.put(key, None)
+            profiles[name] = None
+        else:
+            profile = Profile(name=name, profile_url=url, age='25')
+            cache.put(key, asdict(profile))
+            profiles[name] = profile
+    return profiles
+
+
+class SearchFetcher:
+    """TieredFetcher stand-in: every search comes back empty from `tier`"""
+
+    def __init__(self, tier):
+        self.tier = tier
+
+    def fetch(self, url, parse, required=(), browser=None, kind='page', snapshot_extra=None):
+        return ([] if self.tier else None), self.tier
+
+
+def search_miss_ttls(cache_file):
+    """Seconds each search outcome keeps "no profile" cached (None = not cached)"""
+    cache = ActressProfileCache(cache_file, negative_ttl=86400, unconfirmed_ttl=600)
+    scraper = javdb_scraper.JAVDatabaseScraper()
+    ttls = {}
+    with mock.patch.object(javdb_scraper, 'actress_profiles', cache):
+        for tier in ('http', 'browser', None):
+            name = f'Nobody {tier}'
+            scraper.fetcher = SearchFetcher(tier)
+            assert scraper.scrape_actress_profile(name) is None
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f).get(profile_key('javdb', name))
+            ttls[tier] = entry and round(entry['expires_at'] - entry['cached_at'])
+    return ttls
+
+
+def run_in_process(cache_file, code):
+    """Run code in a fresh interpreter with `cache` bound to cache_file"""
+    script = (
+        f"import sys; sys.path.insert(0, {PROJECT_ROOT!r})\n"
+        f"from actress_profiles import ActressProfileCache, MISSING\n"
+        f"cache = ActressProfileCache({cache_file!r})\n" + code
+    )
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_actress_profiles():
+    temp_dir = tempfile.mkdtemp()
+    cache_file = os.path.join(temp_dir, 'actress_profiles.json')
+    cast = [
+        ('Yua Mikami', 'https://www.javdatabase.com/idols/yua-mikami/'),
+        ('Nobody', 'https://www.javdatabase.com/idols/unknown/'),
+    ]
+
+    try:
+        # Keys: profile slug when known, normalized name otherwise
+        assert profile_key('javdb', 'Yua Mikami', cast[0][1]) == 'javdb:idol:yua-mikami'
+        assert profile_key('javdb', '  Yua   Mikami ') == 'javdb:name:yua mikami'
+
+        # First enrichment loads every profile
+        loads = []
+        first = ActressProfileCache(cache_file)
+        profiles = scrape_cast(first, cast, loads)
+        assert len(loads) == 2, loads
+        assert profiles['Yua Mikami'].age == '25' and profiles['Nobody'] is None
+        print(f"First run: {len(loads)} profile loads")
+
+        # New scraper instance, same process: zero loads
+        loads = []
+        profiles = scrape_cast(ActressProfileCache(cache_file), cast, loads)
+        assert loads == [], f"Known cast loaded pages again: {loads}"
+        assert profiles['Yua Mikami'] == Profile('Yua Mikami', cast[0][1], '25')
+        print("Second instance: 0 profile loads")
+
+        # Another process sees both the profile and the negative entry
+        output = run_in_process(cache_file, (
+            "p = cache.get('test:idol:yua-mikami'); n = cache.get('test:idol:unknown')\n"
+            "print(p['age'], n is None, n is not MISSING)"
+        ))
+        assert output == '25 True True', output
+        print("Other process: profile and negative entry are hits")
+
+        # TTLs: negative entries expire first
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        positive = entries['test:idol:yua-mikami']
+        negative = entries['test:idol:unknown']
+        assert positive['expires_at'] - positive['cached_at'] > negative['expires_at'] - negative['cached_at']
+
+        short = ActressProfileCache(cache_file, ttl=0.2, negative_ttl=0.1)
+        short.put('test:idol:short-lived', {'name': 'Short', 'profile_url': ''})
+        assert short.get('test:idol:short-lived') is not MISSING
+        time.sleep(0.3)
+        assert short.get('test:idol:short-lived') is MISSING, "Expired profile was still served"
+        short.put('test:idol:other', None)  # any write purges expired entries
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            assert 'test:idol:short-lived' not in json.load(f)
+        print("Expired entries are misses and get purged")
+
+        # Search misses: HTTP-only ones are not trusted for the full negative TTL
+        ttls = search_miss_ttls(cache_file)
+        print(f"Search miss TTLs: {ttls}")
+        assert ttls == {'http': 600, 'browser': 86400, None: None}, ttls
+
+        # Unknown cached fields (older scraper versions) are ignored
+        assert restore(Profile, {'name': 'A', 'profile_url': 'u', 'removed_field': 1}) == Profile('A', 'u')
+
+        # Concurrent writers keep each other's entries
+        writer = ("import sys\n"
+                  "for i in range(20):\n"
+                  "    cache.put(f'test:name:{sys.argv[1]}-{i}', {'name': str(i)})\n")
+        procs = [subprocess.Popen([sys.executable, '-c',
+                                   f"import sys; sys.path.insert(0, {PROJECT_ROOT!r})\n"
+                                   f"from actress_profiles import ActressProfileCache\n"
+                                   f"cache = ActressProfileCache({cache_file!r})\n" + writer, tag])
+                 for tag in ('a', 'b')]
+        for proc in procs:
+            assert proc.wait(timeout=60) == 0
+
+        final = ActressProfileCache(cache_file)
+        missing = [f'{tag}-{i}' for tag in ('a', 'b') for i in range(20)
+                   if final.get(f'test:name:{tag}-{i}') is MISSING]
+        assert not missing, f"Lost concurrent writes: {missing}"
+        print("Concurrent processes: 40/40 entries kept")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    try:
+        test_actress_profiles()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Actress profiles are shared across scraper instances and processes")
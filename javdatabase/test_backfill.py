@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Test the bulk JAVDatabase backfill (backfill.py)
+- Only catalog videos without JAVDatabase metadata are queued (FC2 and
+  already enriched ones are left out)
+- Workers run in parallel but never exceed the per-domain request cap, and
+  request starts are spaced by the minimum interval - for every page request
+  a video makes (movie and idol pages), not just per video
+- Each result is saved as soon as it is scraped
+- An interrupted backfill resumes without redoing finished videos, and a
+  video not on JAVDatabase yet is not retried before its 2-day schedule
+- A video the retry manager gave up on is not queued again
+- Ctrl+C hands the videos still being scraped back to the queue at once
+- With the real database save, every video a multi-worker run enriched is
+  in the catalog with its metadata, also while the main loop saves other
+  videos at the same time
+
+Offline - fake catalog, save and HTTP session behind a real TieredFetcher.
+Uses a temporary queue database and temporary database files.
+
+Usage: python test_backfill.py
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import database_manager
+from database_manager import db_manager
+import backfill
+from retry_manager import JAVDBRetryManager
+from backfill import Backfill, DomainGate
+from tiered_fetch import TieredFetcher
+
+
+class FakeSession:
+    """JAVDatabase stand-in: records when each request starts and how many overlap"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.starts = []
+        self.active = 0
+        self.peak = 0
+
+    def get(self, url, **kwargs):
+        with self.lock:
+            self.starts.append(time.monotonic())
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        return SimpleNamespace(status_code=200, text=f'<html><h1>{url}</h1></html>', url=url)
+
+
+def test_backfill():
+    temp_dir = tempfile.mkdtemp()
+    manager = JAVDBRetryManager(queue_file=os.path.join(temp_dir, 'javdb_retry_queue.db'))
+    catalog = [{'code': f'ABC-{i:03d}', 'title': f'ABC-{i:03d}'} for i in range(12)]
+    catalog += [{'code': 'NEW-001'}, {'code': 'FC2-PPV-123'}, {'code': 'OLD-001', 'javdb_available': True}]
+    scraped = []
+    lock = threading.Lock()
+    session = FakeSession()
+    fetcher = TieredFetcher('javdb-test', session=session, stats_file=os.path.join(temp_dir, 'fetch_tiers.json'))
+
+    def scrape(code):
+        """Movie page plus two idol pages, like the real scraper"""
+        with lock:
+            scraped.append(code)
+        base = 'https://www.javdatabase.com'
+        pages = [f'{base}/movies/{code.lower()}/', f'{base}/idols/a-{code.lower()}/', f'{base}/idols/b-{code.lower()}/']
+        for url in pages:
+            fetcher.fetch(url, parse=lambda html: {'title': html}, required=('title',))
+        return None if code == 'NEW-001' else {'code': code, 'title': f'{code} title', 'cast': []}
+
+    def save(code, source_data, javdb_data):
+        # Checkpoint: the catalog entry is enriched right away
+        for video in catalog:
+            if video['code'] == code:
+                video.update(javdb_data, javdb_available=True)
+        return True
+
+    def make_backfill():
+        return Backfill(workers=4, domain_concurrency=2, min_interval=0.02, manager=manager,
+                        scrape=scrape, save=save, load_videos=lambda: catalog, report_interval=0.5)
+
+    try:
+        # Interrupted after a few videos
+        first = make_backfill()
+        assert [v['code'] for v in first.pending()] == [f'ABC-{i:03d}' for i in range(12)] + ['NEW-001']
+        summary = first.run(timeout=0.5)
+        assert not summary['completed'] and summary['queued'] == 13, summary
+        done_first = set(scraped)
+        assert 0 < len(done_first) < 13, done_first
+        assert session.peak == first.gate.peak == 2, f"Domain cap not reached/exceeded: peak {session.peak}"
+        gaps = [b - a for a, b in zip(session.starts, session.starts[1:])]
+        assert min(gaps) >= 0.015, f"Requests started {min(gaps):.3f}s apart"
+        enriched_first = [v['code'] for v in catalog if v.get('javdb_available') and v['code'] != 'OLD-001']
+        assert enriched_first, "No result was checkpointed during the run"
+        assert len(session.starts) >= 3 * len(enriched_first), "Idol pages were not requested"
+        print(f"Interrupted: {len(done_first)} scraped, {len(enriched_first)} saved, "
+              f"at most {first.gate.peak} requests at once")
+
+        # Resume: finished videos are not scraped again
+        second = make_backfill()
+        summary = second.run(timeout=20)
+        assert summary['completed'], summary
+        assert len(scraped) == len(set(scraped)) == 13, f"Videos scraped twice: {sorted(scraped)}"
+        assert all(v.get('javdb_available') for v in catalog if v['code'].startswith('ABC'))
+        assert 'FC2-PPV-123' not in scraped and 'OLD-001' not in scraped
+        print(f"Resumed: {summary['processed']} processed, none redone")
+
+        # A third run has nothing due: NEW-001 waits for its retry date
+        third = make_backfill()
+        summary = third.run(timeout=5)
+        assert summary['completed'] and summary['processed'] == 0 and summary['queued'] == 0, summary
+        queue = {item['code']: item for item in manager.load_queue()}
+        assert set(queue) == {'NEW-001'} and queue['NEW-001']['retry_count'] == 1, queue
+        print("Rerun: not-found video left for its scheduled retry")
+
+        # Given up after max retries: not queued again
+        for _ in range(manager.max_retries - 1):
+            manager.update_retry_status('NEW-001', success=False)
+        summary = make_backfill().run(timeout=5)
+        assert summary['queued'] == 0 and summary['processed'] == 0, summary
+        assert manager.get_queue_stats()['max_retries_reached'] == 1
+        assert manager.add_many_to_queue([{'code': 'NEW-001'}], delay_days=0) == 0
+        print("Given up: not re-added by the next backfill")
+
+        # Ctrl+C while workers are mid-scrape: their videos are due again at once
+        catalog.extend({'code': f'INT-{i:03d}'} for i in range(4))
+        entered = threading.Semaphore(0)
+        blocker = threading.Event()
+
+        def slow_scrape(code):
+            entered.release()
+            blocker.wait(10)
+            return {'code': code, 'title': code, 'cast': []}
+
+        def interrupt(seconds):
+            for _ in range(2):
+                entered.acquire(timeout=5)
+            raise KeyboardInterrupt
+
+        interrupted = Backfill(workers=2, manager=manager, scrape=slow_scrape, save=save,
+                               load_videos=lambda: catalog, report_interval=0.5)
+        no_wait = SimpleNamespace(time=time.time, sleep=interrupt)
+        try:
+            with mock.patch.object(backfill, 'time', no_wait), mock.patch.object(backfill, 'INTERRUPT_GRACE', 0.2):
+                summary = interrupted.run()
+            stats = manager.get_queue_stats()
+            held = [item for item in manager.load_queue() if item.get('claimed_by')]
+            assert not summary['completed'] and summary['queued'] == 4, summary
+            assert stats['in_progress'] == 0 and stats['ready_for_retry'] == 4 and not held, (stats, held)
+            print("Interrupted: unfinished videos handed back, all 4 due at once")
+        finally:
+            blocker.set()
+
+        gate = DomainGate('example.com', 1)
+        with gate:
+            assert gate.active == 1
+        assert gate.active == 0 and gate.peak == 1
+    finally:
+        fetcher.flush()
+        time.sleep(0.2)  # Let interrupted workers finish before removing their database
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_backfill_into_catalog():
+    temp_dir = tempfile.mkdtemp()
+    patched = {name: getattr(database_manager, name) for name in ('COMBINED_DB', 'PROGRESS_DB', 'STATS_DB', 'FAILED_DB')}
+    for name, path in patched.items():
+        setattr(database_manager, name, os.path.join(temp_dir, os.path.basename(path)))
+    manager = JAVDBRetryManager(queue_file=os.path.join(temp_dir, 'javdb_retry_queue.db'))
+    codes = [f'CAT-{i:03d}' for i in range(24)]
+
+    def scrape(code):
+        time.sleep(0.01)
+        return {'code': code, 'title': f'{code} JAVDatabase title', 'cast': [{'actress_name': 'A'}], 'genres': ['G']}
+
+    try:
+        for code in codes:
+            db_manager.add_or_update_video({'code': code, 'processed_at': '2026-01-01T00:00:00',
+                                            'hosting': {'streamwish': {'file_code': code}}})
+
+        # Main loop adding new videos while the backfill saves
+        def main_loop():
+            for i in range(10):
+                db_manager.add_or_update_video({'code': f'NEW-{i:03d}', 'processed_at': '2026-01-02T00:00:00',
+                                                'javdb_available': True})
+
+        runner = Backfill(workers=4, domain_concurrency=4, min_interval=0, manager=manager, scrape=scrape,
+                          report_interval=0.5)
+        loop = threading.Thread(target=main_loop)
+        loop.start()
+        summary = runner.run(timeout=30)
+        loop.join()
+
+        assert summary['completed'] and runner.pool.counts['enriched'] == len(codes), (summary, runner.pool.counts)
+        videos = {video['code']: video for video in db_manager.get_all_videos()}
+        lost = [code for code in codes if not videos.get(code, {}).get('javdb_available')
+                or videos[code].get('title') != f'{code} JAVDatabase title' or not videos[code].get('hosting')]
+        assert not lost, f"Enriched but not (fully) in the catalog: {lost}"
+        assert all(f'NEW-{i:03d}' in videos for i in range(10)), "Main loop's videos lost"
+        assert not manager.load_queue(), "Enriched videos left in the queue"
+        print(f"Catalog: all {len(codes)} enriched videos saved by 4 workers, main loop's saves kept")
+    finally:
+        for name, path in patched.items():
+            setattr(database_manager, name, path)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    try:
+        test_backfill()
+        test_backfill_into_catalog()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Catalog backfill runs in a bounded, polite worker pool and resumes where it stopped")
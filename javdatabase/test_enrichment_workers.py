@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test the background JAVDatabase enrichment workers (enrichment_workers.py)
+- enqueue() returns at once; the workers scrape queued videos in parallel
+  and merge the JAVDatabase data into the saved source data
+- A video not on JAVDatabase yet gets the source-page fallback and is
+  rescheduled (retry manager's 2-day rule),
+  a scrape error is retried later without counting an attempt, FC2 codes are
+  dropped from the queue
+- A video claimed by a worker that died is picked up again once its lease
+  runs out
+- drain() waits for the due videos only
+- merge_into_database from several threads, next to plain saves of other
+  fields, loses no video and no field (locked read-modify-write)
+
+Offline - fake scrape / save. Uses a temporary queue database and temporary
+database files, never the real database.
+
+Usage: python test_enrichment_workers.py
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import database_manager
+from database_manager import db_manager
+from retry_manager import JAVDBRetryManager
+from enrichment_workers import EnrichmentWorkers, javdb_lookup_code, javgg_fallback, merge_into_database
+
+
+def patch_database(temp_dir):
+    """Point the database manager at temporary files; returns the originals"""
+    patched = {name: getattr(database_manager, name) for name in ('COMBINED_DB', 'PROGRESS_DB', 'STATS_DB', 'FAILED_DB')}
+    for name, path in patched.items():
+        setattr(database_manager, name, os.path.join(temp_dir, os.path.basename(path)))
+    return patched
+
+
+def test_enrichment_workers():
+    temp_dir = tempfile.mkdtemp()
+    manager = JAVDBRetryManager(queue_file=os.path.join(temp_dir, 'javdb_retry_queue.db'))
+    saved = {}
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def scrape(code):
+        with lock:
+            active.append(code)
+            peak.append(len(active))
+        time.sleep(0.3)
+        with lock:
+            active.remove(code)
+        if code == 'ERR-001':
+            raise RuntimeError("connection reset")
+        if code == 'NEW-001':
+            return None
+        return {'code': code, 'title': f'{code} JAVDatabase title', 'cast': [{'actress_name': 'A'}], 'genres': ['G']}
+
+    def save(code, source_data, javdb_data):
+        saved[code] = {**source_data, **javdb_data}
+        return True
+
+    fallbacks = {}
+
+    def fallback(code, source_data):
+        fallbacks[code] = source_data
+        return True
+
+    workers = EnrichmentWorkers(workers=3, manager=manager, scrape=scrape, save=save, fallback=fallback,
+                                poll_interval=0.1)
+    try:
+        assert javdb_lookup_code('apak-323-reduce-mosaic') == 'APAK-323'
+
+        # Enqueue returns without waiting for JAVDatabase
+        start = time.time()
+        for code in ('ABC-001', 'ABC-002', 'ABC-003', 'NEW-001', 'ERR-001', 'FC2-PPV-123'):
+            workers.enqueue(code, {'code': code, 'hosting': {'streamwish': {'embed_url': f'https://x/{code}'}}})
+        assert time.time() - start < 1.0, f"enqueue blocked for {time.time() - start:.1f}s"
+        print(f"Enqueue: 6 videos queued in {time.time() - start:.2f}s")
+
+        assert workers.drain(timeout=10), "Queue did not drain"
+        assert max(peak) > 1, "Workers did not run in parallel"
+        assert set(saved) == {'ABC-001', 'ABC-002', 'ABC-003'}, saved
+        assert saved['ABC-001']['hosting'] and saved['ABC-001']['title'] == 'ABC-001 JAVDatabase title'
+        print(f"Workers: 3 videos enriched, up to {max(peak)} scrapes at once")
+
+        queue = {item['code']: item for item in manager.load_queue()}
+        assert set(queue) == {'NEW-001', 'ERR-001'}, list(queue)
+        assert queue['NEW-001']['retry_count'] == 1 and 'claimed_by' not in queue['NEW-001']
+        assert queue['ERR-001']['retry_count'] == 0, "A scrape error counted as an attempt"
+        assert workers.counts == {'enriched': 3, 'not_found': 1, 'skipped': 1, 'errors': 1}, workers.counts
+        assert list(fallbacks) == ['NEW-001'] and fallbacks['NEW-001']['code'] == 'NEW-001', fallbacks
+        assert not javgg_fallback('XYZ-001', {'code': 'XYZ-001', 'source_url': 'https://jable.tv/videos/xyz-001/'})
+        print("Not found: fallback run and rescheduled; error: retried later, no attempt counted; FC2: dropped")
+
+        # A worker died holding a claim: the video comes back once the lease runs out
+        workers.stop()
+        workers.enqueue('ABC-004', {'code': 'ABC-004'}, start=False)
+        assert manager.claim_next('dead-worker', lease_seconds=1)['code'] == 'ABC-004'
+        assert workers.run_one('w') is None, "Claimed video was handed out twice"
+        assert manager.get_queue_stats()['in_progress'] == 1
+        time.sleep(1.1)
+        assert workers.run_one('w') == 'enriched' and 'ABC-004' in saved
+        print("Lease: video of a dead worker re-claimed after the lease expired")
+    finally:
+        workers.stop()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_concurrent_merges():
+    temp_dir = tempfile.mkdtemp()
+    patched = patch_database(temp_dir)
+    codes = [f'CON-{t}{i:02d}' for t in range(3) for i in range(10)]
+    try:
+        for code in codes:
+            db_manager.add_or_update_video({'code': code, 'processed_at': '2026-01-01T00:00:00'})
+
+        def merge(thread):
+            for code in codes[thread * 10:(thread + 1) * 10]:
+                assert merge_into_database(code, {'code': code}, {'code': code, 'title': f'{code} title'})
+
+        def host():
+            # Main loop saving hosting over its own copy of each entry, meanwhile
+            for code in codes:
+                assert db_manager.update_video(code, lambda current: {
+                    **current, 'hosting': {'streamwish': {'embed_url': f'https://x/{current["code"]}'}}})
+
+        threads = [threading.Thread(target=merge, args=(t,)) for t in range(3)] + [threading.Thread(target=host)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        videos = {video['code']: video for video in db_manager.get_all_videos()}
+        assert set(videos) == set(codes), f"{len(set(codes) - set(videos))} of {len(codes)} videos lost"
+        missing = [code for code in codes if not videos[code].get('title') or not videos[code].get('hosting')]
+        assert not missing, f"Fields lost by concurrent saves: {missing}"
+        print(f"Concurrent saves: 3 merge threads + 1 hosting thread, all {len(codes)} videos complete")
+    finally:
+        for name, path in patched.items():
+            setattr(database_manager, name, path)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    try:
+        test_enrichment_workers()
+        test_concurrent_merges()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ JAVDatabase enrichment runs in background workers fed by the retry queue")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test the HTML snapshot store (html_snapshots.py) with the JAVDatabase fixtures
+- Pages parsed by TieredFetcher are stored compressed, once per distinct
+  content, with the parser inputs (code, actress name)
+- re_extract() runs the current parsers over the stored pages (movie, idol
+  and search) with no network requests - a changed parser changes the results
+- Only the newest versions of a URL are kept, and past the size bound the
+  oldest fetches are evicted along with their files
+- Without HTML_SNAPSHOTS the fetcher stores nothing
+- capture() stores a page whatever its status; export_fixtures() writes stored
+  pages out as parser fixtures, byte for byte, with their expected results
+  and source, merged into an existing expected.json
+
+Offline - fake HTTP session. Uses a temporary store.
+
+Usage: python test_html_snapshots.py
+"""
+import os
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+from types import SimpleNamespace
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import javdb_parser
+from javdb_parser import find_idol_links, parse_actress_page, parse_video_page
+from tiered_fetch import TieredFetcher
+from html_snapshots import SnapshotStore, capture, export_fixtures, re_extract
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+MOVIE_URL = 'https://www.javdatabase.com/movies/vec-759/'
+IDOL_URL = 'https://www.javdatabase.com/idols/hibiki-amamiya/'
+SEARCH_URL = 'https://www.javdatabase.com/idols/?q=Yua%20Mikami'
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class FixtureSession:
+    def __init__(self, pages):
+        self.pages = pages
+        self.gets = []
+
+    def get(self, url, **kwargs):
+        self.gets.append(url)
+        return SimpleNamespace(status_code=200, url=url, text=load_fixture(self.pages[url]))
+
+
+def object_files(store):
+    return [name for _, _, names in os.walk(store.objects_dir) for name in names]
+
+
+def test_html_snapshots():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        store = SnapshotStore(root=os.path.join(temp_dir, 'snapshots'))
+        session = FixtureSession({MOVIE_URL: 'movie_vec-759.html'})
+        fetcher = TieredFetcher('javdb', session=session, stats_file=os.path.join(temp_dir, 'tiers.json'),
+                                snapshots=store)
+
+        # Stored on fetch, deduplicated by content
+        for _ in range(2):
+            metadata, tier = fetcher.fetch(MOVIE_URL, kind='movie', required=('title',),
+                                           parse=lambda html: parse_video_page(html, 'VEC-759', MOVIE_URL),
+                                           snapshot_extra={'code': 'VEC-759'})
+            assert metadata and tier == 'http'
+        fetcher.snapshot(IDOL_URL, 'idol', load_fixture('idol_hibiki-amamiya.html'), {'name': 'Hibiki Amamiya'})
+        stats = store.stats()
+        assert stats['fetches'] == 3 and stats['urls'] == 2 and stats['pages'] == 2, stats
+        assert stats['bytes'] < stats['raw_bytes'] / 2, stats
+        assert len(object_files(store)) == 2
+        snapshot = store.latest(MOVIE_URL)
+        assert snapshot['extra'] == {'code': 'VEC-759'} and snapshot['html'] == load_fixture('movie_vec-759.html')
+        print(f"Store: 3 fetches, 2 pages, {stats['raw_bytes'] / stats['bytes']:.1f}x compressed")
+
+        # Re-extract with the current parsers, no requests
+        gets = len(session.gets)
+        results = {r['url']: r for r in re_extract(store, scraper='javdb')}
+        assert len(session.gets) == gets, "Re-extraction fetched pages"
+        assert results[MOVIE_URL]['result']['title'] == metadata.title
+        expected_idol = parse_actress_page(load_fixture('idol_hibiki-amamiya.html'), 'Hibiki Amamiya', IDOL_URL)
+        assert results[IDOL_URL]['result']['name'] == expected_idol.name
+        assert [r['url'] for r in re_extract(store, kind='movie')] == [MOVIE_URL]
+
+        # A fixed parser shows up in the re-extracted results
+        def fixed_parser(html, code, url=None):
+            return {'code': code, 'title': 'fixed title'}
+        with mock.patch.object(javdb_parser, 'parse_video_page', fixed_parser):
+            assert re_extract(store, kind='movie')[0]['result']['title'] == 'fixed title'
+        print("Re-extract: current parsers run over stored pages, no network")
+
+        # Captured pages exported as fixtures: same bytes, parsed like the repo's fixtures
+        search = capture(store, SEARCH_URL, 'search', session=FixtureSession({SEARCH_URL: 'idol_search_yua-mikami.html'}))
+        assert search['extra'] == {'status': 200} and search['tier'] == 'http'
+        searched = re_extract(store, kind='search')
+        expected_links = [list(link) for link in find_idol_links(load_fixture('idol_search_yua-mikami.html'))]
+        assert [r['url'] for r in searched] == [SEARCH_URL] and expected_links
+        assert searched[0]['result'] == expected_links
+
+        fixtures_dir = os.path.join(temp_dir, 'fixtures')
+        os.makedirs(fixtures_dir)
+        with open(os.path.join(FIXTURES, 'expected.json'), 'r', encoding='utf-8') as f:
+            repo_cases = json.load(f)
+        with open(os.path.join(fixtures_dir, 'expected.json'), 'w', encoding='utf-8') as f:
+            json.dump(repo_cases, f)
+
+        exported = export_fixtures(store, fixtures_dir)
+        names = ['movie_vec-759.html', 'idol_hibiki-amamiya.html', 'idol_search_yua-mikami.html']
+        assert sorted(case['file'] for case in exported) == sorted(names), exported
+        with open(os.path.join(fixtures_dir, 'expected.json'), 'r', encoding='utf-8') as f:
+            cases = {case['file']: case for case in json.load(f)}
+        assert len(cases) == len(repo_cases), "Other fixtures dropped from expected.json"
+        for repo_case in repo_cases:
+            case = cases[repo_case['file']]
+            if repo_case['file'] not in names:
+                assert case == repo_case
+                continue
+            with open(os.path.join(fixtures_dir, case['file']), 'rb') as f:
+                raw = f.read()
+            assert raw.decode('utf-8') == load_fixture(case['file'])
+            assert case['source']['digest'] == hashlib.sha256(raw).hexdigest()
+            assert {k: v for k, v in case.items() if k != 'source'} == repo_case, case['file']
+        assert cases['movie_vec-759.html']['source']['url'] == MOVIE_URL
+        print(f"Fixtures: {len(exported)} stored pages exported with their expected results and source")
+
+        # Versions per URL and the size bound
+        small = SnapshotStore(root=os.path.join(temp_dir, 'small'), versions=2, max_bytes=10 ** 9)
+        for i in range(3):
+            small.put('https://example.com/a', f'<html>version {i}</html>', 'javdb', 'movie', fetched_at=100 + i)
+        assert small.stats()['fetches'] == 2 and small.latest('https://example.com/a')['html'] == '<html>version 2</html>'
+        assert len(object_files(small)) == 2
+
+        page = os.urandom(4096).hex()  # incompressible
+        small.max_bytes = 20000
+        for i in range(5):
+            small.put(f'https://example.com/p{i}', f'{page}{i}', 'javdb', 'movie', fetched_at=200 + i)
+        stats = small.stats()
+        assert stats['bytes'] <= 20000, stats
+        assert small.latest('https://example.com/p4') and not small.latest('https://example.com/a')
+        assert len(object_files(small)) == stats['pages'], "Evicted page files left on disk"
+        print(f"Bounds: 2 versions per URL, {stats['pages']} pages kept under {small.max_bytes} bytes")
+
+        # Off unless enabled
+        with mock.patch('tiered_fetch.get_store', return_value=None):
+            plain = TieredFetcher('javdb', session=session, stats_file=os.path.join(temp_dir, 'tiers.json'))
+        assert plain.snapshots is None and plain.snapshot(MOVIE_URL, 'movie', '<html/>') == '<html/>'
+        print("Disabled: nothing stored")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    try:
+        test_html_snapshots()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Fetched pages are kept compressed and can be re-parsed without refetching")
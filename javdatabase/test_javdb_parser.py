@@ -0,0 +1,205 @@
+"""
+Test the JAVDatabase parser against the saved HTML fixtures
+- Every fixture in fixtures/expected.json parses to its recorded result
+  (movie pages, idol profiles, idol search results, a 404 page); fixtures
+  exported from the snapshot store are still the page they captured
+- JAVDatabaseScraper runs end to end on the fixtures over (fake) plain HTTP:
+  movie page + profile page, with full actress details, no browser page loads
+- A second scraper instance makes no profile page requests (shared cache)
+- A 404 over HTTP is final; a Cloudflare-blocked HTTP response escalates to
+  the (fake) browser, whose page loads wait for their ready element
+
+Offline - no browser, no network. Uses temporary actress cache, ready-time
+and fetch-tier files.
+
+Usage: python test_javdb_parser.py
+"""
+import os
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+from dataclasses import asdict
+from types import SimpleNamespace
+from unittest import mock
+
+import javdb_scraper
+from javdb_parser import (PARSER, best_idol_match, find_idol_links, make_soup, parse_actress_page,
+                          parse_video_page)
+from actress_profiles import ActressProfileCache
+from page_readiness import PageReadiness
+from tiered_fetch import TieredFetcher
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+BASE_URL = 'https://www.javdatabase.com'
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def parse_case(case):
+    html = load_fixture(case['file'])
+    if case['type'] == 'video':
+        result = parse_video_page(html, case['code'])
+        if result is None:
+            return None
+        result = asdict(result)
+        result.pop('scraped_at')
+        return result
+    if case['type'] == 'actress':
+        return asdict(parse_actress_page(html, case['name'], case['url']))
+    return [list(link) for link in find_idol_links(html)]
+
+
+class FixtureSession:
+    """Just enough of a requests session: get(url) serves a fixture page (404 if unknown)"""
+
+    def __init__(self, pages, blocked=False):
+        self.pages = pages
+        self.blocked = blocked
+        self.gets = []
+
+    def get(self, url, **kwargs):
+        self.gets.append(url)
+        if self.blocked:
+            return SimpleNamespace(status_code=403, url=url,
+                                   text='<html><head><title>Just a moment...</title></head></html>')
+        if url not in self.pages:
+            return SimpleNamespace(status_code=404, url=url, text=load_fixture('movie_not_found.html'))
+        return SimpleNamespace(status_code=200, url=url, text=load_fixture(self.pages[url]))
+
+
+class FixtureDriver:
+    """Just enough of a Selenium driver: get(url) serves a fixture page"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.loads = []
+        self.page_source = ''
+        self.current_url = ''
+
+    def get(self, url):
+        self.loads.append(url)
+        self.current_url = url
+        self.page_source = load_fixture(self.pages.get(url, 'movie_not_found.html'))
+
+    def find_elements(self, by, css):
+        return make_soup(self.page_source).select(css)
+
+    def quit(self):
+        pass
+
+
+def test_fixtures():
+    with open(os.path.join(FIXTURES, 'expected.json'), 'r', encoding='utf-8') as f:
+        cases = json.load(f)
+
+    hand_written = []
+    for case in cases:
+        result = parse_case(case)
+        assert result == case['expected'], (
+            f"{case['file']}: parsed result differs from fixtures/expected.json\n"
+            f"{json.dumps(result, indent=2, ensure_ascii=False)[:2000]}"
+        )
+        source = case.get('source')
+        if source:
+            with open(os.path.join(FIXTURES, case['file']), 'rb') as f:
+                assert hashlib.sha256(f.read()).hexdigest() == source['digest'], (
+                    f"{case['file']}: edited after capture from {source['url']}")
+            print(f"  ✓ {case['file']} (captured {source['fetched_at']})")
+        else:
+            hand_written.append(case['file'])
+            print(f"  ✓ {case['file']} (hand-written)")
+
+    if hand_written:
+        print(f"  ⚠️ {len(hand_written)} hand-written fixtures - replace them with captured pages "
+              f"(html_snapshots.py capture / export-fixtures)")
+
+    links = find_idol_links(load_fixture('idol_search_yua-mikami.html'))
+    assert best_idol_match(links, 'Yua Mikami')[1] == f'{BASE_URL}/idols/yua-mikami/', "Exact name should win"
+    assert best_idol_match([], 'Nobody') is None
+
+
+def test_scraper_on_fixtures():
+    temp_dir = tempfile.mkdtemp()
+    original_cache = javdb_scraper.actress_profiles
+    original_readiness = javdb_scraper.page_readiness
+    javdb_scraper.actress_profiles = ActressProfileCache(os.path.join(temp_dir, 'actress_profiles.json'))
+    javdb_scraper.page_readiness = PageReadiness(os.path.join(temp_dir, 'page_readiness.json'))
+    pages = {
+        f'{BASE_URL}/movies/vec-759/': 'movie_vec-759.html',
+        f'{BASE_URL}/idols/hibiki-amamiya/': 'idol_hibiki-amamiya.html',
+    }
+
+    stats_file = os.path.join(temp_dir, 'fetch_tiers.json')
+
+    def scraper(session):
+        instance = javdb_scraper.JAVDatabaseScraper()
+        instance.fetcher = TieredFetcher('javdb', session=session, stats_file=stats_file)
+        instance.driver = FixtureDriver(pages)
+        return instance
+
+    try:
+        with mock.patch.object(javdb_scraper.time, 'sleep'):
+            first = scraper(FixtureSession(pages))
+            metadata = first.scrape_video_metadata('VEC-759')
+
+            assert metadata is not None, "Scraper found nothing on the fixture"
+            assert first.fetcher.session.gets == list(pages), f"Unexpected requests: {first.fetcher.session.gets}"
+            assert first.driver.loads == [], f"Browser used although HTTP had the pages: {first.driver.loads}"
+            details = metadata.actress_details['Hibiki Amamiya']
+            assert details['birthdate'] == '2003-08-06' and details['height'] == '168 cm', details
+            assert metadata.actress_images['Hibiki Amamiya'].endswith('/idolimages/full/hibiki-amamiya.webp')
+            print(f"  ✓ Scraper: {len(metadata.screenshots)} screenshots, {len(metadata.categories)} genres, "
+                  f"profile of {details['name']}")
+
+            second = scraper(FixtureSession(pages))
+            again = second.scrape_video_metadata('VEC-759')
+            assert second.fetcher.session.gets == [f'{BASE_URL}/movies/vec-759/'], \
+                f"Known cast requested profile pages: {second.fetcher.session.gets}"
+            assert again.actress_details == metadata.actress_details
+            print("  ✓ Second scraper instance: 0 profile page requests")
+
+            missing = scraper(FixtureSession({}))
+            assert missing.scrape_video_metadata('XYZ-999') is None, "404 page returned metadata"
+            assert missing.driver.loads == [], "HTTP 404 was retried in the browser"
+
+            javdb_scraper.actress_profiles = ActressProfileCache(os.path.join(temp_dir, 'actress_profiles_2.json'))
+            blocked = scraper(FixtureSession(pages, blocked=True))
+            via_browser = blocked.scrape_video_metadata('VEC-759')
+            assert via_browser is not None and blocked.driver.loads == list(pages), blocked.driver.loads
+            assert via_browser.actress_details == metadata.actress_details
+            print("  ✓ Blocked HTTP (Cloudflare 403): same result via the browser")
+
+        waits = javdb_scraper.page_readiness.summary()
+        assert waits['javdb.movie']['samples'] == 1 and waits['javdb.movie']['timeouts'] == 0, waits
+        print(f"  ✓ Page waits: {sum(w['samples'] for w in waits.values())} ready, no fixed sleeps")
+
+        for instance in (first, second, missing, blocked):
+            instance.fetcher.flush()
+        with open(stats_file, encoding='utf-8') as f:
+            tiers = json.load(f)
+        movie, idol = tiers['javdb.movie'], tiers['javdb.idol']
+        assert (movie['http'], movie['not_found'], movie['browser']) == (2, 1, 1), movie
+        assert movie['escalated'] == {'blocked (403)': 1}, movie
+        assert (idol['http'], idol['browser']) == (1, 1), idol
+        print(f"  ✓ Fetch tiers: movie HTTP {movie['http']} / 404 {movie['not_found']} / browser {movie['browser']}")
+    finally:
+        javdb_scraper.actress_profiles = original_cache
+        javdb_scraper.page_readiness = original_readiness
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print(f"Parser: {PARSER}")
+    try:
+        test_fixtures()
+        test_scraper_on_fixtures()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ JAVDatabase pages parse offline to the recorded fixtures")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test the indexed JAVDatabase retry queue (retry_manager.py)
+- Adding a code twice keeps one entry; the video data is stored apart from
+  the queue row and comes back with the entries handed out
+- get_videos_ready_for_retry(limit=N) returns the N entries due soonest,
+  never one that is not due yet
+- The database is created on first use, not by the constructor (so
+  importing the module leaves no file behind); an old JSON queue file is
+  imported once and renamed
+- check_integrity() passes a good file and rejects a damaged one
+- Timing: "next N due" on a large queue stays fast
+
+Offline. Uses a temporary queue database.
+
+Usage: python test_retry_manager.py
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+from retry_manager import JAVDBRetryManager
+
+
+def test_retry_manager():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        # Old JSON queue next to the database is imported once
+        past = (datetime.now() - timedelta(hours=1)).isoformat()
+        with open(os.path.join(temp_dir, 'javdb_retry_queue.json'), 'w', encoding='utf-8') as f:
+            json.dump([{'code': 'OLD-001', 'title': 'Old', 'retry_after': past, 'retry_count': 2,
+                        'video_data': {'code': 'OLD-001', 'categories': ['x']}}], f)
+
+        queue_file = os.path.join(temp_dir, 'javdb_retry_queue.db')
+        manager = JAVDBRetryManager(queue_file=queue_file)
+        assert not os.path.exists(queue_file), "Database created before first use"
+        assert manager.check_integrity()
+        old = manager.get_videos_ready_for_retry()
+        assert os.path.exists(os.path.join(temp_dir, 'javdb_retry_queue.json.migrated'))
+        assert [item['code'] for item in old] == ['OLD-001'], old
+        assert old[0]['retry_count'] == 2 and old[0]['video_data']['categories'] == ['x']
+        print("Import: old JSON queue moved into the database")
+
+        # Duplicate add keeps one entry
+        manager.add_to_queue('DUP-001', {'title': 'First'}, delay_days=0)
+        manager.add_to_queue('DUP-001', {'title': 'Second'}, delay_days=0)
+        queue = [item for item in manager.load_queue() if item['code'] == 'DUP-001']
+        assert len(queue) == 1 and queue[0]['video_data'] == {'title': 'First'}, queue
+
+        # Not due yet -> not handed out; soonest due first
+        manager.add_to_queue('LATER-001', {'title': 'Later'})
+        ready = manager.get_videos_ready_for_retry(limit=1)
+        assert [item['code'] for item in ready] == ['OLD-001'], ready
+        assert 'LATER-001' not in [item['code'] for item in manager.get_videos_ready_for_retry()]
+        stats = manager.get_queue_stats()
+        assert stats == {'total': 3, 'ready_for_retry': 2, 'pending': 1, 'in_progress': 0,
+                         'max_retries_reached': 0}, stats
+        print("Order: due entries soonest first, pending ones held back")
+
+        assert manager.update_retry_status('OLD-001', success=True, found_in_javdb=True)
+        assert manager.remove_from_queue('DUP-001')
+        assert [item['code'] for item in manager.load_queue()] == ['LATER-001']
+        assert manager.check_integrity()
+        damaged = os.path.join(temp_dir, 'damaged.db')
+        with open(damaged, 'wb') as f:
+            f.write(b'SQLite format 3\x00' + b'\xff' * 4096)
+        assert not JAVDBRetryManager(queue_file=damaged).check_integrity()
+
+        # Large queue: next N due is an index read, not a scan of every payload
+        big = JAVDBRetryManager(queue_file=os.path.join(temp_dir, 'big.db'))
+        payload = {'title': 'x' * 2000, 'categories': ['c'] * 50}
+        with big._connect() as conn:
+            now = time.time()
+            conn.executemany("INSERT INTO queue (code, added_at, retry_after) VALUES (?, ?, ?)",
+                             [(f'BIG-{i:05d}', now, now - 86400 + i) for i in range(20000)])
+            conn.executemany("INSERT INTO payload (code, video_data) VALUES (?, ?)",
+                             [(f'BIG-{i:05d}', json.dumps(payload)) for i in range(20000)])
+        start = time.time()
+        ready = big.get_videos_ready_for_retry(limit=10)
+        elapsed = time.time() - start
+        assert [item['code'] for item in ready] == [f'BIG-{i:05d}' for i in range(10)]
+        assert elapsed < 0.5, f"next 10 of 20000 took {elapsed:.2f}s"
+        print(f"Scale: next 10 of 20000 entries in {elapsed * 1000:.1f}ms")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    try:
+        test_retry_manager()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Retry queue is indexed by code and ordered by retry_after")
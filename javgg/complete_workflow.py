@@ -3,7 +3,7 @@
 Complete JavaGG Workflow for GitHub Actions
 1. Scrape new videos from JavaGG
 2. Download video (try multiple servers)
-3. Enrich with JAVDatabase
+3. Save metadata and queue JAVDatabase enrichment (background workers)
 4. Generate preview
 5. Upload to all hosting sites
 6. Update metadata with URLs
@@ -24,11 +24,16 @@ from typing import List, Dict, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from javgg_scraper import JavaGGScraper
-from javdb_enrichment import enrich_with_javdb
+from browser_pool import BrowserPool
 from save_to_database import save_video_to_database
 print("DEBUG: Imported save_to_database", flush=True)
 from database_manager import DatabaseManager
 print("DEBUG: Imported DatabaseManager", flush=True)
+from probe_cache import probe_video
+
+# JAVDatabase enrichment runs in background workers fed by the retry queue
+sys.path.insert(0, str(Path(__file__).parent.parent / 'javdatabase'))
+from enrichment_workers import enrichment_workers
 
 # Import preview generator
 sys.path.insert(0, str(Path(__file__).parent.parent / 'tools' / 'preview_generator'))
@@ -58,8 +63,10 @@ class WorkflowManager:
         self.database_dir = self.base_dir / 'database'
         self.db_manager = DatabaseManager()
         
-        # Reusable browser instance (OPTIMIZATION)
-        self.scraper = None
+        # Warm browser, restarted on health signals only (RSS growth, error streak, unresponsive)
+        self.browser_pool = BrowserPool(lambda: JavaGGScraper(headless=True), name='javgg')
+        self.browser = None
+        self.failure_recorded = False  # The current video's failure already counts in the error streak
         
         # Create directories
         self.download_dir.mkdir(exist_ok=True)
@@ -79,29 +86,17 @@ class WorkflowManager:
         print("DEBUG: verify_dependencies complete", flush=True)
     
     def get_scraper(self):
-        """Get or create reusable scraper instance with retry logic"""
+        """Get the warm scraper from the browser pool, with retry logic"""
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                if self.scraper is None:
-                    self.scraper = JavaGGScraper(headless=True)
-                    self.scraper._init_driver()
-                
-                # Test if browser is still alive
-                try:
-                    _ = self.scraper.driver.title
-                    return self.scraper
-                except:
-                    # Browser is dead, recreate
-                    print(f"  ⚠️ Browser is unresponsive, recreating...")
-                    self.cleanup_scraper()
-                    self.scraper = None
+                if self.browser is None:
+                    self.browser = self.browser_pool.acquire()
+                return self.browser.scraper
                     
             except Exception as e:
                 error_msg = str(e)[:200]
                 print(f"  ⚠️ Failed to initialize browser (attempt {attempt+1}/{max_retries}): {error_msg}")
-                self.cleanup_scraper()
-                self.scraper = None
                 
                 if attempt < max_retries - 1:
                     print(f"  ⏳ Waiting 10 seconds before retry...")
@@ -111,17 +106,25 @@ class WorkflowManager:
                     print(f"   This usually means Chrome/Chromium is not properly installed")
                     print(f"   or there's a system-level issue in GitHub Actions")
                     raise Exception(f"Browser initialization failed: {error_msg}")
-        
-        return self.scraper
+    
+    def release_scraper(self, ok: bool = True):
+        """
+        Hand the browser back after a video: fresh tab if healthy, restarted
+        by the pool if it stopped responding, keeps failing or its RSS grew
+
+        A video counts at most one failure towards the pool's error streak,
+        however many retries inside it released the browser with ok=False
+        """
+        if self.browser is not None:
+            outcome = None if not ok and self.failure_recorded else ok
+            self.browser_pool.release(self.browser, ok=outcome)
+            self.failure_recorded = self.failure_recorded or outcome is False
+            self.browser = None
     
     def cleanup_scraper(self):
-        """Cleanup scraper at end of workflow"""
-        if self.scraper:
-            try:
-                self.scraper.close()
-            except:
-                pass
-            self.scraper = None
+        """Cleanup browser at end of workflow"""
+        self.release_scraper()
+        self.browser_pool.close()
     
     def verify_dependencies(self):
         """Verify all required dependencies are available"""
@@ -517,21 +520,13 @@ class WorkflowManager:
         Returns True if valid, False otherwise
         """
         try:
-            validate_cmd = [
-                'ffprobe', '-v', 'error',
-                '-show_format',
-                '-show_streams',
-                '-of', 'json',
-                str(video_file)
-            ]
-            validate_result = subprocess.run(validate_cmd, capture_output=True, text=True, timeout=10)
+            # Cached probe is shared with preview generation and upload validation
+            validate_data = probe_video(str(video_file))
             
-            if validate_result.returncode != 0:
+            if not validate_data:
                 print(f"  ⚠️ ffprobe failed to read file")
                 return False
             
-            validate_data = json.loads(validate_result.stdout)
-            
             # Check format name - should be mp4, mov, avi, etc. NOT png_pipe
             format_name = validate_data.get('format', {}).get('format_name', '')
             if 'png' in format_name.lower() or 'image' in format_name.lower():
@@ -577,7 +572,7 @@ class WorkflowManager:
                     print(f"❌ Failed to scrape video metadata")
                     if attempt < max_retries - 1:
                         print("  🔄 Retrying...")
-                        self.cleanup_scraper()
+                        self.release_scraper(ok=False)
                         continue
                     return None
                 
@@ -632,8 +627,8 @@ class WorkflowManager:
                         else:
                             print(f"  ⚠️ HLS download failed (likely throttled)")
                             if attempt < max_retries - 1:
-                                print("  🔄 Detecting potential throttling... RESTARTING BROWSER and retrying...")
-                                self.cleanup_scraper() # Force browser restart
+                                print("  🔄 Detecting potential throttling... re-scraping for a fresh URL and retrying...")
+                                self.release_scraper(ok=False)
                                 if video_file.exists():
                                     try:
                                         video_file.unlink() # Clean up partial
@@ -796,19 +791,17 @@ class WorkflowManager:
         
         return None
     
-    def enrich_and_save(self, video_url: str, video_code: str, is_retry: bool = False) -> Dict:
+    def enrich_and_save(self, video_url: str, video_code: str) -> Dict:
         """
-        Scrape, enrich and save video metadata
+        Scrape and save video metadata, then queue JAVDatabase enrichment
+        (merged in by the background enrichment workers, which fall back to
+        the JavaGG page metadata if JAVDatabase does not have the video)
         
         Args:
             video_url: URL of the video
             video_code: Video code (e.g. DLDSS-460)
-            is_retry: If True, don't add to pending queue (already in retry loop)
         """
-        print(f"\n📊 Enriching metadata: {video_code}")
-        
-        # Check if in GitHub Actions
-        is_github_actions = os.environ.get('GITHUB_ACTIONS') == 'true'
+        print(f"\n📊 Saving metadata: {video_code}")
         
         video_dict = None
         
@@ -822,6 +815,8 @@ class WorkflowManager:
             if video_data:
                 print(f"  ✅ JavaGG scraping successful!")
                 video_dict = video_data.__dict__.copy()
+                # Page the enrichment workers' JavaGG fallback re-scrapes
+                video_dict.setdefault('source_url', video_url)
             else:
                 print(f"  ⚠️ JavaGG scraping failed, using minimal data")
                 video_dict = {
@@ -843,61 +838,20 @@ class WorkflowManager:
             print(f"  ❌ Failed to create video data")
             return None
         
-        try:
-            # Enrich with JAVDatabase (this is the main source of metadata)
-            print(f"  🔍 Fetching metadata from JAVDatabase...")
-            enriched_data = enrich_with_javdb(video_dict, headless=True)
-            
-            # Check if JAVDatabase enrichment failed
-            if not enriched_data.get('javdb_available'):
-                print(f"  ⚠️ JAVDatabase not available")
-                
-                # Only add to retry queue if this is NOT already a retry attempt
-                if not is_retry:
-                    print(f"  📋 Adding to retry queue")
-                    
-                    # Check if already in pending queue (avoid duplicates)
-                    already_pending = any(item['code'] == video_code for item in self.progress['pending_enrichment'])
-                    
-                    if not already_pending:
-                        self.progress['pending_enrichment'].append({
-                            'code': video_code,
-                            'url': video_url,
-                            'retry_after': (datetime.now().timestamp() + 2 * 24 * 3600),  # 2 days
-                            'retry_count': 0  # Initialize retry counter
-                        })
-                        print(f"  ✅ Added to retry queue (will retry in 2 days)")
-                    else:
-                        print(f"  ℹ️ Already in retry queue")
-                else:
-                    print(f"  ℹ️ Retry attempt failed, will be handled by retry logic")
-                
-                # Still save what we have
-                save_video_to_database(video_dict, enriched=False)
-                print(f"  ✅ Basic metadata saved")
-                return video_dict
-            
-            # Save to database
-            save_video_to_database(enriched_data, enriched=enriched_data.get('javdb_available', False))
-            
-            print(f"  ✅ Metadata saved to database")
-            
-            return enriched_data
+        if not save_video_to_database(video_dict, enriched=False):
+            print(f"  ❌ Could not save metadata")
+            return None
+        print(f"  ✅ Basic metadata saved")
         
+        # JAVDatabase metadata is fetched and merged in the background
+        try:
+            enrichment_workers.enqueue(video_code, video_dict)
+            print(f"  📋 Queued for JAVDatabase enrichment")
         except Exception as e:
-            print(f"  ❌ Error enriching: {str(e)[:200]}")
-            import traceback
-            traceback.print_exc()
-            
-            # Try to save basic data at least
-            try:
-                save_video_to_database(video_dict, enriched=False)
-                print(f"  ✅ Saved basic metadata despite error")
-                return video_dict
-            except:
-                return None
+            print(f"  ⚠️ Could not queue JAVDatabase enrichment: {str(e)[:100]}")
         
         # Don't close scraper - reuse it
+        return video_dict
     
     def generate_preview_video(self, video_file: str, video_code: str, file_size_mb: float) -> Optional[str]:
         """
@@ -933,46 +887,10 @@ class WorkflowManager:
                 print(f"  ⚠️ ffprobe not found - skipping preview generation")
                 return None
             
-            # Validate video file first
+            # Validate video file first (probe result is cached for the detector)
             print(f"  🔍 Validating video format...")
-            try:
-                validate_cmd = [
-                    'ffprobe', '-v', 'error',
-                    '-show_format',
-                    '-show_streams',
-                    '-of', 'json',
-                    str(video_file)
-                ]
-                validate_result = subprocess.run(validate_cmd, capture_output=True, text=True, timeout=10)
-                
-                if validate_result.returncode != 0:
-                    print(f"  ⚠️ Video validation failed - skipping preview")
-                    return None
-                
-                validate_data = json.loads(validate_result.stdout)
-                
-                # Check format name - should be mp4, mov, avi, etc. NOT png_pipe
-                format_name = validate_data.get('format', {}).get('format_name', '')
-                if 'png' in format_name.lower() or 'image' in format_name.lower():
-                    print(f"  ⚠️ File is not a video (detected as {format_name}) - skipping preview")
-                    return None
-                
-                # Check if there's a video stream
-                video_streams = [s for s in validate_data.get('streams', []) if s.get('codec_type') == 'video']
-                if not video_streams:
-                    print(f"  ⚠️ No video stream found - skipping preview")
-                    return None
-                
-                # Check video codec - should be h264, hevc, etc. NOT png
-                video_codec = video_streams[0].get('codec_name', '')
-                if video_codec.lower() in ['png', 'jpg', 'jpeg', 'gif', 'bmp']:
-                    print(f"  ⚠️ File contains images, not video (codec: {video_codec}) - skipping preview")
-                    return None
-                
-                print(f"  ✅ Video format validated (format: {format_name}, codec: {video_codec})")
-                
-            except Exception as e:
-                print(f"  ⚠️ Validation error: {str(e)} - skipping preview")
+            if not self.validate_video_file(Path(video_file)):
+                print(f"  ⚠️ Video validation failed - skipping preview")
                 return None
             
             # Generate preview with optimized settings
@@ -1271,6 +1189,9 @@ class WorkflowManager:
                 subprocess.run(['git', 'add', 'database/workflow_progress.json'], cwd=self.base_dir, check=True, timeout=30)
                 subprocess.run(['git', 'add', 'database/stats.json'], cwd=self.base_dir, check=True, stderr=subprocess.DEVNULL, timeout=30)
                 subprocess.run(['git', 'add', 'database/progress_tracking.json'], cwd=self.base_dir, check=True, stderr=subprocess.DEVNULL, timeout=30)
+                # Enrichment work still queued for the next run (only if SQLite finds it intact)
+                if enrichment_workers.manager.check_integrity():
+                    subprocess.run(['git', 'add', 'database/javdb_retry_queue.db'], cwd=self.base_dir, stderr=subprocess.DEVNULL, timeout=30)
                 
                 # Check if there are changes
                 result = subprocess.run(['git', 'diff', '--staged', '--quiet'], cwd=self.base_dir, capture_output=True, timeout=30)
@@ -1328,6 +1249,7 @@ class WorkflowManager:
         Process a single video through the complete workflow with error recovery
         """
         video_code = video_url.rstrip('/').split('/')[-1].upper()
+        self.failure_recorded = False
         
         print("\n" + "="*70)
         print(f"PROCESSING VIDEO: {video_code}")
@@ -1355,8 +1277,8 @@ class WorkflowManager:
                 print(f"  ❌ Download error: {str(e)[:100]}")
                 # Try to recover browser if it crashed
                 if "browser" in str(e).lower() or "driver" in str(e).lower():
-                    print(f"  🔄 Browser crashed, recreating...")
-                    self.cleanup_scraper()
+                    print(f"  🔄 Browser may have crashed, checking its health...")
+                    self.release_scraper(ok=False)
             
             # Step 2: Enrich and save metadata (even if download failed)
             try:
@@ -1365,8 +1287,8 @@ class WorkflowManager:
                 print(f"  ❌ Enrichment error: {str(e)[:100]}")
                 # Try to recover browser if it crashed
                 if "browser" in str(e).lower() or "driver" in str(e).lower():
-                    print(f"  🔄 Browser crashed, recreating...")
-                    self.cleanup_scraper()
+                    print(f"  🔄 Browser may have crashed, checking its health...")
+                    self.release_scraper(ok=False)
             
             if not metadata:
                 print(f"  ❌ Enrichment failed, marking as failed")
@@ -1451,8 +1373,8 @@ class WorkflowManager:
             
             # Try to recover browser if it crashed
             if "browser" in str(e).lower() or "driver" in str(e).lower():
-                print(f"  🔄 Browser may have crashed, recreating...")
-                self.cleanup_scraper()
+                print(f"  🔄 Browser may have crashed, checking its health...")
+                self.release_scraper(ok=False)
             
             # Mark as failed
             if video_code not in self.progress['failed_videos']:
@@ -1462,60 +1384,25 @@ class WorkflowManager:
     
     def retry_pending_enrichments(self):
         """
-        Retry videos that failed JAVDatabase enrichment
+        Move videos from the old progress-file pending list into the
+        enrichment queue (the workers retry them on its schedule)
         """
         try:
             print("\n" + "="*70)
-            print("RETRYING PENDING ENRICHMENTS")
+            print("MOVING PENDING ENRICHMENTS TO THE ENRICHMENT QUEUE")
             print("="*70)
             
-            current_time = datetime.now().timestamp()
-            still_pending = []
-            max_retry_attempts = 3  # Maximum retry attempts before giving up
-            
             for item in self.progress['pending_enrichment']:
-                # Initialize retry_count if not present (for backwards compatibility)
-                if 'retry_count' not in item:
-                    item['retry_count'] = 0
-                
-                # Check if max retries exceeded
-                if item['retry_count'] >= max_retry_attempts:
-                    print(f"\n⏭️ Skipping {item['code']}: Max retries ({max_retry_attempts}) exceeded")
-                    print(f"  Video likely not available on JAVDatabase")
-                    # Don't add back to pending - it's permanently failed
-                    continue
-                
-                # Check if it's time to retry (respect retry_after timestamp)
-                if current_time >= item.get('retry_after', 0):
-                    print(f"\n🔄 Retrying: {item['code']} (Attempt {item['retry_count'] + 1}/{max_retry_attempts})")
-                    
-                    # Increment retry count
-                    item['retry_count'] += 1
-                    
-                    # Try to enrich again (pass is_retry=True to prevent re-adding to queue)
-                    metadata = self.enrich_and_save(item['url'], item['code'], is_retry=True)
-                    
-                    if metadata and metadata.get('javdb_available'):
-                        print(f"  ✅ Enrichment successful")
-                        # Don't add back to pending - success!
-                    else:
-                        # Add back to pending with new retry time (2 days from now)
-                        item['retry_after'] = current_time + 2 * 24 * 3600
-                        still_pending.append(item)
-                        print(f"  ⏳ Will retry again in 2 days (attempt {item['retry_count']}/{max_retry_attempts})")
-                else:
-                    # Not time to retry yet, keep in pending
-                    time_until_retry = int((item['retry_after'] - current_time) / 3600)
-                    print(f"\n⏸️ {item['code']}: Not time to retry yet ({time_until_retry}h remaining)")
-                    still_pending.append(item)
+                video_data = self.db_manager.get_video_by_code(item['code']) or {
+                    'code': item['code'],
+                    'source_url': item.get('url', '')
+                }
+                enrichment_workers.enqueue(item['code'], video_data, start=False)
+                print(f"  📋 {item['code']}")
             
-            self.progress['pending_enrichment'] = still_pending
+            self.progress['pending_enrichment'] = []
             self.save_progress()
             
-            print(f"\n📊 Retry Summary:")
-            print(f"  Still pending: {len(still_pending)}")
-            print(f"  Gave up on: {len(self.progress['pending_enrichment']) - len(still_pending)}")
-            
         except Exception as e:
             print(f"  ❌ Error in retry_pending_enrichments: {str(e)[:200]}")
             import traceback
@@ -1537,11 +1424,13 @@ class WorkflowManager:
             print(f"Mode: LIMITED - Processing up to {max_videos} videos one by one")
         
         print("\nChecking pending enrichments...")
-        # Retry pending enrichments first
+        # Old pending list goes into the enrichment queue
         if self.progress['pending_enrichment']:
             self.retry_pending_enrichments()
-        else:
-            print("  No pending enrichments")
+        
+        # Workers start on due retries while videos download
+        enrichment_workers.print_stats()
+        enrichment_workers.start()
         
         print("\nStarting video processing (one at a time)...")
         
@@ -1583,8 +1472,10 @@ class WorkflowManager:
                 print(f"VIDEO {total_processed}/{max_videos if max_videos > 0 else '∞'} (Batch {i+1}/{len(video_urls)})")
                 print(f"{'='*70}")
                 
-                if self.process_video(video_url):
+                ok = self.process_video(video_url)
+                if ok:
                     success_count += 1
+                self.release_scraper(ok=ok)
             
             # Check global limit break
             if max_videos > 0 and total_processed >= max_videos:
@@ -1597,11 +1488,16 @@ class WorkflowManager:
         print("="*70)
         print(f"✅ Successfully processed: {success_count}/{total_processed}")
         print(f"❌ Failed: {total_processed - success_count}")
-        print(f"⏳ Pending enrichment: {len(self.progress['pending_enrichment'])}")
         print(f"End time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
+        # Let the enrichment workers finish due videos before the final commit
+        print("\n🎭 Waiting for JAVDatabase enrichment workers...")
+        enrichment_workers.drain()
+        enrichment_workers.stop()
+        enriched = enrichment_workers.stats()['enriched']
+        
         # Final commit for remaining videos
-        if success_count > 0:
+        if success_count > 0 or enriched:
             self.commit_and_push_changes(f"Final update: {success_count} videos")
         
         # Cleanup browser
@@ -17,6 +17,13 @@ import shutil
 import glob
 from pathlib import Path
 import random
+
+# Shared ffprobe cache lives in the project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from probe_cache import probe_video, get_duration
+from bandwidth_scheduler import bandwidth
+from http_client import create_session
+
 try:
     from Crypto.Cipher import AES
 except ImportError:
@@ -31,24 +38,12 @@ DEFAULT_WORKERS = 32
 class AdvancedHLSDownloader:
     def __init__(self, max_workers=32):
         self.max_workers = max_workers
-        self.session = requests.Session()
-        # Increase pool size significantly to prevent connection exhaustion
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=max_workers * 3,  # Increased pool for high concurrency
-            pool_maxsize=max_workers * 3,
-            max_retries=2,
-            pool_block=False  # Don't block when pool is full, create new connection
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
-        
-        # Use a single, standard high-quality User-Agent + Keep-Alive
-        self.session.headers.update({
+        # Large pool to prevent connection exhaustion, single standard User-Agent + Keep-Alive
+        self.session = create_session(pool_size=max_workers * 3, retries=2, name='hls', headers={
             'Referer': 'https://javgg.net/',
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': '*/*',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Connection': 'keep-alive',
         })
         
         self.rate_limit_delay = 0
@@ -120,9 +115,10 @@ class AdvancedHLSDownloader:
                     time.sleep(0.2 * attempt)
                 
                 # Reduced timeout to prevent hanging
-                response = self.session.get(url, timeout=15, stream=False)
+                response = self.session.get(url, timeout=15, stream=True)
                 response.raise_for_status()
-                data = response.content
+                # Paced by the process-wide scheduler (shares the link with uploads)
+                data = bandwidth.read_response(response)
                 
                 if len(data) == 0:
                     raise ValueError("Empty segment")
@@ -572,28 +568,18 @@ class AdvancedHLSDownloader:
             if size_mb < 10:
                 return False, f"File too small: {size_mb:.2f} MB"
             
-            # Quick validation with ffprobe
-            import subprocess
-            cmd = [
-                'ffprobe',
-                '-v', 'error',
-                '-show_format',
-                '-of', 'json',
-                str(video_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            # Quick validation with ffprobe (cached for later pipeline stages)
+            data = probe_video(str(video_path))
             
-            if result.returncode != 0:
+            if not data:
                 return False, "ffprobe validation failed"
             
-            data = json.loads(result.stdout)
             format_name = data.get('format', {}).get('format_name', '')
             
             if 'png' in format_name.lower() or 'image' in format_name.lower():
                 return False, f"Invalid format: {format_name}"
             
-            duration = float(data.get('format', {}).get('duration', 0))
+            duration = get_duration(data)
             if duration < 30:
                 return False, f"Duration too short: {duration}s"
             
@@ -23,6 +23,14 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from http_client import create_session
+from normalize import strip_code_suffix, RELEASE_SUFFIXES, QUALITY_SUFFIXES
+
+# Stale browsers from earlier runs are killed once per process - later
+# restarts go through the browser pool, which stops its own process tree
+_stale_processes_cleaned = False
+
 
 @dataclass
 class VideoData:
@@ -61,6 +69,8 @@ class JavaGGScraper:
         
         self.download_dir = download_dir
         self.driver = None
+        # Pooled keep-alive connections for the plain-HTTP fetches
+        self.session = create_session(name='javgg')
         os.makedirs(download_dir, exist_ok=True)
     
     def _kill_stale_processes(self):
@@ -92,8 +102,11 @@ class JavaGGScraper:
         """Initialize browser with Cloudflare bypass - GitHub Actions compatible"""
         
         if self.driver is None:
-            # Kill stale processes first to prevent hangs
-            self._kill_stale_processes()
+            # Kill stale processes first to prevent hangs (not our own live browsers)
+            global _stale_processes_cleaned
+            if not _stale_processes_cleaned:
+                self._kill_stale_processes()
+                _stale_processes_cleaned = True
             
             print("🌐 Initializing browser...", flush=True)
             
@@ -323,11 +336,8 @@ class JavaGGScraper:
                 'Referer': 'https://javgg.net/',
             }
             
-            # Create session for connection pooling
-            session = requests.Session()
-            
             # Fetch the embed page
-            response = session.get(embed_url, headers=headers, timeout=15)
+            response = self.session.get(embed_url, headers=headers, timeout=15)
             response.raise_for_status()
             
             # Handle gzip compression manually if needed
@@ -513,28 +523,11 @@ class JavaGGScraper:
             "FC2-PPV-4838212" -> "FC2-PPV-4838212" (keep as is)
             "012926-001-CARIB" -> "012926-001-CARIB" (keep as is)
         """
-        suffixes_to_remove = [
-            '-REDUCE-MOSAIC',
-            '-REDUCED-MOSAIC',
-            '-UNCENSORED',
-            '-LEAKED',
-            '-UNCEN',
-            '-MOSAIC',
-            '-HD',
-            '-FHD',
-            '-4K'
-        ]
-        
-        for suffix in suffixes_to_remove:
-            if code.endswith(suffix):
-                return code[:-len(suffix)]
-        
-        return code
+        return strip_code_suffix(code, RELEASE_SUFFIXES + QUALITY_SUFFIXES)
     
     def _scrape_with_requests(self, video_url: str, code: str) -> Optional[VideoData]:
         """Try to scrape using requests library (faster, better Cloudflare bypass)"""
         try:
-            import requests
             
             # Headers to mimic real browser
             headers = {
@@ -551,7 +544,7 @@ class JavaGGScraper:
             # Fetch page
             # Fetch page
             print(f"    📡 Fetching {video_url[:50]}...", flush=True)
-            response = requests.get(video_url, headers=headers, timeout=20, allow_redirects=True)
+            response = self.session.get(video_url, headers=headers, timeout=20, allow_redirects=True)
             
             print(f"    📊 Status: {response.status_code}", flush=True)
             print(f"    📏 Content length: {len(response.text)} bytes", flush=True)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Shared Code / Title / Metadata Normalization
+- The cleanup the scrapers, the merge step and the database used to repeat ad
+  hoc (video codes, source URLs, titles, file sizes) lives here once
+- Patterns are compiled at import; code, URL, title and size canonicalization
+  is memoized, since the same codes and URLs are normalized over and over
+  while the catalog is scanned (duplicate checks, stats)
+- normalize_video() is applied once at ingest, in
+  DatabaseManager.add_or_update_video
+
+Usage:
+    from normalize import normalize_video, normalize_url, code_key, parse_size_bytes
+
+Benchmark: python benchmark_normalize.py
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+CACHE_SIZE = 65536
+
+JAPANESE_RE = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FFF]')
+WHITESPACE_RE = re.compile(r'\s+')
+SIZE_NUMBER_RE = re.compile(r'(\d+\.?\d*)')
+VIDEO_SLUG_RE = re.compile(r'/videos/([^/]+)/?')
+
+# Release suffixes that are not part of the JAVDatabase code
+RELEASE_SUFFIXES = ('-REDUCE-MOSAIC', '-REDUCED-MOSAIC', '-UNCENSORED', '-LEAKED', '-UNCEN')
+# Also dropped from JavGG codes
+QUALITY_SUFFIXES = ('-MOSAIC', '-HD', '-FHD', '-4K')
+
+SIZE_PLACEHOLDERS = frozenset(('N/A', 'UNKNOWN', '', 'NONE'))
+SIZE_UNITS = (('GB', 1024 * 1024 * 1024), ('MB', 1024 * 1024), ('KB', 1024))
+
+
+# -- Codes ------------------------------------------------------------------
+
+@lru_cache(maxsize=CACHE_SIZE)
+def strip_code_suffix(code: str, suffixes: Tuple[str, ...] = RELEASE_SUFFIXES) -> str:
+    """Code without the first matching release suffix ("APAK-323-UNCENSORED" -> "APAK-323")"""
+    for suffix in suffixes:
+        if code.endswith(suffix):
+            return code[:-len(suffix)]
+    return code
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def javdb_lookup_code(video_code: str) -> str:
+    """Code to look up on JAVDatabase ("apak-323-reduce-mosaic" -> "APAK-323")"""
+    return strip_code_suffix(video_code.upper().strip())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def code_key(code: str) -> str:
+    """Comparison key for codes from URLs and the database ("abc-123" == "ABC_123")"""
+    return (code or '').strip().upper().replace('-', '_')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def code_from_url(url: str) -> Optional[str]:
+    """Video slug of a /videos/<slug>/ URL, or None"""
+    match = VIDEO_SLUG_RE.search(url or '')
+    return match.group(1) if match else None
+
+
+# -- URLs -------------------------------------------------------------------
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_url(url: str) -> str:
+    """
+    Normalize URL for comparison to prevent duplicates.
+
+    Rules:
+    - Convert to lowercase
+    - Use https:// protocol
+    - Remove www. prefix
+    - Remove trailing slashes
+    - Remove query parameters (?key=value)
+    - Remove fragments (#section)
+    """
+    if not url:
+        return ""
+
+    url = url.lower().strip()
+    url = url.replace('http://', 'https://')
+    url = url.replace('https://www.', 'https://')
+    url = url.split('?')[0].split('#')[0]
+    return url.rstrip('/')
+
+
+# -- Titles -----------------------------------------------------------------
+
+def is_japanese(text: str) -> bool:
+    """True if the text contains kana or kanji"""
+    return bool(text) and JAPANESE_RE.search(text) is not None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_text(text: str) -> str:
+    """Collapse runs of whitespace and strip"""
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def resolve_titles(code: str, title: str, title_japanese: str) -> Tuple[str, str]:
+    """
+    (title, title_japanese) with the usual scraper mix-ups fixed
+    - Title empty or just the code: taken from title_japanese
+      ("CODE - English title" or any non-code text)
+    - title_japanese without Japanese text is English: moved to the title
+      if that is still missing, dropped otherwise
+    The title stays empty/the code if nothing better is found
+    """
+    # Issue 1: Title is just the code or empty
+    if not title or title == code:
+        if title_japanese and ' - ' in title_japanese:
+            parts = title_japanese.split(' - ', 1)
+            if parts[0].strip() == code:
+                # Format: "CODE - English title"
+                title = parts[1].strip()
+                title_japanese = ''  # No actual Japanese text
+        elif title_japanese and title_japanese != code:
+            title = title_japanese
+            title_japanese = ''
+
+    # Issue 2: title_japanese is actually English
+    if title_japanese and not is_japanese(title_japanese):
+        if not title or title == code:
+            title = title_japanese
+        title_japanese = ''
+
+    return title, title_japanese
+
+
+def pick_title(code: str, *candidates: str) -> str:
+    """First candidate that is neither empty nor just the code, else the code"""
+    for title in candidates:
+        if title and title != code:
+            return title
+    return code
+
+
+# -- Sizes ------------------------------------------------------------------
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_size_text(size: str) -> int:
+    size_str = size.strip().replace('~', '').replace(' ', '').upper()
+    if size_str in SIZE_PLACEHOLDERS:
+        return 0
+
+    match = SIZE_NUMBER_RE.search(size_str)
+    if not match:
+        return 0
+
+    number = float(match.group(1))
+    for unit, factor in SIZE_UNITS:
+        if unit in size_str:
+            return int(number * factor)
+    return int(number * 1024 * 1024)  # Assume MB if no unit specified
+
+
+def parse_size_bytes(size) -> int:
+    """
+    Bytes of a file_size value: int/float as is, strings like "~600MB",
+    "1.5GB" or "600 MB" parsed (no unit = MB), placeholders/None = 0
+    """
+    if isinstance(size, str):
+        return _parse_size_text(size)
+    if isinstance(size, (int, float)) and not isinstance(size, bool):
+        return int(size)
+    return 0
+
+
+# -- Records ----------------------------------------------------------------
+
+def normalize_video(video_data: Dict) -> Dict:
+    """
+    Canonical copy of a video record, applied once at ingest:
+    code stripped, title fields whitespace-cleaned and resolved (resolve_titles)
+    """
+    video = dict(video_data)
+
+    code = video.get('code')
+    if isinstance(code, str):
+        code = video['code'] = code.strip()
+    else:
+        code = ''
+
+    title = video.get('title')
+    title_japanese = video.get('title_japanese')
+    if isinstance(title, str) or isinstance(title_japanese, str):
+        title, title_japanese = resolve_titles(
+            code,
+            clean_text(title) if isinstance(title, str) else '',
+            clean_text(title_japanese) if isinstance(title_japanese, str) else ''
+        )
+        if title or 'title' in video:
+            video['title'] = title
+        if title_japanese or 'title_japanese' in video:
+            video['title_japanese'] = title_japanese
+
+    return video
+
+
+def cache_info() -> Dict[str, Dict]:
+    """Hit/miss counts of the memoized normalizers"""
+    caches = {
+        'strip_code_suffix': strip_code_suffix, 'javdb_lookup_code': javdb_lookup_code,
+        'code_key': code_key, 'code_from_url': code_from_url, 'normalize_url': normalize_url,
+        'clean_text': clean_text, 'resolve_titles': resolve_titles, 'parse_size': _parse_size_text
+    }
+    return {name: func.cache_info()._asdict() for name, func in caches.items()}
+
+
+def cache_clear():
+    """Empty the memoized normalizers (benchmarks, tests)"""
+    for func in (strip_code_suffix, javdb_lookup_code, code_key, code_from_url, normalize_url,
+                 clean_text, resolve_titles, _parse_size_text):
+        func.cache_clear()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Page Readiness for Selenium Scrapers
+- Replaces fixed sleeps after driver.get() / clicks with explicit waits for
+  the DOM element or network request an extractor actually needs, bounded by
+  a maximum wait
+- Every wait records how long the page took to become ready (or that it hit
+  the bound) in database/page_readiness.json, so the bounds can be tuned
+  from data: `python page_readiness.py` prints percentiles and suggested
+  bounds
+- A bound can be overridden per wait name with READY_TIMEOUT_<NAME>, e.g.
+  READY_TIMEOUT_JABLE_VIDEO_M3U8=20 for the 'jable.video.m3u8' wait
+
+Usage:
+    from page_readiness import page_readiness, element_present, any_of, network_request
+    page_readiness.wait(driver, 'javdb.movie', element_present('h1'), timeout=3)
+    urls = page_readiness.wait(driver, 'jable.video.m3u8',
+                               any_of(network_request(r'\\.m3u8'), page_source_match(r'...\\.m3u8')),
+                               timeout=13)
+
+Conditions are callables taking the driver and returning a truthy value once
+the page is ready (that value is returned by wait(), None on timeout).
+
+CLI: python page_readiness.py [--clear]
+"""
+import os
+import re
+import json
+import time
+import math
+import atexit
+import threading
+from typing import Callable, Dict, List, Optional
+
+try:
+    from filelock import FileLock
+    FILELOCK_AVAILABLE = True
+except ImportError:
+    FILELOCK_AVAILABLE = False
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+READINESS_FILE = os.path.join(SCRIPT_DIR, "database", "page_readiness.json")
+
+MAX_SAMPLES = 200    # Kept per wait name (most recent)
+FLUSH_EVERY = 20     # Pending samples before writing the file
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+# -- conditions ---------------------------------------------------------------
+
+def element_present(css: str):
+    """Ready once an element matching css exists (returns the element)"""
+    def condition(driver):
+        elements = driver.find_elements('css selector', css)
+        return elements[0] if elements else None
+    return condition
+
+
+def element_count(css: str, minimum: int = 1):
+    """Ready once at least `minimum` elements match css (returns them)"""
+    def condition(driver):
+        elements = driver.find_elements('css selector', css)
+        return elements if len(elements) >= minimum else None
+    return condition
+
+
+def count_settled(css: str, settle: float = 1.0):
+    """
+    Ready once the number of elements matching css is non-zero and has not
+    changed for `settle` seconds (lazy-loaded lists after a scroll)
+    """
+    state = {'count': -1, 'since': 0.0}
+
+    def condition(driver):
+        count = len(driver.find_elements('css selector', css))
+        now = time.time()
+        if count != state['count']:
+            state['count'], state['since'] = count, now
+            return None
+        return count if count and now - state['since'] >= settle else None
+    return condition
+
+
+def document_ready():
+    """Ready once the document has finished parsing"""
+    def condition(driver):
+        return driver.execute_script("return document.readyState") in ('interactive', 'complete')
+    return condition
+
+
+def network_request(pattern: str, reject: tuple = ()):
+    """
+    Ready once the browser has requested a URL matching pattern (and none of
+    the `reject` substrings), seen in the Chrome performance log
+
+    Needs a driver started with performance logging (seleniumbase
+    Driver(log_cdp_events=True)); without it this condition never fires, so
+    combine it with a DOM condition via any_of(). Returns every matching URL
+    seen so far.
+    """
+    regex = re.compile(pattern, re.I)
+    seen = []
+
+    def condition(driver):
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return None
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            if message.get('method') != 'Network.requestWillBeSent':
+                continue
+            url = message.get('params', {}).get('request', {}).get('url', '')
+            if regex.search(url) and not any(word in url.lower() for word in reject) and url not in seen:
+                seen.append(url)
+        return list(seen) if seen else None
+    return condition
+
+
+def page_source_match(pattern: str, reject: tuple = ()):
+    """Ready once page_source contains a match (and none of the `reject` substrings)"""
+    regex = re.compile(pattern, re.I)
+
+    def condition(driver):
+        matches = [m for m in regex.findall(driver.page_source)
+                   if not any(word in m.lower() for word in reject)]
+        return matches or None
+    return condition
+
+
+def any_of(*conditions):
+    """Ready as soon as one of the conditions is (returns its value)"""
+    def condition(driver):
+        for c in conditions:
+            value = c(driver)
+            if value:
+                return value
+        return None
+    return condition
+
+
+# -- waits + recorded ready times ---------------------------------------------
+
+class PageReadiness:
+    """Bounded explicit waits that record observed ready times"""
+
+    def __init__(self, stats_file: str = None, poll_interval: float = 0.25):
+        self.stats_file = stats_file or READINESS_FILE
+        self.poll_interval = poll_interval
+        self.pending = {}  # name -> [[seconds, ready], ...] not yet written
+        self.lock = threading.Lock()
+        self.file_lock = FileLock(self.stats_file + '.lock', timeout=10) if FILELOCK_AVAILABLE else None
+
+    @staticmethod
+    def bound(name: str, default: float) -> float:
+        """Maximum wait for `name`: READY_TIMEOUT_<NAME> if set, else default"""
+        env_name = 'READY_TIMEOUT_' + re.sub(r'[^A-Za-z0-9]+', '_', name).upper()
+        value = os.getenv(env_name, '').strip()
+        try:
+            return float(value) if value else default
+        except ValueError:
+            print(f"⚠️ Ignoring invalid {env_name}: {value}")
+            return default
+
+    def wait(self, driver, name: str, condition: Callable, timeout: float):
+        """
+        Poll condition(driver) until it returns something truthy, at most
+        `timeout` seconds (or the READY_TIMEOUT_<NAME> override)
+
+        Returns:
+            The condition's value, or None if the bound was reached
+        """
+        timeout = self.bound(name, timeout)
+        start = time.time()
+
+        while True:
+            try:
+                value = condition(driver)
+            except Exception:
+                value = None  # Page mid-navigation, stale element, ...
+
+            elapsed = time.time() - start
+            if value:
+                self.record(name, elapsed, True)
+                return value
+            if elapsed >= timeout:
+                self.record(name, elapsed, False)
+                return None
+            time.sleep(min(self.poll_interval, timeout - elapsed))
+
+    def record(self, name: str, seconds: float, ready: bool):
+        with self.lock:
+            self.pending.setdefault(name, []).append([round(seconds, 3), ready])
+            if sum(len(s) for s in self.pending.values()) >= FLUSH_EVERY:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _read_file(self) -> Dict:
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        except Exception as e:
+            print(f"[Readiness] Could not read {self.stats_file}: {e}")
+            return {}
+
+    def _flush(self):
+        """Merge pending samples into the file (other processes' samples kept)"""
+        if not self.pending:
+            return
+
+        def write():
+            merged = self._read_file()
+            for name, samples in self.pending.items():
+                entry = merged.setdefault(name, {'samples': []})
+                entry['samples'] = (entry['samples'] + samples)[-MAX_SAMPLES:]
+                entry['updated_at'] = time.time()
+
+            os.makedirs(os.path.dirname(self.stats_file), exist_ok=True)
+            tmp_file = f"{self.stats_file}.tmp{os.getpid()}"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(merged, f, indent=2)
+            os.replace(tmp_file, self.stats_file)
+
+        try:
+            if self.file_lock:
+                with self.file_lock:
+                    write()
+            else:
+                write()
+            self.pending = {}
+        except Exception as e:
+            print(f"[Readiness] Could not save {self.stats_file}: {e}")
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Per wait name: sample count, timeouts, ready-time percentiles and a
+        suggested bound (1.5x the p95 ready time, at least 1s)
+        """
+        with self.lock:
+            self._flush()
+            data = self._read_file()
+
+        result = {}
+        for name, entry in sorted(data.items()):
+            samples = entry.get('samples', [])
+            ready = [s for s, ok in samples if ok]
+            p95 = _percentile(ready, 95)
+            result[name] = {
+                'samples': len(samples),
+                'timeouts': len(samples) - len(ready),
+                'p50': _percentile(ready, 50),
+                'p90': _percentile(ready, 90),
+                'p95': p95,
+                'max': max(ready) if ready else None,
+                'suggested_bound': max(1.0, math.ceil(p95 * 1.5 * 2) / 2) if p95 is not None else None
+            }
+        return result
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            print("No ready times recorded yet")
+            return
+
+        def fmt(value):
+            return f"{value:.2f}" if value is not None else '-'
+
+        print(f"{'wait':<28}{'n':>6}{'timeouts':>10}{'p50':>8}{'p90':>8}{'p95':>8}{'max':>8}{'bound':>8}")
+        print("-" * 84)
+        for name, s in summary.items():
+            print(f"{name:<28}{s['samples']:>6}{s['timeouts']:>10}{fmt(s['p50']):>8}{fmt(s['p90']):>8}"
+                  f"{fmt(s['p95']):>8}{fmt(s['max']):>8}{fmt(s['suggested_bound']):>8}")
+
+        print("\nSuggested overrides:")
+        for name, s in summary.items():
+            if s['suggested_bound'] is not None:
+                env_name = 'READY_TIMEOUT_' + re.sub(r'[^A-Za-z0-9]+', '_', name).upper()
+                print(f"  {env_name}={s['suggested_bound']:g}")
+
+
+# Global instance
+page_readiness = PageReadiness()
+atexit.register(page_readiness.flush)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Observed page ready times and suggested wait bounds')
+    parser.add_argument('--clear', action='store_true', help='Drop all recorded ready times')
+    args = parser.parse_args()
+
+    if args.clear:
+        if os.path.exists(page_readiness.stats_file):
+            os.remove(page_readiness.stats_file)
+        print("✓ Ready times cleared")
+    else:
+        print(f"Ready times: {page_readiness.stats_file}\n")
+        page_readiness.print_summary()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Shared ffprobe Metadata Cache
+- One probe per file per pipeline run instead of one per stage
+- Keyed by absolute path + (size, mtime), so a rewritten file is re-probed
+- Holds the raw ffprobe JSON (format + streams: duration, codecs, bitrate)
+- Persisted to disk so separate processes/stages share results
+"""
+import os
+import json
+import time
+import tempfile
+import threading
+import subprocess
+from typing import Dict, Optional
+
+try:
+    from filelock import FileLock
+    FILELOCK_AVAILABLE = True
+except ImportError:
+    FILELOCK_AVAILABLE = False
+
+PROBE_CACHE_FILE = os.getenv(
+    'FFPROBE_CACHE_FILE',
+    os.path.join(tempfile.gettempdir(), 'ffprobe_cache.json')
+)
+MAX_ENTRIES = 500
+
+
+class ProbeCache:
+    """ffprobe result cache shared across pipeline stages"""
+
+    def __init__(self, cache_file: str = None):
+        self.cache_file = cache_file or PROBE_CACHE_FILE
+        self.entries = {}  # abspath -> {'size', 'mtime', 'data', 'probed_at'}
+        self.lock = threading.Lock()
+        self.file_lock = FileLock(self.cache_file + '.lock', timeout=10) if FILELOCK_AVAILABLE else None
+        self.hits = 0
+        self.misses = 0
+
+        self._load()
+
+    def _read_file(self) -> Dict:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        except Exception as e:
+            print(f"[ProbeCache] Could not read {self.cache_file}: {e}")
+            return {}
+
+    def _load(self):
+        self.entries = self._read_file()
+
+    def _save(self):
+        """Merge our entries with whatever other processes stored, then write"""
+        def write():
+            merged = self._read_file()
+            merged.update(self.entries)
+
+            # Drop entries for deleted files and keep the newest MAX_ENTRIES
+            merged = {p: e for p, e in merged.items() if os.path.exists(p)}
+            if len(merged) > MAX_ENTRIES:
+                newest = sorted(merged.items(), key=lambda kv: kv[1].get('probed_at', 0), reverse=True)
+                merged = dict(newest[:MAX_ENTRIES])
+
+            tmp_file = f"{self.cache_file}.tmp{os.getpid()}"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(merged, f)
+            os.replace(tmp_file, self.cache_file)
+            self.entries = merged
+
+        try:
+            if self.file_lock:
+                with self.file_lock:
+                    write()
+            else:
+                write()
+        except Exception as e:
+            print(f"[ProbeCache] Could not save {self.cache_file}: {e}")
+
+    @staticmethod
+    def _stat(video_path: str):
+        st = os.stat(video_path)
+        return st.st_size, st.st_mtime
+
+    def get(self, video_path: str) -> Optional[Dict]:
+        """Cached ffprobe data if the file is unchanged, else None"""
+        path = os.path.abspath(str(video_path))
+
+        try:
+            size, mtime = self._stat(path)
+        except OSError:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(path)
+
+            # Another stage (process) may have probed it since we loaded
+            if not entry:
+                entry = self._read_file().get(path)
+                if entry:
+                    self.entries[path] = entry
+
+        if entry and entry.get('size') == size and entry.get('mtime') == mtime:
+            return entry.get('data')
+
+        return None
+
+    def put(self, video_path: str, data: Dict):
+        """Store ffprobe data for the current (size, mtime) of the file"""
+        path = os.path.abspath(str(video_path))
+
+        try:
+            size, mtime = self._stat(path)
+        except OSError:
+            return
+
+        with self.lock:
+            self.entries[path] = {
+                'size': size,
+                'mtime': mtime,
+                'probed_at': time.time(),
+                'data': data
+            }
+            self._save()
+
+    def probe(self, video_path: str, ffprobe: str = 'ffprobe', timeout: int = 30) -> Optional[Dict]:
+        """
+        Get ffprobe format/streams data, probing only on cache miss
+
+        Args:
+            video_path: Video file path
+            ffprobe: ffprobe executable
+            timeout: ffprobe timeout in seconds
+
+        Returns:
+            Dict with 'format' and 'streams' keys, or None if probing failed
+        """
+        cached = self.get(video_path)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+
+        cmd = [
+            ffprobe, '-v', 'error',
+            '-print_format', 'json',
+            '-show_format', '-show_streams',
+            str(video_path)
+        ]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            print(f"[ProbeCache] ffprobe timed out after {timeout}s: {video_path}")
+            return None
+        except FileNotFoundError:
+            print(f"[ProbeCache] ffprobe not found: {ffprobe}")
+            return None
+
+        if result.returncode != 0:
+            print(f"[ProbeCache] ffprobe error: {result.stderr.strip()[:200]}")
+            return None
+
+        if not result.stdout or result.stdout.strip() == '{}':
+            return None
+
+        try:
+            data = json.loads(result.stdout)
+        except json.JSONDecodeError as e:
+            print(f"[ProbeCache] Unreadable ffprobe output: {e}")
+            return None
+        data = {
+            'format': data.get('format', {}),
+            'streams': data.get('streams', [])
+        }
+
+        self.put(video_path, data)
+        return data
+
+    def invalidate(self, video_path: str):
+        """Forget cached data for a file"""
+        path = os.path.abspath(str(video_path))
+
+        with self.lock:
+            self.entries.pop(path, None)
+
+            def drop():
+                data = self._read_file()
+                if data.pop(path, None) is not None:
+                    with open(self.cache_file, 'w', encoding='utf-8') as f:
+                        json.dump(data, f)
+
+            try:
+                if self.file_lock:
+                    with self.file_lock:
+                        drop()
+                else:
+                    drop()
+            except Exception as e:
+                print(f"[ProbeCache] Could not update {self.cache_file}: {e}")
+
+
+def get_duration(data: Dict) -> float:
+    """Duration in seconds from probe data (format first, then video stream)"""
+    if not data:
+        return 0.0
+
+    try:
+        duration = float(data.get('format', {}).get('duration', 0) or 0)
+        if duration > 0:
+            return duration
+    except (ValueError, TypeError):
+        pass
+
+    for stream in data.get('streams', []):
+        if stream.get('codec_type') == 'video':
+            try:
+                return float(stream.get('duration', 0) or 0)
+            except (ValueError, TypeError):
+                break
+
+    return 0.0
+
+
+# Global instance
+probe_cache = ProbeCache()
+
+
+def probe_video(video_path: str, ffprobe: str = 'ffprobe', timeout: int = 30) -> Optional[Dict]:
+    """Probe a video through the shared cache (see ProbeCache.probe)"""
+    return probe_cache.probe(video_path, ffprobe=ffprobe, timeout=timeout)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Tiered Page Fetcher (HTTP first, browser on demand)
+- Tier 1: plain HTTP GET (pooled http_client session) + HTML parse
+- Tier 2: the scraper's browser - only when tier 1 was blocked (Cloudflare
+  challenge, 403/503), failed, or the parse lacks a required field
+- A 404 over HTTP is final (the browser would see the same page)
+- After FETCH_HTTP_BLOCK_STREAK (default 5) blocked HTTP attempts in a row
+  for a page kind, HTTP is skipped for that kind for FETCH_HTTP_COOLDOWN
+  seconds (default 600) instead of paying for a doomed request per page
+- Hit rates per tier and page kind, plus why pages escalated, are kept in
+  database/fetch_tiers.json: `python tiered_fetch.py` prints them
+- FETCH_HTTP_FIRST=0 sends everything straight to the browser
+- With HTML_SNAPSHOTS=1 every page that reaches a parser is kept in the
+  snapshot store (html_snapshots.py) for later re-extraction: HTTP pages
+  here, browser pages through snapshot()
+- A DomainGate registered with set_domain_gate() paces every request to its
+  domain (HTTP GET and browser load alike) across all fetchers and threads
+
+Usage:
+    from tiered_fetch import TieredFetcher
+    self.fetcher = TieredFetcher('javdb')
+    metadata, tier = self.fetcher.fetch(
+        url, kind='movie',
+        parse=lambda html: parse_video_page(html, code, url),
+        required=('title', 'release_date'),
+        browser=lambda url: parse_video_page(self._browser_page(url), code, url),
+        snapshot_extra={'code': code})
+
+`browser` returns the parsed result itself, so browser-only extras (clicks,
+network log, player state) can go into it. It stores its page source with
+self.fetcher.snapshot(url, kind, html, extra), which returns the html.
+
+CLI: python tiered_fetch.py [--clear]
+"""
+import os
+import json
+import time
+import atexit
+import threading
+from contextlib import nullcontext
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    from filelock import FileLock
+    FILELOCK_AVAILABLE = True
+except ImportError:
+    FILELOCK_AVAILABLE = False
+
+from http_client import create_session
+from html_snapshots import get_store
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FETCH_STATS_FILE = os.path.join(SCRIPT_DIR, "database", "fetch_tiers.json")
+
+HTTP_FIRST = os.getenv('FETCH_HTTP_FIRST', '1').strip().lower() not in ('0', 'false', 'no')
+BLOCK_STREAK = int(os.getenv('FETCH_HTTP_BLOCK_STREAK', '5') or 5)
+HTTP_COOLDOWN = float(os.getenv('FETCH_HTTP_COOLDOWN', '600') or 600)
+
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Bot-protection interstitials served with 200 as well as 403/503
+BLOCK_MARKERS = ('cf-browser-verification', 'challenge-platform', 'cf_chl_opt', '<title>Just a moment...</title>',
+                 'Attention Required! | Cloudflare', 'DDoS-Guard')
+
+
+def is_blocked(status: int, html: str) -> bool:
+    return status in (403, 429, 503) or any(marker in html for marker in BLOCK_MARKERS)
+
+
+class DomainGate:
+    """At most `concurrency` requests to one domain at once, started `min_interval` apart"""
+
+    def __init__(self, domain: str, concurrency: int, min_interval: float = 0.0):
+        self.domain = domain
+        self.concurrency = max(1, concurrency)
+        self.min_interval = max(0.0, min_interval)
+        self.slots = threading.BoundedSemaphore(self.concurrency)
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+        self.active = 0
+        self.peak = 0
+
+    def __enter__(self):
+        self.slots.acquire()
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        return self
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.active -= 1
+        self.slots.release()
+        return False
+
+
+# domain -> DomainGate every fetcher passes its requests through
+domain_gates: Dict[str, DomainGate] = {}
+
+
+def set_domain_gate(domain: str, gate: Optional[DomainGate]) -> Optional[DomainGate]:
+    """Pace requests to domain through gate (None removes it); returns the previous gate"""
+    previous = domain_gates.pop(domain, None)
+    if gate is not None:
+        domain_gates[domain] = gate
+    return previous
+
+
+def domain_gate(url: str):
+    """Context manager for one request to url (no-op without a registered gate)"""
+    return domain_gates.get(urlsplit(url).hostname or '') or nullcontext()
+
+
+def missing_fields(result, required) -> list:
+    """
+    Required fields that are empty in a parsed result (dataclass/object or dict)
+
+    Without required fields the result itself must be non-empty: an empty
+    search result list may just be a stripped-down page, so it escalates.
+    """
+    if result is None or (not required and not result):
+        return list(required) or ['result']
+    get = result.get if isinstance(result, dict) else (lambda name: getattr(result, name, None))
+    return [name for name in required if not get(name)]
+
+
+class TieredFetcher:
+    """HTTP-first page fetches with a browser fallback, and per-tier hit rates"""
+
+    def __init__(self, name: str, session=None, headers: Dict = None, timeout=(10, 20),
+                 stats_file: str = None, http_first: bool = None, snapshots=None):
+        self.name = name
+        self.session = session or create_session(headers={**BROWSER_HEADERS, **(headers or {})},
+                                                 timeout=timeout, name=f'{name}-fetch')
+        self.timeout = timeout
+        self.stats_file = stats_file or FETCH_STATS_FILE
+        self.http_first = HTTP_FIRST if http_first is None else http_first
+        self.snapshots = snapshots if snapshots is not None else get_store()
+        self.lock = threading.Lock()
+        self.file_lock = FileLock(self.stats_file + '.lock', timeout=10) if FILELOCK_AVAILABLE else None
+
+        self.counts = {}        # kind -> {'http': n, 'browser': n, 'not_found': n, 'failed': n, 'escalated': {reason: n}}
+        self.pending = {}       # same shape, not yet written to the stats file
+        self.block_streak = {}  # kind -> consecutive blocked HTTP attempts
+        self.http_paused_until = {}
+        atexit.register(self.flush)
+
+    # -- fetch ----------------------------------------------------------------
+
+    def _http_get(self, url: str) -> Tuple[Optional[int], str]:
+        try:
+            with domain_gate(url):
+                response = self.session.get(url, timeout=self.timeout, allow_redirects=True)
+            return response.status_code, response.text
+        except Exception as e:
+            print(f"    [Fetch] HTTP error: {str(e)[:80]}")
+            return None, ''
+
+    def fetch(self, url: str, parse: Callable, required: tuple = (), browser: Callable = None,
+              kind: str = 'page', snapshot_extra: Dict = None):
+        """
+        Fetch and parse a page, HTTP first
+
+        Args:
+            parse: html -> result (None if the page has no result)
+            required: Fields the result must have for the HTTP tier to count
+            browser: url -> result using the browser (only called on escalation)
+            kind: Page kind for the stats ('movie', 'idol', ...)
+            snapshot_extra: Parser inputs stored with the page snapshot (code, name...)
+
+        Returns:
+            (result, tier) - tier is 'http', 'browser' or None (nothing found)
+        """
+        if self.http_first and time.time() >= self.http_paused_until.get(kind, 0):
+            status, html = self._http_get(url)
+
+            if status == 404 and not is_blocked(status, html):
+                self._count(kind, 'not_found')
+                return None, 'http'
+
+            if status is None:
+                reason = 'http error'
+            elif is_blocked(status, html):
+                reason = f'blocked ({status})'
+            elif status != 200:
+                reason = f'status {status}'
+            else:
+                reason = None
+
+            if reason and reason.startswith('blocked'):
+                streak = self.block_streak.get(kind, 0) + 1
+                self.block_streak[kind] = streak
+                if streak >= BLOCK_STREAK:
+                    self.http_paused_until[kind] = time.time() + HTTP_COOLDOWN
+                    self.block_streak[kind] = 0
+                    print(f"    [Fetch] {self.name}.{kind}: HTTP blocked {streak}x in a row, "
+                          f"browser only for {HTTP_COOLDOWN / 60:.0f} min")
+            else:
+                self.block_streak[kind] = 0
+
+            if not reason:
+                self.snapshot(url, kind, html, snapshot_extra, tier='http')
+                try:
+                    result = parse(html)
+                except Exception as e:
+                    result = None
+                    print(f"    [Fetch] Parse error: {str(e)[:80]}")
+                missing = missing_fields(result, required)
+                if not missing:
+                    self._count(kind, 'http')
+                    return result, 'http'
+                reason = 'nothing parsed' if not required or result is None else 'missing ' + ', '.join(missing)
+
+            self._count(kind, 'escalated', reason)
+            if browser is not None:
+                print(f"    [Fetch] {kind} via browser ({reason})")
+
+        if browser is None:
+            self._count(kind, 'failed')
+            return None, None
+
+        with domain_gate(url):
+            result = browser(url)
+        self._count(kind, 'browser' if result is not None else 'failed')
+        return result, ('browser' if result is not None else None)
+
+    def snapshot(self, url: str, kind: str, html: str, extra: Dict = None, tier: str = 'browser') -> str:
+        """Keep a fetched page in the snapshot store (if enabled); returns the html for chaining"""
+        if self.snapshots is not None and html:
+            self.snapshots.put(url, html, self.name, kind, tier, extra)
+        return html
+
+    # -- stats ----------------------------------------------------------------
+
+    def _count(self, kind: str, outcome: str, reason: str = None):
+        with self.lock:
+            for counts in (self.counts, self.pending):
+                entry = counts.setdefault(kind, {'http': 0, 'browser': 0, 'not_found': 0, 'failed': 0,
+                                                 'escalated': {}})
+                if outcome == 'escalated':
+                    entry['escalated'][reason] = entry['escalated'].get(reason, 0) + 1
+                else:
+                    entry[outcome] += 1
+
+    def stats(self) -> Dict:
+        """Per kind: fetches, share served by each tier, escalation reasons"""
+        with self.lock:
+            return {kind: _rates(entry) for kind, entry in self.counts.items()}
+
+    def print_stats(self):
+        for kind, s in self.stats().items():
+            print(f"🌐 {self.name}.{kind}: {s['fetches']} fetches - HTTP {s['http']} ({s['http_rate']:.0f}%), "
+                  f"browser {s['browser']} ({s['browser_rate']:.0f}%)"
+                  + (f", escalated: {_reasons(s['escalated'])}" if s['escalated'] else ""))
+
+    def flush(self):
+        """Add pending counts to the stats file (other processes' counts kept)"""
+        with self.lock:
+            if not self.pending:
+                return
+            pending, self.pending = self.pending, {}
+
+        def write():
+            merged = _read_stats(self.stats_file)
+            for kind, entry in pending.items():
+                total = merged.setdefault(f"{self.name}.{kind}", {'http': 0, 'browser': 0, 'not_found': 0,
+                                                                  'failed': 0, 'escalated': {}})
+                for key in ('http', 'browser', 'not_found', 'failed'):
+                    total[key] = total.get(key, 0) + entry[key]
+                for reason, n in entry['escalated'].items():
+                    total['escalated'][reason] = total['escalated'].get(reason, 0) + n
+
+            os.makedirs(os.path.dirname(self.stats_file), exist_ok=True)
+            tmp_file = f"{self.stats_file}.tmp{os.getpid()}"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(merged, f, indent=2)
+            os.replace(tmp_file, self.stats_file)
+
+        try:
+            if self.file_lock:
+                with self.file_lock:
+                    write()
+            else:
+                write()
+        except Exception as e:
+            print(f"[Fetch] Could not save {self.stats_file}: {e}")
+
+
+def _read_stats(stats_file: str) -> Dict:
+    try:
+        with open(stats_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _rates(entry: Dict) -> Dict:
+    fetches = entry['http'] + entry['browser'] + entry['not_found'] + entry['failed']
+    return {
+        **entry,
+        'fetches': fetches,
+        'http_rate': (entry['http'] + entry['not_found']) / fetches * 100 if fetches else 0,
+        'browser_rate': entry['browser'] / fetches * 100 if fetches else 0
+    }
+
+
+def _reasons(escalated: Dict) -> str:
+    return ', '.join(f"{reason} x{n}" for reason, n in sorted(escalated.items(), key=lambda x: -x[1]))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='HTTP vs browser hit rates of the tiered fetchers')
+    parser.add_argument('--clear', action='store_true', help='Drop recorded counts')
+    args = parser.parse_args()
+
+    if args.clear:
+        if os.path.exists(FETCH_STATS_FILE):
+            os.remove(FETCH_STATS_FILE)
+        print("✓ Fetch tier stats cleared")
+    else:
+        data = _read_stats(FETCH_STATS_FILE)
+        if not data:
+            print("No fetches recorded yet")
+            raise SystemExit(0)
+        print(f"{'page kind':<20}{'fetches':>9}{'http %':>9}{'browser %':>11}{'404':>6}{'failed':>8}  escalated")
+        print("-" * 90)
+        for name, entry in sorted(data.items()):
+            s = _rates(entry)
+            print(f"{name:<20}{s['fetches']:>9}{s['http_rate']:>9.1f}{s['browser_rate']:>11.1f}"
+                  f"{s['not_found']:>6}{s['failed']:>8}  {_reasons(s['escalated'])}")
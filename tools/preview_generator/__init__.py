@@ -5,6 +5,8 @@ Professional video preview generation with scene detection and motion analysis
 
 from .preview_generator import PreviewGenerator
 from .clip_extractor import ClipExtractor
+from .preview_cache import PreviewCache
+from .storyboard import StoryboardGenerator
 
 __version__ = "1.0.0"
-__all__ = ['PreviewGenerator', 'ClipExtractor']
+__all__ = ['PreviewGenerator', 'ClipExtractor', 'PreviewCache', 'StoryboardGenerator']
@@ -15,10 +15,15 @@ import json
 import numpy as np
 import concurrent.futures
 import os
+import sys
 import tempfile
 from typing import List, Tuple, Dict
 from multiprocessing import cpu_count
 
+# Shared ffprobe cache lives in the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from probe_cache import probe_video
+
 class AdultSceneDetector:
     """Ultra-fast detector optimized for creampie scenes"""
     
@@ -30,28 +35,21 @@ class AdultSceneDetector:
         self.fps = None
         self.has_audio = False
         
+        # Downscaled RGB frames decoded during scene analysis (timestamp -> array)
+        # Kept so by-products like storyboards need no extra decode
+        self.keep_frames = True
+        self.sampled_frames = {}
+        
     def get_video_info(self) -> dict:
         """Get video metadata with fallback methods"""
         try:
-            cmd = [
-                'ffprobe', '-v', 'error',
-                '-print_format', 'json',
-                '-show_format', '-show_streams',
-                self.video_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            # Shared cache: other pipeline stages may have probed this file already
+            data = probe_video(self.video_path)
             
-            if result.returncode != 0:
-                print(f"[AdultDetector] ffprobe error: {result.stderr}")
-                return None
-            
-            if not result.stdout or result.stdout.strip() == '{}':
+            if not data:
                 print(f"[AdultDetector] No video data returned from ffprobe")
                 return None
             
-            data = json.loads(result.stdout)
-            
             if 'streams' not in data or not data['streams']:
                 print(f"[AdultDetector] No streams found in video")
                 return None
@@ -147,7 +145,6 @@ class AdultSceneDetector:
             }
         except json.JSONDecodeError as e:
             print(f"[AdultDetector] JSON decode error: {e}")
-            print(f"[AdultDetector] Output was: {result.stdout[:200]}")
             return None
         except Exception as e:
             print(f"[AdultDetector] Error getting video info: {e}")
@@ -214,6 +211,7 @@ class AdultSceneDetector:
         print(f"[CreampieDetector] Using {workers} workers for ULTRA-FAST analysis...")
         
         results = []
+        self.sampled_frames = {}
         with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
             future_to_timestamp = {
                 executor.submit(self._analyze_creampie_fast, timestamp): timestamp
@@ -329,6 +327,9 @@ class AdultSceneDetector:
             # Get first frame
             frame1 = frame_data[:frame_size].reshape((90, 160, 3))
             
+            if self.keep_frames:
+                self.sampled_frames[timestamp] = frame1.copy()
+            
             # Analyze frame
             r = frame1[:, :, 0].astype(np.float32)
             g = frame1[:, :, 1].astype(np.float32)
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Preview Generation Benchmark & Regression Suite
+Runs the preview pipeline on synthetic videos - no real footage needed:
+- Generates test videos with ffmpeg testsrc + sine at several lengths/resolutions
+- Times each stage: probe, detection, extraction, concat, concat + GIF, storyboard
+- Records wall time, CPU time (incl. ffmpeg children), per-stage peak RSS
+  (this process and its ffmpeg children, sampled - needs psutil) and output sizes
+- Times a plain ffmpeg decode of each video as a reference, and compares each
+  stage's speed relative to it against a saved baseline - a slower or busier
+  runner slows the reference too, so only real regressions fail (a baseline
+  without reference timings fails the check until it is re-recorded)
+
+Usage:
+    python benchmark.py                           # run default matrix, print + save JSON
+    python benchmark.py --quick                   # one short 360p case
+    python benchmark.py --save-baseline           # store results as the new baseline
+    python benchmark.py --baseline base.json      # fail if any stage is >25% slower (relative)
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import threading
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    # Windows: no getrusage, CPU figures are reported as None
+    RESOURCE_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    # No RSS sampling, RSS figures are reported as None
+    PSUTIL_AVAILABLE = False
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+
+# Siblings from this directory, the shared ffprobe cache from the project root -
+# both anchored on this file, not on what earlier imports put on sys.path
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, SCRIPT_DIR)
+
+from adult_scene_detector import AdultSceneDetector
+from clip_extractor import ClipExtractor
+from storyboard import StoryboardGenerator
+from probe_cache import probe_cache
+
+DEFAULT_WORK_DIR = os.path.join(SCRIPT_DIR, 'benchmark_work')
+DEFAULT_OUTPUT = os.path.join(SCRIPT_DIR, 'benchmark_results.json')
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, 'benchmark_baseline.json')
+
+# (duration seconds, resolution) matrix
+DEFAULT_CASES = [
+    (60, '640x360'),
+    (300, '1280x720'),
+    (900, '1920x1080'),
+]
+QUICK_CASES = [
+    (30, '640x360'),
+]
+
+
+def generate_synthetic_video(output_path: str, duration: int, resolution: str, fps: int = 30) -> bool:
+    """
+    Create a test video with moving test pattern + sine tone
+
+    Args:
+        output_path: Output MP4 path (reused if it already exists)
+        duration: Length in seconds
+        resolution: WxH
+        fps: Frame rate
+
+    Returns:
+        True if the file exists afterwards
+    """
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        return True
+
+    print(f"[Benchmark] Generating synthetic video {resolution} × {duration}s...")
+
+    cmd = [
+        'ffmpeg', '-y',
+        '-f', 'lavfi', '-i', f'testsrc=size={resolution}:rate={fps}:duration={duration}',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:sample_rate=44100:duration={duration}',
+        '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
+        '-g', str(fps * 2),
+        '-c:a', 'aac', '-b:a', '96k',
+        '-shortest',
+        '-loglevel', 'error',
+        output_path
+    ]
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"[Benchmark] ✗ ffmpeg failed: {result.stderr[:300]}")
+        return False
+
+    return os.path.exists(output_path)
+
+
+def _cpu_seconds():
+    """(self cpu, children cpu) seconds, None without getrusage"""
+    if not RESOURCE_AVAILABLE:
+        return None
+
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime, children.ru_utime + children.ru_stime
+
+
+class RssSampler:
+    """
+    Background sampling of this process's RSS and its children's summed RSS
+    (ru_maxrss only knows the process-lifetime peak, not a stage's)
+    """
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.process = psutil.Process() if PSUTIL_AVAILABLE else None
+        self.start_rss = self.peak_rss = self.peak_child_rss = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        rss = self.process.memory_info().rss
+        child_rss = 0
+        for child in self.process.children(recursive=True):
+            try:
+                child_rss += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        self.peak_rss = max(self.peak_rss, rss)
+        self.peak_child_rss = max(self.peak_child_rss, child_rss)
+        return rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        if self.process is None:
+            return
+        self.start_rss = self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Optional[Dict]:
+        """Stage figures in MB: peak_rss_mb, rss_growth_mb, peak_child_rss_mb (None without psutil)"""
+        if self._thread is None:
+            return None
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        mb = 1024 * 1024
+        return {
+            'peak_rss_mb': round(self.peak_rss / mb, 1),
+            'rss_growth_mb': round((self.peak_rss - self.start_rss) / mb, 1),
+            'peak_child_rss_mb': round(self.peak_child_rss / mb, 1)
+        }
+
+
+class StageTimer:
+    """Context manager recording wall/CPU time and peak RSS of one stage"""
+
+    def __init__(self, name: str, stats: Dict):
+        self.name = name
+        self.stats = stats
+
+    def __enter__(self):
+        self.sampler = RssSampler()
+        self.sampler.start()
+        self.start_cpu = _cpu_seconds()
+        self.start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start_wall
+        end_cpu = _cpu_seconds()
+        memory = self.sampler.stop()
+
+        entry = {'wall_s': round(wall, 3), 'cpu_s': None,
+                 'peak_rss_mb': None, 'rss_growth_mb': None, 'peak_child_rss_mb': None}
+
+        if self.start_cpu and end_cpu:
+            cpu = (end_cpu[0] - self.start_cpu[0]) + (end_cpu[1] - self.start_cpu[1])
+            entry['cpu_s'] = round(cpu, 3)
+        if memory:
+            entry.update(memory)
+
+        entry['ok'] = exc_type is None
+        self.stats[self.name] = entry
+        return False
+
+
+def time_reference(video_path: str, seconds: float = 10.0, runs: int = 3) -> Optional[float]:
+    """
+    Wall time of a plain ffmpeg decode of the first `seconds` of the video
+    (best of `runs`) - the yardstick stage speeds are measured against
+
+    Returns:
+        Seconds, or None if ffmpeg failed
+    """
+    cmd = ['ffmpeg', '-v', 'error', '-t', str(seconds), '-i', video_path, '-f', 'null', '-']
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        if subprocess.run(cmd, capture_output=True).returncode != 0:
+            return None
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 3)
+
+
+def _size_mb(path: str) -> float:
+    return round(os.path.getsize(path) / (1024 * 1024), 3) if path and os.path.exists(path) else 0.0
+
+
+def run_case(video_path: str, work_dir: str, num_clips: int, clip_duration: float, workers: int) -> Dict:
+    """
+    Run every pipeline stage on one video
+
+    Returns:
+        Dict with per-stage stats and output sizes
+    """
+    stages = {}
+    outputs = {}
+
+    os.makedirs(work_dir, exist_ok=True)
+
+    reference_s = time_reference(video_path)
+
+    # Force a real probe so the stage is measured
+    probe_cache.invalidate(video_path)
+
+    detector = AdultSceneDetector(video_path)
+    extractor = ClipExtractor(video_path, work_dir)
+
+    with StageTimer('probe', stages):
+        info = detector.get_video_info()
+
+    if not info:
+        return {'error': 'probe failed', 'stages': stages}
+
+    with StageTimer('detect', stages):
+        timestamps = detector.find_best_scenes(num_clips=num_clips, max_workers=workers)
+
+    with StageTimer('storyboard', stages):
+        storyboard_path = os.path.join(work_dir, 'storyboard.jpg')
+        StoryboardGenerator.from_detector(detector).generate(storyboard_path)
+    outputs['storyboard_mb'] = _size_mb(storyboard_path)
+
+    with StageTimer('extract', stages):
+        clip_files = extractor.extract_multiple_clips(
+            [(t, clip_duration) for t in timestamps],
+            resolution="480",
+            crf=28,
+            fps=24,
+            parallel=True,
+            max_workers=workers
+        )
+    outputs['clips'] = len(clip_files)
+    outputs['clips_mb'] = round(sum(_size_mb(c) for c in clip_files), 3)
+
+    preview_path = os.path.join(work_dir, 'preview.mp4')
+    with StageTimer('concat', stages):
+        extractor.concatenate_clips(clip_files, preview_path)
+    outputs['preview_mb'] = _size_mb(preview_path)
+
+    gif_preview_path = os.path.join(work_dir, 'preview_gif.mp4')
+    gif_path = os.path.join(work_dir, 'preview.gif')
+    with StageTimer('concat_gif', stages):
+        extractor.concatenate_clips(clip_files, gif_preview_path, gif_path=gif_path)
+    outputs['gif_mb'] = _size_mb(gif_path)
+
+    extractor.cleanup_clips(clip_files)
+
+    return {
+        'video_duration_s': info['duration'],
+        'resolution': f"{info['width']}x{info['height']}",
+        'reference_s': reference_s,
+        'stages': stages,
+        'outputs': outputs
+    }
+
+
+def throughput(case: Dict, stage: str):
+    """Video seconds processed per wall second for a stage (None if unknown)"""
+    entry = case.get('stages', {}).get(stage)
+    if not entry or not entry.get('ok') or not entry.get('wall_s'):
+        return None
+    return case['video_duration_s'] / entry['wall_s']
+
+
+def relative_speed(case: Dict, stage: str):
+    """
+    Stage speed relative to the same run's reference decode (None if unknown):
+    reference wall time / stage wall time. Machine speed and load cancel out,
+    so it is comparable across runners.
+    """
+    entry = case.get('stages', {}).get(stage)
+    if not entry or not entry.get('ok') or not entry.get('wall_s') or not case.get('reference_s'):
+        return None
+    return case['reference_s'] / entry['wall_s']
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Find stages whose speed relative to the reference decode dropped by more
+    than `tolerance` (wall-clock numbers alone are not compared)
+
+    Returns:
+        List of human-readable regression messages (empty = pass)
+    """
+    regressions = []
+
+    for case_name, case in results['cases'].items():
+        base_case = baseline.get('cases', {}).get(case_name)
+        if not base_case:
+            continue
+        if not base_case.get('reference_s'):
+            # Nothing to compare against - must not read as a pass
+            regressions.append(f"{case_name}: baseline has no reference timing, re-record it with --save-baseline")
+            continue
+
+        for stage in case.get('stages', {}):
+            current = relative_speed(case, stage)
+            previous = relative_speed(base_case, stage)
+
+            if current is None:
+                regressions.append(f"{case_name}/{stage}: stage failed")
+                continue
+
+            if previous and current < previous * (1 - tolerance):
+                regressions.append(
+                    f"{case_name}/{stage}: {current:.2f}x reference speed vs baseline {previous:.2f}x "
+                    f"({(1 - current / previous) * 100:.0f}% slower)"
+                )
+
+    return regressions
+
+
+def print_summary(results: Dict):
+    print("\n" + "=" * 96)
+    print("PREVIEW BENCHMARK RESULTS")
+    print("=" * 96)
+    print(f"{'case':<20}{'stage':<12}{'wall s':>9}{'cpu s':>9}{'rss MB':>9}{'+MB':>8}{'child MB':>10}"
+          f"{'x rt':>9}{'x ref':>9}")
+    print("-" * 96)
+
+    for case_name, case in results['cases'].items():
+        for stage, entry in case.get('stages', {}).items():
+            speed = throughput(case, stage)
+            relative = relative_speed(case, stage)
+            print(
+                f"{case_name:<20}{stage:<12}{entry['wall_s']:>9.2f}"
+                f"{(entry['cpu_s'] if entry['cpu_s'] is not None else float('nan')):>9.2f}"
+                f"{(entry['peak_rss_mb'] or 0):>9.1f}{(entry.get('rss_growth_mb') or 0):>8.1f}"
+                f"{(entry['peak_child_rss_mb'] or 0):>10.1f}"
+                f"{(speed or 0):>9.1f}{(relative or 0):>9.2f}"
+            )
+        if case.get('reference_s'):
+            print(f"{'':<20}reference decode: {case['reference_s']:.2f}s")
+        if case.get('outputs'):
+            print(f"{'':<20}outputs: {case['outputs']}")
+
+    print("=" * 96)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark preview generation on synthetic videos')
+    parser.add_argument('--quick', action='store_true', help='Single short 360p case')
+    parser.add_argument('--case', action='append', metavar='SECONDS:WxH',
+                        help='Custom case, e.g. 120:1280x720 (repeatable)')
+    parser.add_argument('--clips', type=int, default=15, help='Clips per preview (default: 15)')
+    parser.add_argument('--clip-duration', type=float, default=2.0, help='Clip duration (default: 2.0)')
+    parser.add_argument('--workers', type=int, default=16, help='Parallel workers (default: 16)')
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR, help='Synthetic videos + outputs')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Results JSON path')
+    parser.add_argument('--baseline', help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help=f'Write results to {DEFAULT_BASELINE}')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed drop of the reference-relative speed vs baseline (default: 0.25)')
+    parser.add_argument('--keep', action='store_true', help='Keep generated outputs (videos are always kept)')
+    args = parser.parse_args()
+
+    if args.case:
+        cases = []
+        for spec in args.case:
+            seconds, resolution = spec.split(':')
+            cases.append((int(seconds), resolution))
+    else:
+        cases = QUICK_CASES if args.quick else DEFAULT_CASES
+
+    if not shutil.which('ffmpeg') or not shutil.which('ffprobe'):
+        print("✗ ffmpeg/ffprobe not found in PATH")
+        sys.exit(2)
+
+    os.makedirs(args.work_dir, exist_ok=True)
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'host': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count()
+        },
+        'settings': {
+            'clips': args.clips,
+            'clip_duration': args.clip_duration,
+            'workers': args.workers
+        },
+        'cases': {}
+    }
+
+    for duration, resolution in cases:
+        case_name = f"{duration}s_{resolution}"
+        video_path = os.path.join(args.work_dir, f"synthetic_{case_name}.mp4")
+
+        if not generate_synthetic_video(video_path, duration, resolution):
+            results['cases'][case_name] = {'error': 'synthetic video generation failed', 'stages': {}}
+            continue
+
+        print(f"\n[Benchmark] Case {case_name}")
+        case_dir = os.path.join(args.work_dir, case_name)
+        results['cases'][case_name] = run_case(
+            video_path, case_dir, args.clips, args.clip_duration, args.workers
+        )
+
+        if not args.keep:
+            shutil.rmtree(case_dir, ignore_errors=True)
+
+    print_summary(results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Results saved: {args.output}")
+
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"✓ Baseline saved: {DEFAULT_BASELINE}")
+
+    failed = [name for name, case in results['cases'].items() if case.get('error')]
+    if failed:
+        print(f"✗ Cases failed: {', '.join(failed)}")
+        sys.exit(1)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n✗ {len(regressions)} speed regression(s) (tolerance {args.tolerance:.0%}):")
+            for message in regressions:
+                print(f"  - {message}")
+            sys.exit(1)
+
+        print(f"\n✓ No regressions vs baseline (tolerance {args.tolerance:.0%})")
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
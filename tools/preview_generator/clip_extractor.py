@@ -240,21 +240,42 @@ class ClipExtractor:
         self,
         clip_files: List[str],
         output_path: str,
-        add_transitions: bool = False
+        add_transitions: bool = False,
+        gif_path: str = None,
+        webp_path: str = None,
+        gif_width: int = 480,
+        gif_fps: int = 15,
+        max_colors: int = 128
     ) -> bool:
         """
         Concatenate clips into single video
         
+        When gif_path/webp_path are given, the animated thumbnails are produced
+        in the same ffmpeg run from the same decoded frames (split filter
+        branch + palettegen/paletteuse), instead of re-decoding the finished
+        preview afterwards. The palette branch buffers the scaled frames until
+        the palette is ready, so memory grows with gif_width and preview length.
+        With add_transitions (re-encoded preview), or if the single pass fails,
+        they are made from the finished preview in a separate pass instead.
+        
         Args:
             clip_files: List of clip file paths
             output_path: Output file path
             add_transitions: Add fade transitions between clips
+            gif_path: Also write animated GIF here (optional)
+            webp_path: Also write animated WebP here (optional)
+            gif_width: GIF/WebP width
+            gif_fps: GIF/WebP frame rate
+            max_colors: Maximum GIF palette colors
         
         Returns:
-            True if successful
+            True if successful (preview video written)
         """
         print(f"[ClipExtractor] Concatenating {len(clip_files)} clips...")
         
+        want_thumbnails = bool(gif_path or webp_path)
+        with_thumbnails = want_thumbnails and not add_transitions
+        
         try:
             # Create concat file
             concat_file = os.path.join(self.output_dir, "concat_list.txt")
@@ -290,21 +311,33 @@ class ClipExtractor:
                     output_path
                 ]
             else:
-                # Simple concatenation
-                cmd = [
+                # Simple concatenation (stream copy, no re-encode)
+                input_args = [
                     'ffmpeg', '-y',
                     '-f', 'concat',
                     '-safe', '0',
-                    '-i', os.path.abspath(concat_file),
-                    '-c', 'copy',
-                    output_path
+                    '-i', os.path.abspath(concat_file)
                 ]
+                copy_output = ['-map', '0', '-c', 'copy', output_path]
+                
+                cmd = input_args + copy_output
+                
+                if with_thumbnails:
+                    print(f"[ClipExtractor] Creating animated thumbnails in the same pass...")
+                    filter_args, thumb_outputs = self._thumbnail_outputs(gif_path, webp_path, gif_width, gif_fps, max_colors)
+                    cmd = input_args + filter_args + copy_output + thumb_outputs
             
             result = subprocess.run(
                 cmd,
                 capture_output=True
             )
             
+            if result.returncode != 0 and with_thumbnails:
+                # e.g. ffmpeg built without libwebp - keep the preview, thumbnails in a separate pass below
+                print(f"[ClipExtractor] ⚠️ Single-pass thumbnails failed, retrying without them")
+                with_thumbnails = False
+                result = subprocess.run(input_args + copy_output, capture_output=True)
+            
             # Cleanup concat file
             try:
                 os.remove(concat_file)
@@ -314,6 +347,17 @@ class ClipExtractor:
             if result.returncode == 0 and os.path.exists(output_path):
                 size_mb = os.path.getsize(output_path) / (1024 * 1024)
                 print(f"[ClipExtractor] ✓ Concatenated preview created ({size_mb:.1f} MB)")
+                
+                if want_thumbnails and not with_thumbnails:
+                    self.create_thumbnails(output_path, gif_path, webp_path, width=gif_width, fps=gif_fps,
+                                           max_colors=max_colors)
+                
+                if want_thumbnails:
+                    for path in (gif_path, webp_path):
+                        if path and os.path.exists(path):
+                            thumb_mb = os.path.getsize(path) / (1024 * 1024)
+                            print(f"[ClipExtractor] ✓ {os.path.splitext(path)[1][1:].upper()} created ({thumb_mb:.1f} MB)")
+                
                 return True
             else:
                 print(f"[ClipExtractor] ✗ Concatenation failed")
@@ -323,6 +367,72 @@ class ClipExtractor:
             print(f"[ClipExtractor] Error concatenating clips: {e}")
             return False
     
+    @staticmethod
+    def _thumbnail_outputs(
+        gif_path: str,
+        webp_path: str,
+        width: int,
+        fps: int,
+        max_colors: int
+    ) -> Tuple[List[str], List[str]]:
+        """
+        ffmpeg arguments that branch animated GIF/WebP off input 0
+        
+        Returns:
+            Tuple of (filter_complex args, extra output args)
+        """
+        branches = [path for path in (gif_path, webp_path) if path]
+        labels = [f"t{i}" for i in range(len(branches))]
+        
+        filters = [f"[0:v]fps={fps},scale={width}:-1:flags=lanczos,split={len(branches)}" + ''.join(f"[{l}]" for l in labels)]
+        args = []
+        
+        label = iter(labels)
+        if gif_path:
+            src = next(label)
+            # Two-stage palette inside one graph: palettegen on one branch, paletteuse on the other
+            filters.append(f"[{src}]split[g0][g1]")
+            filters.append(f"[g0]palettegen=max_colors={max_colors}:stats_mode=diff[pal]")
+            filters.append(f"[g1][pal]paletteuse=dither=bayer:bayer_scale=5[gif]")
+            args.extend(['-map', '[gif]', '-an', '-loop', '0', gif_path])
+        
+        if webp_path:
+            src = next(label)
+            filters.append(f"[{src}]null[webp]")
+            args.extend(['-map', '[webp]', '-an', '-c:v', 'libwebp', '-lossless', '0', '-q:v', '60', '-loop', '0', webp_path])
+        
+        return ['-filter_complex', ';'.join(filters)], args
+    
+    def create_thumbnails(
+        self,
+        video_path: str,
+        gif_path: str = None,
+        webp_path: str = None,
+        width: int = 480,
+        fps: int = 15,
+        max_colors: int = 128
+    ) -> bool:
+        """
+        Animated GIF and/or WebP from a finished video, both in one extra pass
+        Falls back to create_gif alone if that fails (e.g. no libwebp).
+        
+        Returns:
+            True if every requested thumbnail was written
+        """
+        print(f"[ClipExtractor] Creating animated thumbnails from the preview...")
+        filter_args, thumb_outputs = self._thumbnail_outputs(gif_path, webp_path, width, fps, max_colors)
+        result = subprocess.run(['ffmpeg', '-y', '-i', video_path] + filter_args + thumb_outputs, capture_output=True)
+        if result.returncode == 0:
+            return True
+        
+        if webp_path:
+            print(f"[ClipExtractor] ✗ WebP creation failed: {result.stderr.decode(errors='replace')[-200:]}")
+            if os.path.exists(webp_path):
+                os.remove(webp_path)  # Partial output
+        if gif_path:
+            return self.create_gif(video_path, gif_path, width=width, fps=fps, max_colors=max_colors) and not webp_path
+        return False
+    
     def create_gif(
         self,
         video_path: str,
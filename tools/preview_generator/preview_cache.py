@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Preview Artifact Cache
+Reuses previews that were already generated for the same source video:
+- Keyed by a cheap content fingerprint (size + first/last MB hashes + duration)
+  combined with the generation parameters
+- A cache hit restores the preview (plus GIF/WebP/storyboard) and returns the stored metadata;
+  the storyboard VTT's cues are pointed at the sprite's new file name
+- LRU eviction keeps the cache directory under a size cap
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIR = os.getenv(
+    'PREVIEW_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'preview_generator')
+)
+DEFAULT_MAX_SIZE_MB = float(os.getenv('PREVIEW_CACHE_MAX_MB', '2048'))
+
+# Bytes hashed from the start and the end of the source file
+FINGERPRINT_CHUNK = 1024 * 1024
+
+META_FILE = 'meta.json'
+PREVIEW_FILE = 'preview.mp4'
+
+# Result keys of by-product files stored alongside the preview
+ARTIFACT_KEYS = ('gif_path', 'webp_path', 'storyboard_path', 'storyboard_vtt_path')
+
+# Stands in for the sprite file name in stored VTT cues (rewritten on restore)
+SPRITE_TOKEN = '{storyboard}'
+
+
+def fingerprint_video(video_path: str, duration: float = None) -> str:
+    """
+    Cheap content fingerprint of a video file
+    Reads at most 2 MB regardless of file size
+
+    Args:
+        video_path: Path to source video
+        duration: Video duration in seconds (from ffprobe), if known
+
+    Returns:
+        Hex digest identifying the file content
+    """
+    size = os.path.getsize(video_path)
+
+    digest = hashlib.sha1()
+    digest.update(str(size).encode())
+
+    with open(video_path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_CHUNK))
+
+        if size > FINGERPRINT_CHUNK:
+            f.seek(max(size - FINGERPRINT_CHUNK, FINGERPRINT_CHUNK))
+            digest.update(f.read(FINGERPRINT_CHUNK))
+
+    if duration:
+        digest.update(f"{float(duration):.3f}".encode())
+
+    return digest.hexdigest()
+
+
+class PreviewCache:
+    """On-disk preview cache with LRU size cap"""
+
+    def __init__(self, cache_dir: str = None, max_size_mb: float = None):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_size_mb = max_size_mb if max_size_mb is not None else DEFAULT_MAX_SIZE_MB
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(fingerprint: str, params: Dict) -> str:
+        """Combine source fingerprint and generation parameters into a cache key"""
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha1(f"{fingerprint}:{encoded}".encode()).hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    @staticmethod
+    def _restore_file(src: str, dst: str):
+        """Hard-link cached file into place, copying if linking is not possible"""
+        if os.path.abspath(src) == os.path.abspath(dst):
+            return
+
+        if os.path.exists(dst):
+            os.remove(dst)
+
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    @staticmethod
+    def _swap_sprite_name(vtt: str, old: str, new: str) -> str:
+        """Point the VTT's '<sprite>#xywh=' cues at another sprite file name"""
+        prefix = f"{old}#xywh="
+        return '\n'.join(new + line[len(old):] if line.startswith(prefix) else line
+                         for line in vtt.split('\n'))
+
+    def _restore_vtt(self, src: str, dst: str, sprite_name: str):
+        """Write the cached VTT with its cues pointing at the restored sprite"""
+        with open(src, 'r', encoding='utf-8') as f:
+            vtt = f.read()
+        with open(dst, 'w', encoding='utf-8') as f:
+            f.write(self._swap_sprite_name(vtt, SPRITE_TOKEN, sprite_name))
+
+    def get(self, key: str, output_path: str, artifacts: Dict[str, str] = None) -> Optional[Dict]:
+        """
+        Restore a cached preview
+
+        Args:
+            key: Cache key from make_key()
+            output_path: Where the preview video should be placed
+            artifacts: Extra outputs needed, result key -> destination path
+                       (e.g. {'gif_path': 'x.gif', 'storyboard_path': 'x.jpg'})
+
+        Returns:
+            Stored result dict with paths rewritten, or None on miss
+        """
+        artifacts = {name: path for name, path in (artifacts or {}).items() if path}
+
+        entry_dir = self._entry_dir(key)
+        meta_path = os.path.join(entry_dir, META_FILE)
+        cached_preview = os.path.join(entry_dir, PREVIEW_FILE)
+
+        if not os.path.exists(meta_path) or not os.path.exists(cached_preview):
+            return None
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+
+            stored = meta.get('artifacts', {})
+            if any(not stored.get(name) or not os.path.exists(os.path.join(entry_dir, stored[name]))
+                   for name in artifacts):
+                return None
+
+            self._restore_file(cached_preview, output_path)
+            for name, path in artifacts.items():
+                if name == 'storyboard_vtt_path':
+                    # Cues name the sprite - the one restored now, not the one stored
+                    sprite = artifacts.get('storyboard_path') or meta.get('result', {}).get('storyboard_path') or ''
+                    self._restore_vtt(os.path.join(entry_dir, stored[name]), path, os.path.basename(sprite))
+                else:
+                    self._restore_file(os.path.join(entry_dir, stored[name]), path)
+
+            # Touch entry for LRU ordering
+            meta['last_used'] = time.time()
+            meta['hits'] = meta.get('hits', 0) + 1
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2)
+        except Exception as e:
+            print(f"[PreviewCache] Could not restore cached preview: {e}")
+            return None
+
+        result = dict(meta.get('result', {}))
+        result['video_path'] = output_path
+        for name in stored:
+            result[name] = artifacts.get(name)
+        result.update(artifacts)
+        result['cache_hit'] = True
+
+        print(f"[PreviewCache] ✓ Cache hit ({key[:12]}) - reusing preview")
+        return result
+
+    def put(self, key: str, result: Dict, artifact_keys=ARTIFACT_KEYS) -> bool:
+        """
+        Store a freshly generated preview
+
+        Args:
+            key: Cache key from make_key()
+            result: Successful result dict from PreviewGenerator.generate_preview
+            artifact_keys: Result keys holding extra output files to store
+
+        Returns:
+            True if stored
+        """
+        video_path = result.get('video_path')
+        if not result.get('success') or not video_path or not os.path.exists(video_path):
+            return False
+
+        entry_dir = self._entry_dir(key)
+        tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+
+        try:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+
+            shutil.copy2(video_path, os.path.join(tmp_dir, PREVIEW_FILE))
+
+            stored = {}
+            for name in artifact_keys:
+                path = result.get(name)
+                if path and os.path.exists(path):
+                    filename = name + os.path.splitext(path)[1]
+                    if name == 'storyboard_vtt_path' and result.get('storyboard_path'):
+                        with open(path, 'r', encoding='utf-8') as f:
+                            vtt = f.read()
+                        sprite_name = os.path.basename(result['storyboard_path'])
+                        with open(os.path.join(tmp_dir, filename), 'w', encoding='utf-8') as f:
+                            f.write(self._swap_sprite_name(vtt, sprite_name, SPRITE_TOKEN))
+                    else:
+                        shutil.copy2(path, os.path.join(tmp_dir, filename))
+                    stored[name] = filename
+
+            now = time.time()
+            meta = {
+                'created': now,
+                'last_used': now,
+                'hits': 0,
+                'artifacts': stored,
+                'result': result
+            }
+            with open(os.path.join(tmp_dir, META_FILE), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2)
+
+            # Publish atomically; another process may have stored it first
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except Exception as e:
+            print(f"[PreviewCache] Could not store preview: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+        self.evict()
+        return True
+
+    def _entries(self):
+        """List (key, last_used, size_bytes) for every complete entry"""
+        entries = []
+
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            meta_path = os.path.join(entry_dir, META_FILE)
+
+            if not os.path.isdir(entry_dir) or not os.path.exists(meta_path):
+                continue
+
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    last_used = json.load(f).get('last_used', 0)
+            except Exception:
+                last_used = 0
+
+            size = 0
+            for filename in os.listdir(entry_dir):
+                try:
+                    size += os.path.getsize(os.path.join(entry_dir, filename))
+                except OSError:
+                    pass
+
+            entries.append((name, last_used, size))
+
+        return entries
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits its size cap
+
+        Returns:
+            Number of entries removed
+        """
+        entries = self._entries()
+        total = sum(size for _, _, size in entries)
+        limit = self.max_size_mb * 1024 * 1024
+
+        removed = 0
+        for name, _, size in sorted(entries, key=lambda e: e[1]):
+            if total <= limit:
+                break
+
+            shutil.rmtree(self._entry_dir(name), ignore_errors=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            print(f"[PreviewCache] Evicted {removed} old preview(s), cache now {total / (1024 * 1024):.1f} MB")
+
+        return removed
+
+    def clear(self):
+        """Remove all cached previews"""
+        for name, _, _ in self._entries():
+            shutil.rmtree(self._entry_dir(name), ignore_errors=True)
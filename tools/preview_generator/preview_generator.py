@@ -16,14 +16,17 @@ if sys.platform == 'win32':
 
 from adult_scene_detector import AdultSceneDetector
 from clip_extractor import ClipExtractor
+from preview_cache import PreviewCache, fingerprint_video
+from storyboard import StoryboardGenerator
 
 class PreviewGenerator:
-    def __init__(self, video_path: str, output_dir: str = None):
+    def __init__(self, video_path: str, output_dir: str = None, cache: PreviewCache = None):
         self.video_path = video_path
         self.output_dir = output_dir or os.path.dirname(os.path.abspath(video_path)) or '.'
         
         self.detector = AdultSceneDetector(video_path)
         self.extractor = ClipExtractor(video_path, self.output_dir)
+        self.cache = cache
     
     def generate_preview(
         self,
@@ -35,9 +38,13 @@ class PreviewGenerator:
         fps: int = 30,
         create_gif: bool = False,
         gif_width: int = 480,
+        create_webp: bool = False,
+        create_storyboard: bool = False,
+        storyboard_format: str = "jpg",
         cleanup: bool = True,
         parallel: bool = True,
-        max_workers: int = 32  # Default 32 workers
+        max_workers: int = 32,  # Default 32 workers
+        use_cache: bool = True
     ) -> dict:
         """
         Generate smart preview video with DYNAMIC clip selection
@@ -52,9 +59,14 @@ class PreviewGenerator:
             fps: Target frame rate
             create_gif: Also create GIF version
             gif_width: GIF width in pixels
+            create_webp: Also create animated WebP version
+            create_storyboard: Also write sprite sheet + WebVTT thumbnail track
+                               (tiled from the detector's sampled frames)
+            storyboard_format: Storyboard image format ('jpg' or 'webp')
             cleanup: Remove temporary clip files
             parallel: Use parallel processing (faster)
             max_workers: Max parallel workers (default: 32)
+            use_cache: Reuse a cached preview of the same source and settings
         
         Returns:
             Dict with preview info and paths
@@ -118,10 +130,51 @@ class PreviewGenerator:
         if create_gif:
             gif_path = output_path.replace('.mp4', '.gif')
         
+        webp_path = None
+        if create_webp:
+            webp_path = output_path.replace('.mp4', '.webp')
+        
+        storyboard_path = None
+        storyboard_vtt_path = None
+        if create_storyboard:
+            storyboard_path = output_path.replace('.mp4', f'_storyboard.{storyboard_format}')
+            storyboard_vtt_path = output_path.replace('.mp4', '_storyboard.vtt')
+        
+        # Reuse an existing preview if this exact video was processed before
+        cache_key = None
+        if use_cache:
+            cache_key = self._get_cache_key(info['duration'], {
+                'num_clips': num_clips,
+                'clip_duration': clip_duration,
+                'speed_multiplier': speed_multiplier,
+                'resolution': str(resolution),
+                'crf': crf,
+                'fps': fps,
+                'create_gif': create_gif,
+                'gif_width': gif_width,
+                'create_webp': create_webp,
+                'create_storyboard': create_storyboard,
+                'storyboard_format': storyboard_format
+            })
+            
+            if cache_key:
+                cached = self.cache.get(cache_key, output_path, {
+                    'gif_path': gif_path,
+                    'webp_path': webp_path,
+                    'storyboard_path': storyboard_path,
+                    'storyboard_vtt_path': storyboard_vtt_path
+                })
+                if cached:
+                    print(f"✓ Reused cached preview: {output_path}")
+                    return cached
+        
         result = {
             'success': False,
             'video_path': None,
             'gif_path': None,
+            'webp_path': None,
+            'storyboard_path': None,
+            'storyboard_vtt_path': None,
             'num_clips': 0,
             'total_duration': 0,
             'file_size_mb': 0
@@ -155,6 +208,16 @@ class PreviewGenerator:
             
             print(f"✓ Selected {len(timestamps)} best scenes across entire video")
             
+            # Storyboard is a by-product of detection: reuses the sampled frames
+            storyboard_result = None
+            if create_storyboard:
+                storyboard_result = StoryboardGenerator.from_detector(self.detector).generate(
+                    storyboard_path,
+                    vtt_path=storyboard_vtt_path
+                )
+            # Frames are no longer needed
+            self.detector.sampled_frames = {}
+            
             # Step 3: Extract clips
             print("\n[3/5] Extracting clips...")
             clip_files = self.extractor.extract_multiple_clips(
@@ -173,12 +236,21 @@ class PreviewGenerator:
             
             print(f"✓ Extracted {len(clip_files)} clips")
             
-            # Step 4: Concatenate clips
+            # Step 4: Concatenate clips (GIF/WebP branch off the same decode)
             print("\n[4/5] Creating preview video...")
+            for stale in (gif_path, webp_path):
+                if stale and os.path.exists(stale):
+                    os.remove(stale)
+            
             success = self.extractor.concatenate_clips(
                 clip_files,
                 output_path,
-                add_transitions=False  # Set to True for fade transitions
+                add_transitions=False,  # Set to True for fade transitions
+                gif_path=gif_path,
+                webp_path=webp_path,
+                gif_width=gif_width,
+                gif_fps=15,
+                max_colors=128
             )
             
             if not success:
@@ -189,21 +261,16 @@ class PreviewGenerator:
             
             print(f"✓ Preview created: {output_path}")
             
-            # Step 5: Create GIF (optional)
-            if create_gif:
-                print("\n[5/5] Creating GIF version...")
-                gif_success = self.extractor.create_gif(
-                    output_path,
-                    gif_path,
-                    width=gif_width,
-                    fps=15,
-                    max_colors=128
-                )
-                
-                if gif_success:
-                    print(f"✓ GIF created: {gif_path}")
-                else:
-                    print("✗ GIF creation failed")
+            # Step 5: GIF/WebP were produced by concatenate_clips (concat pass, or after transitions); only check them here
+            if create_gif or create_webp:
+                print("\n[5/5] Checking animated thumbnails...")
+                for label, path in (('GIF', gif_path), ('WebP', webp_path)):
+                    if not path:
+                        continue
+                    if os.path.exists(path):
+                        print(f"✓ {label} created: {path}")
+                    else:
+                        print(f"✗ {label} creation failed")
             else:
                 print("\n[5/5] Skipping GIF creation")
             
@@ -220,6 +287,9 @@ class PreviewGenerator:
                     'success': True,
                     'video_path': output_path,
                     'gif_path': gif_path if create_gif and os.path.exists(gif_path) else None,
+                    'webp_path': webp_path if create_webp and os.path.exists(webp_path) else None,
+                    'storyboard_path': storyboard_path if storyboard_result and storyboard_result['success'] else None,
+                    'storyboard_vtt_path': storyboard_vtt_path if storyboard_result and storyboard_result['success'] else None,
                     'num_clips': len(clip_files),
                     'total_duration': len(timestamps) * clip_duration,
                     'actual_duration': len(timestamps) * clip_duration / speed_multiplier,
@@ -233,6 +303,13 @@ class PreviewGenerator:
                 if result['gif_path']:
                     gif_size = os.path.getsize(result['gif_path'])
                     result['gif_size_mb'] = gif_size / (1024 * 1024)
+                
+                if result['webp_path']:
+                    webp_size = os.path.getsize(result['webp_path'])
+                    result['webp_size_mb'] = webp_size / (1024 * 1024)
+                
+                if cache_key:
+                    self.cache.put(cache_key, result)
             
             print("\n" + "=" * 60)
             print("PREVIEW GENERATION COMPLETE")
@@ -247,6 +324,10 @@ class PreviewGenerator:
             print(f"Coverage: Full video - all sex scenes + drama + outro")
             if result['gif_path']:
                 print(f"GIF: {result['gif_path']} ({result['gif_size_mb']:.1f} MB)")
+            if result.get('webp_path'):
+                print(f"WebP: {result['webp_path']} ({result['webp_size_mb']:.1f} MB)")
+            if result.get('storyboard_path'):
+                print(f"Storyboard: {result['storyboard_path']} + {os.path.basename(result['storyboard_vtt_path'])}")
             print("=" * 60)
             
             return result
@@ -256,6 +337,18 @@ class PreviewGenerator:
             import traceback
             traceback.print_exc()
             return result
+    
+    def _get_cache_key(self, duration: float, params: dict) -> str:
+        """Build preview cache key from source fingerprint + generation params"""
+        try:
+            if self.cache is None:
+                self.cache = PreviewCache()
+            
+            fingerprint = fingerprint_video(self.video_path, duration)
+            return self.cache.make_key(fingerprint, params)
+        except Exception as e:
+            print(f"⚠️ Preview cache unavailable: {e}")
+            return None
 
 
 def main():
@@ -271,9 +364,12 @@ def main():
         print("  --fps N             Frame rate (default: 30)")
         print("  --gif               Also create GIF version")
         print("  --gif-width N       GIF width (default: 480)")
+        print("  --webp              Also create animated WebP version")
+        print("  --storyboard [FMT]  Also create storyboard sprite + WebVTT (jpg|webp)")
         print("  --no-cleanup        Keep temporary clip files")
         print("  --no-parallel       Disable parallel processing")
         print("  --workers N         Max parallel workers (default: 32)")
+        print("  --no-cache          Always regenerate (ignore preview cache)")
         print("\nDynamic Mode (default):")
         print("  Automatically determines optimal number of clips based on video length")
         print("  Captures ALL sex scenes, drama, creampie moments, and outro")
@@ -300,9 +396,13 @@ def main():
         'fps': 30,
         'create_gif': False,
         'gif_width': 480,
+        'create_webp': False,
+        'create_storyboard': False,
+        'storyboard_format': 'jpg',
         'cleanup': True,
         'parallel': True,
-        'max_workers': 32
+        'max_workers': 32,
+        'use_cache': True
     }
     
     i = 2
@@ -338,6 +438,15 @@ def main():
         elif arg == '--gif-width' and i + 1 < len(sys.argv):
             args['gif_width'] = int(sys.argv[i + 1])
             i += 2
+        elif arg == '--webp':
+            args['create_webp'] = True
+            i += 1
+        elif arg == '--storyboard':
+            args['create_storyboard'] = True
+            if i + 1 < len(sys.argv) and sys.argv[i + 1] in ('jpg', 'webp'):
+                args['storyboard_format'] = sys.argv[i + 1]
+                i += 1
+            i += 1
         elif arg == '--no-cleanup':
             args['cleanup'] = False
             i += 1
@@ -347,6 +456,9 @@ def main():
         elif arg == '--workers' and i + 1 < len(sys.argv):
             args['max_workers'] = int(sys.argv[i + 1])
             i += 2
+        elif arg == '--no-cache':
+            args['use_cache'] = False
+            i += 1
         else:
             i += 1
     
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Storyboard / Sprite-Sheet Generator
+Builds hover-preview assets from frames the scene detector already decoded:
+- Tiled storyboard image (JPEG or WebP) of all sampled frames in time order
+- WebVTT thumbnail track mapping time ranges to sprite regions (#xywh=...)
+- No extra pass over the source video - only the small sprite is encoded
+"""
+import os
+import subprocess
+import numpy as np
+from typing import Dict, List
+
+
+class StoryboardGenerator:
+    """Tile detector sample frames into a sprite sheet + WebVTT track"""
+
+    def __init__(self, frames: Dict[float, np.ndarray], duration: float):
+        """
+        Args:
+            frames: timestamp -> RGB frame (H x W x 3 uint8), all the same size
+            duration: Source video duration in seconds (end of last cue)
+        """
+        self.frames = frames
+        self.duration = duration
+
+    @classmethod
+    def from_detector(cls, detector) -> 'StoryboardGenerator':
+        """Use the frames sampled by AdultSceneDetector.find_best_scenes"""
+        return cls(detector.sampled_frames, detector.duration)
+
+    def build_sprite(self, timestamps: List[float], columns: int) -> np.ndarray:
+        """Arrange frames row-major into a single RGB image"""
+        tile_h, tile_w = self.frames[timestamps[0]].shape[:2]
+        rows = (len(timestamps) + columns - 1) // columns
+
+        sprite = np.zeros((rows * tile_h, columns * tile_w, 3), dtype=np.uint8)
+
+        for i, timestamp in enumerate(timestamps):
+            row, col = divmod(i, columns)
+            sprite[row * tile_h:(row + 1) * tile_h, col * tile_w:(col + 1) * tile_w] = self.frames[timestamp]
+
+        return sprite
+
+    @staticmethod
+    def _format_time(seconds: float) -> str:
+        hours, rem = divmod(max(seconds, 0.0), 3600)
+        minutes, secs = divmod(rem, 60)
+        return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+    def build_vtt(self, timestamps: List[float], columns: int, tile_w: int, tile_h: int, image_url: str) -> str:
+        """
+        WebVTT thumbnail track
+        Each cue runs from its sample to the next one; the first starts at 0
+        and the last ends at the video duration.
+        """
+        lines = ['WEBVTT', '']
+
+        for i, timestamp in enumerate(timestamps):
+            start = 0.0 if i == 0 else timestamp
+            end = timestamps[i + 1] if i + 1 < len(timestamps) else max(self.duration or 0, timestamp)
+
+            row, col = divmod(i, columns)
+            lines.append(f"{self._format_time(start)} --> {self._format_time(end)}")
+            lines.append(f"{image_url}#xywh={col * tile_w},{row * tile_h},{tile_w},{tile_h}")
+            lines.append('')
+
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _encode_image(sprite: np.ndarray, output_path: str, quality: int) -> bool:
+        """Encode raw RGB sprite with ffmpeg (JPEG or WebP chosen by extension)"""
+        height, width = sprite.shape[:2]
+
+        cmd = [
+            'ffmpeg', '-y',
+            '-f', 'rawvideo',
+            '-pix_fmt', 'rgb24',
+            '-s', f'{width}x{height}',
+            '-i', '-',
+            '-frames:v', '1',
+        ]
+
+        if output_path.lower().endswith('.webp'):
+            cmd.extend(['-c:v', 'libwebp', '-q:v', str(quality)])
+        else:
+            # Map 0-100 quality onto mjpeg qscale 31-2
+            cmd.extend(['-q:v', str(max(2, min(31, int(31 - quality * 0.29))))])
+
+        cmd.extend(['-loglevel', 'error', output_path])
+
+        result = subprocess.run(cmd, input=sprite.tobytes(), capture_output=True, timeout=60)
+        return result.returncode == 0 and os.path.exists(output_path)
+
+    def generate(
+        self,
+        output_path: str,
+        vtt_path: str = None,
+        columns: int = 10,
+        image_url: str = None,
+        quality: int = 75
+    ) -> dict:
+        """
+        Write storyboard image and WebVTT track
+
+        Args:
+            output_path: Sprite image path (.jpg or .webp)
+            vtt_path: WebVTT path (default: next to sprite, .vtt)
+            columns: Tiles per row
+            image_url: URL used in the VTT cues (default: sprite file name)
+            quality: Image quality 0-100
+
+        Returns:
+            Dict with success flag and paths
+        """
+        result = {
+            'success': False,
+            'storyboard_path': None,
+            'storyboard_vtt_path': None,
+            'num_tiles': 0
+        }
+
+        if not self.frames:
+            print("[Storyboard] ✗ No sampled frames available")
+            return result
+
+        timestamps = sorted(self.frames)
+        tile_h, tile_w = self.frames[timestamps[0]].shape[:2]
+        columns = max(1, min(columns, len(timestamps)))
+
+        vtt_path = vtt_path or os.path.splitext(output_path)[0] + '.vtt'
+        image_url = image_url or os.path.basename(output_path)
+
+        print(f"[Storyboard] Tiling {len(timestamps)} frames ({tile_w}x{tile_h}, {columns} per row)...")
+
+        try:
+            sprite = self.build_sprite(timestamps, columns)
+
+            if not self._encode_image(sprite, output_path, quality):
+                print("[Storyboard] ✗ Failed to encode storyboard image")
+                return result
+
+            with open(vtt_path, 'w', encoding='utf-8') as f:
+                f.write(self.build_vtt(timestamps, columns, tile_w, tile_h, image_url))
+
+            size_kb = os.path.getsize(output_path) / 1024
+            print(f"[Storyboard] ✓ Storyboard created: {output_path} ({size_kb:.0f} KB)")
+
+            result.update({
+                'success': True,
+                'storyboard_path': output_path,
+                'storyboard_vtt_path': vtt_path,
+                'num_tiles': len(timestamps)
+            })
+            return result
+
+        except Exception as e:
+            print(f"[Storyboard] Error creating storyboard: {e}")
+            return result
+
+
+if __name__ == "__main__":
+    import sys
+    from adult_scene_detector import AdultSceneDetector
+
+    if len(sys.argv) < 2:
+        print("Usage: python storyboard.py <video_file> [output.jpg|output.webp]")
+        sys.exit(1)
+
+    video_file = sys.argv[1]
+    output = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(video_file)[0] + '_storyboard.jpg'
+
+    detector = AdultSceneDetector(video_file)
+    detector.find_best_scenes(num_clips=10)
+
+    result = StoryboardGenerator.from_detector(detector).generate(output)
+    sys.exit(0 if result['success'] else 1)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test the preview artifact cache (preview_cache.py)
+- A stored preview is restored on a hit, under new output names
+- The restored storyboard VTT's cues point at the restored sprite's file
+  name, not at the name it was generated under
+- A hit that needs an artifact the entry does not have is a miss
+
+Offline - small fake preview files, no ffmpeg. Uses a temporary cache.
+
+Usage: python test_preview_cache.py
+"""
+import os
+import sys
+import shutil
+import tempfile
+
+from preview_cache import PreviewCache
+
+VTT = """WEBVTT
+
+00:00:00.000 --> 00:00:10.000
+{name}#xywh=0,0,160,90
+
+00:00:10.000 --> 00:00:20.000
+{name}#xywh=160,0,160,90
+"""
+
+
+def write(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(data)
+
+
+def test_preview_cache():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        cache = PreviewCache(cache_dir=os.path.join(temp_dir, 'cache'), max_size_mb=100)
+        first = os.path.join(temp_dir, 'ABC-123_preview')
+        write(first + '.mp4', 'preview')
+        write(first + '_storyboard.jpg', 'sprite')
+        write(first + '_storyboard.vtt', VTT.format(name='ABC-123_preview_storyboard.jpg'))
+
+        key = cache.make_key('fingerprint', {'target_duration': 45})
+        assert cache.put(key, {
+            'success': True,
+            'video_path': first + '.mp4',
+            'storyboard_path': first + '_storyboard.jpg',
+            'storyboard_vtt_path': first + '_storyboard.vtt'
+        })
+
+        # Hit under a different output name
+        second = os.path.join(temp_dir, 'renamed')
+        result = cache.get(key, second + '.mp4', {
+            'storyboard_path': second + '_storyboard.jpg',
+            'storyboard_vtt_path': second + '_storyboard.vtt'
+        })
+        assert result and result['cache_hit'], result
+        assert result['storyboard_vtt_path'] == second + '_storyboard.vtt'
+        with open(second + '_storyboard.jpg', 'r', encoding='utf-8') as f:
+            assert f.read() == 'sprite'
+        with open(second + '_storyboard.vtt', 'r', encoding='utf-8') as f:
+            vtt = f.read()
+        assert vtt == VTT.format(name='renamed_storyboard.jpg'), vtt
+        print("Hit under a new name: VTT cues point at renamed_storyboard.jpg")
+
+        # Same name as generated: unchanged
+        os.remove(first + '_storyboard.vtt')
+        cache.get(key, first + '.mp4', {'storyboard_path': first + '_storyboard.jpg',
+                                        'storyboard_vtt_path': first + '_storyboard.vtt'})
+        with open(first + '_storyboard.vtt', 'r', encoding='utf-8') as f:
+            assert f.read() == VTT.format(name='ABC-123_preview_storyboard.jpg')
+
+        # Artifact not stored: miss
+        assert cache.get(key, second + '.mp4', {'gif_path': second + '.gif'}) is None
+        print("Missing artifact: miss")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    try:
+        test_preview_cache()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Cached previews restore with a storyboard VTT matching the new sprite name")
@@ -113,7 +113,7 @@ class WorkflowIntegration:
                 resolution=resolution,
                 crf=23,  # Good quality
                 fps=30,
-                create_gif=False,
+                create_gif=create_gif,  # Single-pass: branches off the concat decode
                 cleanup=True,
                 parallel=parallel,
                 max_workers=max_workers
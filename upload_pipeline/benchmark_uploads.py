@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Upload Throughput Benchmark
+Runs the real uploaders against local stand-in hosts (standin_hosts.py) -
+no accounts, no internet:
+- mixdrop        MixDropUploader, direct multipart POST
+- uploady        UploadyUploader, get upload server then multipart POST
+- seekstreaming  SeekstreamingUploader, TUS (parallel partial uploads)
+- streamwish     upload_to_streamwish from jable/upload_all_hosts.py
+- Stand-ins drain at a configurable per-connection bandwidth and add a
+  configurable latency to every request
+- Each uploader runs in its own process, so CPU time and peak RSS are its own
+- Reports MB/s, CPU%, peak RSS and setup / transfer / finalize timings as JSON
+
+Usage:
+    python benchmark_uploads.py                               # all uploaders, 256 MB, unlimited bandwidth
+    python benchmark_uploads.py --size-mb 512 --bandwidth 20 --latency 0.05
+    python benchmark_uploads.py --uploaders seekstreaming --streams 8
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+from standin_hosts import start_host, phase_timings
+from test_streaming_upload import peak_rss_mb, make_sparse_file
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_OUTPUT = os.path.join(SCRIPT_DIR, 'benchmark_results.json')
+
+# Uploader -> stand-in host shape
+UPLOADERS = {
+    'mixdrop': 'mixdrop',
+    'uploady': 'xfs',
+    'seekstreaming': 'tus',
+    'streamwish': 'streamwish',
+}
+
+
+# -- child process: one upload -------------------------------------------------
+
+def _upload(name, base_url, video_path, streams, temp_dir):
+    """Upload once with the named uploader pointed at base_url"""
+    if name == 'mixdrop':
+        from mixdrop_uploader import MixDropUploader
+        uploader = MixDropUploader('bench@example.com', 'bench')
+        uploader.upload_url = f'{base_url}/api'
+        return lambda: uploader.upload(video_path, 'benchmark')
+
+    if name == 'uploady':
+        from uploady_uploader import UploadyUploader
+        uploader = UploadyUploader(None, None, 'bench')
+        uploader.base_url = f'{base_url}/api'
+        return lambda: uploader.upload(video_path, 'benchmark')
+
+    if name == 'seekstreaming':
+        from seekstreaming_uploader import SeekstreamingUploader
+        from upload_sessions import UploadSessionStore
+        store = UploadSessionStore(os.path.join(temp_dir, 'upload_sessions.json'))
+        uploader = SeekstreamingUploader(api_key='bench', parallel_streams=streams, session_store=store)
+        uploader.base_url = base_url
+        return lambda: uploader.upload(video_path, 'benchmark')
+
+    if name == 'streamwish':
+        sys.path.insert(0, os.path.join(PROJECT_ROOT, 'jable'))
+        import upload_all_hosts
+        from verification_queue import VerificationQueue
+        upload_all_hosts.STREAMWISH_API_URL = f'{base_url}/api'
+        upload_all_hosts.STREAMWISH_API_KEY = 'bench'
+        upload_all_hosts.verification_queue = VerificationQueue(os.path.join(temp_dir, 'verification_queue.json'))
+        return lambda: upload_all_hosts.upload_to_streamwish(video_path, 'BENCH-001', 'benchmark',
+                                                             allow_small_files=True)
+
+    raise ValueError(f"Unknown uploader: {name}")
+
+
+def run_child(args):
+    """Entry point of the per-uploader process: writes metrics JSON to args.result"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        upload = _upload(args.child, args.base_url, args.file, args.streams, temp_dir)
+        baseline_rss = peak_rss_mb()
+
+        cpu_start = time.process_time()
+        start = time.time()
+        try:
+            result = upload()
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+        end = time.time()
+        cpu = time.process_time() - cpu_start
+
+    metrics = {
+        'start': start,
+        'end': end,
+        'cpu_s': cpu,
+        'peak_rss_mb': peak_rss_mb(),
+        'baseline_rss_mb': baseline_rss,
+        'success': bool(result.get('success')),
+        'error': result.get('error')
+    }
+    with open(args.result, 'w', encoding='utf-8') as f:
+        json.dump(metrics, f)
+
+
+# -- parent: stand-ins + report ------------------------------------------------
+
+def benchmark_uploader(name, video_path, bandwidth, latency, streams, verbose=False):
+    """
+    Run one uploader in a child process against a fresh stand-in
+
+    Returns:
+        Dict with MB/s, CPU%, peak RSS and phase timings
+    """
+    server = start_host(UPLOADERS[name], bandwidth_mbps=bandwidth, latency=latency)
+    fd, result_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    file_size = os.path.getsize(video_path)
+
+    try:
+        cmd = [sys.executable, os.path.abspath(__file__), '--child', name, '--base-url', server.base_url,
+               '--file', video_path, '--streams', str(streams), '--result', result_path]
+        output = None if verbose else subprocess.DEVNULL
+        subprocess.run(cmd, cwd=SCRIPT_DIR, stdout=output, stderr=output, timeout=3600)
+
+        with open(result_path, 'r', encoding='utf-8') as f:
+            metrics = json.load(f) if os.path.getsize(result_path) else None
+    finally:
+        server.shutdown()
+        os.remove(result_path)
+
+    if not metrics:
+        return {'uploader': name, 'shape': UPLOADERS[name], 'success': False, 'error': 'Benchmark process failed'}
+
+    wall = metrics['end'] - metrics['start']
+    phases = phase_timings(server, metrics['start'], metrics['end'])
+
+    return {
+        'uploader': name,
+        'shape': UPLOADERS[name],
+        'success': metrics['success'],
+        'error': metrics['error'],
+        'wall_s': round(wall, 3),
+        'mb_per_s': round(file_size / (1024 * 1024) / wall, 2) if wall > 0 else None,
+        'cpu_s': round(metrics['cpu_s'], 3),
+        'cpu_percent': round(metrics['cpu_s'] / wall * 100, 1) if wall > 0 else None,
+        'peak_rss_mb': round(metrics['peak_rss_mb'], 1) if metrics['peak_rss_mb'] else None,
+        'rss_growth_mb': round(metrics['peak_rss_mb'] - metrics['baseline_rss_mb'], 1)
+        if metrics['peak_rss_mb'] and metrics['baseline_rss_mb'] else None,
+        'phases': {phase: round(phases[phase], 3) for phase in ('setup', 'transfer', 'finalize')},
+        'requests': phases['requests'],
+        'bytes_received': server.received
+    }
+
+
+def print_summary(results):
+    print("\n" + "=" * 86)
+    print("UPLOAD BENCHMARK RESULTS")
+    print("=" * 86)
+    print(f"{'uploader':<15}{'MB/s':>8}{'CPU %':>8}{'RSS MB':>9}{'+RSS':>8}"
+          f"{'setup s':>9}{'xfer s':>9}{'final s':>9}{'reqs':>6}  status")
+    print("-" * 86)
+
+    for r in results['uploaders']:
+        if 'phases' not in r:
+            print(f"{r['uploader']:<15}{'':>66}  ✗ {r['error']}")
+            continue
+        status = '✓' if r['success'] else f"✗ {str(r['error'])[:30]}"
+        print(f"{r['uploader']:<15}{(r['mb_per_s'] or 0):>8.1f}{(r['cpu_percent'] or 0):>8.1f}"
+              f"{(r['peak_rss_mb'] or 0):>9.1f}{(r['rss_growth_mb'] or 0):>8.1f}"
+              f"{r['phases']['setup']:>9.2f}{r['phases']['transfer']:>9.2f}{r['phases']['finalize']:>9.2f}"
+              f"{r['requests']:>6}  {status}")
+
+    print("=" * 86)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark uploaders against local stand-in hosts')
+    parser.add_argument('--uploaders', default=','.join(UPLOADERS),
+                        help=f"Comma-separated subset of {', '.join(UPLOADERS)}")
+    parser.add_argument('--size-mb', type=int, default=256, help='Test file size (default: 256)')
+    parser.add_argument('--random', action='store_true', help='Random file content instead of a sparse file')
+    parser.add_argument('--bandwidth', type=float, default=None, help='Per-connection MB/s (default: unlimited)')
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds added per request (default: 0.02)')
+    parser.add_argument('--streams', type=int, default=4, help='Seekstreaming parallel streams (default: 4)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Results JSON path')
+    parser.add_argument('--verbose', action='store_true', help='Show uploader output')
+    # Internal: run one upload in this process
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    parser.add_argument('--file', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    names = [n.strip() for n in args.uploaders.split(',') if n.strip()]
+    unknown = [n for n in names if n not in UPLOADERS]
+    if unknown:
+        print(f"✗ Unknown uploader(s): {', '.join(unknown)}")
+        sys.exit(2)
+
+    size = args.size_mb * 1024 * 1024
+    if args.random:
+        fd, video_path = tempfile.mkstemp(suffix='.mp4')
+        with os.fdopen(fd, 'wb') as f:
+            for _ in range(args.size_mb):
+                f.write(os.urandom(1024 * 1024))
+    else:
+        video_path = make_sparse_file(size)
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'host': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count()
+        },
+        'settings': {
+            'size_mb': args.size_mb,
+            'random_content': args.random,
+            'bandwidth_mbps': args.bandwidth,
+            'latency_s': args.latency,
+            'seekstreaming_streams': args.streams
+        },
+        'uploaders': []
+    }
+
+    try:
+        for name in names:
+            print(f"[Benchmark] {name} → stand-in '{UPLOADERS[name]}' ({args.size_mb} MB)...")
+            results['uploaders'].append(
+                benchmark_uploader(name, video_path, args.bandwidth, args.latency, args.streams, args.verbose)
+            )
+    finally:
+        os.remove(video_path)
+
+    print_summary(results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Results saved: {args.output}")
+
+    failed = [r['uploader'] for r in results['uploaders'] if not r['success']]
+    if failed:
+        print(f"✗ Uploads failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
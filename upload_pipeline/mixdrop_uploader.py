@@ -3,29 +3,27 @@ MixDrop Uploader
 Popular video hosting site used by many JAV sites
 API Documentation: https://mixdrop.ag/api
 """
-import requests
 import os
 from pathlib import Path
 import time
+from uploader_base import Uploader
+from streaming_multipart import post_multipart
+from http_client import create_session
 
 
-class MixDropUploader:
+class MixDropUploader(Uploader):
+    host = 'mixdrop'
+    display_name = 'MixDrop'
+    max_size_gb = 5.0
+
     def __init__(self, email, api_key):
         self.email = email
         self.api_key = api_key
         self.base_url = "https://api.mixdrop.ag/api"
+        self.upload_url = "https://ul.mixdrop.ag/api"
         
-        # Create session for connection reuse
-        self.session = requests.Session()
-        
-        # Optimize connection pooling
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=10,
-            pool_maxsize=10,
-            max_retries=3
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+        # Pooled keep-alive connections from the shared HTTP client factory
+        self.session = create_session(pool_size=10, retries=3, name='mixdrop')
     
     def get_upload_server(self):
         """Get upload server URL"""
@@ -70,63 +68,64 @@ class MixDropUploader:
             print(f"[MixDrop] Starting upload: {file_name} ({file_size_gb:.2f} GB)")
             
             # MixDrop uses direct upload URL (no need to get upload server)
-            upload_url = "https://ul.mixdrop.ag/api"
+            upload_url = self.upload_url
             print(f"[MixDrop] Upload URL: {upload_url}")
             
             # Upload file
             print(f"[MixDrop] Uploading file...")
             size_mb = file_size / (1024 * 1024)
             
-            with open(video_path, 'rb') as f:
-                files = {'file': (file_name, f, 'video/mp4')}
-                data = {
-                    'email': self.email,
-                    'key': self.api_key
-                }
-                
-                start_time = time.time()
-                
-                try:
-                    upload_response = self.session.post(
-                        upload_url,
-                        files=files,
-                        data=data,
-                        timeout=1800
-                    )
-                except Exception as e:
-                    return {"success": False, "error": f"Upload failed: {str(e)}"}
-                
-                elapsed = time.time() - start_time
-                speed = (size_mb / elapsed) if elapsed > 0 else 0
-                
-                print(f"[MixDrop] Upload completed in {elapsed:.1f}s ({speed:.2f} MB/s)")
-                print(f"[MixDrop] Response status: {upload_response.status_code}")
+            data = {
+                'email': self.email,
+                'key': self.api_key
+            }
+            
+            start_time = time.time()
+            
+            try:
+                upload_response = post_multipart(
+                    self.session,
+                    upload_url,
+                    data,
+                    'file',
+                    video_path,
+                    file_name=file_name,
+                    timeout=1800
+                )
+            except Exception as e:
+                return {"success": False, "error": f"Upload failed: {str(e)}"}
+            
+            elapsed = time.time() - start_time
+            speed = (size_mb / elapsed) if elapsed > 0 else 0
+            
+            print(f"[MixDrop] Upload completed in {elapsed:.1f}s ({speed:.2f} MB/s)")
+            print(f"[MixDrop] Response status: {upload_response.status_code}")
+            
+            if upload_response.status_code == 200:
+                result = upload_response.json()
+                print(f"[MixDrop] Response: {result}")
                 
-                if upload_response.status_code == 200:
-                    result = upload_response.json()
-                    print(f"[MixDrop] Response: {result}")
+                if result.get('success'):
+                    # Safely extract file code
+                    result_data = result.get('result', {})
+                    file_code = result_data.get('fileref')
                     
-                    if result.get('success'):
-                        # Safely extract file code
-                        result_data = result.get('result', {})
-                        file_code = result_data.get('fileref')
-                        
-                        if not file_code:
-                            return {"success": False, "error": f"No file code in response: {result}"}
-                        
-                        print(f"[MixDrop] ✓ Upload successful: {file_code}")
-                        return {
-                            "success": True,
-                            "host": "mixdrop",
-                            "file_code": file_code,
-                            "url": result_data.get('url', f"https://mixdrop.ag/f/{file_code}"),
-                            "embed_url": result_data.get('embedurl', f"https://mixdrop.ag/e/{file_code}")
-                        }
-                    else:
-                        return {"success": False, "error": result.get('msg', 'Upload failed')}
-                else:
-                    return {"success": False, "error": f"HTTP {upload_response.status_code}: {upload_response.text[:200]}"}
+                    if not file_code:
+                        return {"success": False, "error": f"No file code in response: {result}"}
                     
+                    print(f"[MixDrop] ✓ Upload successful: {file_code}")
+                    return {
+                        "success": True,
+                        "host": "mixdrop",
+                        "file_code": file_code,
+                        "url": result_data.get('url', f"https://mixdrop.ag/f/{file_code}"),
+                        "embed_url": result_data.get('embedurl', f"https://mixdrop.ag/e/{file_code}")
+                    }
+                else:
+                    return {"success": False, "error": result.get('msg', 'Upload failed')}
+            else:
+                return {"success": False, "error": f"HTTP {upload_response.status_code}: {upload_response.text[:200]}"}
+                
         except Exception as e:
             print(f"[MixDrop] Error: {str(e)}")
             return {"success": False, "error": str(e)}
@@ -4,45 +4,16 @@ Parallel uploads with validation and comprehensive error handling
 """
 import os
 import sys
-import json
-import subprocess
 from pathlib import Path
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from database_manager import db_manager
-
-# Import all uploaders
-try:
-    from uploady_uploader import UploadyUploader
-except ImportError:
-    UploadyUploader = None
-
-try:
-    from turboviplay_uploader import TurboviplayUploader
-except ImportError:
-    TurboviplayUploader = None
-
-try:
-    from streamtape_uploader import StreamtapeUploader
-except ImportError:
-    StreamtapeUploader = None
-
-try:
-    from mixdrop_uploader import MixDropUploader
-except ImportError:
-    MixDropUploader = None
-
-try:
-    from seekstreaming_uploader import SeekstreamingUploader
-except ImportError:
-    SeekstreamingUploader = None
+from upload_engine import UploadEngine, print_summary, sync_to_main_database
 
 load_dotenv()
 
+# Upload order (Upload18 excluded)
+HOSTS = ['turboviplay', 'streamtape', 'uploady', 'seekstreaming', 'mixdrop']
+
 
 class OptimizedUploadPipeline:
     def __init__(self):
@@ -53,69 +24,18 @@ class OptimizedUploadPipeline:
         """Initialize all available uploaders (excluding Upload18)"""
         print("🔧 Initializing uploaders...")
         
-        # Turboviplay (Priority 1 - Fast and reliable)
-        if TurboviplayUploader and os.getenv("TURBOVIPLAY_API_KEY"):
-            self.uploaders['turboviplay'] = {
-                'uploader': TurboviplayUploader(
-                    email=os.getenv("TURBOVIPLAY_EMAIL"),
-                    username=os.getenv("TURBOVIPLAY_USERNAME"),
-                    password=os.getenv("TURBOVIPLAY_PASSWORD"),
-                    api_key=os.getenv("TURBOVIPLAY_API_KEY")
-                ),
-                'priority': 1,
-                'name': 'Turboviplay'
-            }
-            print("  ✓ Turboviplay")
-        
-        # Streamtape (Priority 2)
-        if StreamtapeUploader and os.getenv("STREAMTAPE_LOGIN") and os.getenv("STREAMTAPE_API_KEY"):
-            self.uploaders['streamtape'] = {
-                'uploader': StreamtapeUploader(
-                    login=os.getenv("STREAMTAPE_LOGIN"),
-                    api_key=os.getenv("STREAMTAPE_API_KEY")
-                ),
-                'priority': 2,
-                'name': 'Streamtape'
-            }
-            print("  ✓ Streamtape")
-        
-        # Uploady (Priority 3 - XFS-based host)
-        if UploadyUploader and os.getenv("UPLOADY_API_KEY"):
-            self.uploaders['uploady'] = {
-                'uploader': UploadyUploader(
-                    email=os.getenv("UPLOADY_EMAIL"),
-                    username=os.getenv("UPLOADY_USERNAME"),
-                    api_key=os.getenv("UPLOADY_API_KEY")
-                ),
-                'priority': 3,
-                'name': 'Uploady'
-            }
-            print("  ✓ Uploady")
-        
-        # SeekStreaming (Priority 4)
-        if SeekstreamingUploader and os.getenv("SEEKSTREAMING_API_KEY"):
-            self.uploaders['seekstreaming'] = {
-                'uploader': SeekstreamingUploader(
-                    api_key=os.getenv("SEEKSTREAMING_API_KEY"),
-                    email=os.getenv("SEEKSTREAMING_EMAIL"),
-                    password=os.getenv("SEEKSTREAMING_PASSWORD")
-                ),
-                'priority': 4,
-                'name': 'SeekStreaming'
+        self.engine = UploadEngine(hosts=HOSTS)
+        self.uploaders = {
+            host_key: {
+                'uploader': uploader,
+                'priority': priority,
+                'name': uploader.display_name or host_key
             }
-            print("  ✓ SeekStreaming")
+            for priority, (host_key, uploader) in enumerate(self.engine.uploaders.items(), start=1)
+        }
         
-        # MixDrop (Priority 5 - Backup)
-        if MixDropUploader and os.getenv("MIXDROP_API_KEY"):
-            self.uploaders['mixdrop'] = {
-                'uploader': MixDropUploader(
-                    email=os.getenv("MIXDROP_EMAIL"),
-                    api_key=os.getenv("MIXDROP_API_KEY")
-                ),
-                'priority': 5,
-                'name': 'MixDrop'
-            }
-            print("  ✓ MixDrop")
+        for host_info in self.uploaders.values():
+            print(f"  ✓ {host_info['name']}")
         
         if not self.uploaders:
             print("  ⚠️  No uploaders configured!")
@@ -125,39 +45,7 @@ class OptimizedUploadPipeline:
     
     def upload_to_host(self, host_key, host_info, video_path, title):
         """Upload to a single host"""
-        host_name = host_info['name']
-        uploader = host_info['uploader']
-        
-        print(f"\n{'='*70}")
-        print(f"[{host_name}] Starting upload...")
-        print(f"{'='*70}")
-        
-        try:
-            import time
-            start_time = time.time()
-            
-            result = uploader.upload(video_path, title)
-            
-            elapsed = time.time() - start_time
-            result['upload_time'] = elapsed
-            result['host_name'] = host_name
-            result['timestamp'] = datetime.now().isoformat()
-            
-            if result.get('success'):
-                print(f"\n[{host_name}] ✓ Upload successful in {elapsed:.1f}s")
-            else:
-                print(f"\n[{host_name}] ✗ Upload failed: {result.get('error', 'Unknown')}")
-            
-            return host_key, result
-            
-        except Exception as e:
-            print(f"\n[{host_name}] ✗ Exception: {str(e)}")
-            return host_key, {
-                'success': False,
-                'error': str(e),
-                'host_name': host_name,
-                'timestamp': datetime.now().isoformat()
-            }
+        return host_key, self.engine.upload_to_host(host_key, video_path, title, uploader=host_info['uploader'])
     
     def upload_parallel(self, video_path, title, max_workers=6):
         """Upload to all hosts in parallel"""
@@ -168,34 +56,7 @@ class OptimizedUploadPipeline:
         print(f"\n📤 Uploading to {len(self.uploaders)} host(s) in parallel...")
         print(f"   Max workers: {max_workers}")
         
-        results = {}
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(
-                    self.upload_to_host,
-                    host_key,
-                    host_info,
-                    video_path,
-                    title
-                ): host_key
-                for host_key, host_info in self.uploaders.items()
-            }
-            
-            for future in as_completed(futures):
-                host_key = futures[future]
-                try:
-                    host_key, result = future.result()
-                    results[host_key] = result
-                except Exception as e:
-                    print(f"✗ {host_key} exception: {str(e)}")
-                    results[host_key] = {
-                        'success': False,
-                        'error': str(e),
-                        'timestamp': datetime.now().isoformat()
-                    }
-        
-        return results
+        return self.engine.upload_all(video_path, title, max_workers=max_workers)
     
     def upload_video(self, video_path, video_code, title=None):
         """Upload video to all hosts in parallel"""
@@ -211,33 +72,8 @@ class OptimizedUploadPipeline:
         results = self.upload_parallel(video_path, title or video_code)
         
         # Summary
+        print_summary(results)
         successful = sum(1 for r in results.values() if r.get('success'))
-        failed = len(results) - successful
-        
-        print(f"\n{'='*80}")
-        print(f"UPLOAD SUMMARY")
-        print(f"{'='*80}")
-        print(f"Total hosts: {len(results)}")
-        print(f"Successful: {successful}")
-        print(f"Failed: {failed}")
-        
-        if successful > 0:
-            print(f"\n✓ Successful uploads:")
-            for host, result in results.items():
-                if result.get('success'):
-                    host_name = result.get('host_name', host)
-                    embed_url = result.get('embed_url', result.get('url', 'N/A'))
-                    print(f"  • {host_name}: {embed_url}")
-        
-        if failed > 0:
-            print(f"\n✗ Failed uploads:")
-            for host, result in results.items():
-                if not result.get('success'):
-                    host_name = result.get('host_name', host)
-                    error = result.get('error', 'Unknown')
-                    print(f"  • {host_name}: {error[:60]}")
-        
-        print(f"\n{'='*80}\n")
         
         # Update database if video exists
         if successful > 0:
@@ -247,45 +83,7 @@ class OptimizedUploadPipeline:
     
     def update_database(self, video_code, results):
         """Update database with upload results"""
-        try:
-            video = db_manager.get_video_by_code(video_code)
-            
-            if not video:
-                print(f"⚠️  Video '{video_code}' not found in database")
-                return
-            
-            if 'hosting' not in video:
-                video['hosting'] = {}
-            
-            # Update hosting URLs
-            for host, result in results.items():
-                if result.get('success'):
-                    # Extract file code from various possible field names
-                    file_code = (
-                        result.get('file_code') or 
-                        result.get('vid') or 
-                        result.get('video_id') or 
-                        result.get('file_id') or 
-                        ''
-                    )
-                    
-                    video['hosting'][host] = {
-                        'embed_url': result.get('embed_url', ''),
-                        'download_url': result.get('url', result.get('download_url', '')),
-                        'file_code': file_code
-                    }
-                    
-                    print(f"  ✓ Saved {host}: {file_code}")
-            
-            video['uploaded_at'] = datetime.now().isoformat()
-            
-            if db_manager.add_or_update_video(video):
-                print(f"\n✓ Updated database for '{video_code}'")
-            else:
-                print(f"\n✗ Failed to update database")
-                
-        except Exception as e:
-            print(f"\n✗ Database update error: {str(e)}")
+        return sync_to_main_database(video_code, results)
 
 
 def main():
@@ -1,78 +1,27 @@
 import os
-import sys
-import json
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Add parent directory to path for database_manager import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from database_manager import db_manager
+from upload_engine import UploadEngine, save_results, sync_to_main_database
+
+HOSTS = ['seekstreaming', 'streamtape', 'turboviplay', 'uploady', 'mixdrop']
 
-from seekstreaming_uploader import SeekstreamingUploader
-from streamtape_uploader import StreamtapeUploader
-from turboviplay_uploader import TurboviplayUploader
-from uploady_uploader import UploadyUploader
-from mixdrop_uploader import MixDropUploader
 
 class ParallelUploadPipeline:
     def __init__(self, env_path=".env"):
         """Initialize the parallel upload pipeline with all hosting services"""
         load_dotenv(env_path)
         
-        # Initialize all uploaders
-        self.uploaders = {
-            "seekstreaming": SeekstreamingUploader(
-                api_key=os.getenv("SEEKSTREAMING_API_KEY"),
-                email=os.getenv("SEEKSTREAMING_EMAIL"),
-                password=os.getenv("SEEKSTREAMING_PASSWORD")
-            ),
-            "streamtape": StreamtapeUploader(
-                login=os.getenv("STREAMTAPE_LOGIN"),
-                api_key=os.getenv("STREAMTAPE_API_KEY")
-            ),
-            "turboviplay": TurboviplayUploader(
-                email=os.getenv("TURBOVIPLAY_EMAIL"),
-                username=os.getenv("TURBOVIPLAY_USERNAME"),
-                password=os.getenv("TURBOVIPLAY_PASSWORD"),
-                api_key=os.getenv("TURBOVIPLAY_API_KEY")
-            ),
-            "uploady": UploadyUploader(
-                email=os.getenv("UPLOADY_EMAIL"),
-                username=os.getenv("UPLOADY_USERNAME"),
-                api_key=os.getenv("UPLOADY_API_KEY")
-            ),
-            "mixdrop": MixDropUploader(
-                email=os.getenv("MIXDROP_EMAIL"),
-                api_key=os.getenv("MIXDROP_API_KEY")
-            )
-        }
+        # Initialize all uploaders (credentials are checked by the hosts themselves)
+        self.engine = UploadEngine(hosts=HOSTS, require_credentials=False)
+        self.uploaders = self.engine.uploaders
         
         self.results_dir = Path("upload_results")
         self.results_dir.mkdir(exist_ok=True)
         
     def upload_to_host(self, host_name, uploader, video_path, title):
         """Upload video to a single host"""
-        start_time = time.time()
-        print(f"\n{'='*60}")
-        print(f"Starting upload to {host_name.upper()}")
-        print(f"{'='*60}")
-        
-        result = uploader.upload(video_path, title)
-        
-        elapsed_time = time.time() - start_time
-        result['host'] = host_name
-        result['upload_time'] = elapsed_time
-        result['timestamp'] = datetime.now().isoformat()
-        
-        if result['success']:
-            print(f"✓ {host_name.upper()} completed in {elapsed_time:.2f}s")
-        else:
-            print(f"✗ {host_name.upper()} failed: {result.get('error', 'Unknown error')}")
-        
-        return result
+        return self.engine.upload_to_host(host_name, video_path, title, uploader=uploader)
     
     def upload_video(self, video_path, title=None, hosts=None, max_workers=6):
         """
@@ -112,37 +61,8 @@ class ParallelUploadPipeline:
         print(f"Max Workers: {max_workers}")
         print(f"{'#'*60}\n")
         
-        results = {}
-        start_time = time.time()
-        
-        # Upload to all hosts in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_host = {
-                executor.submit(
-                    self.upload_to_host,
-                    host_name,
-                    self.uploaders[host_name],
-                    video_path,
-                    title
-                ): host_name
-                for host_name in hosts
-            }
-            
-            for future in as_completed(future_to_host):
-                host_name = future_to_host[future]
-                try:
-                    result = future.result()
-                    results[host_name] = result
-                except Exception as e:
-                    print(f"✗ {host_name.upper()} exception: {str(e)}")
-                    results[host_name] = {
-                        "success": False,
-                        "host": host_name,
-                        "error": str(e),
-                        "timestamp": datetime.now().isoformat()
-                    }
-        
-        total_time = time.time() - start_time
+        results = self.engine.upload_all(video_path, title, hosts=hosts, max_workers=max_workers)
+        total_time = self.engine.last_total_time
         
         # Summary
         successful = sum(1 for r in results.values() if r.get('success'))
@@ -175,23 +95,7 @@ class ParallelUploadPipeline:
     
     def _save_results(self, video_path, title, results, total_time):
         """Save upload results to JSON file"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        video_name = Path(video_path).stem
-        result_file = self.results_dir / f"{video_name}_{timestamp}.json"
-        
-        data = {
-            "video_path": video_path,
-            "video_name": video_name,
-            "title": title,
-            "timestamp": datetime.now().isoformat(),
-            "total_time": total_time,
-            "results": results
-        }
-        
-        with open(result_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        print(f"Results saved to: {result_file}")
+        return save_results(video_path, title, results, total_time, self.results_dir)
     
     def get_successful_urls(self, results):
         """Extract all successful upload URLs"""
@@ -206,86 +110,7 @@ class ParallelUploadPipeline:
     
     def _sync_to_main_database(self, video_title, results):
         """Sync upload results to main combined_videos.json"""
-        try:
-            # Find video by title/code in main database
-            video = db_manager.get_video_by_code(video_title)
-            
-            if not video:
-                print(f"⚠️ Video '{video_title}' not found in main database, skipping sync")
-                return
-            
-            # Update hosting URLs - use 'hosting' not 'hosting_urls' for consistency
-            if 'hosting' not in video:
-                video['hosting'] = {}
-            
-            for host, result in results.items():
-                if result.get('success'):
-                    # Initialize host entry if not exists
-                    if host not in video['hosting']:
-                        video['hosting'][host] = {}
-                    
-                    # Map different host response formats
-                    if host == 'seekstreaming':
-                        video['hosting'][host] = {
-                            'embed_url': result.get('all_urls', {}).get('video_player', ''),
-                            'download_url': result.get('all_urls', {}).get('video_downloader', ''),
-                            'file_code': result.get('all_urls', {}).get('video_player', '').split('#')[-1] if result.get('all_urls', {}).get('video_player') else '',
-                            'upload_time': int(time.time())
-                        }
-                    elif host == 'streamtape':
-                        video['hosting'][host] = {
-                            'embed_url': result.get('embed_url', ''),
-                            'download_url': result.get('url', ''),
-                            'file_code': result.get('file_id', ''),
-                            'upload_time': int(time.time())
-                        }
-                    elif host == 'turboviplay':
-                        video['hosting'][host] = {
-                            'embed_url': result.get('embed_url', ''),
-                            'download_url': result.get('url', ''),
-                            'file_code': result.get('video_id', ''),
-                            'upload_time': int(time.time())
-                        }
-                    elif host == 'vidoza':
-                        video['hosting'][host] = {
-                            'embed_url': result.get('embed_url', ''),
-                            'download_url': result.get('url', ''),
-                            'file_code': result.get('video_id', ''),
-                            'upload_time': int(time.time())
-                        }
-                    elif host == 'uploady':
-                        video['hosting'][host] = {
-                            'embed_url': result.get('embed_url', ''),
-                            'download_url': result.get('url', ''),
-                            'file_code': result.get('file_code', ''),
-                            'upload_time': int(time.time())
-                        }
-                    elif host == 'mixdrop':
-                        video['hosting'][host] = {
-                            'embed_url': result.get('embed_url', ''),
-                            'download_url': result.get('url', ''),
-                            'file_code': result.get('file_code', ''),
-                            'upload_time': int(time.time())
-                        }
-                    elif host == 'upload18':
-                        video['hosting'][host] = {
-                            'embed_url': result.get('embed_url', ''),
-                            'download_url': result.get('url', ''),
-                            'file_code': result.get('file_code', ''),
-                            'upload_time': int(time.time())
-                        }
-            
-            # Update uploaded_at timestamp
-            video['uploaded_at'] = datetime.now().isoformat()
-            
-            # Save back to main database
-            if db_manager.add_or_update_video(video):
-                print(f"✓ Synced hosting URLs to main database for '{video_title}'")
-            else:
-                print(f"✗ Failed to sync to main database")
-                
-        except Exception as e:
-            print(f"✗ Error syncing to main database: {e}")
+        return sync_to_main_database(video_title, results)
 
 
 def main():
@@ -4,27 +4,37 @@ from pathlib import Path
 import time
 import base64
 import sys
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor, wait
+from uploader_base import Uploader
+from streaming_multipart import FileRangeStream, BytesStream
+from shared_source import open_source
+from upload_sessions import upload_sessions, fingerprint
+from bandwidth_scheduler import bandwidth
+from http_client import create_session
 
-class SeekstreamingUploader:
-    def __init__(self, api_key, email=None, password=None):
+
+class SeekstreamingUploader(Uploader):
+    host = 'seekstreaming'
+    display_name = 'SeekStreaming'
+    chunked = True
+    tus = True
+    multipart = False
+    resumable = True
+
+    def __init__(self, api_key, email=None, password=None, parallel_streams=4, session_store=None):
         self.api_key = api_key
+        # Upload locations/offsets survive restarts here
+        self.sessions = session_store or upload_sessions
+        # Parallel partial uploads when the server supports TUS concatenation
+        self.parallel_streams = max(1, int(parallel_streams))
         self.base_url = "https://seekstreaming.com"
         # Keep chunk size at 50 MB as per API spec
         self.chunk_size = 52428800  # 50 MB (required by API)
-        self.session = requests.Session()  # Reuse connections for speed
-        self.session.headers.update({
-            'User-Agent': 'SeekStreaming-Uploader/2.0',
-            'Connection': 'keep-alive'
+        # Pooled keep-alive connections (parallel partial uploads share them)
+        self.session = create_session(pool_size=20, retries=3, name='seekstreaming', headers={
+            'User-Agent': 'SeekStreaming-Uploader/2.0'
         })
-        # Optimized connection pooling
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=20,
-            pool_maxsize=20,
-            max_retries=3,
-            pool_block=False
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
         
     def _print_progress_bar(self, current, total, start_time, prefix='Progress'):
         """Print a simple progress indicator"""
@@ -124,8 +134,320 @@ class SeekstreamingUploader:
             print(f"[Seekstreaming] Error getting upload endpoint: {str(e)}")
             return None
     
-    def _tus_upload_optimized(self, video_path, tus_url, access_token, title=None):
-        """Upload video using TUS protocol with optimizations"""
+    def _tus_extensions(self, tus_url):
+        """TUS extensions advertised by the server (OPTIONS Tus-Extension header)"""
+        try:
+            response = self.session.options(tus_url, headers={'Tus-Resumable': '1.0.0'}, timeout=15)
+            header = response.headers.get('Tus-Extension', '')
+            return {ext.strip().lower() for ext in header.split(',') if ext.strip()}
+        except Exception as e:
+            print(f"[Seekstreaming] Could not query TUS extensions: {e}")
+            return set()
+    
+    def _tus_offset(self, upload_location, default=0):
+        """Current server offset of an upload (HEAD), or default if unknown"""
+        try:
+            head_resp = self.session.head(upload_location, headers={'Tus-Resumable': '1.0.0'}, timeout=30)
+            if head_resp.status_code == 200:
+                return int(head_resp.headers.get('Upload-Offset', default))
+        except Exception as e:
+            print(f"[Seekstreaming] Warning: Could not check offset: {e}")
+        return default
+    
+    def _tus_resume_offset(self, upload_location):
+        """Server offset of a stored upload, or None if the server no longer has it"""
+        try:
+            head_resp = self.session.head(upload_location, headers={'Tus-Resumable': '1.0.0'}, timeout=30)
+            if head_resp.status_code == 200 and 'Upload-Offset' in head_resp.headers:
+                return int(head_resp.headers['Upload-Offset'])
+        except Exception as e:
+            print(f"[Seekstreaming] Warning: Could not check stored upload: {e}")
+        return None
+    
+    def _resumable_session(self, file_fingerprint, file_size):
+        """
+        Stored in-progress session for this file, with offsets refreshed
+        from the server - None if there is nothing to resume
+        """
+        stored = self.sessions.get(file_fingerprint, self.host)
+        if not stored or stored.get('status') != 'uploading' or stored.get('file_size') != file_size:
+            return None
+        
+        if stored.get('mode') == 'concat':
+            for part in stored['parts']:
+                part['offset'] = self._tus_resume_offset(part['location'])
+                if part['offset'] is None:
+                    break
+            else:
+                return stored
+        elif stored.get('location'):
+            stored['offset'] = self._tus_resume_offset(stored['location'])
+            if stored['offset'] is not None:
+                return stored
+        
+        print(f"[Seekstreaming] Stored upload session expired on the server - starting over")
+        self.sessions.discard(file_fingerprint, self.host)
+        return None
+    
+    def _tus_upload_sequential(self, video_path, upload_location, file_size, start_time, file_fingerprint=None):
+        """
+        PATCH chunks one after another, reading the next chunk from disk
+        while the current one is on the wire
+        
+        Returns:
+            (last PATCH response, error message or None)
+        """
+        # Step 1.5: Check for existing offset (Resume capability)
+        offset = self._tus_offset(upload_location)
+        if offset > 0:
+            print(f"[Seekstreaming] Resuming from offset {offset} ({offset/(1024*1024):.1f} MB)")
+        
+        response = None
+        
+        # Step 2: Upload file in chunks with progress bar
+        with open_source(video_path) as f, ThreadPoolExecutor(max_workers=1) as reader:
+            # Seek to current offset
+            if offset > 0:
+                f.seek(offset)
+            
+            next_chunk = reader.submit(f.read, self.chunk_size)
+            
+            while offset < file_size:
+                chunk_data = next_chunk.result()
+                chunk_size = len(chunk_data)
+                
+                if not chunk_data:
+                    break
+                
+                # Read ahead: the next chunk is loaded while this one uploads
+                if offset + chunk_size < file_size:
+                    next_chunk = reader.submit(f.read, self.chunk_size)
+                
+                # Show progress before upload
+                self._print_progress_bar(offset, file_size, start_time, 'Uploading')
+                
+                headers = {
+                    'Tus-Resumable': '1.0.0',
+                    'Upload-Offset': str(offset),
+                    'Content-Type': 'application/offset+octet-stream',
+                    'Content-Length': str(chunk_size)
+                }
+                
+                # Upload chunk with retry logic
+                max_retries = 3
+                success = False
+                
+                for attempt in range(max_retries):
+                    try:
+                        response = self.session.patch(
+                            upload_location,
+                            headers=headers,
+                            data=BytesStream(chunk_data),
+                            timeout=600  # Longer timeout for large chunks
+                        )
+                        
+                        if response.status_code in [200, 204]:
+                            success = True
+                            break
+                        elif attempt < max_retries - 1:
+                            time.sleep(0.5)
+                    except Exception as e:
+                        if attempt < max_retries - 1:
+                            time.sleep(0.5)
+                        else:
+                            raise
+                
+                if not success:
+                    return response, f"Upload failed at offset {offset}: {response.status_code}"
+                
+                offset += chunk_size
+                if file_fingerprint:
+                    self.sessions.update_offset(file_fingerprint, self.host, offset)
+        
+        # Final progress update
+        self._print_progress_bar(file_size, file_size, start_time, 'Uploading')
+        return response, None
+    
+    def _tus_upload_partial(self, upload_location, video_path, start, length, part_progress, index,
+                            max_retries=3, offset=0, file_fingerprint=None, flow=None):
+        """
+        Upload one byte range of the file into a partial TUS upload
+        Bodies are streamed from disk; on failure the server offset is
+        re-read with HEAD and the upload continues from there.
+        """
+        failures = 0
+        part_progress[index] = offset
+        
+        while offset < length:
+            size = min(self.chunk_size, length - offset)
+            
+            def on_progress(bytes_sent, total, base=offset):
+                part_progress[index] = base + bytes_sent
+            
+            body = FileRangeStream(video_path, start + offset, size, callback=on_progress, flow=flow)
+            headers = {
+                'Tus-Resumable': '1.0.0',
+                'Upload-Offset': str(offset),
+                'Content-Type': 'application/offset+octet-stream',
+                'Content-Length': str(size)
+            }
+            
+            try:
+                response = self.session.patch(upload_location, headers=headers, data=body, timeout=600)
+                if response.status_code in [200, 204]:
+                    offset = int(response.headers.get('Upload-Offset', offset + size))
+                    part_progress[index] = offset
+                    failures = 0
+                    if file_fingerprint:
+                        self.sessions.update_offset(file_fingerprint, self.host, offset, part=index)
+                    continue
+                error = f"HTTP {response.status_code}"
+            except Exception as e:
+                error = str(e)
+            
+            failures += 1
+            if failures >= max_retries:
+                raise Exception(f"Part {index + 1} failed at offset {start + offset}: {error}")
+            
+            time.sleep(0.5)
+            offset = self._tus_offset(upload_location, default=offset)
+            part_progress[index] = offset
+    
+    def _tus_upload_concat(self, video_path, tus_url, metadata, file_size, streams, start_time,
+                           file_fingerprint=None, resume=None):
+        """
+        TUS Concatenation: upload N partial uploads in parallel, then
+        create the final upload from them
+        
+        Args:
+            resume: Stored session whose partial uploads are continued
+                    instead of creating new ones
+        
+        Returns:
+            (final upload location, final POST response, number of streams)
+        """
+        if resume:
+            parts = resume['parts']
+            ranges = [(p['start'], p['length']) for p in parts]
+            partial_locations = [p['location'] for p in parts]
+            offsets = [p['offset'] for p in parts]
+            done = sum(offsets)
+            print(f"[Seekstreaming] Resuming parallel upload: {len(ranges)} streams, "
+                  f"{done / (1024*1024):.1f} MB already on the server")
+        else:
+            partial_locations, ranges = self._tus_create_partials(tus_url, metadata, file_size, streams)
+            offsets = [0] * len(ranges)
+            
+            if file_fingerprint:
+                self.sessions.save(
+                    file_fingerprint, self.host,
+                    mode='concat', tus_url=tus_url, file_size=file_size, status='uploading',
+                    parts=[
+                        {'location': location, 'start': start, 'length': length, 'offset': 0}
+                        for location, (start, length) in zip(partial_locations, ranges)
+                    ]
+                )
+        
+        part_progress = [0] * len(ranges)
+        # Worker threads account to this upload's bandwidth flow
+        flow = bandwidth.current_flow()
+        
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(
+                    self._tus_upload_partial, location, video_path, start, length, part_progress, i,
+                    offset=offsets[i], file_fingerprint=file_fingerprint, flow=flow
+                )
+                for i, (location, (start, length)) in enumerate(zip(partial_locations, ranges))
+            ]
+            
+            pending = futures
+            while pending:
+                self._print_progress_bar(sum(part_progress), file_size, start_time, 'Uploading')
+                _, pending = wait(pending, timeout=0.5)
+            
+            for future in futures:
+                future.result()
+        
+        self._print_progress_bar(file_size, file_size, start_time, 'Uploading')
+        
+        # Final upload = concatenation of the partials, in order
+        response = self.session.post(
+            tus_url,
+            headers={
+                'Tus-Resumable': '1.0.0',
+                'Upload-Concat': 'final;' + ' '.join(partial_locations),
+                'Upload-Metadata': metadata
+            },
+            timeout=120
+        )
+        location = response.headers.get('Location')
+        if response.status_code not in [200, 201] or not location:
+            raise Exception(f"Failed to concatenate partial uploads: {response.status_code}")
+        
+        return urljoin(tus_url, location), response, len(ranges)
+    
+    def _tus_create_partials(self, tus_url, metadata, file_size, streams):
+        """
+        Create one partial upload per chunk-aligned byte range
+        
+        Returns:
+            (partial upload locations, [(start, length), ...])
+        """
+        part_size = (file_size + streams - 1) // streams
+        # Keep parts aligned to whole chunks
+        part_size = ((part_size + self.chunk_size - 1) // self.chunk_size) * self.chunk_size
+        ranges = [(start, min(part_size, file_size - start)) for start in range(0, file_size, part_size)]
+        
+        print(f"[Seekstreaming] Parallel upload: {len(ranges)} streams x {part_size / (1024*1024):.0f} MB")
+        
+        partial_locations = []
+        for start, length in ranges:
+            response = self.session.post(
+                tus_url,
+                headers={
+                    'Tus-Resumable': '1.0.0',
+                    'Upload-Concat': 'partial',
+                    'Upload-Length': str(length),
+                    'Upload-Metadata': metadata
+                },
+                timeout=30
+            )
+            location = response.headers.get('Location')
+            if response.status_code not in [200, 201] or not location:
+                raise Exception(f"Failed to create partial upload: {response.status_code}")
+            partial_locations.append(urljoin(tus_url, location))
+        
+        return partial_locations, ranges
+    
+    def _build_result(self, video_id, elapsed, speed_mbps, streams):
+        """Success result with all URLs for a video ID"""
+        # Extract all possible URLs using the actual video ID
+        print(f"[Seekstreaming] Generating embed URLs...")
+        all_urls = self._extract_all_urls(video_id)
+        
+        return {
+            "success": True,
+            "host": "seekstreaming",
+            "file_code": video_id,
+            "video_id": video_id,
+            "embed_url": all_urls["video_player"],
+            "url": all_urls["video_player"],
+            "download_url": all_urls["video_downloader"],
+            "all_urls": all_urls,
+            "upload_time": elapsed,
+            "speed_mbps": speed_mbps,
+            "streams": streams
+        }
+    
+    def _tus_upload_optimized(self, video_path, tus_url, access_token, title=None, file_fingerprint=None):
+        """
+        Upload video using TUS protocol with optimizations
+        Uses parallel partial uploads + concatenation when the server supports
+        it, otherwise sequential PATCHes with read-ahead.
+        An interrupted upload of the same file (file_fingerprint) is resumed
+        from the offsets the server confirmed.
+        """
         try:
             file_name = Path(video_path).name
             file_size = os.path.getsize(video_path)
@@ -143,119 +465,89 @@ class SeekstreamingUploader:
             
             metadata = ",".join(metadata_parts)
             
-            # Step 1: Create upload session
-            print(f"[Seekstreaming] Creating TUS upload session...")
-            headers = {
-                'Tus-Resumable': '1.0.0',
-                'Upload-Length': str(file_size),
-                'Upload-Metadata': metadata,
-                'Content-Type': 'application/offset+octet-stream'
-            }
+            resume = self._resumable_session(file_fingerprint, file_size) if file_fingerprint else None
             
-            response = self.session.post(tus_url, headers=headers, timeout=30)
-            
-            if response.status_code not in [200, 201]:
-                return {"success": False, "error": f"Failed to create upload session: {response.status_code}"}
-            
-            upload_location = response.headers.get('Location')
-            if not upload_location:
-                return {"success": False, "error": "No upload location returned"}
+            total_chunks = (file_size + self.chunk_size - 1) // self.chunk_size
+            streams = min(self.parallel_streams, total_chunks)
+            if resume:
+                use_concat = resume['mode'] == 'concat'
+            else:
+                use_concat = streams > 1 and 'concatenation' in self._tus_extensions(tus_url)
             
-            print(f"[Seekstreaming] Upload session created")
             print(f"[Seekstreaming] File size: {file_size / (1024*1024):.2f} MB")
             print(f"[Seekstreaming] Chunk size: {self.chunk_size / (1024*1024):.0f} MB")
             print()
             
-            print()
-            
-            # Step 1.5: Check for existing offset (Resume capability)
-            offset = 0
-            try:
-                head_resp = self.session.head(upload_location, headers={'Tus-Resumable': '1.0.0'})
-                if head_resp.status_code == 200:
-                    server_offset = int(head_resp.headers.get('Upload-Offset', 0))
-                    if server_offset > 0:
-                        print(f"[Seekstreaming] Resuming from offset {server_offset} ({server_offset/(1024*1024):.1f} MB)")
-                        offset = server_offset
-            except Exception as e:
-                print(f"[Seekstreaming] Warning: Could not check offset: {e}")
-
             start_time = time.time()
             
-            # Step 2: Upload file in chunks with progress bar
-            with open(video_path, 'rb') as f:
-                # Seek to current offset
-                if offset > 0:
-                    f.seek(offset)
+            if use_concat:
+                upload_location, response, streams = self._tus_upload_concat(
+                    video_path, tus_url, metadata, file_size, streams, start_time,
+                    file_fingerprint=file_fingerprint, resume=resume
+                )
+            elif resume:
+                streams = 1
+                upload_location = resume['location']
+                print(f"[Seekstreaming] Resuming stored upload session at "
+                      f"{resume['offset'] / (1024*1024):.1f} MB")
                 
-                chunk_num = 0
-                total_chunks = (file_size + self.chunk_size - 1) // self.chunk_size
+                response, error = self._tus_upload_sequential(
+                    video_path, upload_location, file_size, start_time, file_fingerprint
+                )
+                if error:
+                    print()
+                    return {"success": False, "error": error}
+            else:
+                streams = 1
                 
-                while offset < file_size:
-                    chunk_num += 1
-                    chunk_end = min(offset + self.chunk_size, file_size)
-                    
-                    # Read chunk
-                    chunk_data = f.read(self.chunk_size)
-                    chunk_size = len(chunk_data)
-                    
-                    if not chunk_data:
-                        break
-                    
-                    # Show progress before upload
-                    self._print_progress_bar(offset, file_size, start_time, 'Uploading')
-                    
-                    headers = {
-                        'Tus-Resumable': '1.0.0',
-                        'Upload-Offset': str(offset),
-                        'Content-Type': 'application/offset+octet-stream',
-                        'Content-Length': str(chunk_size)
-                    }
-                    
-                    # Upload chunk with retry logic
-                    max_retries = 3
-                    success = False
-                    
-                    for attempt in range(max_retries):
-                        try:
-                            response = self.session.patch(
-                                upload_location,
-                                headers=headers,
-                                data=chunk_data,
-                                timeout=600  # Longer timeout for large chunks
-                            )
-                            
-                            if response.status_code in [200, 204]:
-                                success = True
-                                break
-                            elif attempt < max_retries - 1:
-                                time.sleep(0.5)
-                        except Exception as e:
-                            if attempt < max_retries - 1:
-                                time.sleep(0.5)
-                            else:
-                                raise
-                    
-                    if not success:
-                        print()
-                        return {"success": False, "error": f"Upload failed at offset {offset}: {response.status_code}"}
-                    
-                    offset += chunk_size
+                # Step 1: Create upload session
+                print(f"[Seekstreaming] Creating TUS upload session...")
+                headers = {
+                    'Tus-Resumable': '1.0.0',
+                    'Upload-Length': str(file_size),
+                    'Upload-Metadata': metadata,
+                    'Content-Type': 'application/offset+octet-stream'
+                }
+                
+                response = self.session.post(tus_url, headers=headers, timeout=30)
+                
+                if response.status_code not in [200, 201]:
+                    return {"success": False, "error": f"Failed to create upload session: {response.status_code}"}
+                
+                upload_location = response.headers.get('Location')
+                if not upload_location:
+                    return {"success": False, "error": "No upload location returned"}
+                
+                upload_location = urljoin(tus_url, upload_location)
+                print(f"[Seekstreaming] Upload session created")
                 
-                # Final progress update
-                self._print_progress_bar(file_size, file_size, start_time, 'Uploading')
-                print()  # New line after progress bar
+                if file_fingerprint:
+                    self.sessions.save(
+                        file_fingerprint, self.host,
+                        mode='sequential', tus_url=tus_url, file_size=file_size,
+                        status='uploading', location=upload_location, offset=0
+                    )
+                
+                start_time = time.time()
+                response, error = self._tus_upload_sequential(
+                    video_path, upload_location, file_size, start_time, file_fingerprint
+                )
+                if error:
+                    print()
+                    return {"success": False, "error": error}
+            
+            print()  # New line after progress bar
             
             elapsed = time.time() - start_time
             speed_mbps = (file_size / (1024*1024)) / elapsed if elapsed > 0 else 0
             
             print()
-            print(f"[Seekstreaming] ✓ Upload completed in {elapsed:.1f}s (avg {speed_mbps:.2f} MB/s)")
+            print(f"[Seekstreaming] ✓ Upload completed in {elapsed:.1f}s (avg {speed_mbps:.2f} MB/s, {streams} stream(s))")
             
-            # Extract actual video ID from the final PATCH response body
+            # Extract actual video ID from the final response body
             actual_video_id = None
             try:
-                if response.text:
+                if response is not None and response.text:
                     response_data = response.json()
                     actual_video_id = response_data.get('videoId')
                     if actual_video_id:
@@ -269,22 +561,10 @@ class SeekstreamingUploader:
                 print(f"[Seekstreaming] ⚠ Video ID not in response, using TUS upload ID: {tus_upload_id}")
                 actual_video_id = tus_upload_id
             
-            # Extract all possible URLs using the actual video ID
-            print(f"[Seekstreaming] Generating embed URLs...")
-            all_urls = self._extract_all_urls(actual_video_id)
-            
-            result = {
-                "success": True,
-                "host": "seekstreaming",
-                "file_code": actual_video_id,
-                "video_id": actual_video_id,
-                "embed_url": all_urls["video_player"],
-                "url": all_urls["video_player"],
-                "download_url": all_urls["video_downloader"],
-                "all_urls": all_urls,
-                "upload_time": elapsed,
-                "speed_mbps": speed_mbps
-            }
+            if file_fingerprint:
+                self.sessions.complete(file_fingerprint, self.host, actual_video_id, location=upload_location)
+            
+            result = self._build_result(actual_video_id, elapsed, speed_mbps, streams)
             
             # Note: Video details may not be immediately available
             # The video is processing on the server
@@ -309,6 +589,15 @@ class SeekstreamingUploader:
             
             print(f"[Seekstreaming] Starting upload: {file_name}")
             
+            # Finished in an earlier run (e.g. crashed before the DB sync)
+            file_fingerprint = fingerprint(video_path)
+            stored = self.sessions.get(file_fingerprint, self.host)
+            if stored and stored.get('status') == 'complete' and stored.get('file_code'):
+                print(f"[Seekstreaming] ✓ Already uploaded in a previous run: {stored['file_code']}")
+                result = self._build_result(stored['file_code'], 0, 0, 0)
+                result['resumed'] = True
+                return result
+            
             # Get TUS upload endpoint
             endpoint_info = self._get_upload_endpoint()
             if not endpoint_info or not endpoint_info.get('tus_url'):
@@ -319,7 +608,8 @@ class SeekstreamingUploader:
                 video_path,
                 endpoint_info['tus_url'],
                 endpoint_info['access_token'],
-                title
+                title,
+                file_fingerprint
             )
                     
         except Exception as e:
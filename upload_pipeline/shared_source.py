@@ -0,0 +1,330 @@
+"""
+Shared Read-Once File Source
+One video, many hosts, one pass over the disk:
+- Upload consumers read the file through a bounded ring of chunks;
+  each chunk is read from disk once, by whichever consumer needs it first
+- Consumers move at their own pace inside the ring; the leader waits for
+  the slowest one when the ring is full
+- A consumer that stalls the others for too long, seeks backwards (retry)
+  or starts outside the ring is detached and reads the file directly
+- Consumers register() before they start and leave() when done; the start
+  of the file is only held back for registered consumers that have not
+  opened it yet, so a lone reader never waits for join_timeout
+- Streaming bodies (streaming_multipart) pick up an active source
+  automatically via open_source(), so uploaders need no changes
+"""
+import os
+import time
+import threading
+
+CHUNK_SIZE = 4 * 1024 * 1024
+RING_SIZE_MB = float(os.getenv('SHARED_SOURCE_RING_MB', '128'))
+
+# abspath -> active SharedFileSource
+_active_sources = {}
+_active_lock = threading.Lock()
+
+
+class SharedFileSource:
+    """Bounded ring of file chunks shared by concurrent sequential readers"""
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE, ring_size_mb=None,
+                 max_stall=30.0, join_timeout=60.0):
+        """
+        Args:
+            path: File to share
+            chunk_size: Bytes per ring chunk (one disk read)
+            ring_size_mb: Ring capacity (default SHARED_SOURCE_RING_MB)
+            max_stall: Seconds the leader waits for the slowest reader
+                       before detaching it
+            join_timeout: Seconds to keep the start of the file for
+                          registered consumers that have not opened it yet
+        """
+        self.path = os.path.abspath(path)
+        self.size = os.path.getsize(path)
+        self.chunk_size = chunk_size
+        ring_size_mb = ring_size_mb if ring_size_mb is not None else RING_SIZE_MB
+        self.max_chunks = max(2, int(ring_size_mb * 1024 * 1024 // chunk_size))
+        self.max_stall = max_stall
+        self.join_timeout = join_timeout
+
+        self.cond = threading.Condition()
+        self.chunks = {}      # chunk index -> bytes
+        self.base = 0         # lowest retained chunk index
+        self.frontier = 0     # next chunk index to read from disk
+        self.loading = False
+        self.readers = set()     # attached readers
+        self.registered = set()  # thread idents that will read from offset 0
+        self.joined = set()      # thread idents that opened at offset 0
+        self.left = set()        # thread idents whose upload finished
+        self.first_open = None
+        self._file = None
+
+        # Stats
+        self.disk_bytes = 0
+        self.served_bytes = 0
+        self.direct_bytes = 0
+        self.detached = 0
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def __enter__(self):
+        with _active_lock:
+            _active_sources[self.path] = self
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        with _active_lock:
+            if _active_sources.get(self.path) is self:
+                del _active_sources[self.path]
+
+        with self.cond:
+            self.chunks.clear()
+            if self._file:
+                self._file.close()
+                self._file = None
+            self.cond.notify_all()
+
+    def register(self):
+        """Announce the calling thread as a consumer that will read from the start"""
+        ident = threading.get_ident()
+        with self.cond:
+            self.registered.add(ident)
+            self.joined.discard(ident)
+            self.left.discard(ident)
+
+    def leave(self):
+        """Mark the calling thread's consumer as finished (opened or not)"""
+        with self.cond:
+            self.left.add(threading.get_ident())
+            self.cond.notify_all()
+
+    def open(self, start=0):
+        """Sequential reader positioned at start"""
+        return SharedReader(self, start)
+
+    # -- ring management (caller holds self.cond) -------------------------
+
+    def _attach(self, reader):
+        idx = reader.pos // self.chunk_size
+
+        if self.first_open is None:
+            self.first_open = time.time()
+
+        if not self.readers and not self.loading and idx not in self.chunks \
+                and not (idx and self._waiting_for_joins()):
+            # Nobody attached - move the window to this reader
+            self.chunks.clear()
+            self.base = self.frontier = idx
+
+        if self.base <= idx <= self.frontier:
+            self.readers.add(reader)
+            if reader.pos == 0:
+                self.joined.add(threading.get_ident())
+            return True
+
+        return False
+
+    def _detach(self, reader):
+        if reader in self.readers:
+            self.readers.discard(reader)
+            self.detached += 1
+            self.cond.notify_all()
+
+    def _waiting_for_joins(self):
+        """True while registered consumers that have not opened yet may still need chunk 0"""
+        if self.base > 0 or not self.registered - self.joined - self.left:
+            return False
+        return time.time() - (self.first_open or time.time()) < self.join_timeout
+
+    def _evict(self):
+        if self._waiting_for_joins():
+            return
+
+        if self.readers:
+            lowest = min(r.pos // self.chunk_size for r in self.readers)
+        else:
+            lowest = self.frontier
+
+        for idx in range(self.base, min(lowest, self.frontier)):
+            self.chunks.pop(idx, None)
+        self.base = max(self.base, min(lowest, self.frontier))
+
+    def _get_chunk(self, reader, idx):
+        """
+        Chunk data for an attached reader, loading it from disk if it is next
+
+        Returns:
+            bytes, or None if the reader was detached
+        """
+        stall_start = None
+
+        with self.cond:
+            while True:
+                if reader not in self.readers:
+                    return None
+
+                if idx in self.chunks:
+                    return self.chunks[idx]
+
+                if idx < self.base or idx > self.frontier:
+                    self._detach(reader)
+                    return None
+
+                if idx == self.frontier and not self.loading:
+                    self._evict()
+
+                    if self.frontier - self.base < self.max_chunks:
+                        self.loading = True
+                        break
+
+                    # Ring full - wait for the slowest reader, then cut it loose
+                    stall_start = stall_start or time.time()
+                    if time.time() - stall_start > self.max_stall and not self._waiting_for_joins():
+                        slowest = min(self.readers, key=lambda r: r.pos)
+                        if slowest is not reader:
+                            self._detach(slowest)
+                            stall_start = None
+                            continue
+
+                self.cond.wait(0.5)
+
+        # Disk read outside the lock; only one loader at a time
+        try:
+            if self._file is None:
+                self._file = open(self.path, 'rb')
+            self._file.seek(idx * self.chunk_size)
+            data = self._file.read(self.chunk_size)
+        except Exception:
+            with self.cond:
+                self.loading = False
+                self.cond.notify_all()
+            raise
+
+        with self.cond:
+            self.chunks[idx] = data
+            self.frontier = idx + 1
+            self.loading = False
+            self.disk_bytes += len(data)
+            self.cond.notify_all()
+
+        return data
+
+    def stats(self):
+        with self.cond:
+            return {
+                'file_bytes': self.size,
+                'disk_bytes': self.disk_bytes,
+                'served_bytes': self.served_bytes,
+                'direct_bytes': self.direct_bytes,
+                'detached_readers': self.detached
+            }
+
+
+class SharedReader:
+    """File-like sequential reader over a SharedFileSource"""
+
+    def __init__(self, source, start=0):
+        self.source = source
+        self.pos = start
+        self._direct = None
+
+        with source.cond:
+            if not source._attach(self):
+                self._open_direct()
+
+    def _open_direct(self):
+        self._direct = open(self.source.path, 'rb')
+        self._direct.seek(self.pos)
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self.pos
+        elif whence == 2:
+            offset += self.source.size
+
+        if self._direct is None and offset < self.pos:
+            # Rewind (retry) - the ring has moved on
+            with self.source.cond:
+                self.source._detach(self)
+
+        self.pos = offset
+        if self._direct is not None or self not in self.source.readers:
+            if self._direct is None:
+                self._open_direct()
+            self._direct.seek(offset)
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+    def readinto(self, buffer):
+        view = memoryview(buffer).cast('B')
+        filled = 0
+
+        while filled < len(view) and self.pos < self.source.size:
+            if self._direct is not None:
+                n = self._direct.readinto(view[filled:])
+                if not n:
+                    break
+                with self.source.cond:
+                    self.source.direct_bytes += n
+            else:
+                idx, offset = divmod(self.pos, self.source.chunk_size)
+                chunk = self.source._get_chunk(self, idx)
+                if chunk is None:
+                    self._open_direct()
+                    continue
+                n = min(len(chunk) - offset, len(view) - filled)
+                if n <= 0:
+                    break
+                view[filled:filled + n] = memoryview(chunk)[offset:offset + n]
+                with self.source.cond:
+                    self.source.served_bytes += n
+
+            filled += n
+            self.pos += n
+
+        return filled
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.source.size - self.pos
+        buffer = bytearray(max(0, min(size, self.source.size - self.pos)))
+        n = self.readinto(buffer)
+        return bytes(buffer[:n])
+
+    def close(self):
+        with self.source.cond:
+            self.source.readers.discard(self)
+            self.source.cond.notify_all()
+        if self._direct is not None:
+            self._direct.close()
+            self._direct = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def open_source(path, start=0):
+    """
+    Open a file for sequential reading at start
+    Uses the active SharedFileSource for the path if there is one,
+    otherwise a plain file object.
+    """
+    with _active_lock:
+        source = _active_sources.get(os.path.abspath(path))
+
+    if source is not None:
+        return source.open(start)
+
+    f = open(path, 'rb')
+    if start:
+        f.seek(start)
+    return f
@@ -0,0 +1,271 @@
+"""
+Local stand-in upload hosts
+HTTP servers with the upload API shapes of the real hosts, for tests and
+benchmarks that must not touch the internet:
+- 'mixdrop'     direct multipart POST            (MixDropUploader)
+- 'xfs'         get upload server, then POST     (UploadyUploader and other XFS hosts)
+- 'streamwish'  get upload server, then POST     (upload_to_streamwish: account/file-list calls,
+                                                  {'files': [...]} response)
+- 'tus'         TUS creation/HEAD/PATCH with optional Concatenation (SeekstreamingUploader)
+
+Each server drains request bodies at a configurable per-connection
+bandwidth, adds a configurable latency to every request, and logs
+per-request timings (server.log) so callers can split an upload into
+setup / transfer / finalize phases.
+
+Usage:
+    from standin_hosts import start_host
+    server = start_host('tus', bandwidth_mbps=20, latency=0.05, concatenation=True)
+    base_url = server.base_url
+    ...
+    server.shutdown()
+"""
+import json
+import time
+import uuid
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MB = 1024 * 1024
+SHAPES = ('mixdrop', 'xfs', 'streamwish', 'tus')
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Routes requests to the configured host shape"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    # -- helpers -----------------------------------------------------------
+
+    def _begin(self):
+        """Latency, then a log entry for this request"""
+        entry = {'method': self.command, 'path': self.path, 'start': time.time(),
+                 'first_byte': None, 'last_byte': None, 'bytes': 0}
+        with self.server.lock:
+            self.server.log.append(entry)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        return entry
+
+    def _reply(self, status, payload=None, headers=None, entry=None):
+        body = json.dumps(payload).encode() if payload is not None else b''
+        self.send_response(status)
+        if self.server.shape == 'tus':
+            self.send_header('Tus-Resumable', '1.0.0')
+        if payload is not None:
+            self.send_header('Content-Type', 'application/json')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        if entry is not None:
+            entry['end'] = time.time()
+
+    def _drain(self, entry, sink=None):
+        """Read the body at the configured bandwidth; returns bytes read"""
+        length = int(self.headers.get('Content-Length', 0))
+        rate = self.server.bandwidth
+        start = time.time()
+        received = 0
+
+        while received < length:
+            data = self.rfile.read(min(256 * 1024, length - received))
+            if not data:
+                break
+            if entry['first_byte'] is None:
+                entry['first_byte'] = time.time()
+            if sink is not None:
+                sink += data
+            received += len(data)
+            with self.server.lock:
+                self.server.received += len(data)
+
+            if rate:
+                ahead = received / rate - (time.time() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+        entry['last_byte'] = time.time()
+        entry['bytes'] = received
+        return received
+
+    def _new_code(self):
+        with self.server.lock:
+            self.server.file_count += 1
+            return f'standin{self.server.file_count:04d}'
+
+    # -- GET: API calls ----------------------------------------------------
+
+    def do_GET(self):
+        entry = self._begin()
+        base = self.server.base_url
+        path = self.path.split('?')[0].rstrip('/')
+        shape = self.server.shape
+
+        if shape == 'tus':
+            # Seekstreaming API: /api/v1/video/upload -> TUS endpoint
+            return self._reply(200, {'tusUrl': f'{base}/files/', 'accessToken': 'standin-token'}, entry=entry)
+
+        if shape == 'mixdrop':
+            return self._reply(200, {'success': True, 'result': {'url': f'{base}/api'}}, entry=entry)
+
+        if path.endswith('/upload/server'):
+            return self._reply(200, {'status': 200, 'result': f'{base}/upload/01', 'sess_id': 'standin-session'},
+                               entry=entry)
+        if path.endswith('/file/list'):
+            return self._reply(200, {'status': 200, 'result': {'files': []}}, entry=entry)
+        if path.endswith('/account/info'):
+            return self._reply(200, {'status': 200, 'result': {'email': 'standin@example.com'}}, entry=entry)
+        return self._reply(200, {'status': 200, 'result': {}}, entry=entry)
+
+    # -- POST: multipart upload or TUS creation ----------------------------
+
+    def do_POST(self):
+        entry = self._begin()
+        if self.server.shape == 'tus':
+            return self._tus_create(entry)
+
+        received = self._drain(entry)
+        code = self._new_code()
+        self.server.posts.append({
+            'content_length': int(self.headers.get('Content-Length', 0)),
+            'bytes_read': received,
+            'content_type': self.headers.get('Content-Type', '')
+        })
+
+        if self.server.shape == 'mixdrop':
+            payload = {'success': True, 'result': {'fileref': code, 'url': f'{self.server.base_url}/f/{code}',
+                                                   'embedurl': f'{self.server.base_url}/e/{code}'}}
+        elif self.server.shape == 'streamwish':
+            payload = {'status': 200, 'msg': 'OK', 'files': [{'filecode': code, 'filename': 'upload', 'status': 'OK'}]}
+        else:
+            payload = [{'file_code': code, 'file_status': 'OK'}]
+        self._reply(200, payload, entry=entry)
+
+    # -- TUS -----------------------------------------------------------------
+
+    def _upload(self):
+        upload_id = self.path.rstrip('/').split('/')[-1]
+        return self.server.uploads.get(upload_id)
+
+    def _tus_create(self, entry):
+        concat = self.headers.get('Upload-Concat', '')
+        upload_id = uuid.uuid4().hex
+
+        if concat.startswith('final;'):
+            if not self.server.concatenation:
+                return self._reply(400, entry=entry)
+            parts = [self.server.uploads[url.rstrip('/').split('/')[-1]] for url in concat[6:].split()]
+            if any(len(p['data']) != p['length'] for p in parts):
+                return self._reply(400, entry=entry)
+            data = b''.join(bytes(p['data']) for p in parts)
+            self.server.uploads[upload_id] = {'length': len(data), 'data': bytearray(data)}
+            self.server.completed.append(upload_id)
+            return self._reply(201, {'videoId': upload_id}, {'Location': f'/files/{upload_id}'}, entry=entry)
+
+        self.server.uploads[upload_id] = {
+            'length': int(self.headers['Upload-Length']),
+            'data': bytearray(),
+            'partial': concat == 'partial'
+        }
+        self._reply(201, headers={'Location': f'/files/{upload_id}'}, entry=entry)
+
+    def do_OPTIONS(self):
+        entry = self._begin()
+        extensions = 'creation,concatenation' if self.server.concatenation else 'creation'
+        self._reply(204, headers={'Tus-Version': '1.0.0', 'Tus-Extension': extensions}, entry=entry)
+
+    def do_HEAD(self):
+        entry = self._begin()
+        upload = self._upload()
+        if not upload:
+            return self._reply(404, entry=entry)
+        self._reply(200, headers={'Upload-Offset': str(len(upload['data'])),
+                                  'Upload-Length': str(upload['length'])}, entry=entry)
+
+    def do_PATCH(self):
+        entry = self._begin()
+        upload = self._upload()
+        length = int(self.headers.get('Content-Length', 0))
+
+        if not upload or int(self.headers['Upload-Offset']) != len(upload['data']):
+            self.rfile.read(length)
+            return self._reply(409 if upload else 404, entry=entry)
+
+        # Simulated outage once fail_at bytes arrived in total
+        if self.server.fail_at is not None and self.server.received >= self.server.fail_at:
+            self.rfile.read(length)
+            return self._reply(503, entry=entry)
+
+        self._drain(entry, sink=upload['data'])
+
+        if len(upload['data']) == upload['length'] and not upload.get('partial'):
+            self.server.completed.append(self.path.rstrip('/').split('/')[-1])
+
+        self._reply(204, headers={'Upload-Offset': str(len(upload['data']))}, entry=entry)
+
+
+def start_host(shape, bandwidth_mbps=None, latency=0.0, concatenation=True, fail_at=None):
+    """
+    Start a stand-in host on a free local port (background thread)
+
+    Args:
+        shape: One of SHAPES
+        bandwidth_mbps: Per-connection drain rate in MB/s (None = unlimited)
+        latency: Seconds added to every request (API round trip)
+        concatenation: 'tus' only - advertise the Concatenation extension
+        fail_at: 'tus' only - answer PATCH with 503 once this many bytes arrived
+
+    Returns:
+        ThreadingHTTPServer with base_url, log, posts, uploads, completed, received
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown stand-in shape: {shape}")
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    host, port = server.server_address[:2]
+    server.base_url = f'http://{host}:{port}'
+    server.shape = shape
+    server.bandwidth = bandwidth_mbps * MB if bandwidth_mbps else None
+    server.latency = latency
+    server.concatenation = concatenation
+    server.fail_at = fail_at
+    server.lock = threading.Lock()
+    server.log = []
+    server.posts = []
+    server.uploads = {}
+    server.completed = []
+    server.received = 0
+    server.file_count = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def phase_timings(server, start, end):
+    """
+    Split [start, end] into phases using the server's request log
+        setup     - until the first body byte arrived (API calls, TUS creation)
+        transfer  - first to last body byte
+        finalize  - last body byte until the upload returned
+    """
+    with server.lock:
+        entries = [e for e in server.log if e['start'] >= start - 0.01]
+    firsts = [e['first_byte'] for e in entries if e['first_byte']]
+    lasts = [e['last_byte'] for e in entries if e['last_byte'] and e['bytes']]
+
+    if not firsts:
+        return {'setup': end - start, 'transfer': 0.0, 'finalize': 0.0, 'requests': len(entries)}
+
+    first, last = min(firsts), max(lasts)
+    return {
+        'setup': first - start,
+        'transfer': last - first,
+        'finalize': end - last,
+        'requests': len(entries)
+    }
@@ -0,0 +1,215 @@
+"""
+Streaming Multipart Upload Body
+multipart/form-data body that is generated while it is sent:
+- requests' files= builds the whole body in memory (a full copy of the video)
+- This streams the file through one fixed-size buffer instead, so memory use
+  stays flat for multi-GB uploads
+- Exact Content-Length is computed up front (no chunked transfer encoding,
+  which several hosts reject)
+- Re-iterable: a connection retry starts again from the first byte
+- FileRangeStream does the same for raw byte ranges (TUS PATCH bodies)
+- Reads go through an active SharedFileSource when several hosts upload
+  the same file (see shared_source)
+- Every chunk is paced by the process-wide bandwidth scheduler, under the
+  flow of the upload that created the body
+"""
+import os
+import sys
+import uuid
+
+from shared_source import open_source
+
+# bandwidth_scheduler lives in the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bandwidth_scheduler import bandwidth
+
+# Bytes read from disk per send() - one buffer, reused for the whole file
+CHUNK_SIZE = 1024 * 1024
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+class MultipartStream:
+    """Iterable multipart/form-data body: form fields followed by one file"""
+
+    def __init__(self, fields, file_field, file_path, file_name=None,
+                 file_content_type='video/mp4', chunk_size=CHUNK_SIZE, callback=None, flow=None):
+        """
+        Args:
+            fields: Plain form fields (name -> value), sent before the file
+            file_field: Form field name of the file (e.g. 'file')
+            file_path: Path of the file to send
+            file_name: File name reported to the server (default: basename)
+            file_content_type: MIME type of the file part
+            chunk_size: Read buffer size in bytes
+            callback: Optional callback(bytes_sent, total_bytes) after each chunk
+            flow: Bandwidth flow (name, kind) (default: the creating thread's flow)
+        """
+        self.file_path = file_path
+        self.file_size = os.path.getsize(file_path)
+        self.chunk_size = chunk_size
+        self.callback = callback
+        self.flow = flow or bandwidth.current_flow()
+        self.boundary = uuid.uuid4().hex
+        self.bytes_sent = 0
+
+        parts = []
+        for name, value in (fields or {}).items():
+            if value is None:
+                continue
+            parts.append(
+                f'--{self.boundary}\r\n'
+                f'Content-Disposition: form-data; name="{_escape(name)}"\r\n\r\n'
+                f'{value}\r\n'
+            )
+
+        file_name = file_name or os.path.basename(file_path)
+        parts.append(
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="{_escape(file_field)}"; filename="{_escape(file_name)}"\r\n'
+            f'Content-Type: {file_content_type}\r\n\r\n'
+        )
+
+        self.head = ''.join(parts).encode('utf-8')
+        self.tail = f'\r\n--{self.boundary}--\r\n'.encode('utf-8')
+
+    @property
+    def content_type(self):
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self):
+        return len(self.head) + self.file_size + len(self.tail)
+
+    def __iter__(self):
+        self.bytes_sent = 0
+        total = len(self)
+
+        yield self.head
+        self._advance(len(self.head), total)
+
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+
+        with open_source(self.file_path) as f:
+            remaining = self.file_size
+            while remaining > 0:
+                n = f.readinto(view[:min(self.chunk_size, remaining)])
+                if not n:
+                    raise IOError(f"{self.file_path} shrank during upload")
+                remaining -= n
+                bandwidth.acquire(n, *self.flow)
+
+                # Sent synchronously before the next readinto() reuses the buffer
+                yield view[:n]
+                self._advance(n, total)
+
+        yield self.tail
+        self._advance(len(self.tail), total)
+
+    def _advance(self, n, total):
+        self.bytes_sent += n
+        if self.callback:
+            self.callback(self.bytes_sent, total)
+
+
+class FileRangeStream:
+    """Iterable raw body for a byte range of a file (TUS PATCH and similar)"""
+
+    def __init__(self, file_path, start, length, chunk_size=CHUNK_SIZE, callback=None, flow=None):
+        """
+        Args:
+            file_path: Path of the file to send
+            start: First byte of the range
+            length: Number of bytes to send
+            chunk_size: Read buffer size in bytes
+            callback: Optional callback(bytes_sent, total_bytes) after each chunk
+            flow: Bandwidth flow (name, kind) (default: the creating thread's flow)
+        """
+        self.file_path = file_path
+        self.start = start
+        self.length = length
+        self.chunk_size = chunk_size
+        self.callback = callback
+        self.flow = flow or bandwidth.current_flow()
+        self.bytes_sent = 0
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        self.bytes_sent = 0
+
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+
+        with open_source(self.file_path, self.start) as f:
+            remaining = self.length
+            while remaining > 0:
+                n = f.readinto(view[:min(self.chunk_size, remaining)])
+                if not n:
+                    raise IOError(f"{self.file_path} shrank during upload")
+                remaining -= n
+                bandwidth.acquire(n, *self.flow)
+
+                yield view[:n]
+                self.bytes_sent += n
+                if self.callback:
+                    self.callback(self.bytes_sent, self.length)
+
+
+class BytesStream:
+    """Iterable body over bytes already in memory, paced like the file streams"""
+
+    def __init__(self, data, chunk_size=CHUNK_SIZE, flow=None):
+        self.data = data
+        self.chunk_size = chunk_size
+        self.flow = flow or bandwidth.current_flow()
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        view = memoryview(self.data)
+        for offset in range(0, len(view), self.chunk_size):
+            chunk = view[offset:offset + self.chunk_size]
+            bandwidth.acquire(len(chunk), *self.flow)
+            yield chunk
+
+
+def post_multipart(session, url, fields, file_field, file_path, file_name=None,
+                   file_content_type='video/mp4', callback=None, chunk_size=CHUNK_SIZE, flow=None, **kwargs):
+    """
+    POST a file as a streamed multipart/form-data body
+
+    Args:
+        session: requests.Session (or the requests module)
+        url: Upload URL
+        fields: Plain form fields
+        file_field: Form field name of the file
+        file_path: Path of the file to send
+        file_name: File name reported to the server
+        file_content_type: MIME type of the file part
+        callback: Optional progress callback(bytes_sent, total_bytes)
+        chunk_size: Read buffer size in bytes
+        flow: Bandwidth flow (name, kind) (default: the current thread's)
+        **kwargs: Passed to session.post (timeout, verify, ...)
+
+    Returns:
+        requests.Response
+    """
+    body = MultipartStream(
+        fields, file_field, file_path,
+        file_name=file_name,
+        file_content_type=file_content_type,
+        chunk_size=chunk_size,
+        callback=callback,
+        flow=flow
+    )
+
+    headers = dict(kwargs.pop('headers', None) or {})
+    headers['Content-Type'] = body.content_type
+    headers['Content-Length'] = str(len(body))
+
+    return session.post(url, data=body, headers=headers, **kwargs)
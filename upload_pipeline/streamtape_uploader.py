@@ -3,28 +3,24 @@ import os
 from pathlib import Path
 import time
 import urllib3
+from uploader_base import Uploader
+from streaming_multipart import post_multipart
+from http_client import create_session
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-class StreamtapeUploader:
+class StreamtapeUploader(Uploader):
+    host = 'streamtape'
+    display_name = 'Streamtape'
+
     def __init__(self, login, api_key):
         self.login = login
         self.api_key = api_key
         self.base_url = "https://api.streamtape.com"
         
-        # Create session for connection reuse
-        self.session = requests.Session()
-        self.session.verify = False
-        
-        # Optimize connection pooling
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=10,
-            pool_maxsize=10,
-            max_retries=3
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+        # Pooled keep-alive connections from the shared HTTP client factory
+        self.session = create_session(pool_size=10, retries=3, verify=False, name='streamtape')
         
     def upload(self, video_path, title=None):
         """Upload video to Streamtape"""
@@ -78,16 +74,17 @@ class StreamtapeUploader:
                         print(f"[Streamtape] Retry attempt {attempt + 1}/{max_retries}...")
                         time.sleep(5)
                     
-                    with open(video_path, 'rb') as f:
-                        files = {'file1': (file_name, f, 'video/mp4')}
-                        
-                        start_time = time.time()
-                        upload_response = self.session.post(
-                            upload_url,
-                            files=files,
-                            timeout=1800
-                        )
-                        elapsed = time.time() - start_time
+                    start_time = time.time()
+                    upload_response = post_multipart(
+                        self.session,
+                        upload_url,
+                        {},
+                        'file1',
+                        video_path,
+                        file_name=file_name,
+                        timeout=1800
+                    )
+                    elapsed = time.time() - start_time
                     
                     speed = (size_mb / elapsed) if elapsed > 0 else 0
                     print(f"[Streamtape] Upload completed in {elapsed:.1f}s ({speed:.2f} MB/s)")
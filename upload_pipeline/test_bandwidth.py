@@ -0,0 +1,148 @@
+"""
+Test the shared bandwidth scheduler
+- Weighted shares: two upload hosts and a download flow under a total cap
+  get bandwidth in proportion to their weights
+- Live retuning: lowering the cap mid-transfer takes effect immediately
+- Work conserving: when one flow stops, the others take over its share
+- Integration: a real post_multipart upload is accounted to the engine's
+  host flow and held to its per-host limit; so are the jable StreamWish,
+  LuluStream and Streamtape uploads (one flow per host)
+
+Usage: python test_bandwidth.py
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+
+import requests
+
+from streaming_multipart import post_multipart
+from bandwidth_scheduler import bandwidth
+from standin_hosts import start_host
+from test_streaming_upload import start_server, make_sparse_file, jable_uploaders
+
+CHUNK = 64 * 1024
+
+
+def run_flow(name, kind, stop):
+    """Move data as fast as the scheduler lets the flow"""
+    while not stop.is_set():
+        bandwidth.acquire(CHUNK, name, kind)
+
+
+def measure(names, seconds):
+    """MB/s per flow over the next few seconds"""
+    before = {n: s['total_mb'] for n, s in bandwidth.stats().items() if n in names}
+    time.sleep(seconds)
+    after = {n: s['total_mb'] for n, s in bandwidth.stats().items() if n in names}
+    return {n: (after[n] - before.get(n, 0)) / seconds for n in names}
+
+
+def close_to(value, expected, tolerance=0.2):
+    return abs(value - expected) <= expected * tolerance
+
+
+def test_bandwidth():
+    flows = {'hostA': 'upload', 'hostB': 'upload', 'download': 'download'}
+    stop = {name: threading.Event() for name in flows}
+
+    bandwidth.set_limit('total', 24)
+    bandwidth.set_weight('hostA', 3)
+    bandwidth.set_weight('hostB', 1)
+    bandwidth.set_weight('download', 2)
+
+    threads = [threading.Thread(target=run_flow, args=(n, k, stop[n]), daemon=True) for n, k in flows.items()]
+    for t in threads:
+        t.start()
+
+    try:
+        time.sleep(1.5)
+        rates = measure(flows, 3)
+        print(f"  cap 24 MB/s, weights 3:1:2 -> " + ', '.join(f"{n} {r:.1f}" for n, r in rates.items()))
+        assert close_to(rates['hostA'], 12) and close_to(rates['hostB'], 4) and close_to(rates['download'], 8), \
+            f"Shares do not follow the weights: {rates}"
+
+        # Live retune
+        bandwidth.set_limit('total', 12)
+        time.sleep(0.5)
+        rates = measure(flows, 3)
+        print(f"  cap 12 MB/s                -> " + ', '.join(f"{n} {r:.1f}" for n, r in rates.items()))
+        assert close_to(sum(rates.values()), 12, 0.15), f"Retuned cap not applied: {rates}"
+        assert close_to(rates['hostA'], 6), f"Shares lost after retune: {rates}"
+
+        # hostA finishes - hostB and the download share its bandwidth 1:2
+        stop['hostA'].set()
+        time.sleep(1.5)
+        rates = measure(['hostB', 'download'], 3)
+        print(f"  hostA done                 -> " + ', '.join(f"{n} {r:.1f}" for n, r in rates.items()))
+        assert close_to(rates['hostB'], 4) and close_to(rates['download'], 8), \
+            f"Freed bandwidth not redistributed: {rates}"
+    finally:
+        for event in stop.values():
+            event.set()
+        for t in threads:
+            t.join()
+        bandwidth.set_limit('total', None)
+
+    # Real upload through the engine's flow context, per-host cap 8 MB/s
+    server = start_server()
+    host, port = server.server_address[:2]
+    video_path = make_sparse_file(16 * 1024 * 1024)
+    bandwidth.set_host_limit('standin', 8)
+
+    try:
+        start = time.time()
+        with bandwidth.use_flow('standin', 'upload'):
+            response = post_multipart(requests, f'http://{host}:{port}/upload', {}, 'file', video_path, timeout=60)
+        elapsed = time.time() - start
+        assert response.status_code == 200
+
+        stats = bandwidth.stats()['standin']
+        speed = 16 / elapsed
+        print(f"  post_multipart, host limit 8 MB/s -> {speed:.1f} MB/s, {stats['total_mb']:.1f} MB accounted")
+        assert stats['total_mb'] >= 16, "Upload bytes not accounted to the host flow"
+        assert speed < 8 * 1.15, f"Host limit not applied: {speed:.1f} MB/s"
+    finally:
+        bandwidth.set_host_limit('standin', None)
+        server.shutdown()
+        os.remove(video_path)
+
+    # jable host uploaders: each upload paced under its own host flow
+    server = start_server()
+    streamwish = start_host('streamwish')
+    temp_dir = tempfile.mkdtemp()
+    video_path = make_sparse_file(64 * 1024 * 1024)
+    bandwidth.set_host_limit('streamtape', 32)
+
+    try:
+        uploaders = dict(jable_uploaders(server.base_url, streamwish.base_url, temp_dir))
+        for name in ('StreamWish', 'LuluStream', 'Streamtape'):
+            before = bandwidth.stats().get(name.lower(), {}).get('total_mb', 0)
+            start = time.time()
+            uploaders[name](video_path)
+            elapsed = time.time() - start
+            sent = bandwidth.stats()[name.lower()]['total_mb'] - before
+            print(f"  {name}: {sent:.0f} MB accounted to its flow, {sent / elapsed:.1f} MB/s")
+            assert sent >= 64, f"{name} upload not accounted to its host flow"
+        assert sent / elapsed < 32 * 1.15, f"Host limit not applied to the jable Streamtape upload"
+    finally:
+        bandwidth.set_host_limit('streamtape', None)
+        server.shutdown()
+        streamwish.shutdown()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.remove(video_path)
+
+    bandwidth.print_rates()
+
+
+if __name__ == "__main__":
+    try:
+        test_bandwidth()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Bandwidth scheduler shares, caps and retunes as configured")
@@ -0,0 +1,144 @@
+"""
+Test the host health model and health-based host ordering
+- Attempts recorded through the UploadEngine carry MB/s and TTFB
+- Errors are classified by exception type / HTTP status before message text
+- A host failing in the last hour is ordered after healthy ones
+- A rate-limited host is left out of the fan-out
+- Among healthy hosts the faster one goes first; hosts without history
+  rank with the median known host
+
+Uses a temporary hosting_status.json, never the real database.
+
+Usage: python test_host_health.py
+"""
+import os
+import sys
+import time
+import tempfile
+
+import requests
+
+from uploader_base import Uploader
+from upload_engine import UploadEngine
+from streaming_multipart import post_multipart
+from test_streaming_upload import start_server, make_sparse_file
+
+import database_manager
+from database_manager import db_manager, classify_host_error
+
+
+class StandInUploader(Uploader):
+    """Streams the file to the local stand-in, optionally failing"""
+
+    def __init__(self, host, url, error=None, delay=0.0, raises=None):
+        self.host = host
+        self.display_name = host
+        self.url = url
+        self.error = error
+        self.delay = delay
+        self.raises = raises
+
+    def upload(self, video_path, title=None):
+        time.sleep(self.delay)  # API round trips before the first byte
+        if self.raises:
+            raise self.raises
+        if self.error:
+            return {'success': False, 'error': self.error}
+        response = post_multipart(requests, self.url, {}, 'file', video_path, timeout=60)
+        return {'success': response.status_code == 200, 'file_code': self.host}
+
+
+def test_host_health():
+    fd, status_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    os.remove(status_path)
+    original_path = database_manager.HOSTING_STATUS_DB
+    database_manager.HOSTING_STATUS_DB = status_path
+
+    server = start_server()
+    host, port = server.server_address[:2]
+    url = f'http://{host}:{port}/upload'
+    video_path = make_sparse_file(8 * 1024 * 1024)
+
+    try:
+        assert classify_host_error('RATE_LIMIT') == 'rate_limit'
+        assert classify_host_error('Read timed out') == 'timeout'
+        assert classify_host_error('HTTP 503') == 'server'
+
+        # Type and status beat misleading text
+        assert classify_host_error('Upload failed: server returned login page', status=429) == 'rate_limit'
+        assert classify_host_error(requests.exceptions.ConnectionError('Max retries exceeded with url: /upload/429')) == 'connection'
+        assert classify_host_error(requests.exceptions.ConnectTimeout('Connection refused')) == 'timeout'
+        response = requests.Response()
+        response.status_code = 403
+        assert classify_host_error(requests.exceptions.HTTPError('500 Server Error', response=response)) == 'auth'
+        assert classify_host_error(TimeoutError('connection reset')) == 'timeout'
+        assert classify_host_error('file size 5030 MB rejected: status 413') == 'file'
+        assert classify_host_error('HTTP 509') == 'rate_limit'
+        assert classify_host_error('Invalid JSON response') == 'other'
+
+        uploaders = {
+            'steady': StandInUploader('steady', url, delay=0.2),
+            'flaky': StandInUploader('flaky', url, error='HTTP 502'),
+            'limited': StandInUploader('limited', url),
+            'fresh': StandInUploader('fresh', url),
+        }
+        engine = UploadEngine(uploaders=uploaders)
+
+        # Build history through the engine
+        for _ in range(3):
+            engine.upload_to_host('steady', video_path)
+            engine.upload_to_host('flaky', video_path)
+
+        steady = db_manager.get_host_health('steady')
+        flaky = db_manager.get_host_health('flaky')
+        print(f"  steady: {steady['success_rate']:.0%} ok, {steady['median_mbps']:.1f} MB/s, "
+              f"TTFB {steady['median_ttfb']:.2f}s")
+        print(f"  flaky:  {flaky['success_rate']:.0%} ok, errors {flaky['recent_errors']}")
+
+        assert steady['success_rate'] == 1.0 and steady['median_mbps'] > 0
+        assert 0.15 <= steady['median_ttfb'] < 2, f"TTFB not measured: {steady['median_ttfb']}"
+        assert flaky['success_rate'] == 0.0 and flaky['recent_errors'] == {'server': 3}
+
+        # Raised exceptions reach the model as exceptions, not just their text
+        engine.uploaders['dropped'] = StandInUploader(
+            'dropped', url, raises=requests.exceptions.ConnectionError('Max retries exceeded with url: /upload/429'))
+        engine.upload_to_host('dropped', video_path)
+        assert db_manager.get_host_health('dropped')['recent_errors'] == {'connection': 1}
+        del engine.uploaders['dropped']
+
+        # Rate-limited host, and a slower healthy one
+        db_manager.record_host_attempt('limited', False, error='RATE_LIMIT', rate_limited_until=time.time() + 3600)
+        db_manager.record_host_attempt('slow', True, duration=100, bytes_sent=10 * 1024 * 1024, ttfb=1)
+
+        order = db_manager.rank_hosts(['flaky', 'limited', 'slow', 'fresh', 'steady'], file_size=1024 ** 3)
+        print(f"  ranked: {' → '.join(order)}")
+        assert order[:3] == ['steady', 'fresh', 'slow'], order
+        assert order[3:] == ['flaky', 'limited'], order
+
+        selected = engine.select_hosts(video_path)
+        assert 'limited' not in selected and selected[-1] == 'flaky', selected
+        assert engine.select_hosts(video_path, max_hosts=1) == ['steady']
+
+        # Recovered host moves back up once it succeeds again
+        engine.uploaders['flaky'].error = None
+        for _ in range(4):
+            engine.upload_to_host('flaky', video_path)
+        assert db_manager.rank_hosts(['flaky', 'slow'])[0] == 'flaky'
+    finally:
+        database_manager.HOSTING_STATUS_DB = original_path
+        server.shutdown()
+        os.remove(video_path)
+        for path in (status_path, status_path + '.lock'):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    try:
+        test_host_health()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Host health model orders hosts by recent reliability and speed")
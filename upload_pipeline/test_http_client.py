@@ -0,0 +1,152 @@
+"""
+Test the shared HTTP client factory
+- Repeated API calls through a factory session reuse one keep-alive
+  connection (bare requests.get opens a new one every call)
+- Per-host pool sizes, default timeouts, DNS cache and request hooks
+- The DNS cache only serves factory sessions: socket.getaddrinfo is not
+  patched, so other code in the process resolves as usual
+
+Usage: python test_http_client.py [calls]
+"""
+import sys
+import time
+import json
+import socket
+import threading
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import streaming_multipart  # noqa: F401 - puts the project root on sys.path
+import http_client
+from http_client import get_session, create_session
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Stand-in API: /file/info answers JSON, /slow stalls"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        if self.path.startswith('/slow'):
+            time.sleep(1.5)
+        body = json.dumps({'status': 200, 'result': {'size': 123}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'sid=abc; Path=/')
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except BrokenPipeError:
+            pass  # Client gave up (timeout test)
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    server.connections = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_http_client(calls=50):
+    server = start_server()
+    port = server.server_address[1]
+    url = f'http://localhost:{port}/file/info'
+
+    lookups = []
+    original_lookup = http_client._getaddrinfo
+    system_lookup = socket.getaddrinfo
+
+    def counting_lookup(*args):
+        lookups.append(args[0])
+        return original_lookup(*args)
+
+    http_client._getaddrinfo = counting_lookup
+    events = []
+    http_client.add_hook(events.append)
+    http_client.reset_stats()
+
+    try:
+        # Bare calls: a new connection each time
+        start = time.time()
+        for _ in range(calls):
+            requests.get(url, timeout=10).json()
+        bare_time = time.time() - start
+        bare_connections = server.connections
+
+        # Factory session: one pooled keep-alive connection
+        server.connections = 0
+        api = get_session('test-api')
+        assert get_session('test-api') is api
+        start = time.time()
+        for _ in range(calls):
+            api.get(url).json()
+        pooled_time = time.time() - start
+
+        print(f"  {calls} calls: bare {bare_connections} connections in {bare_time:.2f}s, "
+              f"pooled {server.connections} connection(s) in {pooled_time:.2f}s")
+        assert bare_connections == calls
+        assert server.connections == 1, f"Pooled session opened {server.connections} connections"
+
+        stats = http_client.stats()['localhost']
+        assert stats['requests'] == calls and stats['connections'] == 1, stats
+        assert len(events) == calls and events[0]['status'] == 200 and events[0]['session'] == 'test-api'
+
+        # DNS cache: new connections of other factory sessions reuse the lookup,
+        # and nothing outside the factory sessions is affected
+        for _ in range(5):
+            create_session().get(url).json()
+        assert lookups.count('localhost') == 1, f"{lookups.count('localhost')} lookups for localhost"
+        assert socket.getaddrinfo is system_lookup, "socket.getaddrinfo was patched process-wide"
+        http_client.enable_dns_cache(0)
+        with mock.patch('socket.getaddrinfo', wraps=system_lookup) as system:
+            for _ in range(2):
+                create_session().get(url).json()
+        assert system.call_count == 2 and lookups.count('localhost') == 1, "DNS cache still used after disabling it"
+        http_client.enable_dns_cache()
+
+        # Default timeout applies to calls without timeout=
+        slow = create_session(timeout=(2, 0.5), retries=0)
+        try:
+            slow.get(f'http://127.0.0.1:{port}/slow')
+            raise AssertionError("Default read timeout not applied")
+        except requests.exceptions.Timeout:
+            pass
+        assert events[-1]['error'] and events[-1]['status'] is None
+
+        # Per-host pool size
+        sized = create_session(pool_size=8, host_pools={'api.streamwish.com': 2})
+        assert sized.get_adapter('https://api.streamwish.com/api/file/info')._pool_maxsize == 2
+        assert sized.get_adapter('https://streamwish.com/abc')._pool_maxsize == 8
+
+        # Shared sessions keep no cookies (like bare requests calls)
+        owned = create_session()
+        owned.get(url)
+        assert not api.cookies and owned.cookies.get('sid') == 'abc'
+        http_client.print_stats()
+    finally:
+        http_client.remove_hook(events.append)
+        http_client._getaddrinfo = original_lookup
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    try:
+        test_http_client(calls)
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Factory sessions reuse pooled connections with shared timeouts and hooks")
@@ -0,0 +1,191 @@
+"""
+Test shared read-once uploads
+Several fake hosts stream the same file at different speeds through the
+UploadEngine fan-out. Every host must receive the exact file bytes while the
+disk is read roughly once (the old path read the file once per host).
+A lone reader never waits for followers that were not registered, and a
+registered follower that opens late still gets the start of the file from
+the ring. Two overlapping upload_all() runs on one engine each keep their
+own shared source.
+
+Usage: python test_shared_source.py [size_mb] [hosts]
+"""
+import os
+import sys
+import time
+import hashlib
+import tempfile
+import threading
+
+from uploader_base import Uploader
+from upload_engine import UploadEngine
+from streaming_multipart import MultipartStream, FileRangeStream
+import shared_source
+from shared_source import SharedFileSource
+
+
+class PacedUploader(Uploader):
+    """Consumes a streaming multipart body at a fixed rate, hashing the file part"""
+
+    def __init__(self, host, mb_per_s, chunk_size=256 * 1024):
+        self.host = host
+        self.display_name = host
+        self.rate = mb_per_s * 1024 * 1024
+        self.chunk_size = chunk_size
+
+    def upload(self, video_path, title=None):
+        body = MultipartStream({'title': title}, 'file', video_path, chunk_size=self.chunk_size)
+        digest = hashlib.sha1()
+        received = 0
+        start = time.time()
+
+        for part in body:
+            received += len(part)
+            digest.update(part)
+
+            ahead = received / self.rate - (time.time() - start)
+            if ahead > 0:
+                time.sleep(ahead)
+
+        expected = hashlib.sha1(body.head)
+        with open(video_path, 'rb') as f:
+            expected.update(f.read())
+        expected.update(body.tail)
+
+        if digest.digest() != expected.digest():
+            return {'success': False, 'error': 'body mismatch'}
+        return {'success': True, 'file_code': self.host}
+
+
+def test_shared_source(size_mb=48, hosts=5):
+    fd, video_path = tempfile.mkstemp(suffix='.mp4')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(os.urandom(size_mb * 1024 * 1024))
+
+    file_size = size_mb * 1024 * 1024
+
+    # Ring smaller than the file, so fast hosts have to wait for slow ones
+    shared_source.RING_SIZE_MB = max(8, size_mb // 4)
+
+    try:
+        # Range reads inside a source (TUS PATCH bodies) return the right bytes
+        with SharedFileSource(video_path):
+            start, length = 3 * 1024 * 1024 + 17, 5 * 1024 * 1024
+            data = b''.join(bytes(p) for p in FileRangeStream(video_path, start, length))
+        with open(video_path, 'rb') as f:
+            f.seek(start)
+            assert data == f.read(length), "FileRangeStream returned wrong bytes"
+
+        # Lone reader, ring smaller than the file: no wait for followers nobody registered
+        with SharedFileSource(video_path, join_timeout=30) as source:
+            source.register()
+            start = time.time()
+            with source.open() as reader:
+                while reader.read(1024 * 1024):
+                    pass
+            elapsed = time.time() - start
+            source.leave()
+        assert elapsed < 10, f"Lone reader waited {elapsed:.1f}s for followers"
+        print(f"Lone reader: {file_size / 1024 / 1024:.0f} MB in {elapsed:.2f}s, no join wait")
+
+        # Registered follower opening late: chunk 0 is kept for it, read once from disk
+        with SharedFileSource(video_path, join_timeout=30) as source:
+            ready = threading.Event()
+            follower_bytes = []
+
+            def follower():
+                source.register()
+                ready.set()
+                time.sleep(0.5)
+                with source.open() as reader:
+                    follower_bytes.append(len(reader.read()))
+                source.leave()
+
+            thread = threading.Thread(target=follower)
+            thread.start()
+            ready.wait(5)
+            source.register()
+            with source.open() as reader:
+                leader_bytes = len(reader.read())
+            source.leave()
+            thread.join(30)
+            stats = source.stats()
+        assert leader_bytes == file_size and follower_bytes == [file_size], (leader_bytes, follower_bytes)
+        assert stats['disk_bytes'] + stats['direct_bytes'] == file_size, stats
+        print("Late follower: start of the file kept in the ring for it")
+
+        # Fan-out: hosts from 20 to 100 MB/s
+        uploaders = {
+            f'host{i}': PacedUploader(f'host{i}', 20 + 80 * i / max(1, hosts - 1))
+            for i in range(hosts)
+        }
+        engine = UploadEngine(uploaders=uploaders, track_health=False)
+        results = engine.upload_all(video_path, 'shared source test', max_workers=hosts)
+
+        failed = {h: r.get('error') for h, r in results.items() if not r.get('success')}
+        assert not failed, f"Hosts received wrong data: {failed}"
+
+        stats = engine.last_source_stats
+        disk = stats['disk_bytes'] + stats['direct_bytes']
+        print(f"\n{'='*60}")
+        print(f"  Hosts:         {hosts}")
+        print(f"  File:          {file_size / 1024 / 1024:.0f} MB")
+        print(f"  Read from disk: {disk / 1024 / 1024:.1f} MB ({disk / file_size:.2f}x)")
+        print(f"  Served from ring: {stats['served_bytes'] / 1024 / 1024:.1f} MB")
+        print(f"  Detached readers: {stats['detached_readers']}")
+        print(f"{'='*60}")
+
+        assert stats['served_bytes'] + stats['direct_bytes'] == file_size * hosts
+        assert disk <= file_size * 1.1, f"Disk read {disk / file_size:.2f}x the file size"
+
+        # Overlapping runs on one engine: a slow one, and a fast one that finishes first
+        fd, other_path = tempfile.mkstemp(suffix='.mp4')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(os.urandom(8 * 1024 * 1024))
+        try:
+            engine = UploadEngine(uploaders={
+                'slow0': PacedUploader('slow0', 40), 'slow1': PacedUploader('slow1', 60),
+                'fast0': PacedUploader('fast0', 200), 'fast1': PacedUploader('fast1', 300),
+            }, track_health=False)
+            runs = {}
+            sources = []
+            original = engine._fan_out
+
+            def fan_out(*args):
+                sources.append(args[-1])
+                return original(*args)
+            engine._fan_out = fan_out
+
+            slow = threading.Thread(target=lambda: runs.update(
+                slow=engine.upload_all(video_path, 'slow run', hosts=['slow0', 'slow1'])))
+            slow.start()
+            time.sleep(0.2)
+            runs['fast'] = engine.upload_all(other_path, 'fast run', hosts=['fast0', 'fast1'])
+            assert slow.is_alive(), "Slow run finished before the fast one - no overlap"
+            slow.join(60)
+
+            failed = {h: r.get('error') for run in runs.values() for h, r in run.items() if not r.get('success')}
+            assert len(runs) == 2 and not failed, (runs, failed)
+            assert len(sources) == 2 and sources[0] is not sources[1]
+            for source, path in zip(sources, (video_path, other_path)):
+                read = source.stats()
+                assert source.path == os.path.abspath(path) and read['served_bytes'] + read['direct_bytes'] == \
+                    os.path.getsize(path) * 2, read
+            print("Overlapping runs: each kept its own source, all hosts got their file")
+        finally:
+            os.remove(other_path)
+    finally:
+        os.remove(video_path)
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 48
+    hosts = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    try:
+        test_shared_source(size_mb, hosts)
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Multi-host upload read the file once")
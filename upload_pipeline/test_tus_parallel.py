@@ -0,0 +1,102 @@
+"""
+Test SeekstreamingUploader against a local tusd-compatible stand-in
+- Stand-in throttles every PATCH to a fixed per-stream rate, like a
+  single TCP stream to a remote host
+- With the Concatenation extension, MB/s should scale with the number
+  of parallel streams
+- Without it, the sequential read-ahead path must still upload correctly
+- Uploaded bytes are compared with the source file in both cases
+
+Usage: python test_tus_parallel.py [size_mb] [per_stream_mb_s]
+"""
+import os
+import sys
+import hashlib
+import tempfile
+
+from seekstreaming_uploader import SeekstreamingUploader
+from upload_sessions import UploadSessionStore
+from standin_hosts import start_host
+
+
+def start_server(concatenation, stream_rate, fail_at=None):
+    """tusd-compatible stand-in, every PATCH drained at stream_rate bytes/s"""
+    return start_host('tus', bandwidth_mbps=stream_rate / (1024 * 1024),
+                      concatenation=concatenation, fail_at=fail_at)
+
+
+def temp_session_store():
+    """Upload session store in a fresh temp file (never the real database)"""
+    fd, path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    os.remove(path)
+    return UploadSessionStore(path)
+
+
+def run_upload(video_path, streams, concatenation, stream_rate, chunk_size):
+    server = start_server(concatenation, stream_rate)
+    host, port = server.server_address[:2]
+    store = temp_session_store()
+
+    try:
+        uploader = SeekstreamingUploader(api_key='test', parallel_streams=streams, session_store=store)
+        uploader.base_url = f'http://{host}:{port}'
+        uploader.chunk_size = chunk_size
+
+        result = uploader.upload(video_path, 'tus test')
+        assert result.get('success'), result
+        assert server.completed, "No upload completed on the server"
+
+        uploaded = bytes(server.uploads[server.completed[-1]]['data'])
+        with open(video_path, 'rb') as f:
+            assert hashlib.sha1(uploaded).digest() == hashlib.sha1(f.read()).digest(), "Uploaded bytes differ"
+
+        return result
+    finally:
+        server.shutdown()
+        for path in (store.path, store.path + '.lock'):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def test_tus_parallel(size_mb=32, per_stream_mb_s=16):
+    fd, video_path = tempfile.mkstemp(suffix='.mp4')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(os.urandom(size_mb * 1024 * 1024))
+
+    stream_rate = per_stream_mb_s * 1024 * 1024
+    chunk_size = 2 * 1024 * 1024
+
+    try:
+        speeds = {}
+        for streams in (1, 2, 4):
+            result = run_upload(video_path, streams, True, stream_rate, chunk_size)
+            assert result['streams'] == streams, result
+            speeds[streams] = result['speed_mbps']
+
+        fallback = run_upload(video_path, 4, False, stream_rate, chunk_size)
+        assert fallback['streams'] == 1, fallback
+
+        print(f"\n{'='*60}")
+        for streams, speed in speeds.items():
+            print(f"  {streams} stream(s): {speed:.1f} MB/s")
+        print(f"  sequential fallback: {fallback['speed_mbps']:.1f} MB/s")
+        print(f"{'='*60}")
+
+        assert speeds[2] > speeds[1] * 1.5, f"2 streams did not scale: {speeds}"
+        assert speeds[4] > speeds[1] * 2.5, f"4 streams did not scale: {speeds}"
+    finally:
+        os.remove(video_path)
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    per_stream = float(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    try:
+        test_tus_parallel(size_mb, per_stream)
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Parallel TUS upload scales with the number of streams")
@@ -0,0 +1,98 @@
+"""
+Test cross-process resume of interrupted uploads
+The TUS stand-in fails every PATCH once 90% of the file arrived. A fresh
+SeekstreamingUploader (as after a restart) sharing the same session store
+must then finish by sending only the missing ~10%, for both the sequential
+and the parallel (concatenation) path. A third run must return the stored
+file code without uploading anything.
+
+Usage: python test_upload_resume.py [size_mb]
+"""
+import os
+import sys
+import hashlib
+import tempfile
+
+from seekstreaming_uploader import SeekstreamingUploader
+from upload_sessions import fingerprint
+from test_tus_parallel import start_server, temp_session_store
+
+
+def new_uploader(server, store, streams, chunk_size):
+    """Uploader as a newly started process would create it"""
+    host, port = server.server_address[:2]
+    uploader = SeekstreamingUploader(api_key='test', parallel_streams=streams, session_store=store)
+    uploader.base_url = f'http://{host}:{port}'
+    uploader.chunk_size = chunk_size
+    return uploader
+
+
+def check_resume(video_path, streams, chunk_size):
+    file_size = os.path.getsize(video_path)
+    server = start_server(streams > 1, 64 * 1024 * 1024, fail_at=int(file_size * 0.9))
+    store = temp_session_store()
+
+    try:
+        result = new_uploader(server, store, streams, chunk_size).upload(video_path, 'resume test')
+        assert not result.get('success'), "Upload should have been interrupted"
+
+        session = store.get(fingerprint(video_path), 'seekstreaming')
+        assert session and session['status'] == 'uploading', f"No session stored: {session}"
+
+        # "Restart": the outage is over, nothing survives but the session store
+        first_run = server.received
+        server.received = 0
+        server.fail_at = None
+
+        result = new_uploader(server, store, streams, chunk_size).upload(video_path, 'resume test')
+        assert result.get('success'), result
+        resent = server.received
+
+        uploaded = bytes(server.uploads[server.completed[-1]]['data'])
+        with open(video_path, 'rb') as f:
+            assert hashlib.sha1(uploaded).digest() == hashlib.sha1(f.read()).digest(), "Uploaded bytes differ"
+
+        # Already complete: no bytes at all
+        server.received = 0
+        again = new_uploader(server, store, streams, chunk_size).upload(video_path, 'resume test')
+        assert again.get('success') and again.get('resumed'), again
+        assert again['file_code'] == result['file_code']
+        assert server.received == 0, "Completed upload was sent again"
+
+        print(f"  {streams} stream(s): first run {first_run / 1024 / 1024:.1f} MB, "
+              f"after restart {resent / 1024 / 1024:.1f} MB ({resent / file_size:.0%} of the file)")
+
+        # 10% missing + at most one partially sent chunk per stream
+        assert resent <= file_size * 0.1 + streams * chunk_size, \
+            f"Resume re-sent {resent / file_size:.0%} of the file"
+    finally:
+        server.shutdown()
+        for path in (store.path, store.path + '.lock'):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def test_upload_resume(size_mb=40):
+    fd, video_path = tempfile.mkstemp(suffix='.mp4')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(os.urandom(size_mb * 1024 * 1024))
+
+    try:
+        print(f"\n{'='*60}")
+        check_resume(video_path, 1, 1024 * 1024)
+        check_resume(video_path, 4, 1024 * 1024)
+        print(f"{'='*60}")
+    finally:
+        os.remove(video_path)
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+
+    try:
+        test_upload_resume(size_mb)
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Interrupted uploads resumed from the stored session")
@@ -0,0 +1,202 @@
+"""
+Test the background post-upload verification queue
+- Upload18 returns as soon as the bytes are delivered (no processing wait);
+  the queued check picks up the VID from a stand-in /myvideo listing and
+  writes it into the video's hosting entry
+- A job finishing before its video is saved is applied once the video exists,
+  looked up by its video code on a backoff - the catalog is scanned for the
+  file code only on the first miss
+- A preview uploaded under the same video code does not overwrite the main
+  upload's verification
+- A host that never finishes processing ends as failed / unverified
+- Pending jobs survive a restart (new queue instance on the same file), and
+  are checked as soon as their checker is registered - no new job needed
+
+Uses temporary database files, never the real database.
+
+Usage: python test_verification_queue.py
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import upload18_uploader_fixed
+from upload18_uploader_fixed import Upload18UploaderFixed
+from test_streaming_upload import make_sparse_file
+
+import database_manager
+from database_manager import db_manager
+from verification_queue import VerificationQueue
+
+FAST = (0.1, 0.1, 0.1, 0.1)
+
+
+class StandInUpload18(BaseHTTPRequestHandler):
+    """Accepts uploads; the VID appears after a few status polls"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        remaining = int(self.headers.get('Content-Length', 0))
+        while remaining:
+            remaining -= len(self.rfile.read(min(remaining, 1024 * 1024)))
+        self._json({'status': 'success', 'vid': '', 'did': '77'})
+
+    def do_GET(self):
+        self.server.polls += 1
+        vid = 'ac5447863877' if self.server.polls > self.server.ready_after else ''
+        self._json({'status': 'success', 'data': [{'did': '77', 'vid': vid, 'zt': 2 if vid else 1}]})
+
+
+def start_server(ready_after):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInUpload18)
+    server.polls = 0
+    server.ready_after = ready_after
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def save_video(code, service, file_code):
+    db_manager.add_or_update_video({
+        'code': code,
+        'processed_at': '2026-01-01T00:00:00',
+        'hosting': {service: {'file_code': file_code, 'embed_url': 'https://upload18.com/myvideo'}}
+    })
+
+
+def test_verification_queue():
+    temp_dir = tempfile.mkdtemp()
+    patched = {name: getattr(database_manager, name) for name in ('COMBINED_DB', 'PROGRESS_DB', 'STATS_DB', 'FAILED_DB')}
+    for name, path in patched.items():
+        setattr(database_manager, name, os.path.join(temp_dir, os.path.basename(path)))
+
+    queue_path = os.path.join(temp_dir, 'verification_queue.json')
+    queue = VerificationQueue(queue_path, poll_interval=0.1, delays=FAST, apply_delays=FAST)
+    original_queue = upload18_uploader_fixed.verification_queue
+    upload18_uploader_fixed.verification_queue = queue
+
+    server = start_server(ready_after=2)
+    host, port = server.server_address[:2]
+    video_path = make_sparse_file(4 * 1024 * 1024)
+
+    try:
+        # Upload returns without waiting for processing
+        uploader = Upload18UploaderFixed(None, None, None, 'test')
+        uploader.base_url = f'http://{host}:{port}'
+
+        start = time.time()
+        result = uploader.upload(video_path, video_code='ABC-123')
+        elapsed = time.time() - start
+
+        print(f"  upload returned in {elapsed:.2f}s: processing={result.get('processing')}")
+        assert result['success'] and result['processing'], result
+        assert elapsed < 5, f"Upload waited for processing ({elapsed:.1f}s)"
+        assert queue.jobs()[0]['video_code'] == 'ABC-123', queue.jobs()
+
+        # Video saved by the main loop right after the upload
+        save_video('ABC-123', 'upload18', result['file_code'])
+
+        assert wait_for(lambda: queue.jobs('verified') and queue.jobs('verified')[0]['applied']), queue.jobs()
+        entry = db_manager.get_video_by_code('ABC-123')['hosting']['upload18']
+        print(f"  after {server.polls} status polls: {entry['file_code']}, verified={entry['verified']}")
+        assert entry['file_code'] == 'ac5447863877' and entry['verified'], entry
+        assert entry['embed_url'] == 'https://upload18.com/play/index/ac5447863877', entry
+        assert not entry['processing']
+
+        # Finished before the video is saved: applied once it exists
+        queue.register('standin', lambda job: {'state': 'verified', 'server_size': 123})
+        job_id = queue.enqueue('standin', 'standin', 'code-2', video_code='DEF-456')
+        assert wait_for(lambda: queue.get(job_id).get('unapplied'))
+        assert queue.get(job_id)['status'] == 'verified' and not queue.get(job_id)['applied']
+        save_video('DEF-456', 'standin', 'code-2')
+        assert wait_for(lambda: queue.get(job_id)['applied'])
+        entry = db_manager.get_video_by_code('DEF-456')['hosting']['standin']
+        assert entry['verified'] and entry['verification']['server_size'] == 123, entry
+
+        # Main upload and a preview of the same video: only the main one's result lands
+        queue.register('sized', lambda job: {'state': job['params']['state']})
+        save_video('JKL-012', 'sized', 'main-file')
+        preview_id = queue.enqueue('sized', 'sized', 'preview-file', video_code='JKL-012', params={'state': 'failed'})
+        main_id = queue.enqueue('sized', 'sized', 'main-file', video_code='JKL-012', params={'state': 'verified'})
+        assert wait_for(lambda: queue.get(main_id)['applied'])
+        assert wait_for(lambda: queue.get(preview_id)['status'] == 'failed')
+        queue.run_pending()
+        entry = db_manager.get_video_by_code('JKL-012')['hosting']['sized']
+        assert not queue.get(preview_id)['applied'], "Preview result applied to the main upload"
+        assert entry['file_code'] == 'main-file' and entry['verified'], entry
+
+        # Never finishes processing
+        queue.register('stuck', lambda job: {'state': 'pending', 'error': 'HTTP 403'})
+        save_video('GHI-789', 'stuck', 'code-3')
+        job_id = queue.enqueue('stuck', 'stuck', 'code-3')
+        assert wait_for(lambda: queue.get(job_id)['applied'])
+        job = queue.get(job_id)
+        entry = db_manager.get_video_by_code('GHI-789')['hosting']['stuck']
+        print(f"  stuck host: {job['status']} after {job['attempts']} checks ({job['result']['error']})")
+        assert job['status'] == 'failed' and job['attempts'] == len(FAST)
+        assert entry['verified'] is False and entry['verification']['status'] == 'failed'
+
+        # Never saved, no video code: one catalog scan, then none on the backoff retries
+        queue.register('ghost', lambda job: {'state': 'verified'})
+        queue.stop()
+        job_id = queue.enqueue('ghost', 'ghost', 'nowhere', start=False)
+        with mock.patch.object(db_manager, 'get_all_videos', wraps=db_manager.get_all_videos) as scans:
+            for _ in range(4):
+                queue.run_pending(now=time.time() + 60)
+                time.sleep(0.15)
+        job = queue.get(job_id)
+        print(f"  unsaved video: {job['apply_misses']} apply attempts, {scans.call_count} catalog scan(s)")
+        assert job['unapplied'] and not job['applied'] and job['apply_misses'] == 4, job
+        assert scans.call_count == 1, f"Catalog scanned {scans.call_count} times"
+
+        # Restart: pending jobs are picked up by a new instance once their checker is registered
+        job_id = queue.enqueue('later', 'standin', 'code-2', start=False)
+        restarted = VerificationQueue(queue_path, poll_interval=0.1, delays=FAST, apply_delays=FAST)
+        restarted.register('later', lambda job: {'state': 'verified'})
+        try:
+            assert wait_for(lambda: restarted.get(job_id)['status'] == 'verified'), restarted.get(job_id)
+        finally:
+            restarted.stop()
+        restarted.print_status()
+    finally:
+        queue.stop()
+        upload18_uploader_fixed.verification_queue = original_queue
+        for name, path in patched.items():
+            setattr(database_manager, name, path)
+        server.shutdown()
+        os.remove(video_path)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    try:
+        test_verification_queue()
+    except AssertionError as e:
+        print(f"✗ FAILED: {e}")
+        sys.exit(1)
+
+    print("✓ Uploads return immediately and verification results reach the database")
@@ -3,11 +3,18 @@ import os
 from pathlib import Path
 import time
 import urllib3
+from uploader_base import Uploader
+from streaming_multipart import post_multipart
+from http_client import create_session
 
 # Disable SSL warnings for expired certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-class TurboviplayUploader:
+class TurboviplayUploader(Uploader):
+    host = 'turboviplay'
+    display_name = 'Turboviplay'
+    max_size_gb = 10.0
+
     def __init__(self, email, username, password, api_key):
         self.email = email
         self.username = username
@@ -15,18 +22,8 @@ class TurboviplayUploader:
         self.api_key = api_key
         self.base_url = "https://api.turboviplay.com"
         
-        # Create session for connection reuse
-        self.session = requests.Session()
-        self.session.verify = False
-        
-        # Optimize connection pooling
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=10,
-            pool_maxsize=10,
-            max_retries=3
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+        # Pooled keep-alive connections from the shared HTTP client factory
+        self.session = create_session(pool_size=10, retries=3, verify=False, name='turboviplay')
         
     def upload(self, video_path, title=None):
         """Upload video to Turboviplay"""
@@ -82,69 +79,70 @@ class TurboviplayUploader:
             file_size = os.path.getsize(video_path)
             size_mb = file_size / (1024 * 1024)
             
-            with open(video_path, 'rb') as f:
-                files = {'file': (file_name, f, 'video/mp4')}
-                data = {'keyapi': self.api_key}
-                
-                start_time = time.time()
+            data = {'keyapi': self.api_key}
+            
+            start_time = time.time()
+            
+            try:
+                response = post_multipart(
+                    self.session,
+                    upload_url,
+                    data,
+                    'file',
+                    video_path,
+                    file_name=file_name,
+                    timeout=1800
+                )
+            except requests.exceptions.Timeout:
+                return {"success": False, "error": "Upload timeout"}
+            except requests.exceptions.ConnectionError as e:
+                return {"success": False, "error": f"Connection error: {str(e)}"}
+            
+            elapsed = time.time() - start_time
+            speed = (size_mb / elapsed) if elapsed > 0 else 0
+            
+            print(f"[Turboviplay] Upload completed in {elapsed:.1f}s ({speed:.2f} MB/s)")
+            print(f"[Turboviplay] Response status: {response.status_code}")
+            
+            if response.status_code == 200:
+                # Check if response is empty
+                if not response.text or response.text.strip() == '':
+                    return {"success": False, "error": "Empty response from server. Try again or check dashboard."}
                 
                 try:
-                    response = self.session.post(
-                        upload_url,
-                        files=files,
-                        data=data,
-                        timeout=1800
-                    )
-                except requests.exceptions.Timeout:
-                    return {"success": False, "error": "Upload timeout"}
-                except requests.exceptions.ConnectionError as e:
-                    return {"success": False, "error": f"Connection error: {str(e)}"}
-                
-                elapsed = time.time() - start_time
-                speed = (size_mb / elapsed) if elapsed > 0 else 0
+                    result = response.json()
+                    print(f"[Turboviplay] Response: {result}")
+                except Exception as e:
+                    return {"success": False, "error": f"Invalid JSON: {response.text[:200]}"}
                 
-                print(f"[Turboviplay] Upload completed in {elapsed:.1f}s ({speed:.2f} MB/s)")
-                print(f"[Turboviplay] Response status: {response.status_code}")
+                # API can return two formats:
+                # Format 1: {"videoID": "6977acc01633c", "title": "test.mp4"}
+                # Format 2: {"videoID": {"status":0, "slug":"...", "title":"..."}, "title":"..."}
+                video_data = result.get('videoID')
                 
-                if response.status_code == 200:
-                    # Check if response is empty
-                    if not response.text or response.text.strip() == '':
-                        return {"success": False, "error": "Empty response from server. Try again or check dashboard."}
-                    
-                    try:
-                        result = response.json()
-                        print(f"[Turboviplay] Response: {result}")
-                    except Exception as e:
-                        return {"success": False, "error": f"Invalid JSON: {response.text[:200]}"}
-                    
-                    # API can return two formats:
-                    # Format 1: {"videoID": "6977acc01633c", "title": "test.mp4"}
-                    # Format 2: {"videoID": {"status":0, "slug":"...", "title":"..."}, "title":"..."}
-                    video_data = result.get('videoID')
-                    
-                    if isinstance(video_data, str):
-                        # Format 1: videoID is directly the ID string
-                        video_id = video_data
-                    elif isinstance(video_data, dict):
-                        # Format 2: videoID is an object with slug
-                        video_id = video_data.get('slug')
-                    else:
-                        return {"success": False, "error": f"Unexpected videoID format: {result}"}
-                    
-                    if not video_id:
-                        return {"success": False, "error": f"No video ID in response: {result}"}
-                    
-                    print(f"[Turboviplay] ✓ Upload successful: {video_id}")
-                    return {
-                        "success": True,
-                        "host": "turboviplay",
-                        "video_id": video_id,
-                        "url": f"https://turboviplay.com/v/{video_id}",
-                        "embed_url": f"https://emturbovid.com/t/{video_id}"
-                    }
+                if isinstance(video_data, str):
+                    # Format 1: videoID is directly the ID string
+                    video_id = video_data
+                elif isinstance(video_data, dict):
+                    # Format 2: videoID is an object with slug
+                    video_id = video_data.get('slug')
                 else:
-                    return {"success": False, "error": f"HTTP {response.status_code}: {response.text[:200]}"}
-                    
+                    return {"success": False, "error": f"Unexpected videoID format: {result}"}
+                
+                if not video_id:
+                    return {"success": False, "error": f"No video ID in response: {result}"}
+                
+                print(f"[Turboviplay] ✓ Upload successful: {video_id}")
+                return {
+                    "success": True,
+                    "host": "turboviplay",
+                    "video_id": video_id,
+                    "url": f"https://turboviplay.com/v/{video_id}",
+                    "embed_url": f"https://emturbovid.com/t/{video_id}"
+                }
+            else:
+                return {"success": False, "error": f"HTTP {response.status_code}: {response.text[:200]}"}
+                
         except Exception as e:
             print(f"[Turboviplay] Error: {str(e)}")
             return {"success": False, "error": str(e)}
@@ -3,6 +3,7 @@ import os
 from pathlib import Path
 import time
 import urllib3
+from streaming_multipart import post_multipart
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -40,23 +41,24 @@ class Upload18SimpleUploader:
                 try:
                     print(f"\n[Upload18] Upload attempt {attempt}/{self.max_retries}...")
                     
-                    with open(video_path, 'rb') as f:
-                        files = {'video': (file_name, f, 'video/mp4')}
-                        data = {
-                            'apikey': self.api_key,
-                            'cid': '15',  # Videos category (default)
-                            'fid': '18'   # Direct upload server (fid 18)
-                        }
-                        
-                        start_time = time.time()
-                        response = requests.post(
-                            f"{self.base_url}/upload",
-                            files=files,
-                            data=data,
-                            verify=False,
-                            timeout=1800
-                        )
-                        elapsed = time.time() - start_time
+                    data = {
+                        'apikey': self.api_key,
+                        'cid': '15',  # Videos category (default)
+                        'fid': '18'   # Direct upload server (fid 18)
+                    }
+                    
+                    start_time = time.time()
+                    response = post_multipart(
+                        requests,
+                        f"{self.base_url}/upload",
+                        data,
+                        'video',
+                        video_path,
+                        file_name=file_name,
+                        verify=False,
+                        timeout=1800
+                    )
+                    elapsed = time.time() - start_time
                     
                     if response.status_code == 200:
                         result = response.json()
@@ -1,8 +1,9 @@
-import requests
 import os
 from pathlib import Path
 import time
 import urllib3
+from streaming_multipart import post_multipart
+from http_client import create_session
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -17,17 +18,8 @@ class Upload18Uploader:
         self.max_retries = 30
         self.wait_seconds = 20
         
-        # Optimized session
-        self.session = requests.Session()
-        self.session.verify = False
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=1,
-            pool_maxsize=1,
-            max_retries=0,
-            pool_block=False
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+        # Pooled keep-alive connections from the shared HTTP client factory
+        self.session = create_session(pool_size=1, retries=0, verify=False, name='upload18')
         
     def upload(self, video_path, title=None):
         """Upload video to Upload18 with queue retry logic"""
@@ -50,33 +42,34 @@ class Upload18Uploader:
                 try:
                     print(f"[Upload18] Attempt {attempt}/{self.max_retries}...")
                     
-                    # Open file fresh for each attempt
-                    with open(video_path, 'rb') as f:
-                        files = {'video': (file_name, f, 'video/mp4')}
-                        data = {
-                            'apikey': self.api_key,
-                            'cid': '15',
-                            'fid': '18'
-                        }
-                        
-                        start_time = time.time()
-                        
-                        try:
-                            response = self.session.post(
-                                f"{self.base_url}/upload",
-                                files=files,
-                                data=data,
-                                timeout=1800
-                            )
-                            elapsed = time.time() - start_time
-                        except (ConnectionAbortedError, ConnectionResetError, ConnectionError) as e:
-                            print(f"[Upload18] Connection error: {str(e)[:50]}")
-                            if attempt < self.max_retries:
-                                print(f"[Upload18] Retrying in {self.wait_seconds}s...")
-                                time.sleep(self.wait_seconds)
-                                continue
-                            else:
-                                return {"success": False, "error": f"Connection failed after {self.max_retries} attempts"}
+                    # Body is streamed from disk again on each attempt
+                    data = {
+                        'apikey': self.api_key,
+                        'cid': '15',
+                        'fid': '18'
+                    }
+                    
+                    start_time = time.time()
+                    
+                    try:
+                        response = post_multipart(
+                            self.session,
+                            f"{self.base_url}/upload",
+                            data,
+                            'video',
+                            video_path,
+                            file_name=file_name,
+                            timeout=1800
+                        )
+                        elapsed = time.time() - start_time
+                    except (ConnectionAbortedError, ConnectionResetError, ConnectionError) as e:
+                        print(f"[Upload18] Connection error: {str(e)[:50]}")
+                        if attempt < self.max_retries:
+                            print(f"[Upload18] Retrying in {self.wait_seconds}s...")
+                            time.sleep(self.wait_seconds)
+                            continue
+                        else:
+                            return {"success": False, "error": f"Connection failed after {self.max_retries} attempts"}
                     
                     if response.status_code == 200:
                         result = response.json()
@@ -9,6 +9,9 @@ import time
 import urllib3
 from tqdm import tqdm
 import json
+from streaming_multipart import post_multipart
+from verification_queue import verification_queue
+from http_client import create_session
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -22,27 +25,14 @@ class Upload18UploaderFixed:
         self.api_key = api_key
         self.base_url = "https://upload18.com/api"
         
-        # Create session for connection reuse
-        self.session = requests.Session()
-        self.session.verify = False
-        
-        # Browser-like headers to bypass WAF
-        self.session.headers.update({
+        # Pooled keep-alive session, browser-like headers to bypass WAF
+        self.session = create_session(pool_size=10, retries=3, verify=False, name='upload18', headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'application/json, text/plain, */*',
             'Accept-Language': 'en-US,en;q=0.9',
             'Referer': 'https://upload18.com/',
             'Origin': 'https://upload18.com'
         })
-        
-        # Optimize connection pooling
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=10,
-            pool_maxsize=10,
-            max_retries=3
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
     
     def check_video_status(self, did):
         """Check video processing status by DID"""
@@ -103,15 +93,39 @@ class Upload18UploaderFixed:
         
         print(f"[Upload18] ⚠ Timeout waiting for VID after {max_wait_minutes} minutes")
         return None
+
+    def verify_processing(self, job):
+        """Background check for the VID of a processing upload (see verification_queue)"""
+        status = self.check_video_status(job['params']['did'])
+        vid = status.get('vid')
+
+        if status.get('found') and vid:
+            url = f"https://upload18.com/play/index/{vid}"
+            return {
+                'state': 'verified',
+                'vid': vid,
+                'updates': {'file_code': vid, 'embed_url': url, 'download_url': url, 'processing': False}
+            }
+
+        if status.get('found'):
+            status_text = {0: 'Pending', 1: 'Transcoding', 2: 'Done'}.get(status.get('status', 0), 'Unknown')
+            return {'state': 'pending', 'error': f"Processing: {status_text}"}
+        return {'state': 'pending', 'error': status.get('error') or 'Video not found yet'}
     
-    def upload(self, video_path, title=None):
-        """Upload video to Upload18 with improved error handling"""
+    def upload(self, video_path, title=None, video_code=None):
+        """
+        Upload video to Upload18 with improved error handling
+
+        video_code: Code of the video, for the background VID check
+                    (default: the file name, as the pipelines save <code>.mp4)
+        """
         try:
             if not os.path.exists(video_path):
                 return {"success": False, "error": "Video file not found"}
             
             file_name = Path(video_path).name
             title = title or Path(video_path).stem
+            video_code = video_code or Path(video_path).stem
             file_size = os.path.getsize(video_path)
             size_mb = file_size / (1024 * 1024)
             
@@ -126,112 +140,97 @@ class Upload18UploaderFixed:
             upload_url = f"{self.base_url}/upload"
             print(f"[Upload18] Uploading to: {upload_url}")
             
-            with open(video_path, 'rb') as f:
-                # Progress bar
-                with tqdm(total=file_size, unit='B', unit_scale=True, unit_divisor=1024, 
-                         desc=f"📤 {file_name}", leave=False) as pbar:
-                    
-                    class ProgressFileWrapper:
-                        def __init__(self, file_obj, progress_bar):
-                            self.file_obj = file_obj
-                            self.progress_bar = progress_bar
-                            self.bytes_read = 0
-                        
-                        def read(self, size=-1):
-                            data = self.file_obj.read(size)
-                            self.bytes_read += len(data)
-                            self.progress_bar.update(len(data))
-                            return data
-                        
-                        def __len__(self):
-                            return file_size
-                    
-                    progress_file = ProgressFileWrapper(f, pbar)
-                    
-                    files = {'video': (file_name, progress_file, 'video/mp4')}
-                    data = {
-                        'apikey': self.api_key,
-                        'cid': '15',  # Category ID
-                        'mycid': '0',
-                        'fid': '18'  # Folder ID
-                    }
-                    
-                    start_time = time.time()
-                    
-                    try:
-                        response = self.session.post(
-                            upload_url,
-                            files=files,
-                            data=data,
-                            timeout=3600  # 1 hour timeout
-                        )
-                    except requests.exceptions.Timeout:
-                        return {"success": False, "error": "Upload timeout (1 hour)"}
-                    except Exception as e:
-                        return {"success": False, "error": f"Upload failed: {str(e)}"}
-                    
-                    elapsed = time.time() - start_time
-                    speed_mbps = (file_size / (1024*1024)) / elapsed if elapsed > 0 else 0
-                    
-                    print(f"\n[Upload18] Upload completed in {elapsed:.1f}s (avg {speed_mbps:.2f} MB/s)")
-                    print(f"[Upload18] Response status: {response.status_code}")
-                    
-                    if response.status_code != 200:
-                        return {"success": False, "error": f"HTTP {response.status_code}: {response.text[:200]}"}
-                    
-                    try:
-                        result = response.json()
-                    except json.JSONDecodeError:
-                        return {"success": False, "error": f"Invalid JSON response: {response.text[:200]}"}
-                    
-                    print(f"[Upload18] Response: {result}")
-                    
-                    if result.get('status') != 'success':
-                        error_msg = result.get('msg', result.get('error', 'Upload failed'))
-                        return {"success": False, "error": error_msg}
-                    
-                    vid = result.get('vid', '')
-                    did = result.get('did', '')
-                    
-                    if not did:
-                        return {"success": False, "error": "No DID returned from server"}
-                    
-                    # If VID is empty, wait for processing
-                    if not vid or vid == '':
-                        print(f"[Upload18] ✓ Upload successful: did={did}")
-                        print(f"[Upload18] ⏳ Video is processing...")
-                        
-                        vid = self.wait_for_processing(did, max_wait_minutes=10)
-                        
-                        if not vid:
-                            print(f"[Upload18] ⚠ VID not available yet")
-                            print(f"[Upload18] Video is still processing on server")
-                            print(f"[Upload18] Check status later with: python upload18_check_status.py {did}")
-                            
-                            return {
-                                "success": True,
-                                "host": "upload18",
-                                "vid": did,  # Use DID as placeholder
-                                "did": did,
-                                "processing": True,
-                                "file_code": did,
-                                "url": f"https://upload18.com/myvideo",
-                                "embed_url": f"https://upload18.com/myvideo",
-                                "note": "Video is processing. VID will be available soon."
-                            }
+            # Progress bar
+            with tqdm(total=file_size, unit='B', unit_scale=True, unit_divisor=1024, 
+                     desc=f"📤 {file_name}", leave=False) as pbar:
+                
+                def on_progress(bytes_sent, total):
+                    pbar.update(min(bytes_sent, file_size) - pbar.n)
+                
+                data = {
+                    'apikey': self.api_key,
+                    'cid': '15',  # Category ID
+                    'mycid': '0',
+                    'fid': '18'  # Folder ID
+                }
+                
+                start_time = time.time()
+                
+                try:
+                    response = post_multipart(
+                        self.session,
+                        upload_url,
+                        data,
+                        'video',
+                        video_path,
+                        file_name=file_name,
+                        callback=on_progress,
+                        timeout=3600  # 1 hour timeout
+                    )
+                except requests.exceptions.Timeout:
+                    return {"success": False, "error": "Upload timeout (1 hour)"}
+                except Exception as e:
+                    return {"success": False, "error": f"Upload failed: {str(e)}"}
+                
+                elapsed = time.time() - start_time
+                speed_mbps = (file_size / (1024*1024)) / elapsed if elapsed > 0 else 0
+                
+                print(f"\n[Upload18] Upload completed in {elapsed:.1f}s (avg {speed_mbps:.2f} MB/s)")
+                print(f"[Upload18] Response status: {response.status_code}")
+                
+                if response.status_code != 200:
+                    return {"success": False, "error": f"HTTP {response.status_code}: {response.text[:200]}"}
+                
+                try:
+                    result = response.json()
+                except json.JSONDecodeError:
+                    return {"success": False, "error": f"Invalid JSON response: {response.text[:200]}"}
+                
+                print(f"[Upload18] Response: {result}")
+                
+                if result.get('status') != 'success':
+                    error_msg = result.get('msg', result.get('error', 'Upload failed'))
+                    return {"success": False, "error": error_msg}
+                
+                vid = result.get('vid', '')
+                did = result.get('did', '')
+                
+                if not did:
+                    return {"success": False, "error": "No DID returned from server"}
+                
+                # If VID is empty, the VID is picked up in the background
+                # and written to the hosting entry once processing finishes
+                if not vid or vid == '':
+                    print(f"[Upload18] ✓ Upload successful: did={did}")
+                    print(f"[Upload18] ⏳ Video is processing - VID check queued")
                     
-                    print(f"[Upload18] ✓ Upload successful: vid={vid}, did={did}")
+                    verification_queue.register('upload18', self.verify_processing)
+                    verification_queue.enqueue('upload18', 'upload18', did, video_code=video_code, params={'did': did})
                     
                     return {
                         "success": True,
                         "host": "upload18",
-                        "vid": vid,
+                        "vid": did,  # Use DID as placeholder
                         "did": did,
-                        "file_code": vid,
-                        "url": f"https://upload18.com/play/index/{vid}",
-                        "embed_url": f"https://upload18.com/play/index/{vid}"
+                        "processing": True,
+                        "file_code": did,
+                        "url": f"https://upload18.com/myvideo",
+                        "embed_url": f"https://upload18.com/myvideo",
+                        "note": "Video is processing. VID is added to the database once available."
                     }
-                    
+                
+                print(f"[Upload18] ✓ Upload successful: vid={vid}, did={did}")
+                
+                return {
+                    "success": True,
+                    "host": "upload18",
+                    "vid": vid,
+                    "did": did,
+                    "file_code": vid,
+                    "url": f"https://upload18.com/play/index/{vid}",
+                    "embed_url": f"https://upload18.com/play/index/{vid}"
+                }
+                
         except Exception as e:
             print(f"[Upload18] Error: {str(e)}")
             import traceback
@@ -239,6 +238,15 @@ class Upload18UploaderFixed:
             return {"success": False, "error": str(e)}
 
 
+def _verify_with_env_key(job):
+    """Checker for jobs left over from a previous run"""
+    uploader = Upload18UploaderFixed(None, None, None, os.getenv("UPLOAD18_API_KEY"))
+    return uploader.verify_processing(job)
+
+
+verification_queue.register('upload18', _verify_with_env_key)
+
+
 if __name__ == "__main__":
     import sys
     from dotenv import load_dotenv
@@ -273,5 +281,8 @@ if __name__ == "__main__":
         print(f"  Embed URL: {result['embed_url']}")
         if result.get('processing'):
             print(f"  Note: {result['note']}")
+            vid = uploader.wait_for_processing(result['did'])
+            if vid:
+                print(f"  VID: {vid}")
     else:
         print(f"\n✗ Upload failed: {result['error']}")
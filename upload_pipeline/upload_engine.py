@@ -0,0 +1,511 @@
+"""
+Upload Engine - Host Registry + Parallel Fan-out
+Single implementation behind every multi-host upload entry point:
+- Registry of hosting services (uploader class, .env credentials, priority)
+- One ThreadPoolExecutor fan-out with per-host timing and size-limit skips
+- Results normalized to the same shape for every host
+  (embed_url, download_url, file_code + the host's original fields)
+- Shared result file writer and main database sync
+- Multi-host fan-outs read the video once through a SharedFileSource
+- Each host uploads under its own bandwidth_scheduler flow (weights, caps)
+- Every attempt feeds the host health model in the DB (success rate, MB/s,
+  TTFB, error classes); fan-outs are ordered and chosen from it
+"""
+import os
+import sys
+import json
+import time
+import importlib
+import threading
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Add parent directory to path for database_manager import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_source import SharedFileSource
+from bandwidth_scheduler import bandwidth
+import http_client
+
+print_lock = threading.Lock()
+
+# host name -> spec dict (see register_host)
+HOST_REGISTRY = {}
+
+
+def register_host(name, module, class_name, env, required=None, priority=100):
+    """
+    Register a hosting service
+
+    Args:
+        name: Host key used in results and video['hosting']
+        module: Module containing the uploader class (imported lazily)
+        class_name: Uploader class name
+        env: Constructor kwarg -> environment variable
+        required: Environment variables that must be set to use the host
+                  (default: all of env)
+        priority: Lower uploads first when no explicit host order is given
+    """
+    HOST_REGISTRY[name] = {
+        'module': module,
+        'class_name': class_name,
+        'env': env,
+        'required': required if required is not None else list(env.values()),
+        'priority': priority
+    }
+
+
+register_host(
+    'uploady', 'uploady_uploader', 'UploadyUploader',
+    env={'email': 'UPLOADY_EMAIL', 'username': 'UPLOADY_USERNAME', 'api_key': 'UPLOADY_API_KEY'},
+    required=['UPLOADY_API_KEY'], priority=1
+)
+register_host(
+    'turboviplay', 'turboviplay_uploader', 'TurboviplayUploader',
+    env={
+        'email': 'TURBOVIPLAY_EMAIL', 'username': 'TURBOVIPLAY_USERNAME',
+        'password': 'TURBOVIPLAY_PASSWORD', 'api_key': 'TURBOVIPLAY_API_KEY'
+    },
+    required=['TURBOVIPLAY_API_KEY'], priority=2
+)
+register_host(
+    'mixdrop', 'mixdrop_uploader', 'MixDropUploader',
+    env={'email': 'MIXDROP_EMAIL', 'api_key': 'MIXDROP_API_KEY'},
+    required=['MIXDROP_API_KEY'], priority=3
+)
+register_host(
+    'seekstreaming', 'seekstreaming_uploader', 'SeekstreamingUploader',
+    env={'api_key': 'SEEKSTREAMING_API_KEY', 'email': 'SEEKSTREAMING_EMAIL', 'password': 'SEEKSTREAMING_PASSWORD'},
+    required=['SEEKSTREAMING_API_KEY'], priority=4
+)
+# Often blocked by ISPs - kept last
+register_host(
+    'streamtape', 'streamtape_uploader', 'StreamtapeUploader',
+    env={'login': 'STREAMTAPE_LOGIN', 'api_key': 'STREAMTAPE_API_KEY'},
+    priority=5
+)
+
+
+def is_configured(name):
+    """True if all required credentials for the host are set"""
+    spec = HOST_REGISTRY[name]
+    return all(os.getenv(var) for var in spec['required'])
+
+
+def create_uploader(name):
+    """
+    Instantiate the uploader for a registered host from .env credentials
+
+    Returns:
+        Uploader instance, or None if the module is missing or init failed
+    """
+    spec = HOST_REGISTRY[name]
+
+    try:
+        module = importlib.import_module(spec['module'])
+        uploader_class = getattr(module, spec['class_name'])
+        kwargs = {kwarg: os.getenv(var) for kwarg, var in spec['env'].items()}
+        return uploader_class(**kwargs)
+    except ImportError as e:
+        print(f"  ⚠️  {name}: uploader not available ({e})")
+    except Exception as e:
+        print(f"  ⚠️  {name}: initialization failed ({e})")
+
+    return None
+
+
+def create_uploaders(hosts=None, require_credentials=True):
+    """
+    Instantiate uploaders for several hosts
+
+    Args:
+        hosts: Host names in upload order (None = all registered, by priority)
+        require_credentials: Skip hosts whose required .env keys are missing
+
+    Returns:
+        Ordered dict host name -> uploader instance
+    """
+    if hosts is None:
+        hosts = sorted(HOST_REGISTRY, key=lambda h: HOST_REGISTRY[h]['priority'])
+
+    uploaders = {}
+    for name in hosts:
+        if name not in HOST_REGISTRY:
+            print(f"  ⚠️  Unknown host: {name}")
+            continue
+        if require_credentials and not is_configured(name):
+            continue
+
+        uploader = create_uploader(name)
+        if uploader is not None:
+            uploaders[name] = uploader
+
+    return uploaders
+
+
+def _health_db():
+    """db_manager for host health, or None if the database is unavailable"""
+    try:
+        from database_manager import db_manager
+        return db_manager
+    except Exception as e:
+        print(f"⚠️ Host health tracking unavailable: {e}")
+        return None
+
+
+def display_name(host, uploader=None):
+    """Human readable host name"""
+    return getattr(uploader, 'display_name', None) or host
+
+
+def normalize_result(host, result):
+    """
+    Give every host result the same core fields
+    Host specific fields are kept; embed_url / download_url / file_code
+    are filled from whichever names the host uses.
+    """
+    result = dict(result or {})
+    result['host'] = host
+    result.setdefault('success', False)
+
+    if not result['success']:
+        return result
+
+    all_urls = result.get('all_urls') or {}
+
+    result['embed_url'] = result.get('embed_url') or all_urls.get('video_player', '')
+    result['download_url'] = (
+        result.get('download_url') or
+        all_urls.get('video_downloader') or
+        result.get('url', '')
+    )
+    result['file_code'] = (
+        result.get('file_code') or
+        result.get('vid') or
+        result.get('video_id') or
+        result.get('file_id') or
+        ''
+    )
+
+    if not result['file_code'] and '#' in result['embed_url']:
+        result['file_code'] = result['embed_url'].split('#')[-1]
+
+    return result
+
+
+class UploadEngine:
+    """Parallel upload of one video to many hosts"""
+
+    def __init__(self, hosts=None, uploaders=None, require_credentials=True, track_health=True):
+        """
+        Args:
+            hosts: Host names in upload order (None = all registered)
+            uploaders: Pre-built host name -> uploader mapping (skips the registry)
+            require_credentials: Skip hosts without .env credentials
+            track_health: Record attempts in the host health model and use it
+                          to order / choose hosts
+        """
+        if uploaders is None:
+            uploaders = create_uploaders(hosts, require_credentials=require_credentials)
+
+        self.uploaders = uploaders
+        self.health_db = _health_db() if track_health else None
+        self.last_total_time = 0
+        self.last_source_stats = None
+
+    def upload_to_host(self, host, video_path, title=None, uploader=None, source=None):
+        """
+        Upload to a single host
+
+        source: SharedFileSource of the upload_all() run this upload belongs to
+
+        Returns:
+            Normalized result with host, host_name, upload_time and timestamp
+        """
+        uploader = uploader or self.uploaders[host]
+        host_name = display_name(host, uploader)
+
+        with print_lock:
+            print(f"\n[{host_name}] Starting upload...")
+
+        start_time = time.time()
+        sent_before = bandwidth.stats().get(host, {}).get('total_mb', 0)
+        exception = None
+        if source is not None:
+            source.register()
+
+        try:
+            skipped = uploader.check_size(video_path) if hasattr(uploader, 'check_size') else None
+            with bandwidth.use_flow(host, 'upload'):
+                result = skipped or uploader.upload(video_path, title)
+        except Exception as e:
+            exception = e
+            result = {'success': False, 'error': str(e)}
+        finally:
+            # Stop holding the shared ring for this host
+            if source is not None:
+                source.leave()
+
+        elapsed = time.time() - start_time
+
+        if self.health_db and not result.get('skipped'):
+            sent_mb = bandwidth.stats().get(host, {}).get('total_mb', 0) - sent_before
+            self._record_health(host, video_path, result, start_time, sent_mb, exception)
+
+        result = normalize_result(host, result)
+        result['upload_time'] = result.get('upload_time') or elapsed
+        result['host_name'] = host_name
+        result['timestamp'] = datetime.now().isoformat()
+
+        with print_lock:
+            if result['success']:
+                print(f"[{host_name}] ✓ Upload successful in {elapsed:.1f}s")
+            elif result.get('skipped'):
+                print(f"[{host_name}] ⏭ Skipped: {result.get('error', '')}")
+            else:
+                print(f"[{host_name}] ✗ Upload failed: {str(result.get('error', 'Unknown'))[:100]}")
+
+        return result
+
+    def _record_health(self, host, video_path, result, start_time, sent_mb, exception=None):
+        """Feed one attempt into the host health model (exception: what the uploader raised, if anything)"""
+        end_time = time.time()
+        first_byte = bandwidth.first_byte_since(host, start_time)
+        ttfb = first_byte - start_time if first_byte else None
+
+        if sent_mb > 0 and first_byte:
+            bytes_sent, duration = sent_mb * 1024 * 1024, end_time - first_byte
+        else:
+            # Uploader did not stream through the scheduler - whole attempt
+            bytes_sent, duration = os.path.getsize(video_path), end_time - start_time
+
+        self.health_db.record_host_attempt(
+            host, result.get('success', False),
+            duration=duration, bytes_sent=bytes_sent, ttfb=ttfb,
+            error=exception or result.get('error'),
+            rate_limited_until=result.get('wait_until'),
+            status=result.get('status_code')
+        )
+
+    def select_hosts(self, video_path, hosts=None, max_hosts=None):
+        """
+        Hosts for a fan-out, best first according to the health model
+        Rate-limited hosts are left out while others are available;
+        max_hosts keeps only the best N.
+        """
+        hosts = [h for h in (hosts or self.uploaders) if h in self.uploaders]
+        if not self.health_db or len(hosts) < 2:
+            return hosts[:max_hosts] if max_hosts else hosts
+
+        ranked = self.health_db.rank_hosts(hosts, file_size=os.path.getsize(video_path))
+
+        now = time.time()
+        limited = [h for h in ranked if (self.health_db.get_host_health(h)['rate_limited_until'] or 0) > now]
+        if limited and len(limited) < len(ranked):
+            print(f"⏸  Rate-limited, skipped: {', '.join(limited)}")
+            ranked = [h for h in ranked if h not in limited]
+
+        if max_hosts:
+            ranked = ranked[:max_hosts]
+
+        print(f"📊 Host order: {' → '.join(ranked)}")
+        return ranked
+
+    def upload_all(self, video_path, title=None, hosts=None, max_workers=6, on_result=None, max_hosts=None):
+        """
+        Upload a video to several hosts in parallel
+
+        Args:
+            video_path: Path to the video file
+            title: Title passed to each uploader
+            hosts: Host names to use (None = all initialized uploaders)
+            max_workers: Maximum parallel uploads
+            on_result: Optional callback(host, result), called as each host finishes
+            max_hosts: Upload only to the N healthiest hosts
+
+        Returns:
+            Dict host -> normalized result (in completion order)
+        """
+        hosts = self.select_hosts(video_path, hosts, max_hosts)
+        results = {}
+
+        if not hosts:
+            print("✗ No uploaders available")
+            return results
+
+        start_time = time.time()
+        workers = max(1, min(max_workers, len(hosts)))
+
+        # Hosts uploading at the same time share one pass over the file
+        # (local to this call - overlapping upload_all() runs keep their own)
+        source = None
+        if workers > 1:
+            source = SharedFileSource(video_path)
+            source.__enter__()
+
+        try:
+            results = self._fan_out(video_path, title, hosts, workers, on_result, source)
+        finally:
+            if source is not None:
+                source.close()
+                self.last_source_stats = source.stats()
+
+        self.last_total_time = time.time() - start_time
+
+        stats = source.stats() if source is not None else None
+        if stats and stats['file_bytes']:
+            disk_mb = (stats['disk_bytes'] + stats['direct_bytes']) / (1024 * 1024)
+            print(f"📀 Disk read: {disk_mb:.1f} MB for {len(hosts)} host(s) "
+                  f"({disk_mb * 1024 * 1024 / stats['file_bytes']:.2f}x file size)")
+
+        if bandwidth.enabled:
+            bandwidth.print_rates()
+        http_client.print_stats()
+
+        return results
+
+    def _fan_out(self, video_path, title, hosts, workers, on_result, source=None):
+        """Run upload_to_host for every host on a thread pool, all reading through source"""
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.upload_to_host, host, video_path, title, source=source): host
+                for host in hosts
+            }
+
+            for future in as_completed(futures):
+                host = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[{host}] ✗ Worker exception: {str(e)}")
+                    result = normalize_result(host, {
+                        'success': False,
+                        'error': str(e),
+                        'timestamp': datetime.now().isoformat()
+                    })
+
+                results[host] = result
+
+                if on_result:
+                    try:
+                        on_result(host, result)
+                    except Exception as e:
+                        print(f"[{host}] ⚠️  Result handler error: {e}")
+
+        return results
+
+
+def print_summary(results, total_time=None):
+    """Print successful/failed hosts"""
+    successful = [h for h, r in results.items() if r.get('success')]
+    failed = [h for h, r in results.items() if not r.get('success')]
+
+    print(f"\n{'='*80}")
+    print(f"UPLOAD SUMMARY")
+    print(f"{'='*80}")
+    if total_time is not None:
+        print(f"Total time: {total_time:.1f}s")
+    print(f"Total hosts: {len(results)}")
+    print(f"Successful: {len(successful)}")
+    print(f"Failed: {len(failed)}")
+
+    if successful:
+        print(f"\n✓ Successful uploads:")
+        for host in successful:
+            result = results[host]
+            print(f"  • {result.get('host_name', host)}: {result.get('embed_url') or result.get('url', 'N/A')}")
+
+    if failed:
+        print(f"\n✗ Failed uploads:")
+        for host in failed:
+            result = results[host]
+            print(f"  • {result.get('host_name', host)}: {str(result.get('error', 'Unknown'))[:60]}")
+
+    print(f"\n{'='*80}\n")
+
+
+def save_results(video_path, title, results, total_time, results_dir="upload_results"):
+    """Save upload results to a JSON file, returns its path"""
+    results_dir = Path(results_dir)
+    results_dir.mkdir(exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    video_name = Path(video_path).stem
+    result_file = results_dir / f"{video_name}_{timestamp}.json"
+
+    data = {
+        "video_path": str(video_path),
+        "video_name": video_name,
+        "title": title,
+        "timestamp": datetime.now().isoformat(),
+        "total_time": total_time,
+        "results": results
+    }
+
+    with open(result_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+
+    print(f"Results saved to: {result_file}")
+    return result_file
+
+
+def sync_to_main_database(video_code, results):
+    """
+    Store successful host URLs in video['hosting'] of the main database
+
+    Returns:
+        Number of hosts synced
+    """
+    from database_manager import db_manager
+
+    try:
+        video = db_manager.get_video_by_code(video_code)
+
+        if not video:
+            print(f"⚠️ Video '{video_code}' not found in main database, skipping sync")
+            return 0
+
+        if 'hosting' not in video:
+            video['hosting'] = {}
+
+        synced = 0
+        for host, result in results.items():
+            if not result.get('success'):
+                continue
+
+            result = normalize_result(host, result)
+            embed_url = result['embed_url']
+            download_url = result['download_url']
+
+            if not embed_url and not download_url:
+                print(f"  ⚠️ {host}: No URLs found in result")
+                continue
+
+            video['hosting'][host] = {
+                'embed_url': embed_url,
+                'download_url': download_url,
+                'file_code': result['file_code'],
+                'upload_time': int(time.time())
+            }
+            synced += 1
+            print(f"  ✓ {host}: {(embed_url or download_url)[:60]}")
+
+        if not synced:
+            print(f"\n⚠️ No valid URLs to sync for '{video_code}'")
+            return 0
+
+        video['uploaded_at'] = datetime.now().isoformat()
+
+        if db_manager.add_or_update_video(video):
+            print(f"\n✓ Synced {synced} hosting URLs to main database for '{video_code}'")
+            return synced
+
+        print(f"\n✗ Failed to sync to main database")
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Error syncing to main database: {e}")
+        return 0
@@ -1,8 +1,10 @@
 """
 Progress tracking utilities for uploads
 """
+import os
 from tqdm import tqdm
 import requests
+from streaming_multipart import post_multipart
 
 class ProgressFileWrapper:
     """Wrapper for file object to track upload progress"""
@@ -39,7 +41,7 @@ def upload_with_progress(url, files, data, timeout, verify=True):
     
     Args:
         url: Upload URL
-        files: Files dict for requests
+        files: Files dict for requests (one open file: {field: (name, file, type)})
         data: Form data
         timeout: Request timeout
         verify: SSL verification
@@ -48,34 +50,38 @@ def upload_with_progress(url, files, data, timeout, verify=True):
         Response object
     """
     # Get file info
-    file_tuple = list(files.values())[0]
+    file_key = list(files.keys())[0]
+    file_tuple = files[file_key]
     filename = file_tuple[0]
     file_obj = file_tuple[1]
-    content_type = file_tuple[2] if len(file_tuple) > 2 else None
-    
-    # Get file size
-    file_obj.seek(0, 2)  # Seek to end
-    total_size = file_obj.tell()
-    file_obj.seek(0)  # Seek back to start
+    content_type = file_tuple[2] if len(file_tuple) > 2 else 'application/octet-stream'
     
-    # Wrap file with progress tracker
-    progress_file = ProgressFileWrapper(file_obj, filename, total_size)
+    # Stream from disk instead of letting requests build the body in memory
+    total_size = os.path.getsize(file_obj.name)
+    progress_bar = tqdm(
+        total=total_size,
+        unit='B',
+        unit_scale=True,
+        unit_divisor=1024,
+        desc=f"📤 {filename}",
+        leave=False
+    )
     
-    # Recreate files dict with progress wrapper
-    file_key = list(files.keys())[0]
-    if content_type:
-        files_with_progress = {file_key: (filename, progress_file, content_type)}
-    else:
-        files_with_progress = {file_key: (filename, progress_file)}
+    def on_progress(bytes_sent, total):
+        progress_bar.update(min(bytes_sent, total_size) - progress_bar.n)
     
     try:
-        response = requests.post(
+        return post_multipart(
+            requests,
             url,
-            files=files_with_progress,
-            data=data,
+            data,
+            file_key,
+            file_obj.name,
+            file_name=filename,
+            file_content_type=content_type,
+            callback=on_progress,
             timeout=timeout,
             verify=verify
         )
-        return response
     finally:
-        progress_file.progress_bar.close()
+        progress_bar.close()
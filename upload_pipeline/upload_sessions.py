@@ -0,0 +1,180 @@
+"""
+Upload Session Store
+Durable record of in-flight uploads so a restarted process can resume:
+- Keyed by file fingerprint + host (renaming or moving the video keeps the key)
+- Holds whatever the host needs to continue: TUS locations, byte ranges,
+  confirmed offsets, and the server file code once the upload completed
+- Stored in database/upload_sessions.json, shared between processes with
+  the same optional filelock as database_manager
+- Resumable uploaders (Uploader.resumable) consult it before creating a
+  new server-side upload
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+
+try:
+    from filelock import FileLock, Timeout
+    FILELOCK_AVAILABLE = True
+except ImportError:
+    FILELOCK_AVAILABLE = False
+
+DATABASE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database")
+UPLOAD_SESSIONS_DB = os.path.join(DATABASE_DIR, "upload_sessions.json")
+
+# Bytes hashed from the start, middle and end of the file
+FINGERPRINT_SAMPLE = 1024 * 1024
+# Servers expire unfinished uploads; older sessions are dropped
+SESSION_MAX_AGE_DAYS = 7
+
+# (abspath, size, mtime) -> fingerprint
+_fingerprint_cache = {}
+
+
+def fingerprint(video_path):
+    """
+    Stable identity of a video file
+    sha1 of the size plus samples from the start, middle and end - cheap
+    for multi-GB files, independent of the file name and location.
+    """
+    stat = os.stat(video_path)
+    cache_key = (os.path.abspath(video_path), stat.st_size, stat.st_mtime)
+    if cache_key in _fingerprint_cache:
+        return _fingerprint_cache[cache_key]
+
+    size = stat.st_size
+    digest = hashlib.sha1(str(size).encode())
+
+    with open(video_path, 'rb') as f:
+        for offset in (0, max(0, size // 2 - FINGERPRINT_SAMPLE // 2), max(0, size - FINGERPRINT_SAMPLE)):
+            f.seek(offset)
+            digest.update(f.read(FINGERPRINT_SAMPLE))
+
+    value = f"{size:x}-{digest.hexdigest()[:24]}"
+    _fingerprint_cache[cache_key] = value
+    return value
+
+
+class UploadSessionStore:
+    """JSON-backed upload sessions, one per (fingerprint, host)"""
+
+    def __init__(self, path=UPLOAD_SESSIONS_DB, max_age_days=SESSION_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age_days = max_age_days
+        self.thread_lock = threading.Lock()
+        self.file_lock = FileLock(path + ".lock", timeout=30) if FILELOCK_AVAILABLE else None
+
+    @staticmethod
+    def _key(file_fingerprint, host):
+        return f"{host}:{file_fingerprint}"
+
+    def _read(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Error reading {self.path}: {e}")
+        return {}
+
+    def _write(self, sessions):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(sessions, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def _modify(self, change):
+        """Read-modify-write under the thread and file locks"""
+        with self.thread_lock:
+            try:
+                if self.file_lock:
+                    self.file_lock.acquire()
+            except Timeout:
+                print(f"⚠️ Lock timeout on {self.path}, writing without lock")
+
+            try:
+                sessions = self._read()
+                result = change(sessions)
+                self._write(sessions)
+                return result
+            finally:
+                if self.file_lock and self.file_lock.is_locked:
+                    self.file_lock.release()
+
+    def get(self, file_fingerprint, host):
+        """Session dict, or None if there is none (or it expired)"""
+        with self.thread_lock:
+            session = self._read().get(self._key(file_fingerprint, host))
+
+        if not session:
+            return None
+
+        if time.time() - session.get('updated', 0) > self.max_age_days * 86400:
+            self.discard(file_fingerprint, host)
+            return None
+
+        return session
+
+    def save(self, file_fingerprint, host, **fields):
+        """Create or update a session; returns the stored session"""
+        key = self._key(file_fingerprint, host)
+
+        def change(sessions):
+            session = sessions.get(key) or {
+                'host': host,
+                'fingerprint': file_fingerprint,
+                'status': 'uploading',
+                'created_at': datetime.now().isoformat()
+            }
+            session.update(fields)
+            session['updated'] = time.time()
+            sessions[key] = session
+            return dict(session)
+
+        return self._modify(change)
+
+    def update_offset(self, file_fingerprint, host, offset, part=None):
+        """Record a confirmed server offset (of the whole upload or one partial)"""
+        key = self._key(file_fingerprint, host)
+
+        def change(sessions):
+            session = sessions.get(key)
+            if not session:
+                return
+            if part is None:
+                session['offset'] = offset
+            else:
+                session['parts'][part]['offset'] = offset
+            session['updated'] = time.time()
+
+        self._modify(change)
+
+    def complete(self, file_fingerprint, host, file_code, **fields):
+        """Mark the upload finished and keep the server file code"""
+        return self.save(file_fingerprint, host, status='complete', file_code=file_code,
+                         completed_at=datetime.now().isoformat(), **fields)
+
+    def discard(self, file_fingerprint, host):
+        """Forget a session (e.g. the server no longer knows the upload)"""
+        key = self._key(file_fingerprint, host)
+        self._modify(lambda sessions: sessions.pop(key, None))
+
+    def prune(self):
+        """Drop expired sessions; returns the number removed"""
+        cutoff = time.time() - self.max_age_days * 86400
+
+        def change(sessions):
+            expired = [k for k, s in sessions.items() if s.get('updated', 0) < cutoff]
+            for key in expired:
+                del sessions[key]
+            return len(expired)
+
+        return self._modify(change)
+
+
+# Global instance
+upload_sessions = UploadSessionStore()
@@ -6,71 +6,21 @@ import sys
 import json
 from datetime import datetime
 from dotenv import load_dotenv
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
 
-# Add parent directory to path for database_manager import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from database_manager import db_manager
-
-# Import all uploaders
-from seekstreaming_uploader import SeekstreamingUploader
-from streamtape_uploader import StreamtapeUploader
-from turboviplay_uploader import TurboviplayUploader
-from uploady_uploader import UploadyUploader
-from mixdrop_uploader import MixDropUploader
+from upload_engine import UploadEngine, print_lock, sync_to_main_database
 
 load_dotenv()
 
-# Thread-safe print lock
-print_lock = threading.Lock()
+HOSTS = ['seekstreaming', 'streamtape', 'turboviplay', 'mixdrop', 'uploady']
 
 class MultiHostUploader:
     def __init__(self):
-        self.uploaders = {}
-        self.databases = {}
-        
-        # Initialize SeekStreaming
-        if os.getenv('SEEKSTREAMING_API_KEY'):
-            self.uploaders['seekstreaming'] = SeekstreamingUploader(
-                api_key=os.getenv('SEEKSTREAMING_API_KEY')
-            )
-            self.databases['seekstreaming'] = "../database/seekstreaming_host.json"
-        
-        # Initialize Streamtape
-        if os.getenv('STREAMTAPE_USERNAME') and os.getenv('STREAMTAPE_PASSWORD'):
-            self.uploaders['streamtape'] = StreamtapeUploader(
-                username=os.getenv('STREAMTAPE_USERNAME'),
-                password=os.getenv('STREAMTAPE_PASSWORD')
-            )
-            self.databases['streamtape'] = "../database/streamtape_host.json"
-        
-        # Initialize Turboviplay
-        if os.getenv('TURBOVIPLAY_API_KEY'):
-            self.uploaders['turboviplay'] = TurboviplayUploader(
-                email=os.getenv('TURBOVIPLAY_EMAIL'),
-                username=os.getenv('TURBOVIPLAY_USERNAME'),
-                password=os.getenv('TURBOVIPLAY_PASSWORD'),
-                api_key=os.getenv('TURBOVIPLAY_API_KEY')
-            )
-            self.databases['turboviplay'] = "../database/turboviplay_host.json"
-        
-        # Initialize MixDrop
-        if os.getenv('MIXDROP_API_KEY'):
-            self.uploaders['mixdrop'] = MixDropUploader(
-                email=os.getenv('MIXDROP_EMAIL'),
-                api_key=os.getenv('MIXDROP_API_KEY')
-            )
-            self.databases['mixdrop'] = "../database/mixdrop_host.json"
-        
-        # Initialize Uploady
-        if os.getenv('UPLOADY_API_KEY'):
-            self.uploaders['uploady'] = UploadyUploader(
-                email=os.getenv('UPLOADY_EMAIL'),
-                username=os.getenv('UPLOADY_USERNAME'),
-                api_key=os.getenv('UPLOADY_API_KEY')
-            )
-            self.databases['uploady'] = "../database/uploady_host.json"
+        self.engine = UploadEngine(hosts=HOSTS)
+        self.uploaders = self.engine.uploaders
+        self.databases = {
+            host: f"../database/{host}_host.json"
+            for host in self.uploaders
+        }
     
     def load_database(self, db_path):
         """Load database"""
@@ -144,48 +94,44 @@ class MultiHostUploader:
         
         self.save_database(db_path, db)
     
-    def upload_to_single_host(self, host, uploader, video_path, video_title, video_info):
-        """Upload to a single host (thread-safe)"""
-        try:
+    def _flatten_result(self, host, result, video_info):
+        """Save a finished upload to the host database and return the flat result"""
+        if result.get('success'):
             with print_lock:
-                print(f"\n[{host.upper()}] Starting upload...")
-                print("-" * 70)
+                print(f"[{host.upper()}] URLs: embed={result.get('embed_url', 'N/A')[:50]}")
             
-            result = uploader.upload(video_path, video_title)
+            # Save to host-specific database
+            self.save_to_database(host, video_info, result)
             
-            if result.get('success'):
-                with print_lock:
-                    print(f"[{host.upper()}] ✓ Upload successful!")
-                    print(f"[{host.upper()}] URLs: embed={result.get('embed_url', 'N/A')[:50]}")
-                
-                # Save to host-specific database
-                self.save_to_database(host, video_info, result)
-                
-                with print_lock:
-                    print(f"[{host.upper()}] ✓ Saved to host database")
-                
-                # CRITICAL FIX: Return flat result, not nested
-                # This ensures complete_workflow.py can access URLs directly
-                return {
-                    'success': True,
-                    'host': host,
-                    'embed_url': result.get('embed_url', ''),
-                    'download_url': result.get('url', result.get('download_url', '')),
-                    'file_code': result.get('file_code', result.get('file_id', result.get('video_id', ''))),
-                    # Keep all_urls for seekstreaming compatibility
-                    'all_urls': result.get('all_urls', {}),
-                    # Keep original result for debugging
-                    '_original': result
-                }
-            else:
-                with print_lock:
-                    print(f"[{host.upper()}] ✗ Upload failed: {result.get('error')}")
-                
-                return {
-                    'host': host,
-                    'success': False,
-                    'error': result.get('error')
-                }
+            with print_lock:
+                print(f"[{host.upper()}] ✓ Saved to host database")
+            
+            # CRITICAL FIX: Return flat result, not nested
+            # This ensures complete_workflow.py can access URLs directly
+            return {
+                'success': True,
+                'host': host,
+                'embed_url': result.get('embed_url', ''),
+                'download_url': result.get('download_url', ''),
+                'file_code': result.get('file_code', ''),
+                # Keep all_urls for seekstreaming compatibility
+                'all_urls': result.get('all_urls', {}),
+                # Keep original result for debugging
+                '_original': result
+            }
+        
+        return {
+            'host': host,
+            'success': False,
+            'error': result.get('error')
+        }
+    
+    def upload_to_single_host(self, host, uploader, video_path, video_title, video_info):
+        """Upload to a single host (thread-safe)"""
+        result = self.engine.upload_to_host(host, video_path, video_title, uploader=uploader)
+        
+        try:
+            return self._flatten_result(host, result, video_info)
         except Exception as e:
             with print_lock:
                 print(f"[{host.upper()}] ✗ Error: {str(e)}")
@@ -225,34 +171,15 @@ class MultiHostUploader:
         
         results = {}
         
-        # Upload to all hosts in parallel using ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all upload tasks
-            future_to_host = {
-                executor.submit(
-                    self.upload_to_single_host,
-                    host,
-                    uploader,
-                    video_path,
-                    video_title,
-                    video_info
-                ): host
-                for host, uploader in self.uploaders.items()
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_host):
-                host = future_to_host[future]
-                try:
-                    result = future.result()
-                    results[result['host']] = result
-                except Exception as e:
-                    with print_lock:
-                        print(f"[{host.upper()}] ✗ Thread error: {str(e)}")
-                    results[host] = {
-                        'success': False,
-                        'error': str(e)
-                    }
+        def on_result(host, result):
+            try:
+                results[host] = self._flatten_result(host, result, video_info)
+            except Exception as e:
+                with print_lock:
+                    print(f"[{host.upper()}] ✗ Error: {str(e)}")
+                results[host] = {'host': host, 'success': False, 'error': str(e)}
+        
+        self.engine.upload_all(video_path, video_title, max_workers=max_workers, on_result=on_result)
         
         # Summary
         print()
@@ -286,72 +213,7 @@ class MultiHostUploader:
     
     def sync_to_main_database(self, video_title, results):
         """Sync upload results to main combined_videos.json"""
-        try:
-            # Find video by title/code in main database
-            video = db_manager.get_video_by_code(video_title)
-            
-            if not video:
-                print(f"⚠️ Video '{video_title}' not found in main database, skipping sync")
-                return
-            
-            # Update hosting URLs
-            if 'hosting' not in video:
-                video['hosting'] = {}
-            
-            successful_hosts = 0
-            
-            for host, result in results.items():
-                if result.get('success'):
-                    # CRITICAL FIX: Results are now flat (not nested)
-                    # Access URLs directly from result
-                    
-                    # Initialize host entry if not exists
-                    if host not in video['hosting']:
-                        video['hosting'][host] = {}
-                    
-                    # Extract URLs - handle both new flat format and old nested format for compatibility
-                    embed_url = result.get('embed_url', '')
-                    download_url = result.get('download_url', result.get('url', ''))
-                    file_code = result.get('file_code', '')
-                    
-                    # Special handling for seekstreaming (has all_urls dict)
-                    if host == 'seekstreaming' and result.get('all_urls'):
-                        all_urls = result.get('all_urls', {})
-                        embed_url = all_urls.get('video_player', embed_url)
-                        download_url = all_urls.get('video_downloader', download_url)
-                        if embed_url and '#' in embed_url:
-                            file_code = embed_url.split('#')[-1]
-                    
-                    # Validate we have actual URLs (not empty strings)
-                    if embed_url or download_url:
-                        video['hosting'][host] = {
-                            'embed_url': embed_url,
-                            'download_url': download_url,
-                            'file_code': file_code
-                        }
-                        successful_hosts += 1
-                        print(f"  ✓ {host}: {embed_url[:60] if embed_url else download_url[:60]}")
-                    else:
-                        print(f"  ⚠️ {host}: No URLs found in result")
-                        print(f"     Result keys: {list(result.keys())}")
-            
-            # Only update if we actually got some URLs
-            if successful_hosts > 0:
-                # Update uploaded_at timestamp
-                video['uploaded_at'] = datetime.now().isoformat()
-                
-                # Save back to main database
-                if db_manager.add_or_update_video(video):
-                    print(f"\n✓ Synced {successful_hosts} hosting URLs to main database for '{video_title}'")
-                else:
-                    print(f"\n✗ Failed to sync to main database")
-            else:
-                print(f"\n⚠️ No valid URLs to sync for '{video_title}'")
-                
-        except Exception as e:
-            print(f"\n✗ Error syncing to main database: {e}")
-            import traceback
-            traceback.print_exc()
+        return sync_to_main_database(video_title, results)
 
 
 def main():
@@ -12,6 +12,7 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database_manager import db_manager
+from probe_cache import probe_video, get_duration
 
 # Import uploaders
 from seekstreaming_uploader import SeekstreamingUploader
@@ -34,22 +35,12 @@ def validate_video(video_path):
         if size_mb < 10:
             return False, f"File too small: {size_mb:.2f} MB"
         
-        # Use ffprobe
-        cmd = [
-            'ffprobe',
-            '-v', 'error',
-            '-show_format',
-            '-show_streams',
-            '-of', 'json',
-            str(video_path)
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        # Shared cache: the downloader/preview stages usually probed it already
+        data = probe_video(video_path)
         
-        if result.returncode != 0:
+        if not data:
             return False, f"ffprobe failed"
         
-        data = json.loads(result.stdout)
         format_info = data.get('format', {})
         streams = data.get('streams', [])
         
@@ -68,7 +59,7 @@ def validate_video(video_path):
             return False, f"Invalid codec: {codec}"
         
         # Check duration
-        duration = float(format_info.get('duration', 0))
+        duration = get_duration(data)
         if duration < 30:
             return False, f"Duration too short: {duration}s"
         
@@ -5,25 +5,20 @@ Skips: Streamtape (ISP blocked), Upload18 (encoding issues)
 """
 import os
 import sys
-import json
-import subprocess
 from pathlib import Path
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from database_manager import db_manager
+from probe_cache import probe_video, get_duration
 
-# Import working uploaders only
-from turboviplay_uploader import TurboviplayUploader
-from seekstreaming_uploader import SeekstreamingUploader
-from mixdrop_uploader import MixDropUploader
-from uploady_uploader import UploadyUploader
+from upload_engine import UploadEngine, print_summary, sync_to_main_database
 
 load_dotenv()
 
+# Working uploaders only, fastest first
+HOSTS = ['uploady', 'turboviplay', 'mixdrop', 'seekstreaming']
+
 
 def validate_video(video_path):
     """Validate video before upload"""
@@ -36,22 +31,12 @@ def validate_video(video_path):
         if size_mb < 1:
             return False, f"File too small: {size_mb:.2f} MB"
         
-        # Quick validation with ffprobe
-        cmd = [
-            'ffprobe',
-            '-v', 'error',
-            '-show_format',
-            '-show_streams',
-            '-of', 'json',
-            str(video_path)
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        # Shared cache: the downloader/preview stages usually probed it already
+        data = probe_video(video_path)
         
-        if result.returncode != 0:
+        if not data:
             return False, "ffprobe validation failed"
         
-        data = json.loads(result.stdout)
         format_info = data.get('format', {})
         streams = data.get('streams', [])
         
@@ -70,7 +55,7 @@ def validate_video(video_path):
             return False, f"Invalid codec: {codec}"
         
         # Check duration
-        duration = float(format_info.get('duration', 0))
+        duration = get_duration(data)
         if duration < 1:
             return False, f"Duration too short: {duration}s"
         
@@ -89,57 +74,18 @@ class WorkingHostsUploader:
         """Initialize only working uploaders"""
         print("🔧 Initializing working uploaders...")
         
-        # Uploady (Priority 1 - Fastest)
-        if os.getenv("UPLOADY_API_KEY"):
-            self.uploaders['uploady'] = {
-                'uploader': UploadyUploader(
-                    email=os.getenv("UPLOADY_EMAIL"),
-                    username=os.getenv("UPLOADY_USERNAME"),
-                    api_key=os.getenv("UPLOADY_API_KEY")
-                ),
-                'priority': 1,
-                'name': 'Uploady'
+        self.engine = UploadEngine(hosts=HOSTS)
+        self.uploaders = {
+            host_key: {
+                'uploader': uploader,
+                'priority': priority,
+                'name': uploader.display_name or host_key
             }
-            print("  ✓ Uploady (fastest)")
+            for priority, (host_key, uploader) in enumerate(self.engine.uploaders.items(), start=1)
+        }
         
-        # Turboviplay (Priority 2 - Reliable)
-        if os.getenv("TURBOVIPLAY_API_KEY"):
-            self.uploaders['turboviplay'] = {
-                'uploader': TurboviplayUploader(
-                    email=os.getenv("TURBOVIPLAY_EMAIL"),
-                    username=os.getenv("TURBOVIPLAY_USERNAME"),
-                    password=os.getenv("TURBOVIPLAY_PASSWORD"),
-                    api_key=os.getenv("TURBOVIPLAY_API_KEY")
-                ),
-                'priority': 2,
-                'name': 'Turboviplay'
-            }
-            print("  ✓ Turboviplay (reliable)")
-        
-        # MixDrop (Priority 3 - Good alternative)
-        if os.getenv("MIXDROP_API_KEY"):
-            self.uploaders['mixdrop'] = {
-                'uploader': MixDropUploader(
-                    email=os.getenv("MIXDROP_EMAIL"),
-                    api_key=os.getenv("MIXDROP_API_KEY")
-                ),
-                'priority': 3,
-                'name': 'MixDrop'
-            }
-            print("  ✓ MixDrop (alternative)")
-        
-        # SeekStreaming (Priority 4 - Backup)
-        if os.getenv("SEEKSTREAMING_API_KEY"):
-            self.uploaders['seekstreaming'] = {
-                'uploader': SeekstreamingUploader(
-                    api_key=os.getenv("SEEKSTREAMING_API_KEY"),
-                    email=os.getenv("SEEKSTREAMING_EMAIL"),
-                    password=os.getenv("SEEKSTREAMING_PASSWORD")
-                ),
-                'priority': 4,
-                'name': 'SeekStreaming'
-            }
-            print("  ✓ SeekStreaming (backup)")
+        for host_info in self.uploaders.values():
+            print(f"  ✓ {host_info['name']}")
         
         if not self.uploaders:
             print("  ⚠️  No uploaders configured!")
@@ -150,39 +96,7 @@ class WorkingHostsUploader:
     
     def upload_to_host(self, host_key, host_info, video_path, title):
         """Upload to a single host"""
-        host_name = host_info['name']
-        uploader = host_info['uploader']
-        
-        print(f"\n{'='*70}")
-        print(f"[{host_name}] Starting upload...")
-        print(f"{'='*70}")
-        
-        try:
-            import time
-            start_time = time.time()
-            
-            result = uploader.upload(video_path, title)
-            
-            elapsed = time.time() - start_time
-            result['upload_time'] = elapsed
-            result['host_name'] = host_name
-            result['timestamp'] = datetime.now().isoformat()
-            
-            if result.get('success'):
-                print(f"\n[{host_name}] ✓ Upload successful in {elapsed:.1f}s")
-            else:
-                print(f"\n[{host_name}] ✗ Upload failed: {result.get('error', 'Unknown')}")
-            
-            return host_key, result
-            
-        except Exception as e:
-            print(f"\n[{host_name}] ✗ Exception: {str(e)}")
-            return host_key, {
-                'success': False,
-                'error': str(e),
-                'host_name': host_name,
-                'timestamp': datetime.now().isoformat()
-            }
+        return host_key, self.engine.upload_to_host(host_key, video_path, title, uploader=host_info['uploader'])
     
     def upload_parallel(self, video_path, title, max_workers=4):
         """Upload to all hosts in parallel"""
@@ -193,34 +107,7 @@ class WorkingHostsUploader:
         print(f"\n📤 Uploading to {len(self.uploaders)} working host(s) in parallel...")
         print(f"   Max workers: {max_workers}")
         
-        results = {}
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(
-                    self.upload_to_host,
-                    host_key,
-                    host_info,
-                    video_path,
-                    title
-                ): host_key
-                for host_key, host_info in self.uploaders.items()
-            }
-            
-            for future in as_completed(futures):
-                host_key = futures[future]
-                try:
-                    host_key, result = future.result()
-                    results[host_key] = result
-                except Exception as e:
-                    print(f"✗ {host_key} exception: {str(e)}")
-                    results[host_key] = {
-                        'success': False,
-                        'error': str(e),
-                        'timestamp': datetime.now().isoformat()
-                    }
-        
-        return results
+        return self.engine.upload_all(video_path, title, max_workers=max_workers)
     
     def upload_video(self, video_path, video_code, title=None):
         """Upload video with validation"""
@@ -247,33 +134,8 @@ class WorkingHostsUploader:
         results = self.upload_parallel(video_path, title or video_code)
         
         # Summary
+        print_summary(results)
         successful = sum(1 for r in results.values() if r.get('success'))
-        failed = len(results) - successful
-        
-        print(f"\n{'='*80}")
-        print(f"UPLOAD SUMMARY")
-        print(f"{'='*80}")
-        print(f"Total hosts: {len(results)}")
-        print(f"Successful: {successful}")
-        print(f"Failed: {failed}")
-        
-        if successful > 0:
-            print(f"\n✓ Successful uploads:")
-            for host, result in results.items():
-                if result.get('success'):
-                    host_name = result.get('host_name', host)
-                    embed_url = result.get('embed_url', result.get('url', 'N/A'))
-                    print(f"  • {host_name}: {embed_url}")
-        
-        if failed > 0:
-            print(f"\n✗ Failed uploads:")
-            for host, result in results.items():
-                if not result.get('success'):
-                    host_name = result.get('host_name', host)
-                    error = result.get('error', 'Unknown')
-                    print(f"  • {host_name}: {error[:60]}")
-        
-        print(f"\n{'='*80}\n")
         
         # Update database if video exists
         if successful > 0:
@@ -283,45 +145,7 @@ class WorkingHostsUploader:
     
     def update_database(self, video_code, results):
         """Update database with upload results"""
-        try:
-            video = db_manager.get_video_by_code(video_code)
-            
-            if not video:
-                print(f"⚠️  Video '{video_code}' not found in database")
-                return
-            
-            if 'hosting' not in video:
-                video['hosting'] = {}
-            
-            # Update hosting URLs
-            for host, result in results.items():
-                if result.get('success'):
-                    # Extract file code from various possible field names
-                    file_code = (
-                        result.get('file_code') or 
-                        result.get('vid') or 
-                        result.get('video_id') or 
-                        result.get('file_id') or 
-                        ''
-                    )
-                    
-                    video['hosting'][host] = {
-                        'embed_url': result.get('embed_url', ''),
-                        'download_url': result.get('url', result.get('download_url', '')),
-                        'file_code': file_code
-                    }
-                    
-                    print(f"  ✓ Saved {host}: {file_code}")
-            
-            video['uploaded_at'] = datetime.now().isoformat()
-            
-            if db_manager.add_or_update_video(video):
-                print(f"\n✓ Updated database for '{video_code}'")
-            else:
-                print(f"\n✗ Failed to update database")
-                
-        except Exception as e:
-            print(f"\n✗ Database update error: {str(e)}")
+        return sync_to_main_database(video_code, results)
 
 
 def main():
@@ -0,0 +1,68 @@
+"""
+Uploader Interface
+Common base for all hosting uploaders:
+- upload(video_path, title) -> result dict with at least 'success' (+ 'error' on failure)
+- Capability flags the upload engine uses to plan a fan-out
+  (chunked / TUS / multipart transfer, per-file size limit)
+- Resumable uploaders keep their server-side state in upload_sessions
+"""
+import os
+
+
+class Uploader:
+    """Base class for host uploaders"""
+
+    # Registry name of the host (e.g. 'mixdrop')
+    host = None
+    # Human readable name used in logs
+    display_name = None
+
+    # Transfer capabilities
+    chunked = False       # Sends the file in several requests
+    tus = False           # Speaks the TUS resumable upload protocol
+    multipart = True      # Sends the file as a multipart/form-data body
+    resumable = False     # Continues interrupted uploads via upload_sessions
+    max_size_gb = None    # Per-file limit, None = unlimited
+
+    def upload(self, video_path, title=None):
+        """
+        Upload a video
+
+        Args:
+            video_path: Path to video file
+            title: Optional title (defaults to file stem)
+
+        Returns:
+            Dict with 'success' and host specific URL/ID fields, or 'error'
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def capabilities(cls):
+        """Capability flags as a dict"""
+        return {
+            'chunked': cls.chunked,
+            'tus': cls.tus,
+            'multipart': cls.multipart,
+            'resumable': cls.resumable,
+            'max_size_gb': cls.max_size_gb
+        }
+
+    @classmethod
+    def check_size(cls, video_path):
+        """
+        Skip result if the file exceeds this host's size limit, else None
+        Lets the engine skip a host without opening a connection.
+        """
+        if not cls.max_size_gb:
+            return None
+
+        size_gb = os.path.getsize(video_path) / (1024 ** 3)
+        if size_gb <= cls.max_size_gb:
+            return None
+
+        return {
+            "success": False,
+            "error": f"File too large ({size_gb:.2f} GB). {cls.display_name or cls.host} limit: {cls.max_size_gb} GB",
+            "skipped": True
+        }
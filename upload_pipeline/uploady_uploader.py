@@ -1,31 +1,27 @@
-import requests
 import os
 from pathlib import Path
 import time
 import urllib3
+from uploader_base import Uploader
+from streaming_multipart import post_multipart
+from http_client import create_session
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-class UploadyUploader:
+class UploadyUploader(Uploader):
+    host = 'uploady'
+    display_name = 'Uploady'
+    max_size_gb = 5.0
+
     def __init__(self, email, username, api_key):
         self.email = email
         self.username = username
         self.api_key = api_key
         self.base_url = "https://uploady.io/api"
         
-        # Create session for connection reuse
-        self.session = requests.Session()
-        self.session.verify = False
-        
-        # Optimize connection pooling
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=10,
-            pool_maxsize=10,
-            max_retries=3
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+        # Pooled keep-alive connections from the shared HTTP client factory
+        self.session = create_session(pool_size=10, retries=3, verify=False, name='uploady')
         
     def upload(self, video_path, title=None):
         """Upload video to Uploady (XFS-based host)"""
@@ -100,27 +96,28 @@ class UploadyUploader:
             file_size = os.path.getsize(video_path)
             size_mb = file_size / (1024 * 1024)
             
-            with open(video_path, 'rb') as f:
-                files = {'file': (file_name, f, 'video/mp4')}
-                data = {'sess_id': sess_id}
-                
-                start_time = time.time()
-                
-                try:
-                    response = self.session.post(
-                        upload_url,
-                        files=files,
-                        data=data,
-                        timeout=1800
-                    )
-                except Exception as e:
-                    return {"success": False, "error": f"Upload failed: {str(e)}"}
-                
-                elapsed = time.time() - start_time
-                speed = (size_mb / elapsed) if elapsed > 0 else 0
-                
-                print(f"[Uploady] Upload completed in {elapsed:.1f}s ({speed:.2f} MB/s)")
-                print(f"[Uploady] Response status: {response.status_code}")
+            data = {'sess_id': sess_id}
+            
+            start_time = time.time()
+            
+            try:
+                response = post_multipart(
+                    self.session,
+                    upload_url,
+                    data,
+                    'file',
+                    video_path,
+                    file_name=file_name,
+                    timeout=1800
+                )
+            except Exception as e:
+                return {"success": False, "error": f"Upload failed: {str(e)}"}
+            
+            elapsed = time.time() - start_time
+            speed = (size_mb / elapsed) if elapsed > 0 else 0
+            
+            print(f"[Uploady] Upload completed in {elapsed:.1f}s ({speed:.2f} MB/s)")
+            print(f"[Uploady] Response status: {response.status_code}")
             
             if response.status_code == 200:
                 result = response.json()
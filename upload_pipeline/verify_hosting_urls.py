@@ -2,7 +2,6 @@
 Verify and fix hosting URLs for uploaded videos
 Tests if URLs are accessible and updates them if needed
 """
-import requests
 import json
 import os
 from datetime import datetime
@@ -11,11 +10,11 @@ import sys
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database_manager import db_manager
+from http_client import create_session
 
 class HostingURLVerifier:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_session(name='verify', headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
     
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Post-Upload Verification Queue
+Checks that run after an upload has delivered its bytes, in the background:
+- Jobs live in database/verification_queue.json, so they survive restarts
+- Each host registers a checker: checker(job) -> {'state': ..., ...}
+    'verified' / 'failed'  final result
+    'pending'              still processing - checked again later (backoff)
+  Extra keys in 'updates' are merged into the hosting entry (e.g. a VID that
+  only exists once the host finished processing)
+- Finished jobs update video['hosting'][service] in the combined database
+  (locked read-modify-write, db_manager.update_video), only if that entry
+  holds the job's file code (not a preview uploaded under the same video code)
+- A finished job whose video is not saved yet is looked up by its video code
+  again on a backoff (APPLY_DELAYS); the whole catalog is scanned for its
+  file code only on the first miss
+- The worker thread starts on the first enqueue, or when a checker is
+  registered (module import at pipeline startup) while jobs from an earlier
+  run are waiting; the upload loop moves on to the next video immediately
+
+Usage: python verification_queue.py [--watch]   (process due jobs from the CLI)
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+from datetime import datetime
+
+try:
+    from filelock import FileLock, Timeout
+    FILELOCK_AVAILABLE = True
+except ImportError:
+    FILELOCK_AVAILABLE = False
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+VERIFICATION_DB = os.path.join(SCRIPT_DIR, "database", "verification_queue.json")
+
+# Seconds until each re-check of a job that is still processing
+DEFAULT_DELAYS = (20, 40, 60, 120, 300, 600, 1200)
+# Seconds until each retry of writing a finished job whose video is not saved yet (last one repeats)
+APPLY_DELAYS = (30, 120, 600, 1800)
+# Finished jobs are kept this long for inspection
+KEEP_FINISHED_SECONDS = 7 * 86400
+
+# Modules that register checkers (imported by the CLI)
+CHECKER_MODULES = [
+    (os.path.join(SCRIPT_DIR, 'jable'), 'upload_all_hosts'),
+    (os.path.join(SCRIPT_DIR, 'upload_pipeline'), 'upload18_uploader_fixed'),
+]
+
+
+class VerificationQueue:
+    """Persistent queue of post-upload checks with a background worker"""
+
+    def __init__(self, path=VERIFICATION_DB, poll_interval=5.0, delays=DEFAULT_DELAYS, apply_delays=APPLY_DELAYS):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.delays = tuple(delays)
+        self.apply_delays = tuple(apply_delays)
+        self.checkers = {}
+        self.autostart = True  # register() starts the worker for waiting jobs
+        self.thread_lock = threading.Lock()
+        self.file_lock = FileLock(path + ".lock", timeout=30) if FILELOCK_AVAILABLE else None
+        self._worker = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    # -- storage -----------------------------------------------------------
+
+    def _read(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Error reading {self.path}: {e}")
+        return []
+
+    def _write(self, jobs):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(jobs, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def _modify(self, change):
+        """Read-modify-write under the thread and file locks"""
+        with self.thread_lock:
+            try:
+                if self.file_lock:
+                    self.file_lock.acquire()
+            except Timeout:
+                print(f"⚠️ Lock timeout on {self.path}, writing without lock")
+
+            try:
+                jobs = self._read()
+                result = change(jobs)
+                self._write(jobs)
+                return result
+            finally:
+                if self.file_lock and self.file_lock.is_locked:
+                    self.file_lock.release()
+
+    # -- API ---------------------------------------------------------------
+
+    def register(self, kind, checker):
+        """
+        Register checker(job) -> result dict for a job kind
+        Starts the worker if jobs of an earlier run are waiting (pending
+        ones of this kind, or finished ones not written to the database)
+        """
+        self.checkers[kind] = checker
+        if self.autostart and any(j['kind'] == kind if j['status'] == 'pending' else not j['applied']
+                                  for j in self.jobs()):
+            self.start()
+
+    def enqueue(self, kind, service, file_code, video_code=None, params=None,
+                delays=None, start=True):
+        """
+        Queue a verification job
+
+        Args:
+            kind: Checker name (see register)
+            service: Key of the hosting entry to update (video['hosting'][service])
+            file_code: Host file code of the upload (also used to find the video)
+            video_code: Video code - without it the job can only be applied by
+                        one scan of the whole catalog for the file code
+            params: JSON-serializable checker parameters (never credentials)
+            delays: Seconds before each check, the job fails after the last one
+                    (default: the queue's delays)
+            start: Start the background worker if it is not running
+
+        Returns:
+            Job ID
+        """
+        now = time.time()
+        delays = delays or self.delays
+        job = {
+            'id': uuid.uuid4().hex[:12],
+            'kind': kind,
+            'service': service,
+            'file_code': file_code,
+            'video_code': video_code,
+            'params': params or {},
+            'delays': list(delays),
+            'attempts': 0,
+            'status': 'pending',
+            'next_run': now + delays[0],
+            'created_at': datetime.now().isoformat(),
+            'applied': False
+        }
+
+        self._modify(lambda jobs: jobs.append(job))
+
+        if start:
+            self.start()
+        self._wake.set()
+        return job['id']
+
+    def jobs(self, status=None):
+        """All jobs, or those with the given status"""
+        with self.thread_lock:
+            jobs = self._read()
+        return [j for j in jobs if status is None or j['status'] == status]
+
+    def get(self, job_id):
+        return next((j for j in self.jobs() if j['id'] == job_id), None)
+
+    # -- processing --------------------------------------------------------
+
+    def _check(self, job):
+        """Run the job's checker; never raises"""
+        checker = self.checkers.get(job['kind'])
+        if checker is None:
+            return None
+
+        try:
+            result = checker(job) or {}
+        except Exception as e:
+            result = {'state': 'pending', 'error': str(e)[:200]}
+
+        if result.get('state') not in ('verified', 'failed', 'pending'):
+            result['state'] = 'pending'
+        return result
+
+    def run_pending(self, now=None):
+        """
+        Check every due job once, apply finished ones to the database
+
+        Returns:
+            Number of jobs checked
+        """
+        now = now or time.time()
+        due = [
+            j for j in self.jobs('pending')
+            if j['next_run'] <= now and j['kind'] in self.checkers
+        ]
+
+        for job in due:
+            result = self._check(job)
+            job['attempts'] += 1
+            job['last_check'] = datetime.now().isoformat()
+            job['result'] = {k: v for k, v in result.items() if k != 'updates'}
+            job['updates'] = result.get('updates', {})
+
+            if result['state'] != 'pending':
+                job['status'] = result['state']
+            elif job['attempts'] >= len(job['delays']):
+                job['status'] = 'failed'
+                job['result']['error'] = job['result'].get('error') or 'Still processing after all checks'
+            else:
+                job['next_run'] = time.time() + job['delays'][job['attempts']]
+
+            if job['status'] != 'pending':
+                job['finished_at'] = time.time()
+                icon = '✓' if job['status'] == 'verified' else '✗'
+                print(f"[Verify] {icon} {job['service']} {job['file_code']}: {job['status']}"
+                      f"{' - ' + str(job['result'].get('error')) if job['result'].get('error') else ''}")
+
+            self._save_job(job)
+
+        # Finished jobs whose video was not in the database yet (backoff after a miss)
+        for job in self.jobs():
+            if job['status'] != 'pending' and not job['applied'] and job.get('next_apply', 0) <= now:
+                if self._apply(job):
+                    job['applied'] = True
+                    job.pop('unapplied', None)
+                    job.pop('next_apply', None)
+                else:
+                    misses = job.get('apply_misses', 0)
+                    job['unapplied'] = True
+                    job['apply_misses'] = misses + 1
+                    job['next_apply'] = time.time() + self.apply_delays[min(misses, len(self.apply_delays) - 1)]
+                self._save_job(job)
+
+        self._prune()
+        return len(due)
+
+    def _save_job(self, updated):
+        def change(jobs):
+            for i, job in enumerate(jobs):
+                if job['id'] == updated['id']:
+                    jobs[i] = updated
+        self._modify(change)
+
+    def _prune(self):
+        cutoff = time.time() - KEEP_FINISHED_SECONDS
+
+        def change(jobs):
+            jobs[:] = [j for j in jobs if j['status'] == 'pending' or j.get('finished_at', 0) > cutoff]
+
+        if any(j['status'] != 'pending' and j.get('finished_at', 0) <= cutoff for j in self.jobs()):
+            self._modify(change)
+
+    def _apply(self, job):
+        """Write the outcome into the hosting entry; False if the video is not found yet"""
+        try:
+            from database_manager import db_manager
+        except Exception as e:
+            print(f"[Verify] ⚠️ Database unavailable: {e}")
+            return False
+
+        def matches(candidate):
+            # Only the entry of this upload - previews of the same video share its code
+            entry = (candidate or {}).get('hosting', {}).get(job['service']) or {}
+            return job['file_code'] in (entry.get('file_code'), entry.get('filecode'))
+
+        def apply(video):
+            # Runs under the database lock, on the entry as it is now
+            if not matches(video):
+                return None
+            entry = video['hosting'][job['service']]
+            entry.update(job.get('updates') or {})
+            entry['verified'] = job['status'] == 'verified'
+            entry['verification'] = {
+                'status': job['status'],
+                'checked_at': job.get('last_check'),
+                'attempts': job['attempts'],
+                **job.get('result', {})
+            }
+            return video
+
+        if job.get('video_code') and db_manager.update_video(job['video_code'], apply):
+            return True
+        if job.get('unapplied'):
+            return False  # Catalog scanned on the first miss already - by video code only from here on
+
+        video = next((candidate for candidate in db_manager.get_all_videos() if matches(candidate)), None)
+        return bool(video) and db_manager.update_video(video['code'], apply)
+
+    # -- worker ------------------------------------------------------------
+
+    def start(self):
+        """Start the background worker (idempotent)"""
+        if self._worker and self._worker.is_alive():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name='verification-queue', daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout=10):
+        self._stop.set()
+        self._wake.set()
+        if self._worker:
+            self._worker.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                print(f"[Verify] ⚠️ Worker error: {e}")
+
+            jobs = self.jobs()
+            pending = [j['next_run'] for j in jobs if j['status'] == 'pending' and j['kind'] in self.checkers]
+            pending += [j['next_apply'] for j in jobs if j['status'] != 'pending' and not j['applied'] and 'next_apply' in j]
+            wait = min(pending) - time.time() if pending else self.poll_interval * 12
+            self._wake.wait(max(0.05, min(wait, self.poll_interval * 12)))
+            self._wake.clear()
+
+    def print_status(self):
+        jobs = self.jobs()
+        counts = {}
+        for job in jobs:
+            counts[job['status']] = counts.get(job['status'], 0) + 1
+        print(f"🔎 Verification queue: {len(jobs)} jobs " +
+              ' '.join(f"{status}={count}" for status, count in sorted(counts.items())))
+
+
+# Global instance
+verification_queue = VerificationQueue()
+
+
+if __name__ == "__main__":
+    import importlib
+
+    verification_queue.autostart = False  # Checked here, or by --watch's worker
+    for path, module in CHECKER_MODULES:
+        sys.path.insert(0, path)
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            print(f"⚠️ Checker module {module} not available: {e}")
+
+    verification_queue.print_status()
+    checked = verification_queue.run_pending()
+    print(f"Checked {checked} due job(s)")
+
+    if '--watch' in sys.argv:
+        verification_queue.start()
+        try:
+            while True:
+                time.sleep(60)
+                verification_queue.print_status()
+        except KeyboardInterrupt:
+            verification_queue.stop()